@@ -4,10 +4,14 @@ Runs every 5 minutes. Produces alerts based on how soon events are:
 - Event in <=15 min -> priority 3, TTL 15 min
 - Event in <=60 min -> priority 2, TTL 30 min
 
+Reads go through the calendar services, so each run also refreshes the
+shared ``calendar_shared.calendar_cache`` that voice queries answer from.
+
 Requires calendar secrets to be configured (skipped otherwise via standard
 agent discovery secret validation).
 """
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List
 
@@ -111,7 +115,9 @@ class CalendarAlertAgent(IJarvisAgent):
                 conversation_id="calendar-alert-agent",
             )
 
-            response = cmd.run(
+            # The command does blocking HTTP; keep it off the shared event loop.
+            response = await asyncio.to_thread(
+                cmd.run,
                 request_info,
                 resolved_datetimes=[today],
             )
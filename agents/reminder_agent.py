@@ -8,6 +8,7 @@ When REMINDER_PUSH_NOTIFICATIONS is enabled, also sends push notifications
 to the user's phone via command-center → jarvis-notifications.
 """
 
+import asyncio
 from datetime import timedelta, timezone, datetime
 from typing import Any, Dict, List
 
@@ -53,6 +54,10 @@ class ReminderAgent(IJarvisAgent):
 
     async def run(self) -> None:
         """Check for due reminders and generate alerts."""
+        # DB access and push notifications block; keep them off the shared event loop.
+        await asyncio.to_thread(self._check_reminders)
+
+    def _check_reminders(self) -> None:
         try:
             from services.reminder_service import get_reminder_service
             from jarvis_command_sdk import UserSettings
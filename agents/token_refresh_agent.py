@@ -9,6 +9,7 @@ Deduplicates by provider so components sharing the same OAuth provider
 (e.g. multiple Google commands) only trigger one refresh per cycle.
 """
 
+import asyncio
 import json
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List
@@ -61,6 +62,10 @@ class TokenRefreshAgent(IJarvisAgent):
 
     async def run(self) -> None:
         """Check all OAuth-enabled commands and device protocols, refresh tokens nearing expiry."""
+        # Token endpoints are called with blocking urllib; keep them off the shared event loop.
+        await asyncio.to_thread(self._refresh_tokens)
+
+    def _refresh_tokens(self) -> None:
         # Collect auth sources from commands and device protocols
         auth_sources: list[tuple[AuthenticationConfig, Any]] = []
 
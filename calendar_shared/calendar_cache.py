@@ -0,0 +1,207 @@
+"""Process-wide calendar event cache shared by the alerts agent and read commands.
+
+``CalendarAlertAgent`` fetches today's events every
+``REFRESH_INTERVAL_SECONDS`` through ``ReadCalendarCommand``, and a voice
+"what's on my calendar today" used to fetch and parse the same events
+again. Both now go through ``ICloudCalendarService.read_events`` /
+``GoogleCalendarService.read_events``, which read from this cache:
+
+  - **Per-provider freshness** — an entry younger than the provider's
+    window (``FRESHNESS_SECONDS``) is served as-is.
+  - **Stale-while-revalidate** — an older entry (up to
+    ``STALE_LIMIT_SECONDS``) is still served immediately while one
+    background refresh runs, so voice queries answer from memory and the
+    agent's periodic reads keep the cache warm.
+  - **Range queries** — each fetch covers whole days and at least
+    ``PREFETCH_DAYS``; ``read`` returns the events overlapping
+    [start, end), so "today", "this afternoon" and "tomorrow" share one
+    fetch.
+
+Fetch callables raise on failure. A failed refresh keeps serving the
+previous entry; a failed first fetch returns ``[]``.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set
+
+try:
+    from jarvis_log_client import JarvisLogger
+except ImportError:
+    import logging
+
+    class JarvisLogger:
+        def __init__(self, **kw): self._log = logging.getLogger(kw.get("service", __name__))
+        def info(self, msg, **kw): self._log.info(msg)
+        def warning(self, msg, **kw): self._log.warning(msg)
+        def error(self, msg, **kw): self._log.error(msg)
+        def debug(self, msg, **kw): self._log.debug(msg)
+
+from calendar_shared.calendar_event import CalendarEvent
+
+logger = JarvisLogger(service="jarvis-node")
+
+# Seconds an entry is served without revalidation, per provider. An
+# unchanged iCloud calendar revalidates with one PROPFIND, so it can be
+# checked more often than a full Google events list.
+FRESHNESS_SECONDS: Dict[str, float] = {"icloud": 60.0, "google": 300.0}
+DEFAULT_FRESHNESS_SECONDS = 120.0
+# Entries older than this are refetched synchronously instead of served stale
+STALE_LIMIT_SECONDS = 1800.0
+# Minimum span fetched per miss, starting at the requested day
+PREFETCH_DAYS = 7
+
+# (start, end) -> events overlapping the range. Raises on failure.
+Fetch = Callable[[datetime, datetime], List[CalendarEvent]]
+
+
+@dataclass
+class _Entry:
+    start: datetime
+    end: datetime
+    events: List[CalendarEvent]
+    fetched_at: float
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        return self.start <= start and end <= self.end
+
+    def overlapping(self, start: datetime, end: datetime) -> List[CalendarEvent]:
+        return [e for e in self.events if e.start_time < end and e.end_time > start]
+
+
+class CalendarCache:
+    """Calendar events per provider account, with stale-while-revalidate."""
+
+    def __init__(
+        self,
+        freshness_seconds: Optional[Dict[str, float]] = None,
+        stale_limit_seconds: float = STALE_LIMIT_SECONDS,
+        prefetch_days: int = PREFETCH_DAYS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._freshness = dict(FRESHNESS_SECONDS if freshness_seconds is None else freshness_seconds)
+        self._stale_limit = stale_limit_seconds
+        self._prefetch = timedelta(days=prefetch_days)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        self._refreshing: Set[str] = set()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+
+    def read(
+        self,
+        key: str,
+        provider: str,
+        start: datetime,
+        end: datetime,
+        fetch: Fetch,
+    ) -> List[CalendarEvent]:
+        """Events for account ``key`` overlapping [start, end), sorted by start time."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.covers(start, end):
+                age = self._clock() - entry.fetched_at
+                if age <= self._freshness.get(provider, DEFAULT_FRESHNESS_SECONDS):
+                    self._stats["hits"] += 1
+                    return entry.overlapping(start, end)
+                if age <= self._stale_limit:
+                    self._stats["stale_hits"] += 1
+                    self._revalidate_locked(key, entry, fetch)
+                    return entry.overlapping(start, end)
+            self._stats["misses"] += 1
+            fetch_lock = self._fetch_locks.setdefault(key, threading.Lock())
+
+        # Concurrent misses for one account share a single fetch
+        with fetch_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                fresh_enough = entry is not None and entry.covers(start, end) and \
+                    self._clock() - entry.fetched_at <= self._stale_limit
+            if fresh_enough:
+                return entry.overlapping(start, end)
+
+            range_start = datetime.combine(start.date(), datetime.min.time())
+            range_end = max(_ceil_day(end), range_start + self._prefetch)
+            try:
+                events = self._fetch(fetch, range_start, range_end)
+            except Exception as e:
+                logger.warning("Calendar fetch failed", key=key, error=str(e))
+                with self._lock:
+                    self._stats["errors"] += 1
+                    entry = self._entries.get(key)
+                return entry.overlapping(start, end) if entry is not None and entry.covers(start, end) else []
+
+            entry = _Entry(range_start, range_end, events, self._clock())
+            with self._lock:
+                self._entries[key] = entry
+            return entry.overlapping(start, end)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one account's entry (after a write), or everything."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), **self._stats}
+
+    # ── Internals ────────────────────────────────────────────────────
+
+    @staticmethod
+    def _fetch(fetch: Fetch, start: datetime, end: datetime) -> List[CalendarEvent]:
+        return sorted(fetch(start, end), key=lambda e: e.start_time)
+
+    def _revalidate_locked(self, key: str, entry: _Entry, fetch: Fetch) -> None:
+        """Start one background refresh of ``entry`` (caller holds ``_lock``)."""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        self._stats["refreshes"] += 1
+
+        def refresh() -> None:
+            try:
+                events = self._fetch(fetch, entry.start, entry.end)
+                with self._lock:
+                    # Skip if invalidated or replaced by a newer fetch meanwhile
+                    if self._entries.get(key) is entry:
+                        self._entries[key] = _Entry(entry.start, entry.end, events, self._clock())
+            except Exception as e:
+                logger.warning("Calendar background refresh failed", key=key, error=str(e))
+                with self._lock:
+                    self._stats["errors"] += 1
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True, name="calendar-cache-refresh").start()
+
+
+def _ceil_day(value: datetime) -> datetime:
+    day = datetime.combine(value.date(), datetime.min.time())
+    return day if day == value else day + timedelta(days=1)
+
+
+_calendar_cache: Optional[CalendarCache] = None
+_calendar_cache_lock = threading.Lock()
+
+
+def get_calendar_cache() -> CalendarCache:
+    """Return the process-wide CalendarCache, creating it on first call."""
+    global _calendar_cache
+    if _calendar_cache is None:
+        with _calendar_cache_lock:
+            if _calendar_cache is None:
+                _calendar_cache = CalendarCache()
+    return _calendar_cache
+
+
+def reset_calendar_cache() -> None:
+    """Drop the singleton (test hook). Production code should not call this."""
+    global _calendar_cache
+    _calendar_cache = None
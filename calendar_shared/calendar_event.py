@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class CalendarEvent:
+    """Data class for calendar events"""
+    id: str
+    summary: str
+    start_time: datetime
+    end_time: datetime
+    location: Optional[str] = None
+    description: Optional[str] = None
+    is_all_day: bool = False
+    recurrence: Optional[str] = None
@@ -5,6 +5,7 @@ Same interface as ICloudCalendarService: list_events via read_events().
 On 401, flags re-auth so the mobile app prompts the user.
 """
 
+import hashlib
 from datetime import datetime, timedelta
 from typing import List
 
@@ -22,6 +23,7 @@ except ImportError:
         def error(self, msg, **kw): self._log.error(msg)
         def debug(self, msg, **kw): self._log.debug(msg)
 
+from calendar_shared.calendar_cache import get_calendar_cache
 from calendar_shared.icloud_calendar_service import CalendarEvent
 
 logger = JarvisLogger(service="jarvis-node")
@@ -47,6 +49,9 @@ class GoogleCalendarService:
     def read_events(self, date: datetime | None = None, look_ahead_days: int = 1) -> List[CalendarEvent]:
         """Fetch events from Google Calendar for a date range.
 
+        Served from the shared calendar cache (stale-while-revalidate);
+        only misses and background refreshes call the API.
+
         Args:
             date: Start date (default: now).
             look_ahead_days: Number of days to fetch.
@@ -57,40 +62,54 @@ class GoogleCalendarService:
         if date is None:
             date = datetime.now()
 
-        time_min = date.strftime("%Y-%m-%dT00:00:00Z")
-        time_max = (date + timedelta(days=look_ahead_days)).strftime("%Y-%m-%dT00:00:00Z")
+        start = datetime.combine(date.date(), datetime.min.time())
+        end = start + timedelta(days=look_ahead_days)
+        return get_calendar_cache().read(self.cache_key, "google", start, end, self._fetch_range)
+
+    @property
+    def cache_key(self) -> str:
+        # The access token rotates; the refresh token identifies the account
+        account = hashlib.sha256(self.refresh_token.encode()).hexdigest()[:12]
+        return f"google:{account}:{self.calendar_id}"
 
+    def _fetch_range(self, start: datetime, end: datetime) -> List[CalendarEvent]:
+        """Fetch events in [start, end) from the API, following every page. Raises on failure."""
         params = {
-            "timeMin": time_min,
-            "timeMax": time_max,
+            "timeMin": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "timeMax": end.strftime("%Y-%m-%dT%H:%M:%SZ"),
             "singleEvents": "true",
             "orderBy": "startTime",
-            "maxResults": "50",
+            "maxResults": "250",
         }
 
         try:
-            response = httpx.get(
-                f"{BASE_URL}/calendars/{self.calendar_id}/events",
-                params=params,
-                headers={"Authorization": f"Bearer {self.access_token}"},
-                timeout=15.0,
-            )
-
-            if response.status_code == 401:
-                logger.warning("Google Calendar returned 401 — flagging re-auth")
-                self._flag_reauth()
-                return []
-
-            response.raise_for_status()
-            data = response.json()
-            return self._parse_events(data.get("items", []))
+            items: list[dict] = []
+            while True:
+                response = httpx.get(
+                    f"{BASE_URL}/calendars/{self.calendar_id}/events",
+                    params=params,
+                    headers={"Authorization": f"Bearer {self.access_token}"},
+                    timeout=15.0,
+                )
+
+                if response.status_code == 401:
+                    logger.warning("Google Calendar returned 401 — flagging re-auth")
+                    self._flag_reauth()
+
+                response.raise_for_status()
+                data = response.json()
+                items.extend(data.get("items", []))
+                page_token = data.get("nextPageToken")
+                if not page_token:
+                    return self._parse_events(items)
+                params["pageToken"] = page_token
 
         except httpx.HTTPStatusError as e:
             logger.error("Google Calendar API error", status_code=e.response.status_code, detail=str(e))
-            return []
+            raise
         except Exception as e:
             logger.error("Google Calendar request failed", error=str(e))
-            return []
+            raise
 
     def _parse_events(self, items: list[dict]) -> List[CalendarEvent]:
         """Convert Google Calendar API items to CalendarEvent objects."""
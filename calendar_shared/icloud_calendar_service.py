@@ -1,6 +1,6 @@
+import threading
 from datetime import datetime, timedelta
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Union
 
 import httpx
 
@@ -16,22 +16,29 @@ except ImportError:
         def error(self, msg, **kw): self._log.error(msg)
         def debug(self, msg, **kw): self._log.debug(msg)
 
+from calendar_shared.calendar_cache import get_calendar_cache
+from calendar_shared.calendar_event import CalendarEvent
+from calendar_shared.caldav_sync import (
+    CalDAVSyncEngine,
+    CalendarIndex,
+    expand_resource,
+    iter_calendar_events,
+    parse_vevents,
+)
 from calendar_shared.date_util import parse_ical_datetime
 
 logger = JarvisLogger(service="jarvis-node")
 
+# Commands build a new service per request, so the sync engines (and the
+# local event index each one keeps) live here, keyed by cache_key.
+_sync_engines: Dict[str, CalDAVSyncEngine] = {}
+_sync_engines_lock = threading.Lock()
 
-@dataclass
-class CalendarEvent:
-    """Data class for calendar events"""
-    id: str
-    summary: str
-    start_time: datetime
-    end_time: datetime
-    location: Optional[str] = None
-    description: Optional[str] = None
-    is_all_day: bool = False
-    recurrence: Optional[str] = None
+
+def reset_sync_engines() -> None:
+    """Drop every cached sync engine (test hook). Production code should not call this."""
+    with _sync_engines_lock:
+        _sync_engines.clear()
 
 
 class ICloudCalendarService:
@@ -297,35 +304,72 @@ class ICloudCalendarService:
         """
         Read calendar events for a specific date or date range
 
+        Served from the shared calendar cache; misses and revalidations go
+        through the local index kept by ``CalDAVSyncEngine``, which costs
+        one Depth-0 PROPFIND when the calendar hasn't changed.
+
         Args:
             date: Start date (default: today)
             look_ahead_days: Number of days to look ahead (default: 1)
 
         Returns:
-            List of CalendarEvent objects
+            List of CalendarEvent objects, sorted by start time
         """
-        if not self._authenticated and not self.authenticate():
-            return []
-
         if date is None:
             date = datetime.now()
 
         # Calculate date range
         end_date = date + timedelta(days=look_ahead_days)
 
-        try:
-            # Build CalDAV query for events in date range
-            # According to OneCal, we need to discover the actual calendar URL first
+        return get_calendar_cache().read(self.cache_key, "icloud", date, end_date, self._fetch_range)
 
-            # Use the discovered calendar home URL directly (it already contains /calendars/)
-            if not hasattr(self, 'calendar_home_url'):
-                logger.debug("No calendar_home_url found, returning empty list")
-                return []
+    @property
+    def cache_key(self) -> str:
+        return f"icloud:{self.username}:{self.calendar_name.lower()}"
 
-            calendars_url = self.calendar_home_url
+    def _fetch_range(self, start: datetime, end: datetime) -> List[CalendarEvent]:
+        """Sync the calendar and return events overlapping [start, end). Raises on failure."""
+        if not self._authenticated and not self.authenticate():
+            raise ConnectionError("iCloud authentication failed")
+
+        engine = self._get_sync_engine()
+        if engine is None:
+            raise LookupError(f"Calendar {self.calendar_name!r} not found")
 
-            # Use PROPFIND to discover calendars as per OneCal article
-            propfind_query = """<?xml version="1.0" encoding="utf-8" ?>
+        try:
+            engine.sync()
+        except Exception as e:
+            if not engine.synced:
+                raise
+            logger.warning("Calendar sync failed, using last synced copy", calendar_name=self.calendar_name, error=str(e))
+
+        logger.debug("Querying calendar index", start=start.strftime('%Y-%m-%d %H:%M:%S'),
+                     end=end.strftime('%Y-%m-%d %H:%M:%S'), sync=engine.last_sync)
+        return engine.index.query(start, end)
+
+    def _get_sync_engine(self) -> Optional[CalDAVSyncEngine]:
+        """Shared sync engine for the configured calendar, discovering its URL once per process."""
+        with _sync_engines_lock:
+            engine = _sync_engines.get(self.cache_key)
+        if engine is None:
+            calendar_url = self._discover_calendar_url()
+            if not calendar_url:
+                return None
+            with _sync_engines_lock:
+                engine = _sync_engines.setdefault(
+                    self.cache_key, CalDAVSyncEngine(self.session, calendar_url, CalendarIndex())
+                )
+        engine.session = self.session  # sync with this instance's credentials
+        return engine
+
+    def _discover_calendar_url(self) -> Optional[str]:
+        """Find the full URL of ``calendar_name`` under the calendar home."""
+        if not self.calendar_home_url:
+            logger.debug("No calendar_home_url found")
+            return None
+
+        # Use PROPFIND to discover calendars as per OneCal article
+        propfind_query = """<?xml version="1.0" encoding="utf-8" ?>
 <D:propfind xmlns:D="DAV:">
     <D:prop>
         <D:resourcetype/>
@@ -334,128 +378,60 @@ class ICloudCalendarService:
     </D:prop>
 </D:propfind>"""
 
-            propfind_headers = {
-                'Content-Type': 'application/xml; charset=utf-8',
-                'Depth': '1'
-            }
-
-            try:
-                logger.debug("Discovering calendars", url=calendars_url)
-                calendars_response = self.session.request('PROPFIND', calendars_url, content=propfind_query, headers=propfind_headers)
-                logger.debug("Calendar discovery response", status_code=calendars_response.status_code)
-
-                if calendars_response.status_code in [200, 207]:
-                    # Parse the calendar list to find the specific calendar we want
-                    calendar_url = self._find_calendar_url(calendars_response.text, self.calendar_name)
-                    if not calendar_url:
-                        logger.debug("Calendar not found in response, returning empty list", calendar_name=self.calendar_name)
-                        return []
-
-                    # Construct the full calendar URL
-                    if calendar_url.startswith('/'):
-                        full_calendar_url = f"{self.base_url}{calendar_url}"
-                    else:
-                        full_calendar_url = calendar_url
-
-                    # Now try to query events using the calendar-query REPORT
-                    # This follows the OneCal article's approach
-
-                    # Debug: Show the exact dates being used
-                    logger.debug("Querying calendar for date range", start=date.strftime('%Y-%m-%d %H:%M:%S'), end=end_date.strftime('%Y-%m-%d %H:%M:%S'))
-
-                    calendar_query = f"""<?xml version="1.0" encoding="utf-8" ?>
-<C:calendar-query xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:caldav">
-    <D:prop>
-        <D:getetag/>
-        <C:calendar-data/>
-    </D:prop>
-    <C:filter>
-        <C:comp-filter name="VCALENDAR">
-            <C:comp-filter name="VEVENT">
-                <C:time-range start="{date.strftime('%Y%m%dT%H%M%SZ')}" end="{end_date.strftime('%Y%m%dT%H%M%SZ')}"/>
-            </C:comp-filter>
-        </C:comp-filter>
-    </C:filter>
-</C:calendar-query>"""
-
-
-
-                    headers = {
-                        'Content-Type': 'application/xml; charset=utf-8',
-                        'Depth': '1'
-                    }
-
-                    response = self.session.request('REPORT', full_calendar_url, content=calendar_query, headers=headers)
-
-                    if response.status_code in [200, 207]:  # CalDAV returns 207 Multi-Status for successful queries
-                        logger.debug("Calendar query successful", status_code=response.status_code)
-                        return self._parse_calendar_response(response.text, date, end_date)
-                    else:
-                        logger.warning("Calendar query failed", status_code=response.status_code)
-                        return []
+        propfind_headers = {
+            'Content-Type': 'application/xml; charset=utf-8',
+            'Depth': '1'
+        }
 
-                else:
-                    return []
+        try:
+            logger.debug("Discovering calendars", url=self.calendar_home_url)
+            calendars_response = self.session.request('PROPFIND', self.calendar_home_url, content=propfind_query, headers=propfind_headers)
+            logger.debug("Calendar discovery response", status_code=calendars_response.status_code)
+        except Exception as e:
+            logger.warning("Calendar discovery failed", error=str(e))
+            return None
 
-            except Exception as e:
-                return []
+        if calendars_response.status_code not in [200, 207]:
+            return None
 
-        except Exception as e:
-            return []
+        # Parse the calendar list to find the specific calendar we want
+        calendar_url = self._find_calendar_url(calendars_response.text, self.calendar_name)
+        if not calendar_url:
+            logger.debug("Calendar not found in response", calendar_name=self.calendar_name)
+            return None
 
-    def _parse_calendar_response(self, response_text: str, start_date: datetime, end_date: datetime) -> List[CalendarEvent]:
+        # Construct the full calendar URL
+        if calendar_url.startswith('/'):
+            return f"{self.base_url}{calendar_url}"
+        return calendar_url
+
+    def _parse_calendar_response(
+        self,
+        response_text: Union[str, bytes, Iterable[bytes]],
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None,
+    ) -> List[CalendarEvent]:
         """
-        Parse the CalDAV response into CalendarEvent objects
+        Parse a CalDAV multistatus response into CalendarEvent objects
 
         Args:
-            response_text: Raw CalDAV response
+            response_text: Raw CalDAV response, or an iterable of body chunks
+                (e.g. ``response.iter_bytes()``) to parse as it streams in
             start_date: Start date for filtering events
             end_date: End date for filtering events
+            limit: Stop reading once this many events have been found
 
         Returns:
-            List of parsed CalendarEvent objects
-        """
-        events = []
+            List of parsed CalendarEvent objects, sorted by start time
 
-        try:
-            # Parse the CalDAV XML response to extract calendar-data
-            lines = response_text.split('\n')
-            in_calendar_data = False
-            calendar_data = ""
-
-            for line in lines:
-                if '<calendar-data' in line:
-                    in_calendar_data = True
-                    # Extract the content after the opening tag
-                    start_tag_end = line.find('>') + 1
-                    if start_tag_end > 0:
-                        calendar_data += line[start_tag_end:]
-                elif '</calendar-data>' in line:
-                    in_calendar_data = False
-                    # Extract the content before the closing tag
-                    end_tag_start = line.find('</calendar-data>')
-                    if end_tag_start > 0:
-                        calendar_data += line[:end_tag_start]
-
-                    # Parse this event's iCal content immediately
-                    if calendar_data.strip():
-                        event_events = self._parse_ical_content(calendar_data, start_date, end_date)
-                        events.extend(event_events)
-
-                    # Reset for next event
-                    calendar_data = ""
-                elif in_calendar_data:
-                    calendar_data += line + '\n'
-
-            # Parse any remaining calendar data
-            if calendar_data.strip():
-                event_events = self._parse_ical_content(calendar_data, start_date, end_date)
-                events.extend(event_events)
-
-            return events
-
-        except Exception as e:
-            return []
+        Raises:
+            MultistatusError: If the response is not well-formed XML
+        """
+        chunks = [response_text] if isinstance(response_text, (str, bytes)) else response_text
+        events = list(iter_calendar_events(chunks, start_date, end_date, limit=limit))
+        events.sort(key=lambda e: e.start_time)
+        return events
 
     def add_event(self, event_data: Dict[str, Any]) -> bool:
         """
@@ -486,7 +462,10 @@ class ICloudCalendarService:
 
             response = self.session.put(calendar_url, content=ical_event, headers=headers)
 
-            return response.status_code in [200, 201]
+            ok = response.status_code in [200, 201]
+            if ok:
+                get_calendar_cache().invalidate(self.cache_key)
+            return ok
 
         except Exception as e:
             return False
@@ -556,7 +535,10 @@ END:VCALENDAR"""
 
             response = self.session.put(calendar_url, content=ical_event, headers=headers)
 
-            return response.status_code == 200
+            ok = response.status_code == 200
+            if ok:
+                get_calendar_cache().invalidate(self.cache_key)
+            return ok
 
         except Exception as e:
             return False
@@ -579,7 +561,10 @@ END:VCALENDAR"""
 
             response = self.session.delete(calendar_url)
 
-            return response.status_code == 200
+            ok = response.status_code == 200
+            if ok:
+                get_calendar_cache().invalidate(self.cache_key)
+            return ok
 
         except Exception as e:
             return False
@@ -620,81 +605,9 @@ END:VCALENDAR"""
             end_date: End date for filtering
 
         Returns:
-            List of CalendarEvent objects
+            List of CalendarEvent objects (recurring events expanded)
         """
-        try:
-            # This is a simplified parser - in practice, you'd want to use the 'icalendar' library
-            # For now, we'll return a basic structure
-            events = []
-
-            # Basic iCal parsing (handle semicolon-separated parameters)
-            lines = ical_content.split('\n')
-            current_event = {}
-
-            for line in lines:
-                line = line.strip()
-                if line.startswith('BEGIN:VEVENT'):
-                    current_event = {}
-                elif line.startswith('END:VEVENT'):
-                    if current_event:
-                        # Create CalendarEvent object
-                        try:
-                            # Parse datetime strings to datetime objects with timezone info
-                            start_time = self._parse_ical_datetime(
-                                current_event.get('dtstart'),
-                                current_event.get('dtstart_full')
-                            )
-                            end_time = self._parse_ical_datetime(
-                                current_event.get('dtend'),
-                                current_event.get('dtend_full')
-                            )
-
-                            # Handle events with missing start time (like notes/reminders)
-                            if not start_time and end_time:
-                                # If no start time but has end time, use end time as start time
-                                # This is common for reminder notes
-                                start_time = end_time
-
-
-                            # Only include events that have both start and end times
-                            if start_time and end_time:
-                                # Check if event overlaps with requested range
-                                # Event starts before end_date AND ends after start_date
-                                if start_time < end_date and end_time > start_date:
-                                    event = CalendarEvent(
-                                        id=current_event.get('uid', f"event_{len(events)}"),
-                                        summary=current_event.get('summary', 'No Title'),
-                                        start_time=start_time,
-                                        end_time=end_time,
-                                        location=current_event.get('location'),
-                                        description=current_event.get('description'),
-                                        is_all_day=current_event.get('dtstart', '').endswith('VALUE=DATE:'),
-                                        recurrence=current_event.get('rrule')
-                                    )
-                                    events.append(event)
-
-                        except Exception as e:
-                            continue
-                elif ':' in line:
-                    # Handle iCal format: KEY;PARAM1=VAL1;PARAM2=VAL2:VALUE
-                    parts = line.split(':', 1)
-                    if len(parts) == 2:
-                        key_part = parts[0]
-                        value = parts[1]
-
-                        # Extract the base key (before any semicolons)
-                        base_key = key_part.split(';')[0].lower()
-                        current_event[base_key] = value
-
-                        # Store the full line for timezone extraction
-                        current_event[f"{base_key}_full"] = line
-
-
-
-            return events
-
-        except Exception as e:
-            return []
+        return expand_resource(parse_vevents(ical_content.splitlines()), start_date, end_date)
 
     def _parse_ical_datetime(self, datetime_str: str, timezone_info: str = None) -> Optional[datetime]:
         """Use the utility function for parsing iCal datetime strings"""
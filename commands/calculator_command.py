@@ -4,9 +4,10 @@ Calculator command for Jarvis.
 Performs basic arithmetic operations on two numbers.
 """
 
+import re
 from typing import List
 from enum import Enum
-from jarvis_command_sdk import IJarvisCommand, CommandExample
+from jarvis_command_sdk import IJarvisCommand, CommandExample, PreRouteResult
 from core.ijarvis_parameter import JarvisParameter
 from core.ijarvis_secret import IJarvisSecret
 from core.command_response import CommandResponse
@@ -21,6 +22,82 @@ class Operation(Enum):
     DIVIDE = "divide"
 
 
+# --- Local routing constants ---
+
+_NUMBER_WORDS: dict[str, int] = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+    "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14,
+    "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+    "nineteen": 19, "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+    "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90,
+}
+_SCALE_WORDS: dict[str, int] = {"hundred": 100, "thousand": 1000, "million": 1_000_000}
+
+_WORD = '|'.join(sorted([*_NUMBER_WORDS, *_SCALE_WORDS], key=len, reverse=True))
+# A digit string, or a run of number words ("twenty five", "twenty-one",
+# "two hundred"). "and" is left out: it separates operands ("add 2 and 3").
+_NUM = rf'(\d+(?:\.\d+)?|(?:{_WORD})(?:(?:\s+|-)(?:{_WORD}))*)'
+
+# Words that make a neighbouring operand part of a larger number or
+# expression ("minus 5 plus 3", "two hundred and five plus 3",
+# "5 plus 3 percent"); the LLM handles those.
+_ADJACENT_WORDS = {*_NUMBER_WORDS, *_SCALE_WORDS, "and", "point", "minus", "negative", "percent"}
+
+# (pattern, operation, swap) — swap=True when the spoken order is
+# reversed ("subtract 7 from 22" → 22 - 7). A bare "-" only means minus
+# between digits or with spaces around it, never inside "twenty-one".
+_LOCAL_PATTERNS: list[tuple[re.Pattern, str, bool]] = [
+    (re.compile(rf'\b{_NUM}\s*(?:plus|\+)\s*{_NUM}\b'), "add", False),
+    (re.compile(rf'\b{_NUM}(?:\s*minus\s*|\s+-\s+|(?<=\d)\s*-\s*(?=\d))\b{_NUM}\b'), "subtract", False),
+    (re.compile(rf'\b{_NUM}\s*(?:times|multiplied by|x|\*)\s*{_NUM}\b'), "multiply", False),
+    (re.compile(rf'\b{_NUM}\s*(?:divided by|over|/)\s*{_NUM}\b'), "divide", False),
+    (re.compile(rf'\b(?:add|sum of)\s+{_NUM}\s+and\s+{_NUM}\b'), "add", False),
+    (re.compile(rf'\bsubtract\s+{_NUM}\s+from\s+{_NUM}\b'), "subtract", True),
+    (re.compile(rf'\bmultiply\s+{_NUM}\s+(?:and|by)\s+{_NUM}\b'), "multiply", False),
+    (re.compile(rf'\bdivide\s+{_NUM}\s+by\s+{_NUM}\b'), "divide", False),
+]
+
+
+def _parse_number(token: str) -> float | None:
+    """Value of a digit string or number-word phrase; None if it isn't a well-formed number."""
+    if token[0].isdigit():
+        return float(token)
+    total = 0
+    current = 0
+    last = None  # "unit" (0-9), "teen" (10-19), "tens" or "scale"
+    for word in re.split(r'[\s-]+', token):
+        if word in _SCALE_WORDS:
+            scale = _SCALE_WORDS[word]
+            if scale == 100:
+                if current >= 100:  # "two hundred hundred"
+                    return None
+                current = (current or 1) * 100
+            else:
+                if total and total < scale * 1000:  # "two thousand three thousand"
+                    return None
+                total += (current or 1) * scale
+                current = 0
+            last = "scale"
+            continue
+        value = _NUMBER_WORDS[word]
+        kind = "unit" if value < 10 else "teen" if value < 20 else "tens"
+        # After "twenty" only a unit may follow; two units/teens in a row
+        # ("five five") are two numbers, not one.
+        if last in ("unit", "teen") or (last == "tens" and kind != "unit"):
+            return None
+        current += value
+        last = kind
+    return float(total + current)
+
+
+def _spoken_number(value: float) -> str:
+    """"8" rather than "8.0" — the message is read aloud."""
+    if value == int(value):
+        return str(int(value))
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
 class CalculatorCommand(IJarvisCommand):
     """Command for performing basic arithmetic calculations"""
     
@@ -129,6 +206,38 @@ class CalculatorCommand(IJarvisCommand):
             ))
         return examples
     
+    def route_locally(self, voice_command: str) -> PreRouteResult | None:
+        """Fill num1/num2/operation once the on-node tool router picked calculate.
+
+        Only plain two-number phrasings are handled; percentages, "double
+        X" and anything else return None and go to the LLM.
+        """
+        text = voice_command.lower().strip().rstrip("?.!")
+        for pattern, operation, swap in _LOCAL_PATTERNS:
+            match = pattern.search(text)
+            if not match:
+                continue
+            if not self._isolated(text, match):
+                return None
+            first, second = _parse_number(match.group(1)), _parse_number(match.group(2))
+            if first is None or second is None:
+                return None
+            if swap:
+                first, second = second, first
+            return PreRouteResult(arguments={"num1": first, "num2": second, "operation": operation})
+        return None
+
+    @staticmethod
+    def _isolated(text: str, match: re.Match) -> bool:
+        """False when a number word or operator sits right next to the match."""
+        before = text[:match.start()].split()
+        after = text[match.end():].split()
+        for word in (before[-1] if before else "", after[0] if after else ""):
+            word = word.strip(",")
+            if word in _ADJACENT_WORDS or word[:1].isdigit() or (word and word[0] in "+-*/"):
+                return False
+        return True
+
     def run(self, request_info: RequestInformation, **kwargs) -> CommandResponse:
         """Execute the calculator command"""
         try:
@@ -211,7 +320,11 @@ class CalculatorCommand(IJarvisCommand):
                     "operation": operation.value,
                     "num1": num1,
                     "num2": num2,
-                    "operation_text": operation_text
+                    "operation_text": operation_text,
+                    "message": (
+                        f"{_spoken_number(num1)} {operation_text} "
+                        f"{_spoken_number(num2)} is {_spoken_number(result)}"
+                    ),
                 }
             )
             
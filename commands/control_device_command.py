@@ -6,9 +6,9 @@ external device manager (e.g., Home Assistant Pantry package) to prevent
 duplicate control_device commands.
 """
 
-import asyncio
 from typing import Any, Dict, List
 
+from core.async_runtime import get_async_runtime
 from core.command_response import CommandResponse
 from jarvis_command_sdk import CommandExample, IJarvisCommand
 from core.ijarvis_parameter import JarvisParameter
@@ -16,17 +16,6 @@ from core.ijarvis_secret import IJarvisSecret
 from core.request_information import RequestInformation
 
 
-# Persistent event loop for async device protocol calls.
-_device_loop: asyncio.AbstractEventLoop | None = None
-
-
-def _get_device_loop() -> asyncio.AbstractEventLoop:
-    global _device_loop
-    if _device_loop is None or _device_loop.is_closed():
-        _device_loop = asyncio.new_event_loop()
-    return _device_loop
-
-
 class ControlDeviceCommand(IJarvisCommand):
     """Control smart home devices (turn on/off, play, pause, volume, etc.)."""
 
@@ -254,15 +243,13 @@ class ControlDeviceCommand(IJarvisCommand):
 
         if not device:
             # Cache might be cold — try refreshing once
-            loop = _get_device_loop()
-            loop.run_until_complete(service.refresh_from_cc())
+            get_async_runtime().run(service.refresh_from_cc())
             device = service.get_device(entity_id)
 
         if not device:
             return {"success": False, "error": f"Device '{entity_id}' not found"}
 
-        loop = _get_device_loop()
-        result = loop.run_until_complete(service.control_device(entity_id, action, data))
+        result = get_async_runtime().run(service.control_device(entity_id, action, data))
 
         if result.success:
             return {"success": True, "device": device.name, "action": action}
@@ -305,8 +292,9 @@ class ControlDeviceCommand(IJarvisCommand):
             mac_address=ctx.get("mac_address"),
         )
 
-        loop = _get_device_loop()
-        result: DeviceControlResult = loop.run_until_complete(
+        # Node-wide runtime loop, so protocol objects (e.g. pyatv pairing
+        # sessions) survive across calls and are shared with MQTT handlers.
+        result: DeviceControlResult = get_async_runtime().run(
             adapter.control(device, action, ctx)
         )
 
@@ -326,8 +314,7 @@ class ControlDeviceCommand(IJarvisCommand):
 
         if not devices:
             # Try refreshing from CC
-            loop = _get_device_loop()
-            loop.run_until_complete(service.refresh_from_cc())
+            get_async_runtime().run(service.refresh_from_cc())
             devices = service.list_devices()
 
         if not devices:
@@ -344,8 +331,7 @@ class ControlDeviceCommand(IJarvisCommand):
             }
 
         # Execute control
-        loop = _get_device_loop()
-        result = loop.run_until_complete(service.control_device(match.entity_id, action, data))
+        result = get_async_runtime().run(service.control_device(match.entity_id, action, data))
 
         if result.success:
             return {"success": True, "device": match.name, "action": action}
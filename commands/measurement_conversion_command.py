@@ -4,14 +4,42 @@ Measurement conversion command for Jarvis.
 Converts between various units using base unit conversion for maximum flexibility.
 """
 
+import re
 from typing import List, Optional
-from jarvis_command_sdk import IJarvisCommand, CommandExample, CommandAntipattern
+from jarvis_command_sdk import IJarvisCommand, CommandExample, CommandAntipattern, PreRouteResult
 from core.ijarvis_parameter import JarvisParameter
 from core.ijarvis_secret import IJarvisSecret
 from core.command_response import CommandResponse
 from core.request_information import RequestInformation
 
 
+# --- Local routing constants ---
+
+# Spoken unit forms → BASE_CONVERSIONS keys. Plural keys map to themselves
+# and are added in __init__; this covers singulars and abbreviations.
+_UNIT_ALIASES: dict[str, str] = {
+    "meter": "meters", "m": "meters", "kilometer": "kilometers", "km": "kilometers",
+    "centimeter": "centimeters", "cm": "centimeters", "millimeter": "millimeters",
+    "mm": "millimeters", "mile": "miles", "yard": "yards", "foot": "feet", "ft": "feet",
+    "inch": "inches", "league": "leagues", "liter": "liters", "litre": "liters",
+    "litres": "liters", "milliliter": "milliliters", "ml": "milliliters",
+    "gallon": "gallons", "quart": "quarts", "pint": "pints", "cup": "cups",
+    "tablespoon": "tablespoons", "tbsp": "tablespoons", "teaspoon": "teaspoons",
+    "tsp": "teaspoons", "fluid ounce": "fluid_ounces", "fluid ounces": "fluid_ounces",
+    "gram": "grams", "g": "grams", "kilogram": "kilograms", "kg": "kilograms",
+    "kilos": "kilograms", "milligram": "milligrams", "mg": "milligrams",
+    "pound": "pounds", "lb": "pounds", "lbs": "pounds", "ounce": "ounces", "oz": "ounces",
+    "ton": "tons", "metric ton": "metric_tons", "metric tons": "metric_tons",
+    "degrees celsius": "celsius", "degrees fahrenheit": "fahrenheit",
+}
+
+_SINGULAR_UNITS: dict[str, str] = {
+    "feet": "foot", "inches": "inch", "fluid_ounces": "fluid ounce", "metric_tons": "metric ton",
+}
+
+_VALUE = r'(\d+(?:\.\d+)?|an?|one)'
+
+
 class MeasurementConversionCommand(IJarvisCommand):
     """Command for converting between various measurement units"""
     
@@ -66,6 +94,18 @@ class MeasurementConversionCommand(IJarvisCommand):
             ("kelvin", "fahrenheit"): lambda k: (k - 273.15) * 9/5 + 32
         }
     
+        self._unit_aliases = {unit.replace("_", " "): unit for unit in self.BASE_CONVERSIONS}
+        self._unit_aliases.update(_UNIT_ALIASES)
+        unit_re = '|'.join(re.escape(u) for u in sorted(self._unit_aliases, key=len, reverse=True))
+        # "how many cups in a gallon" / "how many yards in 3 feet"
+        self._how_many_re = re.compile(
+            rf'\bhow many ({unit_re}) (?:are )?(?:in|per) (?:{_VALUE} )?({unit_re})\b'
+        )
+        # "convert 5 miles to kilometers" / "what's 350 fahrenheit in celsius"
+        self._convert_re = re.compile(
+            rf'\b{_VALUE} (?:degrees )?({unit_re}) (?:to|in|into) ({unit_re})\b'
+        )
+
     @property
     def command_name(self) -> str:
         return "convert_measurement"
@@ -170,6 +210,33 @@ class MeasurementConversionCommand(IJarvisCommand):
             ))
         return examples
     
+    def route_locally(self, voice_command: str) -> PreRouteResult | None:
+        """Fill value/from_unit/to_unit once the on-node tool router picked this command.
+
+        Handles "how many X in [N] Y" and "[convert] N X to Y"; anything
+        else returns None and goes to the LLM.
+        """
+        text = voice_command.lower().strip().rstrip("?.!")
+
+        match = self._how_many_re.search(text)
+        if match:
+            to_unit, value, from_unit = match.group(1), match.group(2), match.group(3)
+        else:
+            match = self._convert_re.search(text)
+            if not match:
+                return None
+            value, from_unit, to_unit = match.group(1), match.group(2), match.group(3)
+
+        from_key = self._unit_aliases[from_unit]
+        to_key = self._unit_aliases[to_unit]
+        if from_key == to_key:
+            return None
+        return PreRouteResult(arguments={
+            "value": float(value) if value and value[0].isdigit() else 1,
+            "from_unit": from_key,
+            "to_unit": to_key,
+        })
+
     def run(self, request_info: RequestInformation, **kwargs) -> CommandResponse:
         """Execute the measurement conversion command"""
         try:
@@ -246,7 +313,8 @@ class MeasurementConversionCommand(IJarvisCommand):
                         "to_unit": to_unit,
                         "result": result,
                         "result_text": result_text,
-                        "conversion_type": "temperature"
+                        "conversion_type": "temperature",
+                        "message": f"{value:g} degrees {from_unit} is {result_text}",
                     }
                 )
             
@@ -279,10 +347,12 @@ class MeasurementConversionCommand(IJarvisCommand):
                     result_text = f"{result:.2f}"
             
             # Create the conversion message
+            to_spoken = to_unit.replace("_", " ")
             if value == 1:
-                conversion_message = f"There are {result_text} {to_unit} in 1 {from_unit}"
+                from_spoken = _SINGULAR_UNITS.get(from_unit, from_unit.rstrip("s"))
+                conversion_message = f"There are {result_text} {to_spoken} in one {from_spoken}"
             else:
-                conversion_message = f"{value} {from_unit} equals {result_text} {to_unit}"
+                conversion_message = f"{value:g} {from_unit.replace('_', ' ')} is {result_text} {to_spoken}"
             
             return CommandResponse.follow_up_response(
                                 context_data={
@@ -291,7 +361,8 @@ class MeasurementConversionCommand(IJarvisCommand):
                     "to_unit": to_unit,
                     "result": result,
                     "result_text": result_text,
-                    "conversion_type": "standard"
+                    "conversion_type": "standard",
+                    "message": conversion_message,
                 }
             )
             
@@ -219,6 +219,35 @@ class RoutineCommand(IJarvisCommand):
 
         return None
 
+    def route_locally(self, voice_command: str) -> PreRouteResult | None:
+        """Pick a routine once the on-node tool router picked this command.
+
+        ``pre_route`` already ran and found no trigger phrase that matches
+        well enough, so this is the looser fallback: the routine whose
+        name or trigger phrases share the most tokens with the utterance.
+        Ties and zero overlap return None (let the LLM decide).
+        """
+        text_tokens = set(re.findall(r"[a-z']+", voice_command.lower()))
+        if not text_tokens:
+            return None
+
+        scores: list[tuple[float, str]] = []
+        for routine_name, routine_def in _load_routines().items():
+            candidates = [routine_name.replace("_", " ")] + list(routine_def.get("trigger_phrases", []))
+            best = 0.0
+            for phrase in candidates:
+                phrase_tokens = set(re.findall(r"[a-z']+", phrase.lower()))
+                if phrase_tokens:
+                    best = max(best, len(phrase_tokens & text_tokens) / len(phrase_tokens))
+            scores.append((best, routine_name))
+
+        scores.sort(reverse=True)
+        if not scores or scores[0][0] < 0.5:
+            return None
+        if len(scores) > 1 and scores[1][0] == scores[0][0]:
+            return None
+        return PreRouteResult(arguments={"routine_name": scores[0][1]})
+
     @staticmethod
     def _matches(text: str, phrases: List[str]) -> bool:
         """Multi-strategy matching against trigger phrases.
@@ -180,6 +180,17 @@ class TimerCommand(IJarvisCommand):
         if not any(trigger in text for trigger in _TIMER_TRIGGERS):
             return None
 
+        return self._parse_duration(text)
+
+    def route_locally(self, voice_command: str) -> PreRouteResult | None:
+        """Fill parameters once the on-node tool router picked set_timer.
+
+        Same extraction as ``pre_route`` minus the trigger-keyword gate —
+        the router already decided this is a timer request.
+        """
+        return self._parse_duration(voice_command.lower().strip())
+
+    def _parse_duration(self, text: str) -> PreRouteResult | None:
         # Pre-process informal durations ("half an hour" → "30 minutes")
         for pattern, replacement in _INFORMAL_DURATIONS:
             text = pattern.sub(replacement, text)
@@ -0,0 +1,216 @@
+"""Node-wide asyncio runtime.
+
+One long-lived event loop in a daemon thread hosts every async subsystem
+on the node — device protocol calls, MQTT-triggered device queries, the
+agent scheduler. Synchronous callers (command ``execute()``, MQTT
+handler threads) hand coroutines over with ``submit()`` / ``run()``.
+
+Why one loop:
+  - Protocol objects bound to a loop (pyatv pairing sessions, aiohttp
+    sessions, cached clients) can be shared across subsystems instead of
+    each subsystem holding its own loop.
+  - No per-request ``new_event_loop()`` / ``close()`` cost.
+  - Loop lag and in-flight task counts are measured in one place
+    (``stats()``) and reported in the node heartbeat.
+
+Never block on ``run()`` from inside the runtime thread itself — that
+would deadlock the loop; it raises ``RuntimeError`` instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, Dict, Optional, TypeVar
+
+from jarvis_log_client import JarvisLogger
+
+logger = JarvisLogger(service="jarvis-node")
+
+T = TypeVar("T")
+
+# Lag probe: sleep this long and measure how late the loop wakes us.
+LAG_PROBE_INTERVAL_SECONDS = 0.5
+# Log when a probe comes back later than this (a blocking call on the loop).
+LAG_WARN_MS = 250.0
+
+
+class AsyncRuntime:
+    """A single event loop running in a daemon thread, with a sync bridge."""
+
+    def __init__(
+        self,
+        name: str = "jarvis-async-runtime",
+        lag_probe_interval: float = LAG_PROBE_INTERVAL_SECONDS,
+    ) -> None:
+        self._name = name
+        self._lag_probe_interval = lag_probe_interval
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._lock = threading.Lock()
+
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._counter_lock = threading.Lock()
+
+        self._lag_ms = 0.0
+        self._lag_max_ms = 0.0
+
+    # ── Lifecycle ────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Start the loop thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._started.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name=self._name)
+            self._thread.start()
+        self._started.wait(timeout=5)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Cancel outstanding tasks and stop the loop."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or thread is None:
+                return
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self._loop is not None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The runtime's loop (starts the runtime if needed)."""
+        self.start()
+        assert self._loop is not None
+        return self._loop
+
+    @property
+    def thread(self) -> Optional[threading.Thread]:
+        return self._thread
+
+    def in_runtime_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    # ── Bridge ───────────────────────────────────────────────────────
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        """Schedule ``coro`` on the runtime loop; returns a thread-safe Future."""
+        loop = self.loop
+        with self._counter_lock:
+            self._submitted += 1
+            self._in_flight += 1
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        # Done-callbacks fire even when the task is cancelled before it
+        # starts, so the in-flight count can't leak.
+        future.add_done_callback(self._on_done)
+        return future
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Run ``coro`` on the runtime loop and block the calling thread for the result."""
+        if self.in_runtime_thread():
+            coro.close()
+            raise RuntimeError("AsyncRuntime.run() called from the runtime thread; await the coroutine instead")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def _on_done(self, future: "concurrent.futures.Future[Any]") -> None:
+        failed = future.cancelled() or future.exception() is not None
+        with self._counter_lock:
+            self._in_flight -= 1
+            self._completed += 1
+            if failed:
+                self._failed += 1
+
+    # ── Metrics ──────────────────────────────────────────────────────
+
+    def stats(self) -> Dict[str, Any]:
+        """Loop lag and task counts (for heartbeat / diagnostics)."""
+        with self._counter_lock:
+            counters = {
+                "in_flight": self._in_flight,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+            }
+        tasks = 0
+        if self._loop is not None and self.running:
+            try:
+                tasks = len(asyncio.all_tasks(self._loop))
+            except RuntimeError:
+                tasks = 0
+        return {
+            "running": self.running,
+            "loop_lag_ms": round(self._lag_ms, 1),
+            "loop_lag_max_ms": round(self._lag_max_ms, 1),
+            "tasks": tasks,
+            **counters,
+        }
+
+    async def _lag_probe(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self._lag_probe_interval)
+            lag_ms = max(0.0, (loop.time() - start - self._lag_probe_interval) * 1000)
+            self._lag_ms = lag_ms
+            if lag_ms > self._lag_max_ms:
+                self._lag_max_ms = lag_ms
+            if lag_ms > LAG_WARN_MS:
+                logger.warning("Async runtime loop lag", lag_ms=round(lag_ms, 1),
+                               in_flight=self._in_flight)
+
+    # ── Thread body ──────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        probe = loop.create_task(self._lag_probe())
+        self._started.set()
+        logger.info("Async runtime started")
+        try:
+            loop.run_forever()
+        finally:
+            probe.cancel()
+            pending = [t for t in asyncio.all_tasks(loop) if not t.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+            self._loop = None
+            logger.info("Async runtime stopped")
+
+
+_runtime: Optional[AsyncRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_async_runtime() -> AsyncRuntime:
+    """Get the node-wide AsyncRuntime, starting it on first use."""
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = AsyncRuntime()
+    _runtime.start()
+    return _runtime
+
+
+def get_async_runtime_stats() -> Optional[Dict[str, Any]]:
+    """Runtime stats if the runtime has been started, else None (doesn't start it)."""
+    return _runtime.stats() if _runtime is not None else None
@@ -16,6 +16,19 @@ Design constraints:
     so wake detection stays responsive.
   - Source-agnostic bus + pyaudio_factory injection = tests without
     hardware.
+
+Instrumentation (``bus.stats()``, also on the heartbeat telemetry):
+  - Per subscriber: chunks enqueued and dropped, current and max queue
+    depth, and consumer lag (enqueue → dequeue, as a histogram). Stats
+    are keyed by name and survive unsubscribe/resubscribe cycles.
+  - Input overruns. The stream is read with ``exception_on_overflow=False``,
+    so ALSA overruns are inferred from timing instead: once the producer
+    has caught up (consecutive reads that actually blocked), wall-clock
+    time should match the audio read so far. A jump of more than ~¾
+    chunk that persists across two such reads means samples were lost.
+    The baseline drifts slowly to absorb mic-clock skew.
+  - Producer jitter: |read interval − chunk duration| as a histogram.
+    A wide tail means the producer thread is being starved of CPU.
 """
 
 from __future__ import annotations
@@ -29,10 +42,73 @@ from typing import Callable, Optional
 import pyaudio
 
 from jarvis_log_client import JarvisLogger
+from core.execution_policy import apply_thread_role
+from core.telemetry import Histogram
 from utils.mic_device import resolve_input_device_index
 
 logger = JarvisLogger(service="jarvis-node")
 
+# Jitter is usually sub-millisecond; starvation shows up in the 20 ms+ buckets.
+_JITTER_BOUNDS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+# Overrun: unrecovered timing excess above this fraction of a chunk.
+_OVERRUN_THRESHOLD_CHUNKS = 0.75
+# How fast the timing baseline may creep up per read (absorbs clock skew).
+_BASELINE_CREEP = 0.002
+_DROP_WARN_INTERVAL_SECS = 30.0
+
+
+class _SubscriberStats:
+    __slots__ = ("enqueued", "dropped", "max_depth", "lag", "_warned_at", "_dropped_at_warn")
+
+    def __init__(self) -> None:
+        self.enqueued = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.lag = Histogram("lag_ms")
+        self._warned_at = 0.0
+        self._dropped_at_warn = 0
+
+
+class _SubscriberQueue(queue.Queue):
+    """Queue that timestamps chunks to measure consumer lag.
+
+    ``_put``/``_get`` are ``queue.Queue``'s subclass hooks and run under
+    its mutex, so the counters need no extra locking.
+    """
+
+    def __init__(self, maxsize: int, stats: _SubscriberStats, clock: Callable[[], float]):
+        self._stats = stats
+        self._clock = clock
+        self._stamps: deque[float] = deque()
+        super().__init__(maxsize=maxsize)
+
+    def _put(self, item: bytes) -> None:
+        super()._put(item)
+        self._stamps.append(self._clock())
+        self._stats.enqueued += 1
+        depth = len(self.queue)
+        if depth > self._stats.max_depth:
+            self._stats.max_depth = depth
+
+    def _get(self) -> bytes:
+        item = super()._get()
+        stamp = self._stamps.popleft()
+        self._stats.lag.observe((self._clock() - stamp) * 1000.0)
+        return item
+
+    def put_dropping_oldest(self, item: bytes) -> bool:
+        """Enqueue without blocking, evicting the oldest chunk if full. True if one was dropped."""
+        with self.mutex:
+            dropped = 0 < self.maxsize <= self._qsize()
+            if dropped:
+                self.queue.popleft()
+                self._stamps.popleft()
+                self._stats.dropped += 1
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+        return dropped
+
 
 class AudioBus:
     """Single mic capture → many consumer queues.
@@ -66,6 +142,7 @@ class AudioBus:
         device_index_resolver: Callable[[], Optional[int]] = resolve_input_device_index,
         pyaudio_factory: Callable[[], pyaudio.PyAudio] = pyaudio.PyAudio,
         read_retry_sleep_secs: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
     ):
         self.rate = rate
         self.chunk_samples = chunk_samples
@@ -76,8 +153,9 @@ class AudioBus:
         self._ring: deque[bytes] = deque(maxlen=ring_capacity)
         self._ring_lock = threading.Lock()
 
-        self._subscribers: dict[str, queue.Queue[bytes]] = {}
+        self._subscribers: dict[str, _SubscriberQueue] = {}
         self._subs_lock = threading.Lock()
+        self._sub_stats: dict[str, _SubscriberStats] = {}
 
         self._device_index_resolver = device_index_resolver
         self._pyaudio_factory = pyaudio_factory
@@ -89,6 +167,20 @@ class AudioBus:
         self._stop_event = threading.Event()
         self._started_event = threading.Event()
 
+        self._clock = clock
+        self._chunk_secs = chunk_samples / rate
+        self._chunks = 0
+        self._read_errors = 0
+        self._jitter = Histogram("jitter_ms", _JITTER_BOUNDS_MS)
+        self._overruns = 0
+        self._overrun_lost_ms = 0.0
+        self._timing_t0: Optional[float] = None
+        self._last_read: Optional[float] = None
+        self._samples_read = 0
+        self._baseline_ms: Optional[float] = None
+        self._last_blocked = False
+        self._suspect_ms: Optional[float] = None
+
     @property
     def is_running(self) -> bool:
         return self._thread is not None and self._thread.is_alive()
@@ -165,7 +257,9 @@ class AudioBus:
         seconds of audio from the ring buffer before the producer's next
         push arrives.
         """
-        q: queue.Queue[bytes] = queue.Queue(maxsize=maxsize)
+        with self._subs_lock:
+            stats = self._sub_stats.setdefault(name, _SubscriberStats())
+        q = _SubscriberQueue(maxsize, stats, self._clock)
 
         if history_secs > 0:
             history_chunks = int(history_secs * self.rate / self.chunk_samples)
@@ -213,19 +307,71 @@ class AudioBus:
 
     def _producer_loop(self) -> None:
         assert self._stream is not None
+        apply_thread_role("audio")
         self._started_event.set()
         while not self._stop_event.is_set():
+            read_started = self._clock()
             try:
                 data = self._stream.read(
                     self.chunk_samples, exception_on_overflow=False
                 )
             except OSError as e:
+                self._read_errors += 1
+                self._timing_t0 = None  # the stream clock restarts after an error
                 logger.warning("AudioBus read error, retrying", error=str(e))
                 time.sleep(self._read_retry_sleep_secs)
                 continue
+            self._record_read(read_started, self._clock())
             self._distribute(data)
 
+    def _record_read(self, started: float, now: float) -> None:
+        """Update jitter and overrun tracking for a read spanning ``started``..``now``."""
+        chunk_ms = self._chunk_secs * 1000.0
+        blocked = now - started >= self._chunk_secs * 0.5
+        if self._timing_t0 is None:
+            self._timing_t0 = now
+            self._last_read = now
+            self._samples_read = 0
+            self._baseline_ms = None
+            self._last_blocked = blocked
+            self._suspect_ms = None
+            return
+        interval = now - (self._last_read or now)
+        self._last_read = now
+        self._jitter.observe(abs(interval * 1000.0 - chunk_ms))
+        self._samples_read += self.chunk_samples
+
+        # Wall clock ahead of the audio clock. Constant while healthy;
+        # grows for good when the device dropped samples.
+        excess_ms = (now - self._timing_t0) * 1000.0 - self._samples_read / self.rate * 1000.0
+        caught_up = blocked and self._last_blocked
+        self._last_blocked = blocked
+        if not caught_up:
+            # Still draining audio buffered during a stall; judge once reads block again.
+            self._suspect_ms = None
+            return
+        if self._baseline_ms is None:
+            self._baseline_ms = excess_ms
+            return
+        lost = excess_ms - self._baseline_ms
+        if lost >= chunk_ms * _OVERRUN_THRESHOLD_CHUNKS and self._suspect_ms is None:
+            # A read can also return late with audio still queued behind it
+            # (e.g. waiting for the GIL); only the next blocking read confirms.
+            self._suspect_ms = excess_ms
+            return
+        if self._suspect_ms is not None:
+            lost = min(excess_ms, self._suspect_ms) - self._baseline_ms
+            self._suspect_ms = None
+        if lost >= chunk_ms * _OVERRUN_THRESHOLD_CHUNKS:
+            self._overruns += 1
+            self._overrun_lost_ms += lost
+            self._baseline_ms = excess_ms
+            logger.warning("AudioBus input overrun", lost_ms=round(lost, 1), overruns=self._overruns)
+        else:
+            self._baseline_ms = min(excess_ms, self._baseline_ms + chunk_ms * _BASELINE_CREEP)
+
     def _distribute(self, data: bytes) -> None:
+        self._chunks += 1
         with self._ring_lock:
             self._ring.append(data)
 
@@ -233,12 +379,44 @@ class AudioBus:
             subs = list(self._subscribers.items())
 
         for name, q in subs:
-            try:
-                q.put_nowait(data)
-            except queue.Full:
-                try:
-                    q.get_nowait()
-                    q.put_nowait(data)
-                except (queue.Empty, queue.Full):
-                    pass
-                logger.debug("AudioBus subscriber slow, dropped chunk", name=name)
+            if q.put_dropping_oldest(data):
+                self._warn_dropped(name, q._stats)
+
+    def _warn_dropped(self, name: str, stats: _SubscriberStats) -> None:
+        now = self._clock()
+        if stats._warned_at and now - stats._warned_at < _DROP_WARN_INTERVAL_SECS:
+            return
+        logger.warning(
+            "AudioBus subscriber slow, dropping chunks",
+            name=name,
+            dropped=stats.dropped - stats._dropped_at_warn,
+            total_dropped=stats.dropped,
+        )
+        stats._warned_at = now
+        stats._dropped_at_warn = stats.dropped
+
+    def stats(self) -> dict:
+        """Producer timing and per-subscriber queue health since start."""
+        with self._subs_lock:
+            active = dict(self._subscribers)
+            per_sub = dict(self._sub_stats)
+        subscribers = {}
+        for name, st in per_sub.items():
+            q = active.get(name)
+            subscribers[name] = {
+                "active": q is not None,
+                "enqueued": st.enqueued,
+                "dropped": st.dropped,
+                "depth": q.qsize() if q is not None else 0,
+                "max_depth": st.max_depth,
+                "lag_ms": st.lag.summary(),
+            }
+        return {
+            "chunk_ms": round(self._chunk_secs * 1000.0, 1),
+            "chunks": self._chunks,
+            "read_errors": self._read_errors,
+            "overruns": self._overruns,
+            "overrun_lost_ms": round(self._overrun_lost_ms, 1),
+            "jitter_ms": self._jitter.summary(),
+            "subscribers": subscribers,
+        }
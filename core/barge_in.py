@@ -1,9 +1,14 @@
 """Barge-in monitor for interrupting TTS playback with wake word detection.
 
-Subscribes to an ``AudioBus`` during TTS playback and runs openWakeWord
-against each chunk.  On detection it cancels the active playback
-subprocess so the voice listener can immediately start recording a new
-command.
+A single long-lived monitor is *armed* while TTS plays and *disarmed*
+afterwards.  While armed it consumes per-frame scores from the shared
+``WakeScorer`` (it never runs openWakeWord itself); on detection it
+cancels the active playback subprocess so the voice listener can
+immediately start recording a new command.
+
+Arming and disarming only flip events and (un)register a score queue —
+no thread start/join and no model reset on the caller's thread.  Arming
+asks the scorer for a reset and ignores scores from before it.
 
 Detection strategy — energy-gated OWW:
   OWW alone cannot reliably score the wake word through heavy speaker-
@@ -24,20 +29,15 @@ from __future__ import annotations
 import queue
 import threading
 import time
+from typing import Sequence
 
-import numpy as np
-from scipy.signal import resample_poly
 from jarvis_log_client import JarvisLogger
 
-from core.audio_bus import AudioBus
 from core.platform_audio import platform_audio
+from core.wake_scorer import WakeScorer, WakeScores
 
 logger = JarvisLogger(service="jarvis-node")
 
-# openWakeWord constants (must match voice_listener.py)
-_OWW_RATE = 16000
-_OWW_CHUNK = 1280
-
 # Energy-gate defaults.  TTS bleed through a desk mic typically reads
 # 100-300 RMS; a user speaking at normal volume 2-3 ft away reads
 # 1000-3000.  500 sits safely in between.
@@ -54,23 +54,26 @@ _DEFAULT_CONFIRM_CHUNKS = 2
 
 
 class BargeInMonitor:
-    """Score wake-word predictions on bus chunks during TTS playback.
+    """Apply the barge-in gates to shared wake scores while armed.
 
     Usage::
 
-        monitor = BargeInMonitor(bus, oww_model, "hey_jarvis")
-        monitor.start()
+        monitor = BargeInMonitor(scorer, "hey_jarvis")
+        monitor.start()                 # once, at listener startup
+        ...
+        monitor.arm()
         platform_audio.play_audio_file(response_wav)  # blocks
-        monitor.stop()
+        monitor.disarm()                # microseconds
         if monitor.was_interrupted:
             # cancel any follow-up, jump straight to LISTENING
+        ...
+        monitor.close()                 # at shutdown
     """
 
     def __init__(
         self,
-        bus: AudioBus,
-        oww_model,
-        wake_word_model_name: str,
+        scorer: WakeScorer,
+        wake_word_models: str | Sequence[str],
         *,
         threshold: float = _DEFAULT_OWW_THRESHOLD,
         energy_threshold: float = _DEFAULT_ENERGY_THRESHOLD,
@@ -78,147 +81,191 @@ class BargeInMonitor:
         skip_seconds: float = 0.5,
         subscriber_name: str = "barge_in",
     ):
-        self._bus = bus
-        self._oww = oww_model
-        self._wake_word = wake_word_model_name
+        self._scorer = scorer
+        # Any configured wake word interrupts playback
+        self._wake_words = [wake_word_models] if isinstance(wake_word_models, str) else list(wake_word_models)
         self._threshold = threshold
         self._energy_threshold = energy_threshold
         self._confirm_chunks = confirm_chunks
         self._skip_seconds = skip_seconds
         self._subscriber_name = subscriber_name
 
-        # Bus is at 48 kHz; OWW needs 16 kHz. Always resample.
-        self._needs_resample = bus.rate != _OWW_RATE
-        self._resample_ratio = bus.rate // _OWW_RATE if self._needs_resample else 1
-
-        self._stop_event = threading.Event()
+        self._closed = threading.Event()
+        self._armed = threading.Event()
+        self._detected = threading.Event()
+        self._queue: "queue.Queue[WakeScores] | None" = None
+        # Bumped on every arm() so the monitor thread knows to reset its
+        # per-window state (RMS window, skip deadline, diagnostics).
+        self._arm_generation = 0
+        self._armed_at = 0.0
+        self._reset_epoch = 0
         self._interrupted = False
         self._thread: threading.Thread | None = None
 
+        # Per-armed-window diagnostics (written by the monitor thread)
+        self._chunk_count = 0
+        self._max_score = 0.0
+        self._max_rms = 0
+
     @property
     def was_interrupted(self) -> bool:
-        """True if wake word was detected during monitoring."""
+        """True if wake word was detected during the current/last armed window."""
         return self._interrupted
 
+    @property
+    def armed(self) -> bool:
+        return self._armed.is_set()
+
     def start(self) -> None:
-        """Subscribe to the bus and begin scoring in a background thread."""
-        self._stop_event.clear()
-        self._interrupted = False
+        """Start the monitor thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._closed.clear()
         self._thread = threading.Thread(
             target=self._monitor_loop, daemon=True, name="BargeInMonitor"
         )
         self._thread.start()
 
-    def stop(self) -> None:
-        """Signal the monitor to stop and wait for the thread to exit.
+    def arm(self) -> None:
+        """Begin consuming scores; clears the previous interrupt state."""
+        self._scorer.unsubscribe(self._subscriber_name)
+        self._interrupted = False
+        self._detected.clear()
+        self._armed_at = time.monotonic()
+        # Drop OWW context from before this window (e.g. the wake word
+        # that started the turn) so it can't re-trigger a barge-in.
+        self._reset_epoch = self._scorer.request_reset()
+        self._queue = self._scorer.subscribe(self._subscriber_name)
+        self._arm_generation += 1
+        self._armed.set()
+
+    def disarm(self) -> None:
+        """Stop consuming scores. Safe to call on the hot path."""
+        self._scorer.unsubscribe(self._subscriber_name)
+        if not self._armed.is_set():
+            return
+        self._armed.clear()
+        logger.info(
+            "Barge-in disarmed",
+            chunks_processed=self._chunk_count,
+            max_score=round(self._max_score, 3),
+            max_rms=self._max_rms,
+            interrupted=self._interrupted,
+        )
 
-        Resets the OWW model from the calling thread (not the monitor
-        thread) to avoid concurrent access with the wake detection loop.
-        """
-        self._stop_event.set()
+    def wait_for_detection(self, timeout: float | None = None) -> bool:
+        """Block until a barge-in is detected in the current armed window."""
+        return self._detected.wait(timeout)
+
+    def close(self) -> None:
+        """Stop the monitor thread and drop the score subscription."""
+        self.disarm()
+        self._closed.set()
         if self._thread is not None:
-            self._thread.join(timeout=5)
+            self._thread.join(timeout=2)
             self._thread = None
-        # Reset OWW here — in the caller's thread — so there is zero
-        # chance of overlapping with oww.predict() in the wake loop.
-        self._oww.reset()
 
     def _monitor_loop(self) -> None:
-        q = self._bus.subscribe(self._subscriber_name)
-        skip_until = time.monotonic() + self._skip_seconds
-        chunk_count = 0
-        max_score = 0.0
-        max_rms = 0
+        seen_generation = 0
+        skip_until = 0.0
 
         # Trailing energy window — OWW scores peak ~0.5-1s after the
         # user's voice energy spike, so we track whether a spike happened
         # recently rather than requiring it on the same chunk.
-        chunk_secs = self._bus.chunk_samples / self._bus.rate
-        energy_window_chunks = max(1, int(1.0 / chunk_secs))  # ~1 second
+        energy_window_chunks = max(1, int(1.0 / self._scorer.frame_seconds))  # ~1 second
         recent_rms: list[int] = []
 
         try:
-            while not self._stop_event.is_set():
+            while not self._closed.is_set():
+                if not self._armed.wait(timeout=0.1):
+                    continue
+                q = self._queue
+                if q is None:
+                    continue
                 try:
-                    raw_data = q.get(timeout=0.1)
+                    event = q.get(timeout=0.1)
                 except queue.Empty:
                     continue
 
-                if time.monotonic() < skip_until:
+                if not self._armed.is_set():
                     continue
 
-                chunk_count += 1
-                samples = np.frombuffer(raw_data, dtype=np.int16)
-                rms = int(np.sqrt(np.mean(samples.astype(np.float64) ** 2)))
-
-                if rms > max_rms:
-                    max_rms = rms
-
-                # Maintain trailing RMS window
-                recent_rms.append(rms)
-                if len(recent_rms) > energy_window_chunks:
-                    recent_rms.pop(0)
-                recent_max_rms = max(recent_rms)
-
-                # Periodic diagnostics
-                if chunk_count % 25 == 1:
-                    logger.info(
-                        "Barge-in audio",
-                        chunk=chunk_count,
-                        rms=rms,
-                        recent_max_rms=recent_max_rms,
-                        max_score=round(max_score, 3),
-                    )
-
-                if self._needs_resample:
-                    resampled = resample_poly(samples, up=1, down=self._resample_ratio)
-                    samples = np.clip(resampled, -32768, 32767).astype(np.int16)
-
-                predictions = self._oww.predict(samples)
-                score = predictions.get(self._wake_word, 0)
-
-                if score > max_score:
-                    max_score = score
-
-                if score > 0.05:
-                    logger.info(
-                        "Barge-in score",
-                        score=round(float(score), 3),
-                        rms=rms,
-                        recent_max_rms=recent_max_rms,
-                    )
-
-                # --- Two-tier detection ---
-                # Tier 1: Strong OWW (>0.5) + recent energy spike.
-                #         OWW peaks after the voice energy fades, so
-                #         we check the trailing window, not this chunk.
-                # Tier 2: Weak OWW (>threshold) + current high energy.
-                #         For heavy TTS bleed where OWW can only score
-                #         ~0.07-0.12, require simultaneous energy.
-                triggered = False
-                if score > 0.5 and recent_max_rms > self._energy_threshold:
-                    triggered = True
-                elif score > self._threshold and rms > self._energy_threshold:
-                    triggered = True
-
-                if triggered:
-                    logger.info(
-                        "Barge-in detected",
-                        score=round(float(score), 3),
-                        rms=rms,
-                        recent_max_rms=recent_max_rms,
-                    )
+                if seen_generation != self._arm_generation:
+                    seen_generation = self._arm_generation
+                    recent_rms.clear()
+                    skip_until = self._armed_at + self._skip_seconds
+                    self._chunk_count = 0
+                    self._max_score = 0.0
+                    self._max_rms = 0
+
+                if event.epoch < self._reset_epoch or event.timestamp < skip_until:
+                    continue
+
+                if self._check_event(event, recent_rms, energy_window_chunks):
                     self._interrupted = True
+                    self._armed.clear()
+                    self._detected.set()
                     platform_audio.cancel_playback()
-                    break
         except Exception as e:
             logger.warning("Barge-in monitor error", error=str(e))
         finally:
+            logger.info("Barge-in monitor stopped")
+
+    def _check_event(self, event: WakeScores, recent_rms: list[int], energy_window_chunks: int) -> bool:
+        """Apply the gates to one frame's scores; True on barge-in."""
+        self._chunk_count += 1
+        rms = event.rms
+
+        if rms > self._max_rms:
+            self._max_rms = rms
+
+        # Maintain trailing RMS window
+        recent_rms.append(rms)
+        if len(recent_rms) > energy_window_chunks:
+            recent_rms.pop(0)
+        recent_max_rms = max(recent_rms)
+
+        # Periodic diagnostics
+        if self._chunk_count % 25 == 1:
+            logger.info(
+                "Barge-in audio",
+                chunk=self._chunk_count,
+                rms=rms,
+                recent_max_rms=recent_max_rms,
+                max_score=round(self._max_score, 3),
+            )
+
+        score = max((event.scores.get(m, 0) for m in self._wake_words), default=0)
+
+        if score > self._max_score:
+            self._max_score = score
+
+        if score > 0.05:
+            logger.info(
+                "Barge-in score",
+                score=round(float(score), 3),
+                rms=rms,
+                recent_max_rms=recent_max_rms,
+            )
+
+        # --- Two-tier detection ---
+        # Tier 1: Strong OWW (>0.5) + recent energy spike.
+        #         OWW peaks after the voice energy fades, so
+        #         we check the trailing window, not this chunk.
+        # Tier 2: Weak OWW (>threshold) + current high energy.
+        #         For heavy TTS bleed where OWW can only score
+        #         ~0.07-0.12, require simultaneous energy.
+        triggered = False
+        if score > 0.5 and recent_max_rms > self._energy_threshold:
+            triggered = True
+        elif score > self._threshold and rms > self._energy_threshold:
+            triggered = True
+
+        if triggered:
             logger.info(
-                "Barge-in monitor stopped",
-                chunks_processed=chunk_count,
-                max_score=round(max_score, 3),
-                max_rms=max_rms,
-                interrupted=self._interrupted,
+                "Barge-in detected",
+                score=round(float(score), 3),
+                rms=rms,
+                recent_max_rms=recent_max_rms,
             )
-            self._bus.unsubscribe(self._subscriber_name)
+        return triggered
@@ -0,0 +1,358 @@
+"""Mic capture in a child process, handed over through shared memory.
+
+``AudioBus`` reads the mic from a thread in the node process, so a long
+GIL hold anywhere in the node (a scan, a JSON blob, an import) delays
+the read, and once the ALSA period buffer fills the audio is gone. Here
+the mic is read by a small dedicated process instead:
+
+    child:  pyaudio.read() → ring slot → bump write counter → wake pipe
+    parent: AudioBus producer → CaptureStream.read() → next ring slot
+
+The child does nothing but read and copy, runs with the ``audio``
+execution-policy role (FIFO / pinned where permitted) and has no GIL to
+share. The ring holds ``ring_secs`` of audio, far more than ALSA's
+buffer, so the node can stall for seconds without losing samples. If it
+stalls longer the reader skips to the oldest slot still intact; the
+skipped chunks show up as ``lapped_chunks`` here and as an overrun in
+``AudioBus.stats()``.
+
+``CaptureProcessAudio`` is a drop-in ``pyaudio_factory`` for
+``AudioBus``: nothing downstream of the bus changes. Ring layout: a
+64-byte header (u32 write counter, u32 child read errors) followed by
+fixed-size slots of one chunk each. The counter is the only shared
+word, written by the child alone; u32 stores are atomic on the Pi.
+
+The child is started with ``python -m core.capture_process`` rather
+than ``multiprocessing`` so it doesn't re-import the node's main module,
+and exits on its own if the node dies (parent pid check). If the child
+dies instead, the next read respawns it on the same ring (at most once
+per ``_RESPAWN_BACKOFF_SECS``; reads fail with ``OSError`` until a
+respawn succeeds, which ``AudioBus`` already retries).
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import os
+import select
+import signal
+import subprocess
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pyaudio
+
+from jarvis_log_client import JarvisLogger
+
+logger = JarvisLogger(service="jarvis-node")
+
+HEADER_BYTES = 64
+_MASK = 0xFFFFFFFF
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_RING_SECS = 4.0
+DEFAULT_START_TIMEOUT_SECS = 15.0
+# Re-check the child's liveness this often while waiting for audio.
+_POLL_SECS = 0.5
+_PARENT_CHECK_EVERY = 25
+_RESPAWN_BACKOFF_SECS = 1.0
+
+Spawner = Callable[[], Tuple[subprocess.Popen, int]]
+
+
+def _load(path: str) -> Callable[[], Any]:
+    module, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+class CaptureStream:
+    """Parent-side reader over the shared ring; quacks like a PyAudio input stream."""
+
+    def __init__(
+        self,
+        proc: subprocess.Popen,
+        shm: shared_memory.SharedMemory,
+        wake_fd: int,
+        *,
+        slots: int,
+        slot_bytes: int,
+        frames_per_buffer: int,
+        respawn: Optional[Spawner] = None,
+    ) -> None:
+        self._proc = proc
+        self._shm = shm
+        self._wake_fd = wake_fd
+        self._respawn = respawn
+        self._last_respawn = 0.0
+        self.restarts = 0
+        self._slots = slots
+        self._slot_bytes = slot_bytes
+        self._frames = frames_per_buffer
+        self._header = shm.buf[:8].cast("I")
+        self._seq = self._header[0]
+        self.lapped_chunks = 0
+        self._stopped = False
+        self._closed = False
+
+    def read(self, num_frames: int, exception_on_overflow: bool = False) -> bytes:
+        if num_frames != self._frames:
+            raise ValueError(f"CaptureStream reads whole chunks of {self._frames} frames")
+        while True:
+            if self._closed:
+                raise OSError("capture stream closed")
+            available = (self._header[0] - self._seq) & _MASK
+            if available == 0:
+                self._wait()
+                continue
+            # The slot the child is writing now is unreadable, so at most
+            # slots - 1 chunks are intact behind the write counter.
+            if available > self._slots - 1:
+                lost = available - (self._slots - 1)
+                self._seq = (self._seq + lost) & _MASK
+                self.lapped_chunks += lost
+            offset = HEADER_BYTES + (self._seq % self._slots) * self._slot_bytes
+            data = bytes(self._shm.buf[offset:offset + self._slot_bytes])
+            if ((self._header[0] - self._seq) & _MASK) > self._slots - 1:
+                continue  # overwritten while we copied it
+            self._seq = (self._seq + 1) & _MASK
+            return data
+
+    def _wait(self) -> None:
+        if self._proc.poll() is not None:
+            self._restart()
+            return
+        ready, _, _ = select.select([self._wake_fd], [], [], _POLL_SECS)
+        if ready:
+            try:
+                os.read(self._wake_fd, 4096)  # drain wake-ups; the counter is the truth
+            except BlockingIOError:
+                pass
+
+    def _restart(self) -> None:
+        """Replace an exited child with a new one writing to the same ring."""
+        code = self._proc.returncode
+        now = time.monotonic()
+        if self._stopped or self._respawn is None or now - self._last_respawn < _RESPAWN_BACKOFF_SECS:
+            raise OSError(f"audio capture process exited (code {code})")
+        self._last_respawn = now
+        logger.warning("Audio capture process exited, restarting", pid=self._proc.pid, code=code)
+        try:
+            proc, wake_fd = self._respawn()
+        except OSError as e:
+            raise OSError(f"audio capture process exited (code {code}); restart failed: {e}") from e
+        os.close(self._wake_fd)
+        self._proc, self._wake_fd = proc, wake_fd
+        self.restarts += 1
+
+    def is_active(self) -> bool:
+        return not self._closed and self._proc.poll() is None
+
+    def stop_stream(self) -> None:
+        self._stopped = True
+        if self._proc.poll() is None:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+                self._proc.wait(timeout=2)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.stop_stream()
+        self._closed = True
+        self._header.release()
+        os.close(self._wake_fd)
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pid": self._proc.pid,
+            "alive": self._proc.poll() is None,
+            "ring_chunks": self._slots,
+            "lapped_chunks": self.lapped_chunks,
+            "restarts": self.restarts,
+            "child_read_errors": 0 if self._closed else self._header[1],
+        }
+
+
+class CaptureProcessAudio:
+    """``pyaudio_factory`` stand-in whose ``open()`` starts a capture child.
+
+    ``device_factory`` is an importable ``"module:callable"`` returning a
+    PyAudio-like object; the child calls it in place of ``pyaudio.PyAudio``.
+    """
+
+    def __init__(
+        self,
+        *,
+        device_factory: str = "pyaudio:PyAudio",
+        ring_secs: float = DEFAULT_RING_SECS,
+        plan: Optional[Dict[str, Any]] = None,
+        start_timeout: float = DEFAULT_START_TIMEOUT_SECS,
+    ) -> None:
+        self._device_factory = device_factory
+        self._ring_secs = ring_secs
+        self._plan = plan or {}
+        self._start_timeout = start_timeout
+        self.stream: Optional[CaptureStream] = None
+
+    def open(self, **open_kwargs: Any) -> CaptureStream:
+        frames = int(open_kwargs["frames_per_buffer"])
+        slot_bytes = frames * int(open_kwargs.get("channels", 1)) * pyaudio.get_sample_size(
+            open_kwargs["format"]
+        )
+        slots = max(4, int(self._ring_secs * open_kwargs["rate"] / frames))
+        shm = shared_memory.SharedMemory(create=True, size=HEADER_BYTES + slots * slot_bytes)
+        spec = {
+            "shm": shm.name,
+            "slots": slots,
+            "slot_bytes": slot_bytes,
+            "parent_pid": os.getpid(),
+            "device_factory": self._device_factory,
+            "open_kwargs": open_kwargs,
+            "plan": self._plan,
+        }
+        try:
+            proc, read_fd = self._spawn(spec)
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+        self.stream = CaptureStream(
+            proc, shm, read_fd, slots=slots, slot_bytes=slot_bytes, frames_per_buffer=frames,
+            respawn=lambda: self._spawn(spec),
+        )
+        return self.stream
+
+    def _spawn(self, spec: Dict[str, Any]) -> Tuple[subprocess.Popen, int]:
+        """Start a child on ``spec``'s ring; returns it and the wake pipe's read end."""
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(_PROJECT_ROOT), env.get("PYTHONPATH")]))
+        try:
+            proc = subprocess.Popen(
+                [sys.executable, "-m", "core.capture_process", json.dumps(dict(spec, wake_fd=write_fd))],
+                cwd=str(_PROJECT_ROOT),
+                env=env,
+                pass_fds=(write_fd,),
+                stdout=subprocess.PIPE,
+            )
+        except Exception:
+            os.close(read_fd)
+            raise
+        finally:
+            os.close(write_fd)
+
+        try:
+            status = self._await_ready(proc)
+        except Exception:
+            os.close(read_fd)
+            raise
+        logger.info("Audio capture process started", pid=proc.pid, ring_chunks=spec["slots"], **status)
+        return proc, read_fd
+
+    def _await_ready(self, proc: subprocess.Popen) -> Dict[str, Any]:
+        assert proc.stdout is not None
+        # The ready line is all the child ever writes; don't keep the pipe open.
+        with proc.stdout:
+            ready, _, _ = select.select([proc.stdout], [], [], self._start_timeout)
+            line = proc.stdout.readline() if ready else b""
+        try:
+            status = json.loads(line) if line else {}
+        except json.JSONDecodeError:
+            status = {}
+        if status.get("ok"):
+            return status.get("policy", {})
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait(timeout=2)
+        # OSError, like a failed pyaudio open, so AudioBus callers retry the same way.
+        raise OSError(f"audio capture process failed to start: {status.get('error', 'no response')}")
+
+    def terminate(self) -> None:
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def stats(self) -> Optional[Dict[str, Any]]:
+        return self.stream.stats() if self.stream is not None else None
+
+
+# ── Child ────────────────────────────────────────────────────────────
+
+
+def _child_main(spec: Dict[str, Any]) -> int:
+    from core.execution_policy import ThreadPlan, apply_plan
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    shm = shared_memory.SharedMemory(name=spec["shm"])
+    # The parent owns the segment; keep this process's tracker from unlinking it.
+    resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    header = shm.buf[:8].cast("I")
+    slots, slot_bytes, wake_fd = spec["slots"], spec["slot_bytes"], spec["wake_fd"]
+    os.set_blocking(wake_fd, False)
+    frames = spec["open_kwargs"]["frames_per_buffer"]
+
+    pa = stream = None
+    try:
+        policy = apply_plan(ThreadPlan.from_dict(spec["plan"]))
+        try:
+            pa = _load(spec["device_factory"])()
+            stream = pa.open(**spec["open_kwargs"])
+        except Exception as e:
+            print(json.dumps({"ok": False, "error": str(e)}), flush=True)
+            return 1
+        print(json.dumps({"ok": True, "policy": policy}), flush=True)
+
+        seq = header[0]
+        reads = 0
+        while not stopping:
+            try:
+                data = stream.read(frames, exception_on_overflow=False)
+            except OSError:
+                header[1] = (header[1] + 1) & _MASK
+                time.sleep(0.05)
+                continue
+            offset = HEADER_BYTES + (seq % slots) * slot_bytes
+            shm.buf[offset:offset + len(data)] = data
+            seq = (seq + 1) & _MASK
+            header[0] = seq
+            try:
+                os.write(wake_fd, b"\0")
+            except (BlockingIOError, BrokenPipeError):
+                pass  # reader is behind or gone; the counter still advanced
+            reads += 1
+            if reads % _PARENT_CHECK_EVERY == 0 and os.getppid() != spec["parent_pid"]:
+                break
+        return 0
+    finally:
+        for closer in (getattr(stream, "stop_stream", None), getattr(stream, "close", None),
+                       getattr(pa, "terminate", None)):
+            if closer is not None:
+                try:
+                    closer()
+                except Exception:
+                    pass
+        header.release()
+        shm.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jarvis mic capture child (started by CaptureProcessAudio)")
+    parser.add_argument("spec", help="JSON capture spec")
+    sys.exit(_child_main(json.loads(parser.parse_args().spec)))
@@ -0,0 +1,383 @@
+"""Who gets the CPU: scheduling, niceness and core pinning per thread role.
+
+On a 4-core Pi the audio producer, the wake scorer, MQTT handlers,
+package installs and agent runs all share the default scheduler. A pip
+build or a network scan landing on the same core as the mic reader is
+enough to overrun the ALSA buffer and miss a wake word. Threads declare
+a role and the policy maps it onto the kernel's knobs:
+
+  - ``audio`` — mic capture. ``SCHED_FIFO`` where permitted, else a
+    negative nice; pinned to the reserved core.
+  - ``wake`` — the wake scorer. Negative nice, same reserved core, so it
+    never competes with background work for a CPU.
+  - ``background`` — discovery refresh, device scans, package installs.
+    ``nice 15`` and every core *except* the reserved one. Subprocesses
+    (pip) inherit both.
+
+Everything else keeps the defaults. Linux applies all three settings per
+thread, so roles are applied from inside the thread itself
+(``apply_thread_role``). Without ``CAP_SYS_NICE`` the privileged parts
+(FIFO, negative nice) are refused; that's recorded in ``stats()`` and
+the thread carries on with whatever was allowed.
+
+Kernel priorities don't help against the GIL: a niced background thread
+holding it still delays the wake scorer. Heavy background work belongs
+in a subprocess (pip already is), and ``core.capture_process`` can move
+mic capture out of the interpreter entirely.
+
+Background work is submitted to small pools (``run_in_background``)
+whose workers carry the ``background`` role, instead of each MQTT
+handler starting its own thread. Jobs that can run for minutes (package
+installs, adapter training) go to the ``long`` lane so a scan or an
+uninstall queued behind them in the ``short`` lane still starts at once.
+A job can read how long it queued (``current_background_job``) and
+report it with its result.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+from jarvis_log_client import JarvisLogger
+
+logger = JarvisLogger(service="jarvis-node")
+
+ROLES = ("audio", "wake", "background")
+
+DEFAULT_AUDIO_RT_PRIORITY = 20
+DEFAULT_AUDIO_NICE = -10
+DEFAULT_WAKE_NICE = -5
+DEFAULT_BACKGROUND_NICE = 15
+DEFAULT_BACKGROUND_WORKERS = 3
+DEFAULT_LONG_BACKGROUND_WORKERS = 2
+LANES = ("short", "long")
+
+
+@dataclass(frozen=True)
+class ThreadPlan:
+    """What to ask the kernel for; zero/None fields are left alone."""
+    cpus: Optional[Tuple[int, ...]] = None
+    fifo_priority: int = 0
+    nice: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ThreadPlan":
+        cpus = data.get("cpus")
+        return cls(
+            cpus=tuple(cpus) if cpus else None,
+            fifo_priority=int(data.get("fifo_priority", 0)),
+            nice=int(data.get("nice", 0)),
+        )
+
+
+def apply_plan(plan: ThreadPlan, tid: Optional[int] = None) -> Dict[str, Any]:
+    """Apply ``plan`` to thread ``tid`` (default: the calling thread).
+
+    Never raises: each refused setting is listed under ``denied``.
+    """
+    if tid is None:
+        tid = threading.get_native_id()
+    outcome: Dict[str, Any] = {"scheduler": "other", "nice": None, "cpus": None, "denied": []}
+
+    if plan.cpus and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(tid, plan.cpus)
+            outcome["cpus"] = sorted(plan.cpus)
+        except OSError:
+            outcome["denied"].append("affinity")
+
+    if plan.fifo_priority and hasattr(os, "sched_setscheduler"):
+        try:
+            os.sched_setscheduler(tid, os.SCHED_FIFO, os.sched_param(plan.fifo_priority))
+            outcome["scheduler"] = "fifo"
+        except OSError:
+            outcome["denied"].append("fifo")
+
+    # FIFO threads ignore nice; only fall back to it when FIFO was refused.
+    if plan.nice and outcome["scheduler"] != "fifo" and hasattr(os, "setpriority"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, tid, plan.nice)  # per-thread on Linux
+            outcome["nice"] = plan.nice
+        except OSError:
+            outcome["denied"].append("nice")
+    return outcome
+
+
+def _allowed_cpus() -> FrozenSet[int]:
+    try:
+        return frozenset(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return frozenset(range(os.cpu_count() or 1))
+
+
+class ExecutionPolicy:
+    """Maps thread roles to plans and applies them.
+
+    With two or more CPUs one core (``audio_cpu``, default the highest)
+    is reserved for ``audio`` and ``wake``; ``background`` gets the rest.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        cpus: Optional[FrozenSet[int]] = None,
+        audio_cpu: Optional[int] = None,
+        audio_rt_priority: int = DEFAULT_AUDIO_RT_PRIORITY,
+        audio_nice: int = DEFAULT_AUDIO_NICE,
+        wake_nice: int = DEFAULT_WAKE_NICE,
+        background_nice: int = DEFAULT_BACKGROUND_NICE,
+    ) -> None:
+        self.enabled = enabled
+        self.cpus = frozenset(cpus) if cpus is not None else _allowed_cpus()
+        if audio_cpu is None or audio_cpu not in self.cpus:
+            audio_cpu = max(self.cpus) if self.cpus else None
+        reserved = (audio_cpu,) if audio_cpu is not None and len(self.cpus) >= 2 else None
+        shared = tuple(sorted(self.cpus - set(reserved))) if reserved else None
+
+        self._plans: Dict[str, ThreadPlan] = {
+            "audio": ThreadPlan(cpus=reserved, fifo_priority=audio_rt_priority, nice=audio_nice),
+            "wake": ThreadPlan(cpus=reserved, nice=wake_nice),
+            "background": ThreadPlan(cpus=shared, nice=background_nice),
+        }
+        self._applied: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def plan(self, role: str) -> ThreadPlan:
+        if role not in self._plans:
+            raise ValueError(f"Unknown thread role {role!r}")
+        return self._plans[role] if self.enabled else ThreadPlan()
+
+    def apply(self, role: str) -> Dict[str, Any]:
+        """Apply ``role`` to the calling thread and record the outcome."""
+        outcome = apply_plan(self.plan(role))
+        with self._lock:
+            entry = self._applied.setdefault(role, {"threads": 0})
+            first = entry["threads"] == 0
+            entry["threads"] += 1
+            entry.update(outcome)
+        if first:
+            logger.info(
+                "Execution policy applied",
+                role=role,
+                thread=threading.current_thread().name,
+                **outcome,
+            )
+        return outcome
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            applied = {role: dict(entry) for role, entry in self._applied.items()}
+        return {
+            "enabled": self.enabled,
+            "cpus": sorted(self.cpus),
+            "roles": applied,
+        }
+
+
+_job = threading.local()
+
+
+def current_background_job() -> Optional[Dict[str, Any]]:
+    """Queue stats of the background job running on this thread, or None outside a pool.
+
+    ``lane``, ``jobs_ahead`` (running or queued in its pool when it was
+    submitted) and ``wait_ms`` (submit to start).
+    """
+    info = getattr(_job, "info", None)
+    return dict(info) if info is not None else None
+
+
+class BackgroundPool:
+    """Small thread pool whose workers run with the ``background`` role."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_BACKGROUND_WORKERS,
+        initializer: Optional[Callable[[], Any]] = None,
+        lane: str = "short",
+    ) -> None:
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="background" if lane == "short" else f"background-{lane}",
+            initializer=initializer,
+        )
+        self.max_workers = max_workers
+        self.lane = lane
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._running = 0
+        self._started = 0
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+
+    def submit(self, fn: Callable[..., Any], *args: Any, name: Optional[str] = None,
+               **kwargs: Any) -> "concurrent.futures.Future[Any]":
+        """Queue ``fn(*args, **kwargs)``; exceptions are logged, not raised."""
+        task_name = name or getattr(fn, "__name__", "task")
+        submitted_at = time.monotonic()
+
+        def run() -> Any:
+            wait_ms = (time.monotonic() - submitted_at) * 1000
+            with self._lock:
+                self._running += 1
+                self._started += 1
+                self._wait_ms_total += wait_ms
+                self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+            _job.info = {"lane": self.lane, "jobs_ahead": jobs_ahead, "wait_ms": round(wait_ms)}
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                with self._lock:
+                    self._failed += 1
+                logger.error("Background task failed", task=task_name, error=str(e))
+                return None
+            finally:
+                _job.info = None
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        with self._lock:
+            jobs_ahead = self._submitted - self._completed
+            self._submitted += 1
+        if jobs_ahead >= self.max_workers:
+            logger.info("Background task queued", task=task_name, lane=self.lane, jobs_ahead=jobs_ahead)
+        return self._executor.submit(run)
+
+    def _queued_locked(self) -> int:
+        # self._lock held
+        return self._submitted - self._completed - self._running
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "running": self._running,
+                "queued": self._queued_locked(),
+                "wait_ms_avg": round(self._wait_ms_total / self._started) if self._started else 0,
+                "wait_ms_max": round(self._wait_ms_max),
+            }
+
+
+_policy: Optional[ExecutionPolicy] = None
+_pools: Dict[str, BackgroundPool] = {}
+_lock = threading.Lock()
+
+
+def get_execution_policy() -> ExecutionPolicy:
+    """Return the process-wide policy, creating it from config on first call.
+
+    Config: ``execution_policy_enabled``, ``audio_cpu`` (-1 = highest
+    core), ``audio_rt_priority``, ``background_nice``.
+    """
+    global _policy
+    if _policy is None:
+        from utils.config_service import Config
+
+        with _lock:
+            if _policy is None:
+                audio_cpu = Config.get_int("audio_cpu", -1)
+                _policy = ExecutionPolicy(
+                    enabled=bool(Config.get_bool("execution_policy_enabled", True)),
+                    audio_cpu=audio_cpu if audio_cpu >= 0 else None,
+                    audio_rt_priority=Config.get_int("audio_rt_priority", DEFAULT_AUDIO_RT_PRIORITY),
+                    background_nice=Config.get_int("background_nice", DEFAULT_BACKGROUND_NICE),
+                )
+    return _policy
+
+
+def set_execution_policy(policy: Optional[ExecutionPolicy]) -> None:
+    """Install ``policy`` as the process-wide policy (tools and benchmarks without config)."""
+    global _policy
+    with _lock:
+        _policy = policy
+
+
+def apply_thread_role(role: str) -> Optional[Dict[str, Any]]:
+    """Apply ``role`` to the calling thread (no-op until a policy exists).
+
+    Library classes (``AudioBus``, ``WakeScorer``) call this from their
+    threads; the node creates the policy at startup, tests never do.
+    """
+    if _policy is None:
+        return None
+    return _policy.apply(role)
+
+
+def get_background_pool(lane: str = "short") -> BackgroundPool:
+    """Return the process-wide pool for ``lane``.
+
+    Config: ``background_workers`` (short lane) and
+    ``background_long_workers`` (long lane).
+    """
+    if lane not in LANES:
+        raise ValueError(f"Unknown background lane {lane!r}")
+    pool = _pools.get(lane)
+    if pool is None:
+        policy = get_execution_policy()
+        from utils.config_service import Config
+
+        if lane == "long":
+            workers = Config.get_int("background_long_workers", DEFAULT_LONG_BACKGROUND_WORKERS)
+        else:
+            workers = Config.get_int("background_workers", DEFAULT_BACKGROUND_WORKERS)
+        with _lock:
+            pool = _pools.get(lane)
+            if pool is None:
+                pool = _pools[lane] = BackgroundPool(
+                    max_workers=max(1, workers),
+                    initializer=lambda: policy.apply("background"),
+                    lane=lane,
+                )
+    return pool
+
+
+def run_in_background(fn: Callable[..., Any], *args: Any, name: Optional[str] = None,
+                      lane: str = "short", **kwargs: Any) -> "concurrent.futures.Future[Any]":
+    """Run low-priority work on the background pool.
+
+    ``lane="long"`` for jobs that can take minutes (installs, training);
+    the default short lane is for scans, uninstalls and refreshes.
+    """
+    return get_background_pool(lane).submit(fn, *args, name=name, **kwargs)
+
+
+def get_execution_policy_stats() -> Optional[Dict[str, Any]]:
+    """Policy outcomes and pool counters for the heartbeat, or None if unused."""
+    if _policy is None:
+        return None
+    data = _policy.stats()
+    with _lock:
+        pools = dict(_pools)
+    if "short" in pools:
+        data["background_pool"] = pools["short"].stats()
+    if "long" in pools:
+        data["background_pool_long"] = pools["long"].stats()
+    return data
+
+
+def reset_execution_policy() -> None:
+    """Drop the singletons (test hook). Production code should not call this."""
+    global _policy
+    with _lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False)
+        _policy = None
+        _pools.clear()
@@ -0,0 +1,409 @@
+"""In-process LAN scanner: neighbor table + non-blocking probes + MAC-keyed cache.
+
+The network discovery providers used to shell out for every step —
+``nmap`` / ``arp-scan`` when installed, otherwise one ``ping`` process
+per address (254 spawns for a /24), then one ``open_connection`` per
+port per host. ``NetworkScanner`` does it in-process:
+
+  1. **Neighbor table** — ``/proc/net/arp`` on Linux (``arp -an`` once on
+     macOS) lists hosts the kernel already resolved, with MACs, for free.
+  2. **Sweep** — one non-blocking ICMP datagram socket sends an echo to
+     every address and collects replies until ``sweep_timeout``. Where
+     unprivileged ICMP isn't allowed (``net.ipv4.ping_group_range``),
+     one UDP socket sends a 1-byte datagram to each address instead: the
+     kernel ARPs for every target, and whoever answered shows up in the
+     neighbor table, which is read again after the sweep.
+  3. **Port probes** — non-blocking ``connect()`` over every
+     (host, port) pair, bounded by one semaphore across all hosts
+     (``port_concurrency``) instead of a small pool per host.
+  4. **Cache** — results are kept per MAC address. A host whose MAC is
+     still at the same IP and whose ports were probed less than
+     ``freshness_seconds`` ago is not probed again, so a repeat scan
+     only touches hosts that are new or have moved.
+
+All scanning is async; run it on the node ``AsyncRuntime`` (or any loop).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import os
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from jarvis_log_client import JarvisLogger
+
+logger = JarvisLogger(service="jarvis-node")
+
+PROC_NET_ARP = "/proc/net/arp"
+ATF_COMPLETE = 0x2
+SWEEP_TIMEOUT_SECONDS = 1.0
+PORT_TIMEOUT_SECONDS = 0.5
+PORT_CONCURRENCY = 128
+HOST_FRESHNESS_SECONDS = 600.0
+# Pause between sweep sends so a /24 doesn't go out as one burst
+SEND_SPACING_SECONDS = 0.0005
+# UDP "discard" port; any closed port works, we only want the ARP exchange
+NUDGE_PORT = 9
+
+
+@dataclass(frozen=True)
+class NeighborEntry:
+    ip: str
+    mac: str
+    interface: str = ""
+
+
+@dataclass
+class HostRecord:
+    """One LAN host as last seen by the scanner."""
+
+    ip: str
+    mac: Optional[str] = None
+    open_ports: List[int] = field(default_factory=list)
+    probed_ports: Set[int] = field(default_factory=set)
+    seen_at: float = 0.0
+    probed_at: float = 0.0
+
+    @property
+    def key(self) -> str:
+        return self.mac or f"ip:{self.ip}"
+
+
+# ---------------------------------------------------------------------------
+# Neighbor table
+# ---------------------------------------------------------------------------
+
+def _valid_mac(mac: str) -> bool:
+    return len(mac) == 17 and mac not in ("00:00:00:00:00:00", "ff:ff:ff:ff:ff:ff")
+
+
+def parse_proc_net_arp(text: str) -> List[NeighborEntry]:
+    """Parse ``/proc/net/arp`` (complete entries only)."""
+    entries = []
+    for line in text.splitlines()[1:]:
+        parts = line.split()
+        if len(parts) < 6:
+            continue
+        ip, _hw_type, flags, mac, _mask, device = parts[:6]
+        try:
+            complete = int(flags, 16) & ATF_COMPLETE
+        except ValueError:
+            continue
+        mac = mac.lower()
+        if complete and _valid_mac(mac):
+            entries.append(NeighborEntry(ip, mac, device))
+    return entries
+
+
+def parse_arp_output(text: str) -> List[NeighborEntry]:
+    """Parse BSD/macOS ``arp -an`` output: ``? (192.168.1.5) at aa:bb:.. on en0 ...``."""
+    entries = []
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) < 4 or parts[2] != "at":
+            continue
+        ip = parts[1].strip("()")
+        # macOS drops leading zeros ("a:b:c:..."); normalize to two digits
+        octets = parts[3].lower().split(":")
+        if len(octets) != 6:
+            continue
+        try:
+            mac = ":".join(f"{int(o, 16):02x}" for o in octets)
+        except ValueError:
+            continue
+        interface = parts[5] if len(parts) > 5 and parts[4] == "on" else ""
+        if _valid_mac(mac):
+            entries.append(NeighborEntry(ip, mac, interface))
+    return entries
+
+
+async def read_neighbor_table() -> List[NeighborEntry]:
+    """Hosts the kernel has resolved, with their MACs."""
+    if os.path.exists(PROC_NET_ARP):
+        try:
+            with open(PROC_NET_ARP) as f:
+                return parse_proc_net_arp(f.read())
+        except OSError as e:
+            logger.warning("Reading neighbor table failed", error=str(e))
+            return []
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "arp", "-an", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=5.0)
+        return parse_arp_output(stdout.decode(errors="replace"))
+    except (OSError, asyncio.TimeoutError) as e:
+        logger.warning("Reading neighbor table failed", error=str(e))
+        return []
+
+
+# ---------------------------------------------------------------------------
+# Sweep
+# ---------------------------------------------------------------------------
+
+def _checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _echo_request(ident: int, seq: int) -> bytes:
+    header = struct.pack("!BBHHH", 8, 0, 0, ident, seq)
+    payload = b"jarvis-scan"
+    return struct.pack("!BBHHH", 8, 0, _checksum(header + payload), ident, seq) + payload
+
+
+def _is_echo_reply(data: bytes) -> bool:
+    if data and data[0] >> 4 == 4:
+        # macOS datagram ICMP sockets include the IP header
+        data = data[(data[0] & 0x0F) * 4:]
+    return bool(data) and data[0] == 0
+
+
+def _open_icmp_socket() -> Optional[socket.socket]:
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+    except (PermissionError, OSError):
+        return None
+    sock.setblocking(False)
+    return sock
+
+
+async def icmp_sweep(hosts: List[str], timeout: float = SWEEP_TIMEOUT_SECONDS) -> Optional[Set[str]]:
+    """Addresses that answered an ICMP echo, or None if ICMP sockets aren't permitted."""
+    sock = _open_icmp_socket()
+    if sock is None:
+        return None
+    loop = asyncio.get_running_loop()
+    alive: Set[str] = set()
+    targets = set(hosts)
+
+    # add_reader + plain recvfrom/sendto rather than loop.sock_recvfrom /
+    # sock_sendto, which only exist from Python 3.11.
+    def receive() -> None:
+        while True:
+            try:
+                data, (ip, *_rest) = sock.recvfrom(1500)
+            except OSError:  # drained (BlockingIOError) or a transient error
+                return
+            if ip in targets and _is_echo_reply(data):
+                alive.add(ip)
+
+    loop.add_reader(sock.fileno(), receive)
+    try:
+        ident = os.getpid() & 0xFFFF
+        for seq, ip in enumerate(hosts):
+            try:
+                sock.sendto(_echo_request(ident, seq & 0xFFFF), (ip, 0))
+            except OSError:  # includes a full send buffer; one missed host is fine
+                continue
+            if SEND_SPACING_SECONDS:
+                await asyncio.sleep(SEND_SPACING_SECONDS)
+        await asyncio.sleep(timeout)
+    finally:
+        loop.remove_reader(sock.fileno())
+        sock.close()
+    return alive
+
+
+async def udp_nudge(hosts: List[str]) -> None:
+    """Send one datagram to each address so the kernel resolves it via ARP."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    try:
+        for ip in hosts:
+            try:
+                sock.sendto(b"\x00", (ip, NUDGE_PORT))
+            except OSError:
+                continue
+            if SEND_SPACING_SECONDS:
+                await asyncio.sleep(SEND_SPACING_SECONDS)
+    finally:
+        sock.close()
+
+
+# ---------------------------------------------------------------------------
+# Port probes
+# ---------------------------------------------------------------------------
+
+async def _port_open(ip: str, port: int, timeout: float) -> bool:
+    loop = asyncio.get_running_loop()
+    family = socket.AF_INET6 if ":" in ip else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setblocking(False)
+    try:
+        await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout)
+        return True
+    except (OSError, asyncio.TimeoutError):
+        return False
+    finally:
+        sock.close()
+
+
+async def probe_ports(
+    targets: Iterable[Tuple[str, int]],
+    concurrency: int = PORT_CONCURRENCY,
+    timeout: float = PORT_TIMEOUT_SECONDS,
+) -> Dict[str, List[int]]:
+    """Open ports per host for every (ip, port) pair, at most ``concurrency`` connects at once."""
+    semaphore = asyncio.Semaphore(concurrency)
+    pairs = list(dict.fromkeys(targets))
+
+    async def probe(ip: str, port: int) -> Tuple[str, int, bool]:
+        async with semaphore:
+            return ip, port, await _port_open(ip, port, timeout)
+
+    results: Dict[str, List[int]] = {ip: [] for ip, _ in pairs}
+    for ip, port, is_open in await asyncio.gather(*(probe(ip, port) for ip, port in pairs)):
+        if is_open:
+            results[ip].append(port)
+    for ports in results.values():
+        ports.sort()
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Scanner
+# ---------------------------------------------------------------------------
+
+class NetworkScanner:
+    """Scans a subnet and keeps per-MAC results for ``freshness_seconds``."""
+
+    def __init__(
+        self,
+        freshness_seconds: float = HOST_FRESHNESS_SECONDS,
+        sweep_timeout: float = SWEEP_TIMEOUT_SECONDS,
+        port_timeout: float = PORT_TIMEOUT_SECONDS,
+        port_concurrency: int = PORT_CONCURRENCY,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.freshness_seconds = freshness_seconds
+        self.sweep_timeout = sweep_timeout
+        self.port_timeout = port_timeout
+        self.port_concurrency = port_concurrency
+        self._clock = clock
+        self._hosts: Dict[str, HostRecord] = {}
+        self._lock = threading.Lock()
+        self._stats = {"scans": 0, "hosts_probed": 0, "hosts_cached": 0, "port_probes": 0, "icmp_fallbacks": 0}
+
+    async def discover(self, network_range: str) -> List[HostRecord]:
+        """Live hosts in ``network_range`` (neighbor table + sweep), without port probes."""
+        subnet = ipaddress.ip_network(network_range, strict=False)
+        addresses = [str(ip) for ip in subnet.hosts()]
+        neighbors = {e.ip: e for e in await read_neighbor_table() if ipaddress.ip_address(e.ip) in subnet}
+
+        alive = await icmp_sweep(addresses, self.sweep_timeout)
+        if alive is None:
+            self._stats["icmp_fallbacks"] += 1
+            await udp_nudge([ip for ip in addresses if ip not in neighbors])
+            await asyncio.sleep(self.sweep_timeout)
+            alive = set()
+        # Re-read: the sweep itself makes the kernel resolve responders
+        for entry in await read_neighbor_table():
+            if ipaddress.ip_address(entry.ip) in subnet:
+                neighbors[entry.ip] = entry
+
+        now = self._clock()
+        found: Dict[str, HostRecord] = {}
+        for ip in sorted(set(neighbors) | alive, key=ipaddress.ip_address):
+            mac = neighbors[ip].mac if ip in neighbors else None
+            found[ip] = HostRecord(ip=ip, mac=mac, seen_at=now)
+        return list(found.values())
+
+    async def scan(self, network_range: str, ports: Iterable[int] = ()) -> List[HostRecord]:
+        """Discover hosts and probe ``ports`` on the ones that are new, moved or stale."""
+        hosts = await self.discover(network_range)
+        records = await self._with_ports(hosts, set(ports))
+        self._stats["scans"] += 1
+        return records
+
+    async def ports_for(self, ip: str, ports: Iterable[int], mac: Optional[str] = None) -> List[int]:
+        """Open ``ports`` on one host, from cache when fresh."""
+        if mac is None:
+            mac = next((e.mac for e in await read_neighbor_table() if e.ip == ip), None)
+        [record] = await self._with_ports([HostRecord(ip=ip, mac=mac, seen_at=self._clock())], set(ports))
+        return [p for p in record.open_ports if p in set(ports)]
+
+    def cached_hosts(self) -> List[HostRecord]:
+        with self._lock:
+            return list(self._hosts.values())
+
+    def invalidate(self, mac: Optional[str] = None) -> None:
+        with self._lock:
+            if mac is None:
+                self._hosts.clear()
+            else:
+                self._hosts.pop(mac.lower(), None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"cached_hosts": len(self._hosts), **self._stats}
+
+    async def _with_ports(self, hosts: List[HostRecord], ports: Set[int]) -> List[HostRecord]:
+        now = self._clock()
+        to_probe: List[HostRecord] = []
+        results: List[HostRecord] = []
+        with self._lock:
+            for host in hosts:
+                cached = self._hosts.get(host.key)
+                if (
+                    cached is not None
+                    and cached.ip == host.ip
+                    and ports <= cached.probed_ports
+                    and now - cached.probed_at <= self.freshness_seconds
+                ):
+                    cached.seen_at = now
+                    results.append(cached)
+                    self._stats["hosts_cached"] += 1
+                else:
+                    to_probe.append(host)
+
+        if ports and to_probe:
+            opened = await probe_ports(
+                ((h.ip, p) for h in to_probe for p in sorted(ports)),
+                concurrency=self.port_concurrency, timeout=self.port_timeout,
+            )
+            self._stats["port_probes"] += len(to_probe) * len(ports)
+        else:
+            opened = {}
+
+        now = self._clock()
+        with self._lock:
+            for host in to_probe:
+                host.open_ports = opened.get(host.ip, [])
+                host.probed_ports = set(ports)
+                host.probed_at = now
+                self._hosts[host.key] = host
+                results.append(host)
+            self._stats["hosts_probed"] += len(to_probe)
+        results.sort(key=lambda h: ipaddress.ip_address(h.ip))
+        return results
+
+
+_scanner: Optional[NetworkScanner] = None
+_scanner_lock = threading.Lock()
+
+
+def get_network_scanner() -> NetworkScanner:
+    """Process-wide NetworkScanner (its cache is shared by all callers)."""
+    global _scanner
+    if _scanner is None:
+        with _scanner_lock:
+            if _scanner is None:
+                _scanner = NetworkScanner()
+    return _scanner
+
+
+def reset_network_scanner() -> None:
+    """Drop the singleton (test hook)."""
+    global _scanner
+    _scanner = None
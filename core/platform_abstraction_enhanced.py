@@ -3,19 +3,19 @@ Enhanced platform abstraction layer for Jarvis Node.
 
 This module provides platform-agnostic interfaces and platform-specific implementations
 using dependency injection and composition patterns. It includes enhanced async methods
-for network discovery.
+for network discovery, backed by the in-process ``core.network_scanner``.
 """
 
 import os
 import platform
-import asyncio
-import ipaddress
 import subprocess
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Tuple
 
 from jarvis_log_client import JarvisLogger
 
+from core.network_scanner import get_network_scanner, read_neighbor_table
+
 logger = JarvisLogger(service="jarvis-node")
 
 class AudioProvider(ABC):
@@ -238,133 +238,21 @@ class MacOSNetworkDiscoveryProvider(NetworkDiscoveryProvider):
         return active_hosts
     
     async def scan_network_async(self, network_range: str) -> List[str]:
-        """Async network scanning for macOS with optimizations and fallbacks"""
+        """Async network scanning for macOS (in-process, see ``core.network_scanner``)"""
         try:
-            # First, try arp-scan which is faster but requires installation
-            proc = await asyncio.create_subprocess_shell(
-                "which arp-scan",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            _, _ = await proc.communicate()
-            
-            if proc.returncode == 0:
-                # arp-scan is available
-                proc = await asyncio.create_subprocess_shell(
-                    f"arp-scan --localnet",
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                stdout, _ = await proc.communicate()
-                
-                active_hosts = []
-                subnet = ipaddress.IPv4Network(network_range)
-                
-                for line in stdout.decode().splitlines():
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        try:
-                            ip = parts[0]
-                            if ipaddress.IPv4Address(ip) in subnet:
-                                active_hosts.append(ip)
-                        except ValueError:
-                            pass  # Invalid IP address format, skip
-                            
-                return active_hosts
-            else:
-                # Fallback to ping sweep with rate limiting
-                return await self._ping_sweep_async(network_range)
-                
+            hosts = await get_network_scanner().scan(network_range)
+            return [host.ip for host in hosts]
         except Exception as e:
             logger.error(f"Error in async network scan: {e}")
             return []
-    
-    async def _ping_sweep_async(self, network_range: str) -> List[str]:
-        """Fallback ping sweep with controlled concurrency for macOS"""
-        active_hosts = []
-        subnet = ipaddress.IPv4Network(network_range)
-        semaphore = asyncio.Semaphore(25)  # Limit concurrent pings
-        
-        async def ping_host(ip):
-            async with semaphore:
-                try:
-                    proc = await asyncio.create_subprocess_shell(
-                        f"ping -c 1 -W 1 -t 1 {ip}",
-                        stdout=asyncio.subprocess.DEVNULL,
-                        stderr=asyncio.subprocess.DEVNULL
-                    )
-                    await asyncio.wait_for(proc.communicate(), timeout=2.0)
-                    if proc.returncode == 0:
-                        return ip
-                    return None
-                except asyncio.TimeoutError:
-                    return None
-                except OSError:
-                    return None
-                
-        tasks = []
-        for ip in subnet.hosts():
-            ip_str = str(ip)
-            tasks.append(ping_host(ip_str))
-            
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for result in results:
-            if isinstance(result, str):
-                active_hosts.append(result)
-                
-        return active_hosts
-        
+
     async def get_arp_table(self) -> List[Tuple[str, str]]:
         """Get ARP table entries for macOS"""
-        entries = []
-        try:
-            proc = await asyncio.create_subprocess_shell(
-                "arp -a",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, _ = await proc.communicate()
-            
-            for line in stdout.decode().splitlines():
-                parts = line.split()
-                if len(parts) >= 4:
-                    ip = parts[1].strip("()")
-                    mac = parts[3]
-                    if mac != "ff:ff:ff:ff:ff:ff" and not mac.startswith("incomplete"):
-                        entries.append((ip, mac))
-        except Exception as e:
-            logger.error(f"Error getting ARP table: {e}")
-            
-        return entries
-        
+        return [(entry.ip, entry.mac) for entry in await read_neighbor_table()]
+
     async def scan_device_ports(self, ip: str, ports: List[int]) -> List[int]:
-        """Scan common ports on a macOS device"""
-        open_ports = []
-        semaphore = asyncio.Semaphore(10)  # Limit concurrent connections
-        
-        async def check_port(port):
-            async with semaphore:
-                try:
-                    # Create socket with timeout
-                    reader, writer = await asyncio.wait_for(
-                        asyncio.open_connection(ip, port),
-                        timeout=0.5
-                    )
-                    writer.close()
-                    await writer.wait_closed()
-                    return port
-                except (OSError, asyncio.TimeoutError):
-                    return None  # Port closed or connection failed
-        
-        tasks = [check_port(port) for port in ports]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for result in results:
-            if isinstance(result, int):
-                open_ports.append(result)
-                
-        return open_ports
+        """Scan common ports on a macOS device (cached per MAC)"""
+        return await get_network_scanner().ports_for(ip, ports)
 
 
 class PiAudioProvider(AudioProvider):
@@ -526,145 +414,21 @@ class PiNetworkDiscoveryProvider(NetworkDiscoveryProvider):
         return active_hosts
     
     async def scan_network_async(self, network_range: str) -> List[str]:
-        """Async network scanning for Raspberry Pi/Linux with optimizations"""
+        """Async network scanning for Raspberry Pi/Linux (in-process, see ``core.network_scanner``)"""
         try:
-            # Try to use nmap for efficient scanning
-            proc = await asyncio.create_subprocess_shell(
-                f"nmap -sn -n --max-retries=1 --max-scan-delay=10ms {network_range}",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=30.0)
-            
-            active_hosts = []
-            for line in stdout.decode().splitlines():
-                if "Nmap scan report for" in line:
-                    parts = line.split()
-                    ip = parts[-1].strip("()")
-                    active_hosts.append(ip)
-                    
-            if active_hosts:
-                return active_hosts
-            else:
-                # Fallback to ping sweep
-                return await self._ping_sweep_async(network_range)
-                
+            hosts = await get_network_scanner().scan(network_range)
+            return [host.ip for host in hosts]
         except Exception as e:
             logger.error(f"Error in async network scan: {e}")
-            # Fallback to ping sweep
-            return await self._ping_sweep_async(network_range)
-    
-    async def _ping_sweep_async(self, network_range: str) -> List[str]:
-        """Fallback ping sweep for Raspberry Pi/Linux with controlled concurrency"""
-        active_hosts = []
-        subnet = ipaddress.IPv4Network(network_range)
-        semaphore = asyncio.Semaphore(25)  # Limit concurrent pings
-        
-        async def ping_host(ip):
-            async with semaphore:
-                try:
-                    proc = await asyncio.create_subprocess_shell(
-                        f"ping -c 1 -W 1 {ip}",
-                        stdout=asyncio.subprocess.DEVNULL,
-                        stderr=asyncio.subprocess.DEVNULL
-                    )
-                    await asyncio.wait_for(proc.communicate(), timeout=2.0)
-                    if proc.returncode == 0:
-                        return ip
-                    return None
-                except asyncio.TimeoutError:
-                    return None
-                except OSError:
-                    return None
-                
-        tasks = []
-        for ip in subnet.hosts():
-            ip_str = str(ip)
-            tasks.append(ping_host(ip_str))
-            
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for result in results:
-            if isinstance(result, str):
-                active_hosts.append(result)
-                
-        return active_hosts
-        
+            return []
+
     async def get_arp_table(self) -> List[Tuple[str, str]]:
-        """Get ARP table entries for Raspberry Pi/Linux"""
-        entries = []
-        
-        # First try with ip neigh
-        try:
-            proc = await asyncio.create_subprocess_shell(
-                "ip neigh show",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, _ = await proc.communicate()
-            
-            for line in stdout.decode().splitlines():
-                parts = line.split()
-                if len(parts) >= 4 and "lladdr" in line:
-                    ip = parts[0]
-                    mac_index = parts.index("lladdr") + 1
-                    if mac_index < len(parts):
-                        mac = parts[mac_index]
-                        entries.append((ip, mac))
-                        
-            if entries:
-                return entries
-        except Exception as e:
-            logger.error(f"Error getting ARP table with ip neigh: {e}")
-        
-        # Fallback to arp command
-        try:
-            proc = await asyncio.create_subprocess_shell(
-                "arp -a",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, _ = await proc.communicate()
-            
-            for line in stdout.decode().splitlines():
-                parts = line.split()
-                if len(parts) >= 4:
-                    ip = parts[1].strip("()")
-                    mac = parts[3]
-                    if mac != "ff:ff:ff:ff:ff:ff" and not mac.startswith("incomplete"):
-                        entries.append((ip, mac))
-        except Exception as e:
-            logger.error(f"Error getting ARP table with arp -a: {e}")
-            
-        return entries
-        
+        """Get ARP table entries for Raspberry Pi/Linux (``/proc/net/arp``)"""
+        return [(entry.ip, entry.mac) for entry in await read_neighbor_table()]
+
     async def scan_device_ports(self, ip: str, ports: List[int]) -> List[int]:
-        """Scan common ports on a Raspberry Pi/Linux device"""
-        open_ports = []
-        semaphore = asyncio.Semaphore(10)  # Limit concurrent connections
-        
-        async def check_port(port):
-            async with semaphore:
-                try:
-                    # Create socket with timeout
-                    reader, writer = await asyncio.wait_for(
-                        asyncio.open_connection(ip, port),
-                        timeout=0.5
-                    )
-                    writer.close()
-                    await writer.wait_closed()
-                    return port
-                except (OSError, asyncio.TimeoutError):
-                    return None  # Port closed or connection failed
-        
-        tasks = [check_port(port) for port in ports]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for result in results:
-            if isinstance(result, int):
-                open_ports.append(result)
-                
-        return open_ports
+        """Scan common ports on a Raspberry Pi/Linux device (cached per MAC)"""
+        return await get_network_scanner().ports_for(ip, ports)
 
 
 class PiSystemProvider(SystemProvider):
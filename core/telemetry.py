@@ -0,0 +1,260 @@
+"""In-process performance telemetry, summarized onto the heartbeat.
+
+Subsystems record into named instruments on the process-wide registry::
+
+    from core.telemetry import get_telemetry
+
+    telemetry = get_telemetry()
+    telemetry.counter("wakes").inc()
+    telemetry.histogram("turn_ms").observe(elapsed_ms)
+    telemetry.gauge("alert_queue_depth", lambda: len(queue))
+
+The heartbeat takes a ``snapshot()`` — counts and latency summaries for
+the interval since the last *successful* heartbeat — and calls
+``commit(snapshot)`` once the command center accepted it, so a failed
+POST folds its interval into the next one instead of losing it.
+
+The hot path takes no locks: counters and histogram buckets are slots in
+preallocated lists, incremented in place. Under the GIL a concurrent
+increment can very rarely be lost, which is fine for telemetry and much
+cheaper than a lock on every audio frame. Snapshots read cumulative
+values and subtract the last committed baseline, so nothing is ever
+reset underneath a writer.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from jarvis_log_client import JarvisLogger
+
+logger = JarvisLogger(service="jarvis-node")
+
+# Latency bucket upper bounds in ms (plus an implicit overflow bucket).
+DEFAULT_MS_BOUNDS: Tuple[float, ...] = (
+    1, 2, 5, 10, 20, 50, 100, 200, 350, 500, 750,
+    1000, 1500, 2000, 3000, 5000, 10000, 20000, 60000,
+)
+
+
+class Counter:
+    """Monotonic count; ``inc()`` is a single list-slot add."""
+
+    __slots__ = ("name", "_value", "_base")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._value = [0]
+        self._base = 0
+
+    def inc(self, n: int = 1) -> None:
+        self._value[0] += n
+
+    @property
+    def total(self) -> int:
+        return self._value[0]
+
+    def delta(self) -> int:
+        return self._value[0] - self._base
+
+    def commit(self, value: int) -> None:
+        self._base = value
+
+
+class Histogram:
+    """Fixed-bucket distribution (ms by default) with interval summaries."""
+
+    __slots__ = ("name", "bounds", "_counts", "_sum", "_max", "_base_counts", "_base_sum")
+
+    def __init__(self, name: str, bounds: Sequence[float] = DEFAULT_MS_BOUNDS) -> None:
+        self.name = name
+        self.bounds = tuple(bounds)
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._sum = [0.0]
+        self._max = [0.0]
+        self._base_counts = [0] * len(self._counts)
+        self._base_sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self.bounds, value)] += 1
+        self._sum[0] += value
+        if value > self._max[0]:
+            self._max[0] = value
+
+    def time(self) -> "_Timer":
+        """``with histogram.time(): ...`` records the block's duration in ms."""
+        return _Timer(self)
+
+    def interval(self) -> Tuple[List[int], float]:
+        counts = [c - b for c, b in zip(list(self._counts), self._base_counts)]
+        return counts, self._sum[0] - self._base_sum
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        counts, total = self.interval()
+        n = sum(counts)
+        if n == 0:
+            return None
+        peak = self._max[0]
+        return {
+            "n": n,
+            "mean": round(total / n, 1),
+            "p50": self._quantile(counts, n, 0.50, peak),
+            "p95": self._quantile(counts, n, 0.95, peak),
+            "p99": self._quantile(counts, n, 0.99, peak),
+            "max": round(peak, 1),
+        }
+
+    def _quantile(self, counts: List[int], n: int, q: float, peak: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (capped at the max seen)."""
+        rank = q * n
+        seen = 0
+        for i, count in enumerate(counts):
+            seen += count
+            if seen >= rank and count:
+                bound = self.bounds[i] if i < len(self.bounds) else peak
+                return round(min(bound, peak), 1)
+        return round(peak, 1)
+
+    def commit(self, counts: List[int], total: float) -> None:
+        self._base_counts = [b + c for b, c in zip(self._base_counts, counts)]
+        self._base_sum += total
+        self._max[0] = 0.0
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: Histogram) -> None:
+        self._histogram = histogram
+        self._start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._histogram.observe((time.perf_counter() - self._start) * 1000.0)
+
+
+class _ProcessCpu:
+    """Process CPU % (of one core) between successive reads."""
+
+    def __init__(self) -> None:
+        self._last = (time.monotonic(), time.process_time())
+
+    def __call__(self) -> float:
+        now, cpu = time.monotonic(), time.process_time()
+        wall = now - self._last[0]
+        used = cpu - self._last[1]
+        self._last = (now, cpu)
+        return round(100.0 * used / wall, 1) if wall > 0 else 0.0
+
+
+def _load_1m() -> Optional[float]:
+    try:
+        return round(os.getloadavg()[0], 2)
+    except (AttributeError, OSError):
+        return None
+
+
+def _rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class Telemetry:
+    """Registry of counters, histograms and gauges."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()      # registration only
+        self._counters: Dict[str, Counter] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._gauges: Dict[str, Callable[[], Any]] = {}
+
+    def counter(self, name: str) -> Counter:
+        c = self._counters.get(name)
+        if c is None:
+            with self._lock:
+                c = self._counters.setdefault(name, Counter(name))
+        return c
+
+    def histogram(self, name: str, bounds: Sequence[float] = DEFAULT_MS_BOUNDS) -> Histogram:
+        h = self._histograms.get(name)
+        if h is None:
+            with self._lock:
+                h = self._histograms.setdefault(name, Histogram(name, bounds))
+        return h
+
+    def gauge(self, name: str, read: Callable[[], Any]) -> None:
+        """Register (or replace) a value sampled at snapshot time."""
+        with self._lock:
+            self._gauges[name] = read
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Compact interval summary: non-zero counters, non-empty histograms, gauges."""
+        counters = {name: c.delta() for name, c in list(self._counters.items())}
+        histograms = {name: h.summary() for name, h in list(self._histograms.items())}
+        gauges: Dict[str, Any] = {}
+        for name, read in list(self._gauges.items()):
+            try:
+                value = read()
+            except Exception as e:
+                logger.debug("Telemetry gauge failed", gauge=name, error=str(e))
+                continue
+            if value is not None:
+                gauges[name] = value
+        return {
+            "counters": {k: v for k, v in counters.items() if v},
+            "latency_ms": {k: v for k, v in histograms.items() if v},
+            "gauges": gauges,
+            "_marks": {
+                "counters": {name: c.total for name, c in list(self._counters.items())},
+                "histograms": {name: h.interval() for name, h in list(self._histograms.items())},
+            },
+        }
+
+    @staticmethod
+    def payload(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """The part of a snapshot that goes on the wire."""
+        return {k: v for k, v in snapshot.items() if not k.startswith("_") and v}
+
+    def commit(self, snapshot: Dict[str, Any]) -> None:
+        """Mark a snapshot as delivered; the next one starts after it."""
+        marks = snapshot.get("_marks", {})
+        for name, total in marks.get("counters", {}).items():
+            self._counters[name].commit(total)
+        for name, (counts, total) in marks.get("histograms", {}).items():
+            self._histograms[name].commit(counts, total)
+
+
+_telemetry: Optional[Telemetry] = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry() -> Telemetry:
+    """Return the process-wide registry, creating it (with process gauges) on first call."""
+    global _telemetry
+    if _telemetry is None:
+        with _telemetry_lock:
+            if _telemetry is None:
+                telemetry = Telemetry()
+                telemetry.gauge("cpu_percent", _ProcessCpu())
+                telemetry.gauge("load_1m", _load_1m)
+                telemetry.gauge("rss_mb", _rss_mb)
+                telemetry.gauge("threads", threading.active_count)
+                _telemetry = telemetry
+    return _telemetry
+
+
+def reset_telemetry() -> None:
+    """Drop the singleton (test hook). Production code should not call this."""
+    global _telemetry
+    _telemetry = None
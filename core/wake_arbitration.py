@@ -0,0 +1,331 @@
+"""Household wake-word arbitration.
+
+When several nodes in one household hear the same "Hey Jarvis", only one
+of them should answer. On wake each node publishes a *claim* — its wake
+score and speech energy — to the household topic on the existing MQTT
+connection, then waits a short window for its peers' claims. Every node
+ranks the same claims the same way, so exactly one proceeds and the rest
+go straight back to wake detection.
+
+Ranking: highest wake score, then highest RMS (closest/loudest), then
+node id as a stable tie-break.
+
+Timing is based on *local receive time*, never on peer clocks, so NTP
+skew between nodes doesn't matter. The winner re-publishes its claim
+marked ``won`` once it commits; that decision is final. A node whose
+wake lands just after a peer's window closed (the peer can no longer see
+it) yields to that announcement — or, if the announcement was lost, to
+a claim whose window closed just before its own wake.
+
+The window ends early when:
+  - a better claim or a ``won`` announcement arrives (we lost), or
+  - every peer seen recently has claimed, all within the first half of
+    our window so they were still listening when our claim reached
+    them (we won).
+
+Without a transport (MQTT not connected, no household configured) the
+arbiter always wins immediately, so a single node pays no latency.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from jarvis_log_client import JarvisLogger
+
+from utils.config_service import Config
+
+logger = JarvisLogger(service="jarvis-node")
+
+DEFAULT_WINDOW_MS = 150.0
+
+# Claims older than this are forgotten; long enough to cover one wake
+# phrase heard late by a far-away node.
+CLAIM_HORIZON_SECONDS = 2.0
+# How long a peer counts as present for the early-win check.
+PEER_PRESENCE_SECONDS = 3600.0
+
+_DELAY_SAMPLES = 256
+
+Publisher = Callable[[str, bytes], None]
+
+
+@dataclass(frozen=True)
+class WakeClaim:
+    """One node's bid for a wake event."""
+    wake_id: str
+    node_id: str
+    score: float
+    rms: int
+    timestamp: float            # sender's time.time(), informational only
+    won: bool = False           # True on the winner's final announcement
+
+    def rank(self) -> Tuple[float, int, str]:
+        return (self.score, self.rms, self.node_id)
+
+    def to_payload(self) -> bytes:
+        return json.dumps(asdict(self)).encode()
+
+    @classmethod
+    def from_payload(cls, payload: bytes) -> "WakeClaim":
+        data = json.loads(payload.decode() if isinstance(payload, (bytes, bytearray)) else payload)
+        return cls(
+            wake_id=str(data["wake_id"]),
+            node_id=str(data["node_id"]),
+            score=float(data["score"]),
+            rms=int(data.get("rms", 0)),
+            timestamp=float(data.get("timestamp", 0.0)),
+            won=bool(data.get("won", False)),
+        )
+
+
+@dataclass(frozen=True)
+class ArbitrationResult:
+    won: bool
+    claim: WakeClaim
+    winner: WakeClaim
+    rivals: int                 # peer claims considered in this round
+    delay_ms: float
+    reason: str                 # solo | best | all_peers | outscored | announced | settled
+
+
+def wake_topic(household_id: str) -> str:
+    return f"jarvis/households/{household_id}/wake"
+
+
+class WakeArbiter:
+    """Publish wake claims and decide whether this node should answer.
+
+    ``arbitrate()`` blocks the caller (the voice listener) for at most the
+    window; ``receive()`` is called from the MQTT thread with raw payloads.
+    """
+
+    def __init__(
+        self,
+        node_id: str,
+        household_id: str,
+        *,
+        window_ms: float = DEFAULT_WINDOW_MS,
+        claim_horizon: float = CLAIM_HORIZON_SECONDS,
+        publisher: Optional[Publisher] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.node_id = node_id
+        self.household_id = household_id
+        self.topic = wake_topic(household_id)
+        self.window = max(0.0, window_ms) / 1000.0
+        self.claim_horizon = max(claim_horizon, 2 * self.window)
+        self._publisher = publisher
+        self._clock = clock
+
+        self._cond = threading.Condition()
+        self._claims: Deque[Tuple[float, WakeClaim]] = deque()   # (received_at, claim)
+        self._peers: Dict[str, float] = {}                        # node_id -> last seen
+
+        self._arbitrations = 0
+        self._wins = 0
+        self._suppressed = 0
+        self._solo = 0
+        self._early = 0
+        self._peer_claims = 0
+        self._bad_payloads = 0
+        self._delays: Deque[float] = deque(maxlen=_DELAY_SAMPLES)
+
+    # ── Transport ──────────────────────────────────────────────────────
+
+    def attach(self, publisher: Optional[Publisher]) -> None:
+        """Set (or clear, with None) the function used to publish claims."""
+        self._publisher = publisher
+
+    @property
+    def attached(self) -> bool:
+        return self._publisher is not None
+
+    def receive(self, payload: bytes) -> None:
+        """Record a claim published on the household topic."""
+        try:
+            claim = WakeClaim.from_payload(payload)
+        except (ValueError, KeyError, TypeError) as e:
+            self._bad_payloads += 1
+            logger.debug("Ignoring malformed wake claim", error=str(e))
+            return
+        if claim.node_id == self.node_id:
+            return  # our own publish echoed back by the broker
+        now = self._clock()
+        with self._cond:
+            self._claims.append((now, claim))
+            self._peers[claim.node_id] = now
+            self._peer_claims += 1
+            self._cond.notify_all()
+
+    # ── Arbitration ────────────────────────────────────────────────────
+
+    def arbitrate(self, score: float, rms: int) -> ArbitrationResult:
+        """Claim the current wake; return whether this node should proceed."""
+        started = self._clock()
+        claim = WakeClaim(
+            wake_id=uuid.uuid4().hex[:12],
+            node_id=self.node_id,
+            score=round(float(score), 4),
+            rms=int(rms),
+            timestamp=time.time(),
+        )
+        publisher = self._publisher
+        if publisher is None or self.window <= 0:
+            return self._finish(claim, claim, [], started, "solo")
+
+        try:
+            publisher(self.topic, claim.to_payload())
+        except Exception as e:
+            logger.warning("Wake claim publish failed, proceeding alone", error=str(e))
+            return self._finish(claim, claim, [], started, "solo")
+
+        deadline = started + self.window
+        with self._cond:
+            self._prune(started)
+            # A peer that already committed (or, if its announcement got
+            # lost, one whose window closed just before our wake).
+            settled = [
+                c for t, c in self._claims
+                if t < started - self.window and (c.won or t >= started - 2 * self.window)
+            ]
+            if settled:
+                winner = max(settled, key=lambda c: (c.won, c.rank()))
+                return self._finish(claim, winner, settled, started, "settled")
+
+            while True:
+                recent = [(t, c) for t, c in self._claims if t >= started - self.window]
+                announced = [c for _, c in recent if c.won]
+                if announced:
+                    return self._finish(claim, announced[0], announced, started, "announced")
+                rivals = [c for _, c in recent]
+                better = [c for c in rivals if c.rank() > claim.rank()]
+                if better:
+                    return self._finish(claim, max(better, key=WakeClaim.rank), rivals, started, "outscored")
+                expected = self._present_peers(started)
+                if (expected and expected <= {c.node_id for c in rivals}
+                        and all(t >= started - self.window / 2 for t, _ in recent)):
+                    return self._finish(claim, claim, rivals, started, "all_peers")
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    return self._finish(claim, claim, rivals, started, "best")
+                self._cond.wait(timeout=remaining)
+
+    def _present_peers(self, now: float) -> Set[str]:
+        return {node for node, seen in self._peers.items() if now - seen <= PEER_PRESENCE_SECONDS}
+
+    def _prune(self, now: float) -> None:
+        while self._claims and now - self._claims[0][0] > self.claim_horizon:
+            self._claims.popleft()
+
+    def _finish(
+        self,
+        claim: WakeClaim,
+        winner: WakeClaim,
+        rivals: List[WakeClaim],
+        started: float,
+        reason: str,
+    ) -> ArbitrationResult:
+        delay_ms = (self._clock() - started) * 1000.0
+        won = winner is claim
+        if won and reason != "solo":
+            self._announce(claim)
+        self._arbitrations += 1
+        if reason == "solo":
+            self._solo += 1
+        else:
+            self._delays.append(delay_ms)
+            if reason in ("outscored", "announced", "all_peers"):
+                self._early += 1
+        if won:
+            self._wins += 1
+        else:
+            self._suppressed += 1
+        result = ArbitrationResult(
+            won=won, claim=claim, winner=winner, rivals=len(rivals),
+            delay_ms=round(delay_ms, 2), reason=reason,
+        )
+        logger.info(
+            "Wake arbitration",
+            won=won, reason=reason, score=claim.score, rms=claim.rms,
+            winner=winner.node_id, rivals=len(rivals), delay_ms=result.delay_ms,
+        )
+        return result
+
+    def _announce(self, claim: WakeClaim) -> None:
+        publisher = self._publisher
+        if publisher is None:
+            return
+        try:
+            publisher(self.topic, replace(claim, won=True).to_payload())
+        except Exception as e:
+            logger.debug("Wake win announcement failed", error=str(e))
+
+    # ── Diagnostics ────────────────────────────────────────────────────
+
+    def stats(self) -> Dict[str, Any]:
+        delays = sorted(self._delays)
+        contested = self._arbitrations - self._solo
+        return {
+            "household_id": self.household_id,
+            "window_ms": round(self.window * 1000.0, 1),
+            "attached": self.attached,
+            "arbitrations": self._arbitrations,
+            "wins": self._wins,
+            "suppressed": self._suppressed,
+            "solo": self._solo,
+            "early_decisions": self._early,
+            "suppression_rate": round(self._suppressed / contested, 3) if contested else 0.0,
+            "peer_claims": self._peer_claims,
+            "bad_payloads": self._bad_payloads,
+            "peers": len(self._peers),
+            "delay_ms_mean": round(sum(delays) / len(delays), 2) if delays else None,
+            "delay_ms_p95": round(delays[int(0.95 * (len(delays) - 1))], 2) if delays else None,
+        }
+
+
+_arbiter: Optional[WakeArbiter] = None
+_arbiter_lock = threading.Lock()
+
+
+def get_wake_arbiter() -> Optional[WakeArbiter]:
+    """Return the process-wide arbiter, or None when arbitration is off.
+
+    Needs ``household_id`` and ``node_id`` in config; disable with
+    ``wake_arbitration_enabled: false``.
+    """
+    global _arbiter
+    if _arbiter is not None:
+        return _arbiter
+    if not Config.get_bool("wake_arbitration_enabled", True):
+        return None
+    household_id = Config.get_str("household_id", "") or ""
+    node_id = Config.get_str("node_id", "") or ""
+    if not household_id or not node_id:
+        return None
+    with _arbiter_lock:
+        if _arbiter is None:
+            _arbiter = WakeArbiter(
+                node_id,
+                household_id,
+                window_ms=Config.get_float("wake_arbitration_window_ms", DEFAULT_WINDOW_MS),
+            )
+        return _arbiter
+
+
+def get_wake_arbiter_stats() -> Optional[Dict[str, Any]]:
+    """Arbitration stats for the heartbeat, or None if no arbiter exists."""
+    return _arbiter.stats() if _arbiter is not None else None
+
+
+def reset_wake_arbiter() -> None:
+    """Drop the singleton (tests)."""
+    global _arbiter
+    with _arbiter_lock:
+        _arbiter = None
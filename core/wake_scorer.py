@@ -0,0 +1,228 @@
+"""Shared wake-word scoring worker.
+
+One thread subscribes to the ``AudioBus``, resamples each 80 ms mic
+frame to 16 kHz and runs openWakeWord exactly once per frame. The result
+is published as a ``WakeScores`` event to every subscriber — the wake
+loop, the barge-in monitor and any diagnostics — so none of them owns
+inference or touches the model directly.
+
+Consequences:
+  - No duplicate inference while barge-in and wake detection overlap.
+  - The model is only ever used from the scorer thread, so there are no
+    cross-thread ``predict()``/``reset()`` races. Consumers call
+    ``request_reset()`` and ignore events from before the reset by
+    comparing ``WakeScores.epoch``.
+  - A model loaded with several wake words scores them all in one call
+    (openWakeWord shares the melspectrogram/embedding front-end).
+  - With no subscribers the scorer drains the bus without running the
+    model, and resets before scoring again (the gap makes old context
+    meaningless).
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+from scipy.signal import resample_poly
+from jarvis_log_client import JarvisLogger
+
+from core.audio_bus import AudioBus
+from core.execution_policy import apply_thread_role
+
+logger = JarvisLogger(service="jarvis-node")
+
+OWW_RATE = 16000
+
+
+@dataclass(frozen=True)
+class WakeScores:
+    """Scores for one 80 ms frame."""
+    frame_cursor: int              # monotonically increasing frame index
+    scores: Dict[str, float]       # wake model name -> score
+    rms: int                       # RMS of the raw (pre-resample) frame
+    epoch: int                     # reset generation the scores belong to
+    timestamp: float               # time.monotonic() when the frame was scored
+
+
+class WakeScorer:
+    """Single owner of the openWakeWord model; fans scores out to consumers.
+
+    Usage::
+
+        scorer = WakeScorer(bus, OWWModel(...))
+        scorer.start()
+        q = scorer.subscribe("wake")
+        epoch = scorer.request_reset()
+        while True:
+            event = q.get()
+            if event.epoch < epoch:
+                continue   # scored before our reset
+            if event.scores["hey_jarvis"] > 0.4:
+                ...
+    """
+
+    def __init__(
+        self,
+        bus: AudioBus,
+        oww_model,
+        *,
+        subscriber_name: str = "wake_scorer",
+    ):
+        self._bus = bus
+        self._oww = oww_model
+        self._subscriber_name = subscriber_name
+        self._resample_ratio = bus.rate // OWW_RATE if bus.rate != OWW_RATE else 1
+
+        self._subscribers: Dict[str, "queue.Queue[WakeScores]"] = {}
+        self._subs_lock = threading.Lock()
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._frame_cursor = 0
+        # Requested vs applied reset generation. Bumping the requested
+        # epoch is all a consumer does; the scorer thread applies it
+        # before its next predict().
+        self._requested_epoch = 0
+        self._applied_epoch = 0
+        self._epoch_lock = threading.Lock()
+
+        self._frames_scored = 0
+        self._inference_ms_total = 0.0
+
+    # ── Lifecycle ────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Subscribe to the bus and start the scoring thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        q = self._bus.subscribe(self._subscriber_name)
+        self._thread = threading.Thread(
+            target=self._run, args=(q,), daemon=True, name="WakeScorer"
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    # ── Consumers ────────────────────────────────────────────────────
+
+    def subscribe(self, name: str, *, maxsize: int = 64) -> "queue.Queue[WakeScores]":
+        """Register a consumer and return its event queue."""
+        q: queue.Queue[WakeScores] = queue.Queue(maxsize=maxsize)
+        with self._subs_lock:
+            if name in self._subscribers:
+                raise ValueError(f"WakeScorer subscriber {name!r} already registered")
+            self._subscribers[name] = q
+        return q
+
+    def unsubscribe(self, name: str) -> None:
+        """Remove a consumer. No-op if name isn't registered."""
+        with self._subs_lock:
+            self._subscribers.pop(name, None)
+
+    def subscribers(self) -> list[str]:
+        with self._subs_lock:
+            return list(self._subscribers.keys())
+
+    def request_reset(self) -> int:
+        """Ask the scorer to reset model state before the next frame.
+
+        Returns the epoch that post-reset events will carry; events with
+        a lower ``epoch`` were scored against the old state.
+        """
+        with self._epoch_lock:
+            self._requested_epoch += 1
+            return self._requested_epoch
+
+    @property
+    def frame_cursor(self) -> int:
+        return self._frame_cursor
+
+    @property
+    def frame_seconds(self) -> float:
+        """Duration of one scored frame (80 ms for the production bus)."""
+        return self._bus.chunk_samples / self._bus.rate
+
+    def stats(self) -> Dict[str, float]:
+        scored = self._frames_scored
+        return {
+            "frames_seen": self._frame_cursor,
+            "frames_scored": scored,
+            "avg_inference_ms": round(self._inference_ms_total / scored, 3) if scored else 0.0,
+            "subscribers": len(self.subscribers()),
+        }
+
+    # ── Worker ───────────────────────────────────────────────────────
+
+    def _run(self, q: "queue.Queue[bytes]") -> None:
+        apply_thread_role("wake")
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    raw_data = q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                self._frame_cursor += 1
+
+                with self._subs_lock:
+                    subs = list(self._subscribers.items())
+                if not subs:
+                    if self._applied_epoch == self._requested_epoch:
+                        self.request_reset()
+                    continue
+
+                try:
+                    event = self._score(raw_data)
+                except Exception as e:
+                    # One bad frame must not take wake detection down
+                    logger.warning("Wake scoring failed for frame", error=str(e))
+                    continue
+
+                for name, sub_q in subs:
+                    try:
+                        sub_q.put_nowait(event)
+                    except queue.Full:
+                        try:
+                            sub_q.get_nowait()
+                            sub_q.put_nowait(event)
+                        except (queue.Empty, queue.Full):
+                            pass
+                        logger.debug("WakeScorer subscriber slow, dropped event", name=name)
+        finally:
+            self._bus.unsubscribe(self._subscriber_name)
+            logger.info("Wake scorer stopped", **self.stats())
+
+    def _score(self, raw_data: bytes) -> WakeScores:
+        requested = self._requested_epoch
+        if requested != self._applied_epoch:
+            self._oww.reset()
+            self._applied_epoch = requested
+
+        samples = np.frombuffer(raw_data, dtype=np.int16)
+        rms = int(np.sqrt(np.mean(samples.astype(np.float64) ** 2))) if samples.size else 0
+        if self._resample_ratio > 1:
+            resampled = resample_poly(samples, up=1, down=self._resample_ratio)
+            samples = np.clip(resampled, -32768, 32767).astype(np.int16)
+
+        start = time.perf_counter()
+        predictions = self._oww.predict(samples)
+        self._inference_ms_total += (time.perf_counter() - start) * 1000
+        self._frames_scored += 1
+
+        return WakeScores(
+            frame_cursor=self._frame_cursor,
+            scores={name: float(score) for name, score in predictions.items()},
+            rms=rms,
+            epoch=self._applied_epoch,
+            timestamp=time.monotonic(),
+        )
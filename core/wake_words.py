@@ -0,0 +1,134 @@
+"""Multiple wake words with per-model thresholds and debounce.
+
+openWakeWord scores every loaded wake model in one ``predict()`` call —
+the melspectrogram and embedding front-end run once per frame and only
+the small per-word classifier heads are repeated — so several wake words
+(per person, per room, a "stop" hotword) cost little more than one.
+
+Config (``wake_words``) is a comma-separated list of
+``model[:threshold[:debounce_seconds]]`` entries, e.g.::
+
+    "wake_words": "hey_jarvis:0.4, alexa:0.6:2.0"
+
+Without it the single ``wake_word_model`` / ``wake_word_threshold`` pair
+is used, so existing configs behave exactly as before.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from jarvis_log_client import JarvisLogger
+
+from core.wake_scorer import WakeScores
+from utils.config_service import Config
+
+logger = JarvisLogger(service="jarvis-node")
+
+DEFAULT_WAKE_WORD_MODEL = "hey_jarvis"
+DEFAULT_THRESHOLD = 0.4
+DEFAULT_DEBOUNCE_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class WakeWordSpec:
+    model: str
+    threshold: float = DEFAULT_THRESHOLD
+    debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS
+
+    @property
+    def display_name(self) -> str:
+        return self.model.replace("_", " ")
+
+
+@dataclass(frozen=True)
+class WakeEvent:
+    """A wake detection: which model fired, and on which frame."""
+    model: str
+    score: float
+    threshold: float
+    frame_cursor: int
+    timestamp: float
+
+
+def parse_wake_words(raw: str, default_threshold: float = DEFAULT_THRESHOLD) -> List[WakeWordSpec]:
+    """Parse ``model[:threshold[:debounce]]`` entries; malformed entries are skipped."""
+    specs: List[WakeWordSpec] = []
+    seen: set[str] = set()
+    for entry in raw.split(","):
+        parts = [p.strip() for p in entry.split(":")]
+        if not parts[0]:
+            continue
+        model = parts[0]
+        try:
+            threshold = float(parts[1]) if len(parts) > 1 and parts[1] else default_threshold
+            debounce = float(parts[2]) if len(parts) > 2 and parts[2] else DEFAULT_DEBOUNCE_SECONDS
+        except ValueError:
+            logger.warning("Invalid wake word entry, skipping", entry=entry.strip())
+            continue
+        if model in seen:
+            logger.warning("Duplicate wake word entry, skipping", model=model)
+            continue
+        seen.add(model)
+        specs.append(WakeWordSpec(model=model, threshold=threshold, debounce_seconds=debounce))
+    return specs
+
+
+def load_wake_word_specs() -> List[WakeWordSpec]:
+    """Wake words from config (``wake_words``), else the single legacy model."""
+    default_threshold = Config.get_float("wake_word_threshold", DEFAULT_THRESHOLD)
+    specs = parse_wake_words(Config.get_str("wake_words", "") or "", default_threshold)
+    if specs:
+        return specs
+    model = Config.get_str("wake_word_model", DEFAULT_WAKE_WORD_MODEL) or DEFAULT_WAKE_WORD_MODEL
+    return [WakeWordSpec(model=model, threshold=default_threshold)]
+
+
+class WakeWordDetector:
+    """Turn per-frame scores into wake events.
+
+    A model fires when its score exceeds its own threshold and it hasn't
+    fired within its debounce window. When several cross on the same
+    frame, the one furthest above its threshold wins.
+    """
+
+    def __init__(self, specs: List[WakeWordSpec]):
+        if not specs:
+            raise ValueError("At least one wake word is required")
+        self.specs = list(specs)
+        self._last_fired: Dict[str, float] = {}
+
+    @property
+    def models(self) -> List[str]:
+        return [spec.model for spec in self.specs]
+
+    def check(self, event: WakeScores) -> Optional[WakeEvent]:
+        best: Optional[WakeWordSpec] = None
+        best_margin = 0.0
+        for spec in self.specs:
+            score = event.scores.get(spec.model, 0.0)
+            margin = score - spec.threshold
+            if margin <= 0:
+                continue
+            last = self._last_fired.get(spec.model)
+            if last is not None and event.timestamp - last < spec.debounce_seconds:
+                continue
+            if best is None or margin > best_margin:
+                best, best_margin = spec, margin
+
+        if best is None:
+            return None
+
+        self._last_fired[best.model] = event.timestamp
+        return WakeEvent(
+            model=best.model,
+            score=event.scores[best.model],
+            threshold=best.threshold,
+            frame_cursor=event.frame_cursor,
+            timestamp=event.timestamp,
+        )
+
+    def max_score(self, event: WakeScores) -> float:
+        """Highest score across configured models (for diagnostics)."""
+        return max((event.scores.get(m, 0.0) for m in self.models), default=0.0)
@@ -422,6 +422,82 @@ class NestProtocol(IJarvisDeviceProtocol):
         except Exception as e:
             return DeviceControlResult(success=False, entity_id=entity_id, action=action, error=f"Control failed: {e}")
 
+    def _parse_state(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Build a state dict from an SDM device resource."""
+        traits: dict[str, Any] = data.get("traits", {})
+        device_type: str = data.get("type", "")
+        state: dict[str, Any] = {}
+        temp_unit: str = self._get_temp_unit()
+
+        # Thermostat traits
+        mode_trait: dict[str, Any] = traits.get(
+            "sdm.devices.traits.ThermostatMode", {}
+        )
+        if mode_trait:
+            current_mode: str = mode_trait.get("mode", "OFF")
+            state["state"] = "off" if current_mode == "OFF" else "on"
+            state["mode"] = current_mode
+            available_modes: list[str] = mode_trait.get("availableModes", [])
+            state["available_modes"] = available_modes
+
+        temp_trait: dict[str, Any] = traits.get(
+            "sdm.devices.traits.Temperature", {}
+        )
+        if temp_trait:
+            ambient_c: float = temp_trait.get("ambientTemperatureCelsius", 0)
+            if temp_unit == "F":
+                state["temperature"] = round(_c_to_f(ambient_c), 1)
+                state["temperature_unit"] = "F"
+            else:
+                state["temperature"] = round(ambient_c, 1)
+                state["temperature_unit"] = "C"
+
+        setpoint_trait: dict[str, Any] = traits.get(
+            "sdm.devices.traits.ThermostatTemperatureSetpoint", {}
+        )
+        if setpoint_trait:
+            if "heatCelsius" in setpoint_trait:
+                heat_c: float = setpoint_trait["heatCelsius"]
+                if temp_unit == "F":
+                    state["heat_setpoint"] = round(_c_to_f(heat_c), 1)
+                else:
+                    state["heat_setpoint"] = round(heat_c, 1)
+            if "coolCelsius" in setpoint_trait:
+                cool_c: float = setpoint_trait["coolCelsius"]
+                if temp_unit == "F":
+                    state["cool_setpoint"] = round(_c_to_f(cool_c), 1)
+                else:
+                    state["cool_setpoint"] = round(cool_c, 1)
+
+        humidity_trait: dict[str, Any] = traits.get(
+            "sdm.devices.traits.Humidity", {}
+        )
+        if humidity_trait:
+            state["humidity"] = humidity_trait.get("ambientHumidityPercent")
+
+        hvac_trait: dict[str, Any] = traits.get(
+            "sdm.devices.traits.ThermostatHvac", {}
+        )
+        if hvac_trait:
+            state["hvac_status"] = hvac_trait.get("status", "OFF")
+
+        # Camera traits
+        connectivity_trait: dict[str, Any] = traits.get(
+            "sdm.devices.traits.CameraLiveStream", {}
+        )
+        if connectivity_trait:
+            state["has_stream"] = True
+
+        cam_connectivity: dict[str, Any] = traits.get(
+            "sdm.devices.traits.Connectivity", {}
+        )
+        if cam_connectivity:
+            status_val: str = cam_connectivity.get("status", "OFFLINE")
+            state["state"] = "on" if status_val == "ONLINE" else "off"
+            state["connectivity"] = status_val
+
+        return state
+
     async def get_state(self, ip: str, **kwargs: Any) -> dict[str, Any] | None:
         cloud_id: str = kwargs.get("cloud_id", "")
         access_token: str | None = self._get_access_token()
@@ -451,80 +527,56 @@ class NestProtocol(IJarvisDeviceProtocol):
                 if resp.status_code != 200:
                     return {"error": f"Nest API returned {resp.status_code}"}
 
-                data: dict[str, Any] = resp.json()
-                traits: dict[str, Any] = data.get("traits", {})
-                device_type: str = data.get("type", "")
-                state: dict[str, Any] = {}
-                temp_unit: str = self._get_temp_unit()
-
-                # Thermostat traits
-                mode_trait: dict[str, Any] = traits.get(
-                    "sdm.devices.traits.ThermostatMode", {}
-                )
-                if mode_trait:
-                    current_mode: str = mode_trait.get("mode", "OFF")
-                    state["state"] = "off" if current_mode == "OFF" else "on"
-                    state["mode"] = current_mode
-                    available_modes: list[str] = mode_trait.get("availableModes", [])
-                    state["available_modes"] = available_modes
-
-                temp_trait: dict[str, Any] = traits.get(
-                    "sdm.devices.traits.Temperature", {}
-                )
-                if temp_trait:
-                    ambient_c: float = temp_trait.get("ambientTemperatureCelsius", 0)
-                    if temp_unit == "F":
-                        state["temperature"] = round(_c_to_f(ambient_c), 1)
-                        state["temperature_unit"] = "F"
-                    else:
-                        state["temperature"] = round(ambient_c, 1)
-                        state["temperature_unit"] = "C"
-
-                setpoint_trait: dict[str, Any] = traits.get(
-                    "sdm.devices.traits.ThermostatTemperatureSetpoint", {}
-                )
-                if setpoint_trait:
-                    if "heatCelsius" in setpoint_trait:
-                        heat_c: float = setpoint_trait["heatCelsius"]
-                        if temp_unit == "F":
-                            state["heat_setpoint"] = round(_c_to_f(heat_c), 1)
-                        else:
-                            state["heat_setpoint"] = round(heat_c, 1)
-                    if "coolCelsius" in setpoint_trait:
-                        cool_c: float = setpoint_trait["coolCelsius"]
-                        if temp_unit == "F":
-                            state["cool_setpoint"] = round(_c_to_f(cool_c), 1)
-                        else:
-                            state["cool_setpoint"] = round(cool_c, 1)
-
-                humidity_trait: dict[str, Any] = traits.get(
-                    "sdm.devices.traits.Humidity", {}
-                )
-                if humidity_trait:
-                    state["humidity"] = humidity_trait.get("ambientHumidityPercent")
+                return self._parse_state(resp.json())
 
-                hvac_trait: dict[str, Any] = traits.get(
-                    "sdm.devices.traits.ThermostatHvac", {}
-                )
-                if hvac_trait:
-                    state["hvac_status"] = hvac_trait.get("status", "OFF")
+        except Exception as e:
+            return {"error": f"Failed to get state: {e}"}
 
-                # Camera traits
-                connectivity_trait: dict[str, Any] = traits.get(
-                    "sdm.devices.traits.CameraLiveStream", {}
-                )
-                if connectivity_trait:
-                    state["has_stream"] = True
+    async def get_states(self, requests: list[dict[str, Any]]) -> dict[str, dict[str, Any] | None]:
+        """Batch state query: one SDM ``devices`` list call for several devices.
 
-                cam_connectivity: dict[str, Any] = traits.get(
-                    "sdm.devices.traits.Connectivity", {}
-                )
-                if cam_connectivity:
-                    status_val: str = cam_connectivity.get("status", "OFFLINE")
-                    state["state"] = "on" if status_val == "ONLINE" else "off"
-                    state["connectivity"] = status_val
+        Each request carries ``entity_id`` and ``cloud_id``. Returns
+        entity_id -> state; entities missing from the list map to None.
+        """
+        project_id: str | None = self._get_project_id()
+        access_token: str | None = self._get_access_token()
+        if not access_token:
+            return {r["entity_id"]: {"error": "NEST_ACCESS_TOKEN not configured"} for r in requests}
+        if not project_id:
+            return {r["entity_id"]: {"error": "NEST_PROJECT_ID not configured"} for r in requests}
 
-                return state
+        try:
+            import httpx
+        except ImportError:
+            return {r["entity_id"]: {"error": "httpx is not installed"} for r in requests}
 
+        headers: dict[str, str] = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+        }
+
+        try:
+            async with httpx.AsyncClient(timeout=10) as client:
+                resp = await client.get(
+                    f"{SDM_API_BASE}/enterprises/{project_id}/devices",
+                    headers=headers,
+                )
+                if resp.status_code == 401:
+                    error: dict[str, Any] = {"error": "Nest access token expired — re-authenticate"}
+                    return {r["entity_id"]: error for r in requests}
+                if resp.status_code != 200:
+                    error = {"error": f"Nest API returned {resp.status_code}"}
+                    return {r["entity_id"]: error for r in requests}
+
+                by_cloud_id: dict[str, dict[str, Any]] = {
+                    dev.get("name", ""): dev for dev in resp.json().get("devices", [])
+                }
         except Exception as e:
-            return {"error": f"Failed to get state: {e}"}
+            error = {"error": f"Failed to get state: {e}"}
+            return {r["entity_id"]: error for r in requests}
+
+        states: dict[str, dict[str, Any] | None] = {}
+        for r in requests:
+            dev = by_cloud_id.get(r.get("cloud_id") or "")
+            states[r["entity_id"]] = self._parse_state(dev) if dev else None
+        return states
@@ -33,6 +33,15 @@ class ChunkedCommandResponse(BaseModel):
         from_attributes = True
 
 
+class ChunkedContentUpdate(BaseModel):
+    """Pydantic model for the result of an append or replace (no content copy)"""
+    session_id: str = Field(..., description="Session identifier of the updated response")
+    offset: int = Field(..., description="Position in the content where the written text starts")
+    length: int = Field(..., description="Length of the written text")
+    total_length: int = Field(..., description="Length of the full content after the update")
+    updated_at: datetime = Field(..., description="When the content was last updated")
+
+
 class CreateChunkedCommandResponse(BaseModel):
     """Pydantic model for creating new chunked responses"""
     command_name: str = Field(..., description="Name of the command that generated this response")
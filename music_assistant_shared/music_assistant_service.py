@@ -3,6 +3,11 @@ Music Assistant service wrapper.
 
 Async wrapper around the official music-assistant-client package.
 Provides methods for playing music, controlling playback, and managing players.
+
+When the node already holds a ``MusicAssistantSession`` for the same URL
+(see ``music_assistant_session``), ``connect()`` attaches to it instead of
+opening a new client: no extra socket, no ``fetch_state()``, and player
+lookups come from the session's push-updated index.
 """
 
 from enum import Enum
@@ -98,17 +103,21 @@ class MusicAssistantService:
         await service.disconnect()
     """
 
-    def __init__(self, url: str, token: Optional[str] = None):
+    def __init__(self, url: str, token: Optional[str] = None,
+                 session: Optional[Any] = None):
         """
         Initialize the service.
 
         Args:
             url: Music Assistant WebSocket URL (e.g., "ws://192.168.1.50:8095/ws")
             token: Authentication token (required for server schema >= 28)
+            session: Shared ``MusicAssistantSession`` to use (default: the
+                node's session for ``url``, if one is running)
         """
         self.url = url
         self.token = token
         self._client: Optional[Any] = None
+        self._session = session
         self._connected = False
 
     @property
@@ -124,6 +133,14 @@ class MusicAssistantService:
             ConnectionError: If connection fails
             AuthenticationRequired: If token is needed but not provided
         """
+        if self._session is None:
+            self._session = _node_session(self.url)
+        if self._session is not None:
+            if not await self._session.ready():
+                raise ConnectionError(f"Music Assistant session not connected: {self.url}")
+            self._connected = True
+            return
+
         if MusicAssistantClient is None:
             raise ImportError(
                 "music-assistant-client is not installed. "
@@ -137,7 +154,7 @@ class MusicAssistantService:
         self._connected = True
 
     async def disconnect(self) -> None:
-        """Close connection to Music Assistant."""
+        """Close connection to Music Assistant (a shared session stays open)."""
         if self._client:
             await self._client.disconnect()
         self._connected = False
@@ -151,6 +168,8 @@ class MusicAssistantService:
         Returns:
             List of player dicts with id, name, and state
         """
+        if self._session is not None:
+            return [_player_summary(p) for p in self._session.players.all()]
         if not self._client:
             return []
 
@@ -175,6 +194,10 @@ class MusicAssistantService:
         Returns:
             Player dict if found, None otherwise
         """
+        if self._session is not None:
+            player = self._session.find_player(name)
+            return _player_summary(player) if player else None
+
         # Try built-in get_by_name first if available
         if self._client and hasattr(self._client.players, 'get_by_name'):
             try:
@@ -200,27 +223,37 @@ class MusicAssistantService:
 
     async def pause(self, queue_id: str) -> None:
         """Pause playback on a queue."""
-        if self._client:
+        if self._session is not None:
+            await self._session.pause(queue_id)
+        elif self._client:
             await self._client.player_queues.pause(queue_id)
 
     async def resume(self, queue_id: str) -> None:
         """Resume playback on a queue."""
-        if self._client:
+        if self._session is not None:
+            await self._session.resume(queue_id)
+        elif self._client:
             await self._client.player_queues.resume(queue_id)
 
     async def stop(self, queue_id: str) -> None:
         """Stop playback on a queue."""
-        if self._client:
+        if self._session is not None:
+            await self._session.stop_playback(queue_id)
+        elif self._client:
             await self._client.player_queues.stop(queue_id)
 
     async def next_track(self, queue_id: str) -> None:
         """Skip to next track in queue."""
-        if self._client:
+        if self._session is not None:
+            await self._session.next_track(queue_id)
+        elif self._client:
             await self._client.player_queues.next(queue_id)
 
     async def previous_track(self, queue_id: str) -> None:
         """Go to previous track in queue."""
-        if self._client:
+        if self._session is not None:
+            await self._session.previous_track(queue_id)
+        elif self._client:
             await self._client.player_queues.previous(queue_id)
 
     # --- Volume Controls ---
@@ -233,24 +266,32 @@ class MusicAssistantService:
             player_id: Player to control
             level: Volume level 0-100
         """
-        if self._client:
+        if self._session is not None:
+            await self._session.set_volume(player_id, level)
+        elif self._client:
             await self._client.players.volume_set(player_id, level)
 
     async def volume_up(self, player_id: str) -> None:
         """Increase volume."""
-        if self._client:
+        if self._session is not None:
+            await self._session.volume_up(player_id)
+        elif self._client:
             await self._client.players.volume_up(player_id)
 
     async def volume_down(self, player_id: str) -> None:
         """Decrease volume."""
-        if self._client:
+        if self._session is not None:
+            await self._session.volume_down(player_id)
+        elif self._client:
             await self._client.players.volume_down(player_id)
 
     # --- Shuffle and Repeat ---
 
     async def set_shuffle(self, queue_id: str, enabled: bool) -> None:
         """Enable or disable shuffle."""
-        if self._client:
+        if self._session is not None:
+            await self._session.set_shuffle(queue_id, enabled)
+        elif self._client:
             await self._client.player_queues.shuffle(queue_id, enabled)
 
     async def set_repeat(self, queue_id: str, mode: RepeatMode) -> None:
@@ -261,7 +302,9 @@ class MusicAssistantService:
             queue_id: Queue to control
             mode: RepeatMode.OFF, RepeatMode.ONE, or RepeatMode.ALL
         """
-        if self._client:
+        if self._session is not None:
+            await self._session.set_repeat(queue_id, _enum_value(mode))
+        elif self._client:
             await self._client.player_queues.repeat(queue_id, mode)
 
     # --- Search and Play ---
@@ -287,7 +330,7 @@ class MusicAssistantService:
         Returns:
             Dict with success status and played item info
         """
-        if not self._client:
+        if not self._client and self._session is None:
             return {"success": False, "error": "Not connected"}
 
         # Build media types to search - only use common types that most providers support
@@ -303,6 +346,20 @@ class MusicAssistantService:
                 MediaType.RADIO,
             ]
 
+        if self._session is not None:
+            # Shared session: cached search, results are plain dicts
+            results = await self._session.search(query, [_enum_value(t) for t in media_types], limit=10)
+            item = self._pick_best_result(results, media_type)
+            if not item:
+                return {"success": False, "error": f"No results for '{query}'"}
+            await self._session.play_media(
+                queue_id, item.get("uri") or item, option=_enum_value(queue_option), radio_mode=radio_mode
+            )
+            return {
+                "success": True,
+                "item": {"name": item.get("name"), "type": _enum_value(item.get("media_type"))}
+            }
+
         # Search
         results = await self._client.music.search(query, media_types, limit=10)
 
@@ -339,21 +396,46 @@ class MusicAssistantService:
         Returns:
             Best matching item, or None
         """
+        def items(kind: str) -> List[Any]:
+            # Client results are objects; shared-session results are dicts
+            if isinstance(results, dict):
+                return results.get(kind) or []
+            return getattr(results, kind, None) or []
+
         # Check for preferred type first
-        if preferred_type == MediaType.ARTIST and results.artists:
-            return results.artists[0]
-        if preferred_type == MediaType.ALBUM and results.albums:
-            return results.albums[0]
-        if preferred_type == MediaType.TRACK and results.tracks:
-            return results.tracks[0]
-        if preferred_type == MediaType.PLAYLIST and results.playlists:
-            return results.playlists[0]
-        if preferred_type == MediaType.RADIO and results.radio:
-            return results.radio[0]
+        preferred = {
+            MediaType.ARTIST: "artists",
+            MediaType.ALBUM: "albums",
+            MediaType.TRACK: "tracks",
+            MediaType.PLAYLIST: "playlists",
+            MediaType.RADIO: "radio",
+        }.get(preferred_type)
+        if preferred and items(preferred):
+            return items(preferred)[0]
 
         # No preference - return first available
-        for items in [results.tracks, results.artists, results.albums,
-                      results.playlists, results.radio]:
-            if items:
-                return items[0]
+        for kind in ["tracks", "artists", "albums", "playlists", "radio"]:
+            if items(kind):
+                return items(kind)[0]
+        return None
+
+
+def _node_session(url: str) -> Optional[Any]:
+    """The node's shared session for ``url``, when running inside a node."""
+    try:
+        from music_assistant_shared.music_assistant_session import find_music_assistant_session
+    except ImportError:
         return None
+    return find_music_assistant_session(url)
+
+
+def _enum_value(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def _player_summary(player: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": player["player_id"],
+        "name": player.get("display_name") or player.get("name", ""),
+        "state": _enum_value(player.get("state")) or "unknown",
+    }
@@ -0,0 +1,487 @@
+"""Long-lived Music Assistant connection owned by the node.
+
+Every music command used to open its own Music Assistant websocket,
+fetch the full player state and only then send the one command it came
+for; the legacy ``utils.music_assistant_service`` kept yet another
+socket on its own event loop. ``MusicAssistantSession`` replaces both
+with one connection on the node-wide ``AsyncRuntime``:
+
+  - **Auto-reconnect** — the connection task reconnects with exponential
+    backoff (``RECONNECT_MIN_SECONDS`` .. ``RECONNECT_MAX_SECONDS``);
+    commands in flight when the socket drops fail with
+    ``ConnectionError``.
+  - **Push-updated player index** — players and queues are fetched once
+    per connection, then kept current from ``player_*`` / ``queue_*``
+    events. ``PlayerIndex.find`` resolves exact, normalized and fuzzy
+    names from memory.
+  - **Pipelining** — commands are matched to replies by ``message_id``,
+    so concurrent callers share the socket without waiting on each
+    other.
+  - **Search cache** — ``music/search`` results are kept for
+    ``SEARCH_CACHE_TTL_SECONDS``.
+
+With the index in memory, "pause the music" is one round trip: resolve
+the player locally, send ``player_queues/pause``, await the reply.
+
+The async methods can be awaited from any event loop — calls from
+outside the runtime loop are forwarded to it. ``call()`` is the
+blocking bridge for synchronous callers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import difflib
+import itertools
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Coroutine, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+try:
+    import websockets
+except ImportError:
+    websockets = None  # type: ignore
+
+try:
+    from jarvis_log_client import JarvisLogger
+except ImportError:
+    import logging
+
+    class JarvisLogger:
+        def __init__(self, **kw): self._log = logging.getLogger(kw.get("service", __name__))
+        def info(self, msg, **kw): self._log.info(msg)
+        def warning(self, msg, **kw): self._log.warning(msg)
+        def error(self, msg, **kw): self._log.error(msg)
+        def debug(self, msg, **kw): self._log.debug(msg)
+
+from core.async_runtime import AsyncRuntime, get_async_runtime
+
+logger = JarvisLogger(service="jarvis-node")
+
+T = TypeVar("T")
+
+CONNECT_TIMEOUT_SECONDS = 10.0
+COMMAND_TIMEOUT_SECONDS = 10.0
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 30.0
+SEARCH_CACHE_TTL_SECONDS = 300.0
+SEARCH_CACHE_MAX_ENTRIES = 128
+# difflib ratio a spoken name must reach to match a player
+FUZZY_MATCH_CUTOFF = 0.75
+
+
+class MusicAssistantError(Exception):
+    """Music Assistant answered a command with an error."""
+
+    def __init__(self, error_code: Any, details: Optional[str] = None) -> None:
+        super().__init__(details or f"Music Assistant error {error_code}")
+        self.error_code = error_code
+
+
+def normalize_player_name(name: str) -> str:
+    """Lower-case, punctuation-free, without a leading "the" ("The Kitchen!" -> "kitchen")."""
+    normalized = re.sub(r"[^a-z0-9]+", " ", name.lower()).strip()
+    return normalized[4:] if normalized.startswith("the ") else normalized
+
+
+def _player_name(player: Dict[str, Any]) -> str:
+    return player.get("display_name") or player.get("name") or player.get("player_id", "")
+
+
+class PlayerIndex:
+    """Players by id, with exact, normalized and fuzzy name lookup."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._players: Dict[str, Dict[str, Any]] = {}
+        self._by_name: Dict[str, str] = {}
+        self._by_normalized: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def replace_all(self, players: Iterable[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._players = {p["player_id"]: p for p in players if p.get("player_id")}
+            self._reindex()
+
+    def upsert(self, player: Dict[str, Any]) -> None:
+        """Add a player or merge an update into the stored one."""
+        player_id = player.get("player_id")
+        if not player_id:
+            return
+        with self._lock:
+            self._players[player_id] = {**self._players.get(player_id, {}), **player}
+            self._reindex()
+
+    def remove(self, player_id: str) -> None:
+        with self._lock:
+            if self._players.pop(player_id, None) is not None:
+                self._reindex()
+
+    def get(self, player_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._players.get(player_id)
+
+    def all(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._players.values())
+
+    def find(self, name: str) -> Optional[Dict[str, Any]]:
+        """Resolve a (spoken) player name: exact, then normalized, then partial, then fuzzy."""
+        with self._lock:
+            player_id = self._by_name.get(name)
+            if player_id is None:
+                normalized = normalize_player_name(name)
+                player_id = self._by_normalized.get(normalized)
+                if player_id is None and normalized:
+                    partial = [key for key in self._by_normalized if normalized in key]
+                    if partial:
+                        player_id = self._by_normalized[min(partial, key=len)]
+                    else:
+                        close = difflib.get_close_matches(normalized, list(self._by_normalized), n=1,
+                                                          cutoff=FUZZY_MATCH_CUTOFF)
+                        player_id = self._by_normalized[close[0]] if close else None
+            return self._players.get(player_id) if player_id else None
+
+    def _reindex(self) -> None:
+        self._by_name = {_player_name(p): pid for pid, p in self._players.items()}
+        self._by_normalized = {normalize_player_name(name): pid for name, pid in self._by_name.items()}
+
+
+class MusicAssistantSession:
+    """One auto-reconnecting Music Assistant websocket shared by the node."""
+
+    def __init__(
+        self,
+        url: str,
+        token: Optional[str] = None,
+        runtime: Optional[AsyncRuntime] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.url = url
+        self.token = token
+        self._runtime = runtime
+        self._clock = clock
+        self.players = PlayerIndex()
+        self.queues: Dict[str, Dict[str, Any]] = {}
+        self.server_info: Optional[Dict[str, Any]] = None
+
+        self._ws: Optional[Any] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._task: Optional[Any] = None
+        self._ready = asyncio.Event()
+        self._stopping = False
+        self._ids = itertools.count(1)
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._partial: Dict[str, List[Any]] = {}
+        self._search_cache: "OrderedDict[Tuple[Any, ...], Tuple[float, Any]]" = OrderedDict()
+        self._stats = {
+            "connects": 0, "disconnects": 0, "commands": 0, "events": 0,
+            "search_hits": 0, "search_misses": 0,
+        }
+
+    @property
+    def runtime(self) -> AsyncRuntime:
+        return self._runtime or get_async_runtime()
+
+    @property
+    def connected(self) -> bool:
+        return self._ready.is_set()
+
+    # ── Lifecycle ────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Start the connection task on the runtime loop (idempotent)."""
+        if self._task is not None and not self._task.done():
+            return
+        if websockets is None:
+            raise ImportError("websockets is not installed")
+        self._stopping = False
+        self._task = asyncio.run_coroutine_threadsafe(self._run(), self.runtime.loop)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Close the connection and stop reconnecting."""
+        self._stopping = True
+        task, self._task = self._task, None
+        if task is None or not self.runtime.running:
+            return
+        task.cancel()
+        try:
+            self.runtime.run(self._drop_connection(), timeout=timeout)
+        except Exception as e:
+            logger.debug("Music Assistant session stop", error=str(e))
+
+    def wait_connected(self, timeout: float = CONNECT_TIMEOUT_SECONDS) -> bool:
+        """Block until connected (starting the session if needed)."""
+        self.start()
+        try:
+            return self.runtime.run(self._wait_ready(timeout), timeout=timeout + 1)
+        except Exception:
+            return False
+
+    async def ready(self, timeout: float = CONNECT_TIMEOUT_SECONDS) -> bool:
+        """Await until connected, from any loop (starting the session if needed)."""
+        self.start()
+        return await self._on_runtime(self._wait_ready(timeout))
+
+    async def _wait_ready(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _run(self) -> None:
+        delay = RECONNECT_MIN_SECONDS
+        while not self._stopping:
+            try:
+                await self._connect()
+                delay = RECONNECT_MIN_SECONDS
+                await self._reader
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Music Assistant connection failed", url=self.url, error=str(e),
+                               retry_in_seconds=delay)
+            finally:
+                await self._drop_connection()
+            if self._stopping:
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    async def _connect(self) -> None:
+        ws = await asyncio.wait_for(websockets.connect(self.url, max_size=None), CONNECT_TIMEOUT_SECONDS)
+        self._ws = ws
+        # The server greets every connection with its server info
+        self.server_info = json.loads(await asyncio.wait_for(ws.recv(), CONNECT_TIMEOUT_SECONDS))
+        self._reader = asyncio.ensure_future(self._read_loop(ws))
+        if self.token:
+            await self._send("auth", {"token": self.token}, COMMAND_TIMEOUT_SECONDS)
+        players, queues = await asyncio.gather(
+            self._send("players/all", {}, COMMAND_TIMEOUT_SECONDS),
+            self._send("player_queues/all", {}, COMMAND_TIMEOUT_SECONDS),
+        )
+        self.players.replace_all(players or [])
+        self.queues = {q["queue_id"]: q for q in queues or [] if q.get("queue_id")}
+        self._stats["connects"] += 1
+        self._ready.set()
+        logger.info("Music Assistant connected", url=self.url, players=len(self.players),
+                    server_version=(self.server_info or {}).get("server_version"))
+
+    async def _drop_connection(self) -> None:
+        was_connected = self._ready.is_set()
+        self._ready.clear()
+        ws, self._ws = self._ws, None
+        reader, self._reader = self._reader, None
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Music Assistant connection lost"))
+        self._pending.clear()
+        self._partial.clear()
+        if reader is not None and not reader.done():
+            reader.cancel()
+        if ws is not None:
+            try:
+                await ws.close()
+            except Exception:
+                pass
+        if was_connected:
+            self._stats["disconnects"] += 1
+            logger.warning("Music Assistant disconnected", url=self.url)
+
+    # ── Socket I/O (runtime loop only) ───────────────────────────────
+
+    async def _read_loop(self, ws: Any) -> None:
+        async for raw in ws:
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                continue
+            if "event" in message:
+                self._apply_event(message)
+                continue
+            message_id = str(message.get("message_id"))
+            if message.get("partial"):
+                # Large results arrive in several messages
+                self._partial.setdefault(message_id, []).extend(message.get("result") or [])
+                continue
+            future = self._pending.get(message_id)
+            if future is None or future.done():
+                continue
+            if "error_code" in message:
+                future.set_exception(MusicAssistantError(message["error_code"], message.get("details")))
+            elif message_id in self._partial:
+                future.set_result(self._partial.pop(message_id) + list(message.get("result") or []))
+            else:
+                future.set_result(message.get("result"))
+
+    def _apply_event(self, message: Dict[str, Any]) -> None:
+        self._stats["events"] += 1
+        event, data = message.get("event"), message.get("data")
+        if event in ("player_added", "player_updated") and isinstance(data, dict):
+            self.players.upsert(data)
+        elif event == "player_removed":
+            self.players.remove(message.get("object_id") or (data or {}).get("player_id", ""))
+        elif event in ("queue_added", "queue_updated") and isinstance(data, dict) and data.get("queue_id"):
+            self.queues[data["queue_id"]] = {**self.queues.get(data["queue_id"], {}), **data}
+        elif event == "media_item_updated":
+            self._search_cache.clear()
+
+    async def _send(self, command: str, args: Dict[str, Any], timeout: float) -> Any:
+        if self._ws is None:
+            raise ConnectionError("Music Assistant not connected")
+        message_id = str(next(self._ids))
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        try:
+            await self._ws.send(json.dumps({"message_id": message_id, "command": command, "args": args}))
+            self._stats["commands"] += 1
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(message_id, None)
+            self._partial.pop(message_id, None)
+
+    async def _command(self, command: str, args: Dict[str, Any], timeout: float) -> Any:
+        if self._task is None:
+            self.start()
+        if not await self._wait_ready(timeout):
+            raise ConnectionError("Music Assistant not connected")
+        return await self._send(command, args, timeout)
+
+    async def _on_runtime(self, coro: Coroutine[Any, Any, T]) -> T:
+        loop = self.runtime.loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    # ── Commands ─────────────────────────────────────────────────────
+
+    async def command(self, command: str, timeout: float = COMMAND_TIMEOUT_SECONDS, **args: Any) -> Any:
+        """Send one command over the shared socket and return its result."""
+        return await self._on_runtime(self._command(command, args, timeout))
+
+    def call(self, command: str, timeout: float = COMMAND_TIMEOUT_SECONDS, **args: Any) -> Any:
+        """Blocking ``command()`` for synchronous callers."""
+        return self.runtime.run(self._command(command, args, timeout), timeout=timeout + 1)
+
+    def find_player(self, name: str) -> Optional[Dict[str, Any]]:
+        """Resolve a player name from the in-memory index (no I/O)."""
+        return self.players.find(name)
+
+    def queue_id_for(self, player: Dict[str, Any]) -> str:
+        """Queue that controls ``player`` (its active source if that is a queue)."""
+        source = player.get("active_source")
+        return source if source and source in self.queues else player["player_id"]
+
+    async def pause(self, queue_id: str) -> None:
+        await self.command("player_queues/pause", queue_id=queue_id)
+
+    async def resume(self, queue_id: str) -> None:
+        await self.command("player_queues/resume", queue_id=queue_id)
+
+    async def stop_playback(self, queue_id: str) -> None:
+        await self.command("player_queues/stop", queue_id=queue_id)
+
+    async def next_track(self, queue_id: str) -> None:
+        await self.command("player_queues/next", queue_id=queue_id)
+
+    async def previous_track(self, queue_id: str) -> None:
+        await self.command("player_queues/previous", queue_id=queue_id)
+
+    async def set_volume(self, player_id: str, level: int) -> None:
+        await self.command("players/cmd/volume_set", player_id=player_id, volume_level=level)
+
+    async def volume_up(self, player_id: str) -> None:
+        await self.command("players/cmd/volume_up", player_id=player_id)
+
+    async def volume_down(self, player_id: str) -> None:
+        await self.command("players/cmd/volume_down", player_id=player_id)
+
+    async def set_shuffle(self, queue_id: str, enabled: bool) -> None:
+        await self.command("player_queues/shuffle", queue_id=queue_id, shuffle_enabled=enabled)
+
+    async def set_repeat(self, queue_id: str, mode: str) -> None:
+        await self.command("player_queues/repeat", queue_id=queue_id, repeat_mode=mode)
+
+    async def play_media(self, queue_id: str, media: Any, option: Optional[str] = None,
+                         radio_mode: bool = False) -> None:
+        await self.command("player_queues/play_media", queue_id=queue_id, media=media,
+                           option=option, radio_mode=radio_mode)
+
+    async def search(self, query: str, media_types: List[str], limit: int = 10) -> Dict[str, Any]:
+        """``music/search`` with results cached for ``SEARCH_CACHE_TTL_SECONDS``."""
+        key = (query.strip().lower(), tuple(media_types), limit)
+        cached = self._search_cache.get(key)
+        if cached is not None and self._clock() - cached[0] <= SEARCH_CACHE_TTL_SECONDS:
+            self._search_cache.move_to_end(key)
+            self._stats["search_hits"] += 1
+            return cached[1]
+        self._stats["search_misses"] += 1
+        result = await self.command("music/search", search_query=query, media_types=list(media_types), limit=limit)
+        self._search_cache[key] = (self._clock(), result)
+        while len(self._search_cache) > SEARCH_CACHE_MAX_ENTRIES:
+            self._search_cache.popitem(last=False)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connected": self.connected,
+            "players": len(self.players),
+            "queues": len(self.queues),
+            "in_flight": len(self._pending),
+            "search_cache_entries": len(self._search_cache),
+            **self._stats,
+        }
+
+
+_session: Optional[MusicAssistantSession] = None
+_session_lock = threading.Lock()
+
+
+def get_music_assistant_session() -> Optional[MusicAssistantSession]:
+    """The node's Music Assistant session, started on first call.
+
+    Returns None when ``MUSIC_ASSISTANT_URL`` is not configured.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                from services.secret_service import get_secret_value
+
+                url = get_secret_value("MUSIC_ASSISTANT_URL", "integration")
+                if not url:
+                    return None
+                token = get_secret_value("MUSIC_ASSISTANT_TOKEN", "integration")
+                _session = MusicAssistantSession(url, token=token)
+    _session.start()
+    return _session
+
+
+def find_music_assistant_session(url: str) -> Optional[MusicAssistantSession]:
+    """The node's session if one is running for ``url`` (doesn't create one)."""
+    session = _session
+    return session if session is not None and session.url == url else None
+
+
+def get_music_assistant_session_stats() -> Optional[Dict[str, Any]]:
+    """Session stats if the session has been created, else None."""
+    return _session.stats() if _session is not None else None
+
+
+def reset_music_assistant_session() -> None:
+    """Stop and drop the singleton (test hook)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.stop()
+        _session = None
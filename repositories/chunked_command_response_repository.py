@@ -1,3 +1,4 @@
+import uuid
 from typing import Optional, List
 from sqlalchemy.orm import Session
 
@@ -34,6 +35,7 @@ class ChunkedCommandResponseRepository:
             Exception: If database operation fails
         """
         db_record = ChunkedCommandResponseDB(
+            id=str(uuid.uuid4()),
             command_name=create_data.command_name,
             session_id=create_data.session_id,
             full_content=create_data.full_content
@@ -109,6 +111,36 @@ class ChunkedCommandResponseRepository:
             self.db.rollback()
             raise Exception(f"Failed to update chunked command response: {str(e)}")
     
+    def append_delta(self, session_id: str, delta: str) -> bool:
+        """
+        Append a delta to the stored content in a single UPDATE.
+        
+        Unlike ``update_content(append=True)`` the accumulated text never
+        makes a round trip through Python, so write-behind flushes cost
+        O(delta) instead of O(full content).
+        
+        Args:
+            session_id: The session identifier
+            delta: Content to append
+            
+        Returns:
+            True if the session row was updated, False if not found
+            
+        Raises:
+            Exception: If database operation fails
+        """
+        try:
+            updated = self.db.query(ChunkedCommandResponseDB).filter_by(session_id=session_id).update(
+                {ChunkedCommandResponseDB.full_content: ChunkedCommandResponseDB.full_content + delta},
+                synchronize_session=False,
+            )
+            self.db.commit()
+            return updated > 0
+            
+        except Exception as e:
+            self.db.rollback()
+            raise Exception(f"Failed to append chunked command response: {str(e)}")
+    
     def delete_by_session_id(self, session_id: str) -> bool:
         """
         Delete a chunked command response by session ID.
@@ -6,6 +6,19 @@ from sqlalchemy.orm import Session
 
 from models.command_registry import CommandRegistry
 
+# Bumped on every registry write in this process (see get_registry_generation).
+_generation: int = 0
+
+
+def get_registry_generation() -> int:
+    """Counter that changes whenever enabled/disabled state is written."""
+    return _generation
+
+
+def _bump_generation() -> None:
+    global _generation
+    _generation += 1
+
 
 class CommandRegistryRepository:
     """CRUD operations for the command_registry table."""
@@ -36,6 +49,7 @@ class CommandRegistryRepository:
             row = CommandRegistry(command_name=command_name, enabled=1 if enabled else 0)
             self.db.add(row)
         self.db.commit()
+        _bump_generation()
 
     def ensure_registered(self, command_names: list[str]) -> None:
         """Insert any missing commands with enabled=1 (default).
@@ -53,3 +67,4 @@ class CommandRegistryRepository:
             if name not in existing:
                 self.db.add(CommandRegistry(command_name=name, enabled=1))
         self.db.commit()
+        _bump_generation()
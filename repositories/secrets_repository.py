@@ -1,5 +1,6 @@
 from typing import cast
 from datetime import datetime, timezone
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from models.secret import Secret
 
@@ -39,3 +40,11 @@ class SecretRepository:
         if scope == "user" and user_id is not None:
             q = q.filter_by(user_id=user_id)
         return cast(list[Secret], q.all())
+
+    def get_all_visible(self, user_id: int | None = None) -> list[Secret]:
+        """All node/integration secrets plus ``user_id``'s user-scoped ones."""
+        q = self.db.query(Secret).filter(
+            or_(Secret.scope != "user", Secret.user_id == user_id)
+            if user_id is not None else Secret.scope != "user"
+        )
+        return cast(list[Secret], q.all())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Parse cost of a large CalDAV REPORT body: buffered vs streaming.
+
+Builds a synthetic multistatus response with N events (default 5,000,
+spread over a month, every tenth one weekly-recurring) and parses it
+three ways:
+
+  - ``buffered``  — read the whole body, ``ET.fromstring`` it, then parse
+                    every ``calendar-data`` (what the sync engine did
+                    before ``MultistatusStream``)
+  - ``streaming`` — ``iter_calendar_events`` over 16 KiB chunks
+  - ``first-10``  — streaming with ``limit=10`` (e.g. "what's next")
+
+and reports wall time, time to first event and peak traced memory.
+
+Usage:
+    python scripts/benchmark_caldav_parser.py
+    python scripts/benchmark_caldav_parser.py --events 20000 --repeat 5 --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from calendar_shared.caldav_sync import (  # noqa: E402
+    CALDAV,
+    DAV,
+    expand_resource,
+    iter_calendar_events,
+    parse_vevents,
+)
+
+CHUNK_SIZE = 16 * 1024
+RANGE_START = datetime(2026, 3, 1)
+RANGE_END = datetime(2026, 4, 1)
+
+
+def _synthetic_body(count: int) -> bytes:
+    """Multistatus body with ``count`` calendar objects, about 700 bytes each."""
+    rows = []
+    for i in range(count):
+        start = RANGE_START + timedelta(days=i % 30, hours=7 + i % 12)
+        end = start + timedelta(minutes=30 + 15 * (i % 4))
+        rrule = "RRULE:FREQ=WEEKLY;COUNT=8\r\n" if i % 10 == 0 else ""
+        ical = (
+            "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//bench//EN\r\nBEGIN:VEVENT\r\n"
+            f"UID:event-{i}@example.com\r\nSUMMARY:Synthetic event number {i} with a longer\r\n"
+            "  folded title\r\n"
+            f"DTSTART;TZID=America/New_York:{start:%Y%m%dT%H%M%S}\r\n"
+            f"DTEND;TZID=America/New_York:{end:%Y%m%dT%H%M%S}\r\n"
+            f"LOCATION:Room {i % 40}\r\nDESCRIPTION:Generated for the parser benchmark\r\n{rrule}"
+            "BEGIN:VALARM\r\nTRIGGER:-PT15M\r\nACTION:DISPLAY\r\nEND:VALARM\r\n"
+            "END:VEVENT\r\nEND:VCALENDAR\r\n"
+        )
+        rows.append(
+            f"<d:response><d:href>/cal/event-{i}.ics</d:href><d:propstat><d:prop>"
+            f'<d:getetag>"{i}"</d:getetag><c:calendar-data>{ical}</c:calendar-data></d:prop>'
+            "<d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>"
+        )
+    return (
+        '<?xml version="1.0"?><d:multistatus xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">'
+        + "".join(rows) + "</d:multistatus>"
+    ).encode()
+
+
+def _chunks(body: bytes):
+    for offset in range(0, len(body), CHUNK_SIZE):
+        yield body[offset:offset + CHUNK_SIZE]
+
+
+def _buffered(body: bytes):
+    root = ET.fromstring(b"".join(_chunks(body)))
+    for response in root.iter(f"{DAV}response"):
+        data = response.find(f".//{CALDAV}calendar-data")
+        if data is not None and data.text:
+            yield from expand_resource(parse_vevents(data.text.splitlines()), RANGE_START, RANGE_END)
+
+
+def _streaming(body: bytes, limit: int | None = None):
+    return iter_calendar_events(_chunks(body), RANGE_START, RANGE_END, limit=limit)
+
+
+def _measure(make_iter, repeat: int) -> dict:
+    times, firsts, peaks = [], [], []
+    count = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        started = time.perf_counter()
+        first = None
+        count = 0
+        for _event in make_iter():
+            if first is None:
+                first = time.perf_counter() - started
+            count += 1
+        times.append(time.perf_counter() - started)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        firsts.append(first or 0.0)
+    return {
+        "events": count,
+        "total_ms": round(min(times) * 1000, 1),
+        "first_event_ms": round(min(firsts) * 1000, 2),
+        "peak_mib": round(min(peaks) / 2**20, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark CalDAV multistatus parsing")
+    parser.add_argument("--events", type=int, default=5000, help="Calendar objects in the synthetic body")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant (best is reported)")
+    parser.add_argument("--output", type=Path, help="Also write results as JSON")
+    args = parser.parse_args()
+
+    body = _synthetic_body(args.events)
+    print(f"Body: {args.events} objects, {len(body) / 2**20:.1f} MiB, python {platform.python_version()}")
+
+    results = {
+        "buffered": _measure(lambda: _buffered(body), args.repeat),
+        "streaming": _measure(lambda: _streaming(body), args.repeat),
+        "first-10": _measure(lambda: _streaming(body, limit=10), args.repeat),
+    }
+    print(f"{'variant':<10} {'events':>7} {'total ms':>9} {'first ms':>9} {'peak MiB':>9}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['events']:>7} {r['total_ms']:>9} {r['first_event_ms']:>9} {r['peak_mib']:>9}")
+
+    if args.output:
+        args.output.write_text(json.dumps({
+            "events": args.events,
+            "body_bytes": len(body),
+            "python": platform.python_version(),
+            "results": results,
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Household wake arbitration: added latency and duplicate suppression.
+
+Runs N ``WakeArbiter`` nodes against an in-process broker stand-in (the
+household MQTT topic, with configurable one-way latency) and replays R
+wake events. For each event every node hears the wake word with some
+probability, at a jittered onset (different distances to the speaker,
+frame alignment) and with its own score/RMS. Reported per window:
+
+  - ``answered``     — wakes where at least one node proceeded
+  - ``duplicates``   — extra nodes that proceeded for the same wake
+                       (window 0 = no arbitration, the old behaviour)
+  - ``suppression``  — share of hearing nodes that stood down
+  - ``winner ms``    — mean / p95 delay the winning node added before
+                       its wake response
+  - ``loser ms``     — mean delay before a losing node resumed listening
+
+Usage:
+    python scripts/benchmark_wake_arbitration.py
+    python scripts/benchmark_wake_arbitration.py --nodes 6 --latency-ms 15 --windows 0 80 150 250
+    python scripts/benchmark_wake_arbitration.py --rounds 100 --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.wake_arbitration import ArbitrationResult, WakeArbiter  # noqa: E402
+
+
+class LocalBroker:
+    """Fan every publish out to all members (sender included) after ``latency`` seconds."""
+
+    def __init__(self, latency: float, jitter: float, rng: random.Random) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = rng
+        self.members: List[WakeArbiter] = []
+        self.messages = 0
+
+    def publish(self, topic: str, payload: bytes) -> None:
+        self.messages += 1
+        for member in self.members:
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            threading.Timer(delay, member.receive, args=(payload,)).start()
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[int(pct * (len(ordered) - 1))]
+
+
+def _run_window(args: argparse.Namespace, window_ms: float) -> Dict[str, float]:
+    rng = random.Random(args.seed)
+    broker = LocalBroker(args.latency_ms / 1000.0, args.latency_ms / 3000.0, rng)
+    horizon = 2 * window_ms / 1000.0
+    nodes = [
+        WakeArbiter(f"node-{i}", "bench", window_ms=window_ms, claim_horizon=horizon)
+        for i in range(args.nodes)
+    ]
+    for node in nodes:
+        node.attach(broker.publish)
+        broker.members.append(node)
+
+    answered = duplicates = heard_total = 0
+    winner_delays: List[float] = []
+    loser_delays: List[float] = []
+
+    for _ in range(args.rounds):
+        heard = [n for n in nodes if rng.random() < args.hear_probability] or [rng.choice(nodes)]
+        heard_total += len(heard)
+        results: Dict[str, ArbitrationResult] = {}
+
+        def wake(node: WakeArbiter, onset: float, score: float, rms: int) -> None:
+            time.sleep(onset)
+            results[node.node_id] = node.arbitrate(score, rms)
+
+        threads = [
+            threading.Thread(target=wake, args=(
+                node,
+                rng.uniform(0, args.onset_jitter_ms / 1000.0),
+                rng.uniform(0.5, 1.0),
+                rng.randint(200, 4000),
+            ))
+            for node in heard
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        winners = [r for r in results.values() if r.won]
+        answered += bool(winners)
+        duplicates += max(0, len(winners) - 1)
+        winner_delays.extend(r.delay_ms for r in winners)
+        loser_delays.extend(r.delay_ms for r in results.values() if not r.won)
+        # Let every claim and announcement age out before the next wake.
+        time.sleep(horizon + args.latency_ms / 1000.0 * 2 + 0.02)
+
+    suppressed = sum(n.stats()["suppressed"] for n in nodes)
+    return {
+        "window_ms": window_ms,
+        "answered": answered,
+        "duplicates": duplicates,
+        "suppression": round(suppressed / heard_total, 3) if heard_total else 0.0,
+        "winner_ms_mean": round(sum(winner_delays) / len(winner_delays), 1) if winner_delays else 0.0,
+        "winner_ms_p95": round(_percentile(winner_delays, 0.95), 1),
+        "loser_ms_mean": round(sum(loser_delays) / len(loser_delays), 1) if loser_delays else 0.0,
+        "messages": broker.messages,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark household wake arbitration")
+    parser.add_argument("--nodes", type=int, default=3, help="Nodes in the household")
+    parser.add_argument("--rounds", type=int, default=40, help="Wake events to replay")
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 80, 150, 250],
+                        help="Arbitration windows to compare (ms); 0 disables arbitration")
+    parser.add_argument("--latency-ms", type=float, default=8.0, help="One-way broker latency")
+    parser.add_argument("--onset-jitter-ms", type=float, default=120.0,
+                        help="Spread of wake detection times across nodes")
+    parser.add_argument("--hear-probability", type=float, default=0.85,
+                        help="Chance each node detects a given wake")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=Path, help="Also write results as JSON")
+    args = parser.parse_args()
+
+    print(f"{args.nodes} nodes, {args.rounds} wakes, broker latency {args.latency_ms} ms, "
+          f"onset jitter {args.onset_jitter_ms} ms, python {platform.python_version()}")
+    print(f"{'window':>7} {'answered':>9} {'dups':>5} {'suppr':>6} "
+          f"{'win ms':>7} {'win p95':>8} {'lose ms':>8} {'msgs':>5}")
+    rows = []
+    for window in args.windows:
+        r = _run_window(args, window)
+        rows.append(r)
+        print(f"{r['window_ms']:>7.0f} {r['answered']:>9} {r['duplicates']:>5} {r['suppression']:>6} "
+              f"{r['winner_ms_mean']:>7} {r['winner_ms_p95']:>8} {r['loser_ms_mean']:>8} {r['messages']:>5}")
+
+    if args.output:
+        args.output.write_text(json.dumps({
+            "python": platform.python_version(),
+            "nodes": args.nodes,
+            "rounds": args.rounds,
+            "latency_ms": args.latency_ms,
+            "onset_jitter_ms": args.onset_jitter_ms,
+            "results": rows,
+        }, indent=2))
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""Wake-detection latency under synthetic background load.
+
+Drives the real ``AudioBus`` → ``WakeScorer`` pipeline from a simulated
+mic and measures, for every frame carrying a "wake word", the time from
+the moment the device had the audio to the moment the scorer produced
+its score. The load stands in for what a node does while idling:
+
+  - ``--gil-threads``   pure-Python busy threads (MQTT handlers, scans)
+  - ``--gil-hold-ms``   a thread that periodically holds the GIL in one
+                        C call (a big ``json.loads``), the worst case for
+                        a mic read that shares the interpreter
+  - ``--cpu-procs``     busy subprocesses (pip builds, agent runs)
+
+Each mode runs the same load:
+
+  - ``baseline`` — default scheduler, capture thread in-process
+  - ``policy``   — execution policy on: background load on the
+                   background pool (nice 15, off the audio core),
+                   audio/wake roles applied (FIFO/pinning where permitted)
+  - ``process``  — policy plus mic capture in a child process
+                   (``core.capture_process``)
+
+The simulated mic keeps ``--periods`` periods like ALSA does; a reader
+that falls further behind loses audio. Wake frames that never reach the
+scorer (lost in the device buffer or dropped from a full bus queue) are
+reported as ``missed``.
+
+Usage:
+    python scripts/benchmark_wake_latency.py
+    python scripts/benchmark_wake_latency.py --seconds 30 --gil-threads 3 --cpu-procs 4
+    python scripts/benchmark_wake_latency.py --modes baseline process --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import queue
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.audio_bus import AudioBus  # noqa: E402
+from core.capture_process import CaptureProcessAudio  # noqa: E402
+from core.execution_policy import (  # noqa: E402
+    BackgroundPool,
+    ExecutionPolicy,
+    reset_execution_policy,
+    set_execution_policy,
+)
+from core.wake_scorer import OWW_RATE, WakeScorer  # noqa: E402
+
+RATE = OWW_RATE           # 16 kHz end to end: the scorer passes samples through unchanged
+CHUNK = 1280              # 80 ms, the production frame
+CHUNK_SECS = CHUNK / RATE
+
+
+class _SimulatedStream:
+    """Device clock with an ALSA-like ring of ``periods`` periods.
+
+    Frame layout: samples 0-3 carry the monotonic time the period became
+    available (float64), sample 4 the wake flag, samples 5-6 the index.
+    """
+
+    def __init__(self, periods: int, wake_every: int) -> None:
+        self._periods = periods
+        self._wake_every = wake_every
+        self._t0 = time.monotonic()
+        self._next = 0
+        self.lost = 0
+
+    def read(self, frames: int, exception_on_overflow: bool = True) -> bytes:
+        while True:
+            produced = int((time.monotonic() - self._t0) / CHUNK_SECS)
+            if produced > self._next:
+                break
+            time.sleep(self._t0 + (self._next + 1) * CHUNK_SECS - time.monotonic())
+        if produced - self._next > self._periods:
+            self.lost += produced - self._next - self._periods
+            self._next = produced - self._periods
+        idx = self._next
+        self._next += 1
+        samples = np.zeros(frames, dtype=np.int16)
+        samples[0:4] = np.frombuffer(np.float64(self._t0 + (idx + 1) * CHUNK_SECS).tobytes(), dtype=np.int16)
+        samples[4] = 1 if idx % self._wake_every == 0 else 0
+        samples[5:7] = np.frombuffer(np.uint32(idx).tobytes(), dtype=np.int16)
+        return samples.tobytes()
+
+    def stop_stream(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class SimulatedMic:
+    """PyAudio stand-in; also loaded by the capture child via ``device_factory``."""
+
+    def __init__(self) -> None:
+        self.stream = None
+
+    def open(self, **kwargs: Any) -> _SimulatedStream:
+        self.stream = _SimulatedStream(
+            int(os.environ.get("BENCH_PERIODS", "4")),
+            int(os.environ.get("BENCH_WAKE_EVERY", "10")),
+        )
+        return self.stream
+
+    def terminate(self) -> None:
+        pass
+
+
+class SimulatedWakeModel:
+    """openWakeWord stand-in: ~``infer_ms`` of GIL-releasing numpy work per frame."""
+
+    def __init__(self, infer_ms: float) -> None:
+        self._a = np.random.default_rng(0).random((96, 96))
+        start = time.perf_counter()
+        for _ in range(50):
+            self._a @ self._a
+        per = (time.perf_counter() - start) / 50
+        self._reps = max(1, int(infer_ms / 1000 / per))
+        self.latencies_ms: List[float] = []
+        self.indices: List[int] = []
+        self.wakes: List[int] = []
+
+    def predict(self, samples: np.ndarray) -> Dict[str, float]:
+        for _ in range(self._reps):
+            self._a @ self._a
+        captured = float(np.frombuffer(samples[0:4].tobytes(), dtype=np.float64)[0])
+        idx = int(np.frombuffer(samples[5:7].tobytes(), dtype=np.uint32)[0])
+        self.indices.append(idx)
+        if samples[4]:
+            self.latencies_ms.append((time.monotonic() - captured) * 1000.0)
+            self.wakes.append(idx)
+            return {"bench": 1.0}
+        return {"bench": 0.0}
+
+    def reset(self) -> None:
+        pass
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))], 1)
+
+
+def _gil_spin(stop: threading.Event) -> None:
+    n = 0
+    while not stop.is_set():
+        n += 1
+
+
+def _gil_hold(stop: threading.Event, hold_ms: float) -> None:
+    blob = json.dumps([{"id": i, "name": f"device-{i}", "on": True} for i in range(2000)])
+    start = time.perf_counter()
+    json.loads(blob)
+    reps = max(1, int(hold_ms / 1000 / (time.perf_counter() - start)))
+    blob = "[" + ",".join([blob] * reps) + "]"
+    while not stop.wait(0.5):
+        json.loads(blob)
+
+
+def _run_mode(args: argparse.Namespace, mode: str) -> Dict[str, Any]:
+    policy = ExecutionPolicy(enabled=mode != "baseline")
+    set_execution_policy(policy)
+    pool = BackgroundPool(
+        max_workers=args.gil_threads + 2,
+        initializer=lambda: policy.apply("background"),
+    ) if mode != "baseline" else None
+
+    def background(fn, *fn_args) -> None:
+        if pool is not None:
+            pool.submit(fn, *fn_args)
+        else:
+            threading.Thread(target=fn, args=fn_args, daemon=True).start()
+
+    stop = threading.Event()
+    procs: List[subprocess.Popen] = []
+
+    def spawn_cpu_hogs() -> None:
+        # Started from the (background) thread so the children inherit its nice/affinity.
+        for _ in range(args.cpu_procs):
+            procs.append(subprocess.Popen([sys.executable, "-c", "while True: pass"]))
+
+    if mode == "process":
+        factory = lambda: CaptureProcessAudio(  # noqa: E731
+            device_factory="scripts.benchmark_wake_latency:SimulatedMic",
+            plan=policy.plan("audio").to_dict(),
+        )
+    else:
+        factory = SimulatedMic
+    bus = AudioBus(rate=RATE, chunk_samples=CHUNK, device_index_resolver=lambda: None,
+                   pyaudio_factory=factory)
+    model = SimulatedWakeModel(args.infer_ms)
+    scorer = WakeScorer(bus, model)
+    bus.start()
+    scorer.start()
+    events = scorer.subscribe("bench")
+
+    def drain() -> None:
+        while not stop.is_set():
+            try:
+                events.get(timeout=0.2)
+            except queue.Empty:
+                pass
+
+    threading.Thread(target=drain, daemon=True).start()
+
+    background(spawn_cpu_hogs)
+    for _ in range(args.gil_threads):
+        background(_gil_spin, stop)
+    if args.gil_hold_ms > 0:
+        background(_gil_hold, stop, args.gil_hold_ms)
+
+    time.sleep(args.seconds)
+
+    stop.set()
+    for proc in procs:
+        proc.kill()
+        proc.wait()
+    bus_stats = bus.stats()
+    scorer.stop()
+    bus.stop()
+    if pool is not None:
+        pool.shutdown(wait=True)
+    reset_execution_policy()
+
+    expected = 0
+    if model.indices:
+        first, last = min(model.indices), max(model.indices)
+        expected = sum(1 for i in range(first, last + 1) if i % args.wake_every == 0)
+    lat = model.latencies_ms
+    return {
+        "mode": mode,
+        "wakes": expected,
+        "missed": expected - len(model.wakes),
+        "p50_ms": _percentile(lat, 50),
+        "p95_ms": _percentile(lat, 95),
+        "p99_ms": _percentile(lat, 99),
+        "max_ms": round(max(lat), 1) if lat else 0.0,
+        "overruns": bus_stats["overruns"],
+        "policy": policy.stats()["roles"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark wake-detection latency under load")
+    parser.add_argument("--modes", nargs="+", default=["baseline", "policy", "process"],
+                        choices=["baseline", "policy", "process"])
+    parser.add_argument("--seconds", type=float, default=20.0, help="Duration of each mode")
+    parser.add_argument("--gil-threads", type=int, default=2, help="Pure-Python busy threads")
+    parser.add_argument("--gil-hold-ms", type=float, default=400.0,
+                        help="Periodic single-call GIL hold (0 disables)")
+    parser.add_argument("--cpu-procs", type=int, default=os.cpu_count() or 1,
+                        help="Busy subprocesses")
+    parser.add_argument("--infer-ms", type=float, default=15.0, help="Simulated inference per frame")
+    parser.add_argument("--periods", type=int, default=4, help="Device buffer, in 80 ms periods")
+    parser.add_argument("--wake-every", type=int, default=10, help="Mark every Nth frame as a wake")
+    parser.add_argument("--output", type=Path, help="Also write results as JSON")
+    args = parser.parse_args()
+
+    os.environ["BENCH_PERIODS"] = str(args.periods)
+    os.environ["BENCH_WAKE_EVERY"] = str(args.wake_every)
+
+    print(f"{os.cpu_count()} CPUs, {args.seconds:.0f} s per mode, {args.gil_threads} GIL threads, "
+          f"{args.gil_hold_ms:.0f} ms GIL holds, {args.cpu_procs} busy procs, "
+          f"device buffer {args.periods * CHUNK_SECS * 1000:.0f} ms, python {platform.python_version()}")
+    print(f"{'mode':>9} {'wakes':>6} {'missed':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7} {'overruns':>9}")
+    rows = []
+    for mode in args.modes:
+        r = _run_mode(args, mode)
+        rows.append(r)
+        print(f"{r['mode']:>9} {r['wakes']:>6} {r['missed']:>7} {r['p50_ms']:>7} {r['p95_ms']:>7} "
+              f"{r['p99_ms']:>7} {r['max_ms']:>7} {r['overruns']:>9}")
+
+    if args.output:
+        args.output.write_text(json.dumps({
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "args": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+            "results": rows,
+        }, indent=2))
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
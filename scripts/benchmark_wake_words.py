@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Per-frame wake-word inference cost for 1, 2 and 4 loaded models.
+
+openWakeWord runs its melspectrogram + embedding front-end once per
+80 ms frame and then one small classifier head per wake word, so the
+cost of extra wake words should be well below N×. This measures it on
+the current machine (run it on the Pi to size ``wake_words``).
+
+Usage:
+    python scripts/benchmark_wake_words.py
+    python scripts/benchmark_wake_words.py --counts 1 2 4 8 --frames 500
+    python scripts/benchmark_wake_words.py --wav sample_16k.wav --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Bundled openWakeWord models, in the order they are added per run.
+DEFAULT_MODELS = ["hey_jarvis", "alexa", "hey_mycroft", "hey_rhasspy", "timer", "weather"]
+FRAME_SAMPLES = 1280  # 80 ms at 16 kHz
+WARMUP_FRAMES = 20
+
+
+def _load_frames(wav_path: Path | None, count: int, seed: int) -> list[np.ndarray]:
+    """16 kHz int16 frames from a mono WAV (looped), or low-level noise."""
+    if wav_path is None:
+        rng = np.random.default_rng(seed)
+        return [
+            rng.normal(0, 300, FRAME_SAMPLES).clip(-32768, 32767).astype(np.int16)
+            for _ in range(count)
+        ]
+
+    with wave.open(str(wav_path), "rb") as wf:
+        if wf.getframerate() != 16000 or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise SystemExit(f"{wav_path}: expected 16 kHz mono 16-bit PCM")
+        audio = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    if audio.size < FRAME_SAMPLES:
+        raise SystemExit(f"{wav_path}: shorter than one frame")
+    usable = audio[: audio.size - audio.size % FRAME_SAMPLES].reshape(-1, FRAME_SAMPLES)
+    return [usable[i % len(usable)] for i in range(count)]
+
+
+def _bench(models: list[str], frames: list[np.ndarray], framework: str) -> dict:
+    from openwakeword.model import Model as OWWModel
+
+    oww = OWWModel(wakeword_models=models, inference_framework=framework)
+    for frame in frames[:WARMUP_FRAMES]:
+        oww.predict(frame)
+    oww.reset()
+
+    latencies: list[float] = []
+    for frame in frames:
+        start = time.perf_counter()
+        oww.predict(frame)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    arr = np.array(latencies)
+    return {
+        "models": models,
+        "frames": len(latencies),
+        "mean_ms": round(float(arr.mean()), 3),
+        "p50_ms": round(float(np.percentile(arr, 50)), 3),
+        "p95_ms": round(float(np.percentile(arr, 95)), 3),
+        # Fraction of the 80 ms real-time budget spent on inference
+        "realtime_load": round(float(arr.mean()) / 80.0, 4),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark multi-wake-word inference cost")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 2, 4],
+                        help="Numbers of wake models to load (default: 1 2 4)")
+    parser.add_argument("--models", nargs="+", default=DEFAULT_MODELS,
+                        help="Model names, taken in order for each count")
+    parser.add_argument("--frames", type=int, default=300, help="Frames timed per run")
+    parser.add_argument("--wav", type=Path, default=None, help="16 kHz mono WAV to feed instead of noise")
+    parser.add_argument("--framework", default="onnx", choices=["onnx", "tflite"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    if max(args.counts) > len(args.models):
+        parser.error(f"--counts needs at most {len(args.models)} models (got {max(args.counts)})")
+
+    import openwakeword.utils
+    openwakeword.utils.download_models(model_names=args.models[: max(args.counts)])
+
+    frames = _load_frames(args.wav, args.frames + WARMUP_FRAMES, args.seed)
+    runs = []
+    for count in args.counts:
+        result = _bench(args.models[:count], frames, args.framework)
+        runs.append(result)
+        print(f"{count} model(s): mean {result['mean_ms']:.2f} ms  p50 {result['p50_ms']:.2f} ms  "
+              f"p95 {result['p95_ms']:.2f} ms  load {result['realtime_load']:.1%}")
+
+    baseline = runs[0]["mean_ms"] if runs else 0.0
+    for result in runs:
+        result["relative_to_first"] = round(result["mean_ms"] / baseline, 2) if baseline else None
+
+    report = {
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "python": platform.python_version(),
+        },
+        "framework": args.framework,
+        "input": str(args.wav) if args.wav else "noise",
+        "runs": runs,
+    }
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
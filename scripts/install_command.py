@@ -108,6 +108,15 @@ def _find_base_requirements() -> str:
     return base_req
 
 
+def _load_previous_snapshot() -> dict | None:
+    """Last dependency-snapshot.json (its graph makes resolution incremental)."""
+    try:
+        with open(DEPENDENCY_SNAPSHOT_PATH) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
 def _resolve_deps(
     base_req_path: str,
     commands: dict,
@@ -115,7 +124,8 @@ def _resolve_deps(
 ) -> ResolutionResult:
     """Resolve dependencies and write output files. Returns the result."""
     print("\nResolving command dependencies...")
-    result = resolve_all(base_req_path, commands)
+    result = resolve_all(base_req_path, commands, previous_snapshot=_load_previous_snapshot())
+    print(f"Re-solved {len(result.resolved_packages)} package(s)")
 
     if not result.success:
         print("\nDependency conflicts detected:")
@@ -129,41 +139,50 @@ def _resolve_deps(
 
     if not result.merged_specs:
         print("No additional command dependencies to install.")
+        if not dry_run:
+            _write_snapshot(result)
         return result
 
     print(f"Resolved {len(result.merged_specs)} command dependencies:")
     for spec in result.merged_specs:
-        print(f"  {spec}")
+        marker = "+" if spec in result.install_specs else " "
+        print(f"  {marker} {spec}")
 
     if dry_run:
         print("\n(dry run — nothing installed)")
         return result
 
-    # Write custom-requirements.txt
+    # Write custom-requirements.txt (full set, for setup.sh / fresh installs)
     with open(CUSTOM_REQUIREMENTS_PATH, "w") as f:
         f.write("# Auto-generated by install_command.py — do not edit manually\n")
         for spec in result.merged_specs:
             f.write(f"{spec}\n")
     print(f"\nWrote {CUSTOM_REQUIREMENTS_PATH}")
 
-    # Write dependency-snapshot.json
-    with open(DEPENDENCY_SNAPSHOT_PATH, "w") as f:
-        json.dump(result.snapshot, f, indent=2)
-    print(f"Wrote {DEPENDENCY_SNAPSHOT_PATH}")
-
-    # Install
-    print("\nInstalling command dependencies...")
-    pip_cmd = [sys.executable, "-m", "pip", "install", "-r", CUSTOM_REQUIREMENTS_PATH, "--quiet"]
-    ret = subprocess.run(pip_cmd)
-    if ret.returncode != 0:
-        print("pip install failed — check output above")
-        result.success = False
-    else:
+    # Install only the delta
+    if result.install_specs:
+        print(f"\nInstalling {len(result.install_specs)} changed command dependencies...")
+        pip_cmd = [sys.executable, "-m", "pip", "install", "--quiet"] + result.install_specs
+        ret = subprocess.run(pip_cmd)
+        if ret.returncode != 0:
+            print("pip install failed — check output above")
+            result.success = False
+            return result
         print("Command dependencies installed.")
+    else:
+        print("\nCommand dependencies already satisfied.")
 
+    # Snapshot last, so a failed install is retried as a delta next time
+    _write_snapshot(result)
     return result
 
 
+def _write_snapshot(result: ResolutionResult) -> None:
+    with open(DEPENDENCY_SNAPSHOT_PATH, "w") as f:
+        json.dump(result.snapshot, f, indent=2)
+    print(f"Wrote {DEPENDENCY_SNAPSHOT_PATH}")
+
+
 def _list_commands(commands: dict) -> None:
     print(f"\n{len(commands)} commands discovered:\n")
     for name in sorted(commands.keys()):
@@ -1,11 +1,10 @@
-import asyncio
 import json
 import os
 import subprocess
 import threading
 import time
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import paho.mqtt.client as mqtt
 
@@ -13,10 +12,17 @@ from jarvis_log_client import JarvisLogger
 
 from utils.audio_volume import set_volume_percent
 from utils.config_service import Config
+from core.async_runtime import get_async_runtime, get_async_runtime_stats
+from core.execution_policy import get_execution_policy_stats, run_in_background
+from services.device_state_cache import get_device_state_cache, get_device_state_cache_stats
 from core.helpers import get_tts_provider
-from services.config_push_service import process_pending_configs
+from services.chunked_command_response_service import get_chunked_response_stats
+from services.config_push_service import get_config_push_stats, process_config_push
 from services.settings_snapshot_service import handle_snapshot_request
 from utils.music_assistant_service import MusicAssistantService
+from core.wake_arbitration import get_wake_arbiter, get_wake_arbiter_stats
+from music_assistant_shared.music_assistant_session import get_music_assistant_session_stats
+from services.tts_peer_cache import DEFAULT_PORT, get_tts_cache, get_tts_cache_stats
 
 logger = JarvisLogger(service="jarvis-node")
 
@@ -50,6 +56,9 @@ def set_tracked_threads(threads: Dict[str, Any]) -> None:
 
 def _on_disconnect(client: mqtt.Client, userdata: Any, rc: int) -> None:
     """Handle MQTT disconnection. paho-mqtt will auto-reconnect via loop_forever()."""
+    arbiter = get_wake_arbiter()
+    if arbiter is not None:
+        arbiter.attach(None)  # arbitrate alone until we reconnect
     if rc == 0:
         logger.info("MQTT disconnected cleanly")
     else:
@@ -142,7 +151,7 @@ def _run_training() -> None:
 
 
 def handle_train_adapter(details: Dict[str, Any]) -> None:
-    """Verify and trigger adapter training in a background thread."""
+    """Verify and trigger adapter training on the background pool."""
     global _training_running
 
     request_id: Optional[str] = details.get("request_id")
@@ -163,9 +172,8 @@ def handle_train_adapter(details: Dict[str, Any]) -> None:
             _training_running = False
         return
 
-    thread = threading.Thread(target=_run_training, daemon=True)
-    thread.start()
-    logger.info("Adapter training thread started", request_id=request_id[:8])
+    run_in_background(_run_training, name="train_adapter", lane="long")
+    logger.info("Adapter training queued", request_id=request_id[:8])
 
 
 def handle_action(details: Dict[str, Any]) -> None:
@@ -718,8 +726,11 @@ def handle_invalidate_device_cache(details: Dict[str, Any]) -> None:
     from a stale cache.
     """
     try:
+        from services.device_scanner_service import notify_devices_changed
         from services.direct_device_service import get_direct_device_service
         get_direct_device_service().invalidate_cache()
+        # A device was just added/removed — rescan soon, not after a backed-off interval
+        notify_devices_changed()
         logger.info("Device cache invalidated by CC notification")
     except Exception as e:
         logger.warning("invalidate_device_cache failed", error=str(e))
@@ -748,6 +759,39 @@ def on_connect(client: mqtt.Client, userdata: Any, flags: Dict[str, int], rc: in
     client.subscribe("jarvis/auth/+/ready", qos=1)
     logger.info("MQTT subscribed", topic="jarvis/auth/+/ready")
 
+    # Household wake arbitration: claims are latency-sensitive and worthless
+    # once the window has passed, so QoS 0 both ways.
+    arbiter = get_wake_arbiter()
+    if arbiter is not None:
+        client.subscribe(arbiter.topic, qos=0)
+        arbiter.attach(lambda topic, payload: client.publish(topic, payload, qos=0))
+        logger.info("MQTT subscribed", topic=arbiter.topic)
+
+    _start_tts_peer_cache(client)
+
+
+def _start_tts_peer_cache(client: mqtt.Client) -> None:
+    """Serve our TTS cache to household peers and track theirs.
+
+    Inventories are retained per node, so subscribing replays every
+    peer's current inventory immediately — a fresh node can fill its
+    cache from peers before it ever asks the TTS server.
+    """
+    tts_cache = get_tts_cache()
+    if tts_cache.topic is None:
+        return
+    try:
+        tts_cache.start_server(
+            port=Config.get_int("tts_peer_cache_port", DEFAULT_PORT),
+            advertise_host=Config.get_str("tts_peer_cache_host", "") or None,
+            probe_host=get_mqtt_config()["broker"],
+        )
+    except Exception as e:
+        logger.warning("TTS peer cache server unavailable", error=str(e))
+    client.subscribe(tts_cache.topic, qos=1)
+    tts_cache.attach(lambda topic, payload, retain: client.publish(topic, payload, qos=1, retain=retain))
+    logger.info("MQTT subscribed", topic=tts_cache.topic)
+
 
 def _handle_auth_ready(raw_payload: bytes) -> None:
     """Handle OAuth auth-ready notification from JCC.
@@ -860,21 +904,6 @@ def _handle_k2_provision(raw_payload: bytes) -> None:
             _ack_k2_provision(request_id, success=False, error=str(e))
 
 
-# Persistent event loop for device protocol calls. Protocols like Apple TV
-# store pairing state (pyatv objects) that are bound to the event loop they
-# were created on. Creating a new loop per call killed the pairing connection
-# between pair_start and pair_finish.
-_device_protocol_loop: Optional[asyncio.AbstractEventLoop] = None
-
-
-def _get_device_protocol_loop() -> asyncio.AbstractEventLoop:
-    """Return a persistent event loop for device protocol async calls."""
-    global _device_protocol_loop
-    if _device_protocol_loop is None or _device_protocol_loop.is_closed():
-        _device_protocol_loop = asyncio.new_event_loop()
-    return _device_protocol_loop
-
-
 def _handle_device_protocol_control(action_name: str, context: Dict[str, Any], reply_id: str) -> None:
     """Dispatch device control directly to a device protocol (no command needed).
 
@@ -918,10 +947,11 @@ def _handle_device_protocol_control(action_name: str, context: Dict[str, Any], r
             mac_address=context.get("mac_address"),
         )
 
-        # Use persistent loop so protocol objects (e.g. pyatv pairing sessions)
-        # survive across sequential calls like pair_start → pair_finish.
-        loop = _get_device_protocol_loop()
-        result = loop.run_until_complete(protocol.control(device, action_name, context))
+        # Run on the node-wide runtime loop. Protocols like Apple TV store
+        # pairing state (pyatv objects) bound to the loop they were created
+        # on, so pair_start → pair_finish must share one long-lived loop.
+        result = get_async_runtime().run(protocol.control(device, action_name, context))
+        get_device_state_cache().invalidate_threadsafe(entity_id)
         print(f"[ACTION] device protocol control: {protocol_name} {action_name} success={result.success}", flush=True)
         input_req = result.input_required.to_dict() if result.input_required else None
         _post_action_result(reply_id, result.success, result.error if not result.success else None, input_required=input_req)
@@ -958,7 +988,7 @@ def _ack_k2_provision(request_id: str, success: bool = True, error: str | None =
 
 
 def _handle_config_push_notification(raw_payload: bytes) -> None:
-    """Handle config push MQTT notification — triggers polling in background."""
+    """Handle config push MQTT notification — applies inline pushes or polls, in background."""
     try:
         notification: Dict[str, Any] = json.loads(raw_payload.decode())
     except json.JSONDecodeError:
@@ -968,14 +998,14 @@ def _handle_config_push_notification(raw_payload: bytes) -> None:
     config_type: str = notification.get("config_type", "unknown")
     logger.info("Config push notification received", config_type=config_type)
 
-    thread = threading.Thread(target=_process_config_push, daemon=True)
+    thread = threading.Thread(target=_process_config_push, args=(notification,), daemon=True)
     thread.start()
 
 
-def _process_config_push() -> None:
-    """Process pending config pushes (runs in background thread)."""
+def _process_config_push(notification: Dict[str, Any]) -> None:
+    """Process config pushes (runs in background thread)."""
     try:
-        count: int = process_pending_configs()
+        count: int = process_config_push(notification)
         logger.info("Config push processing complete", processed=count)
     except Exception as e:
         logger.error("Config push processing failed", error=str(e))
@@ -1092,7 +1122,7 @@ def _handle_camera_credentials_notification(raw_payload: bytes) -> None:
 
 
 def _handle_package_install_notification(raw_payload: bytes) -> None:
-    """Handle package install request from CC — runs install in background thread."""
+    """Handle package install request from CC — runs install on the background pool."""
     try:
         notification: Dict[str, Any] = json.loads(raw_payload.decode())
     except json.JSONDecodeError:
@@ -1103,6 +1133,7 @@ def _handle_package_install_notification(raw_payload: bytes) -> None:
     command_name: str = notification.get("command_name", "")
     github_repo_url: str = notification.get("github_repo_url", "")
     git_tag: str | None = notification.get("git_tag")
+    archive_sha256: str | None = notification.get("archive_sha256")
 
     if not request_id or not github_repo_url:
         print(f"[INSTALL] missing request_id or github_repo_url, ignoring", flush=True)
@@ -1112,17 +1143,16 @@ def _handle_package_install_notification(raw_payload: bytes) -> None:
 
     from services.package_install_handler import run_install_and_upload
 
-    thread = threading.Thread(
-        target=run_install_and_upload,
-        args=(request_id, command_name, github_repo_url, git_tag),
-        daemon=True,
+    run_in_background(
+        run_install_and_upload,
+        request_id, command_name, github_repo_url, git_tag, archive_sha256,
+        name="package_install", lane="long",
     )
-    thread.start()
-    print(f"[INSTALL] thread started", flush=True)
+    print("[INSTALL] queued", flush=True)
 
 
 def _handle_package_uninstall_notification(raw_payload: bytes) -> None:
-    """Handle package uninstall request from CC — runs uninstall in background thread."""
+    """Handle package uninstall request from CC — runs uninstall on the background pool."""
     try:
         notification: Dict[str, Any] = json.loads(raw_payload.decode())
     except json.JSONDecodeError:
@@ -1140,13 +1170,8 @@ def _handle_package_uninstall_notification(raw_payload: bytes) -> None:
 
     from services.package_install_handler import run_uninstall_and_upload
 
-    thread = threading.Thread(
-        target=run_uninstall_and_upload,
-        args=(request_id, command_name),
-        daemon=True,
-    )
-    thread.start()
-    print("[UNINSTALL] thread started", flush=True)
+    run_in_background(run_uninstall_and_upload, request_id, command_name, name="package_uninstall")
+    print("[UNINSTALL] queued", flush=True)
 
 
 def _post_factory_reset_status(
@@ -1334,7 +1359,7 @@ def _handle_factory_reset(raw_payload: bytes) -> None:
 
 
 def _handle_test_install_notification(raw_payload: bytes) -> None:
-    """Handle test install nudge from CC — verify and install in background thread."""
+    """Handle test install nudge from CC — verify and install on the background pool."""
     try:
         notification: Dict[str, Any] = json.loads(raw_payload.decode())
     except json.JSONDecodeError:
@@ -1350,16 +1375,11 @@ def _handle_test_install_notification(raw_payload: bytes) -> None:
 
     from services.test_install_handler import run_test_install_and_upload
 
-    thread = threading.Thread(
-        target=run_test_install_and_upload,
-        args=(request_id,),
-        daemon=True,
-    )
-    thread.start()
+    run_in_background(run_test_install_and_upload, request_id, name="test_install", lane="long")
 
 
 def _handle_device_scan_notification(raw_payload: bytes) -> None:
-    """Handle device scan request from CC — runs scan in background thread."""
+    """Handle device scan request from CC — runs scan on the background pool."""
     try:
         notification: Dict[str, Any] = json.loads(raw_payload.decode())
     except json.JSONDecodeError:
@@ -1375,11 +1395,25 @@ def _handle_device_scan_notification(raw_payload: bytes) -> None:
 
     from services.device_scan_handler import run_scan_and_upload
 
-    thread = threading.Thread(target=run_scan_and_upload, args=(request_id,), daemon=True)
-    thread.start()
+    run_in_background(run_scan_and_upload, request_id, name="device_scan")
 
 
 def on_message(client: mqtt.Client, userdata: Any, msg: mqtt.MQTTMessage) -> None:
+    # Wake claims first: they are on the hot path of every wake in the house.
+    if msg.topic.startswith("jarvis/households/") and msg.topic.endswith("/wake"):
+        from core.wake_arbitration import get_wake_arbiter
+
+        arbiter = get_wake_arbiter()
+        if arbiter is not None:
+            arbiter.receive(msg.payload)
+        return
+
+    if msg.topic.startswith("jarvis/households/") and "/tts-cache/" in msg.topic:
+        from services.tts_peer_cache import get_tts_cache
+
+        get_tts_cache().receive(msg.topic, msg.payload)
+        return
+
     print(f"[MQTT] message on {msg.topic}", flush=True)
     # Route by topic — auth-ready notifications from JCC OAuth flow
     if msg.topic.startswith("jarvis/auth/") and msg.topic.endswith("/ready"):
@@ -1461,22 +1495,100 @@ def on_message(client: mqtt.Client, userdata: Any, msg: mqtt.MQTTMessage) -> Non
             logger.warning("Unknown MQTT command", command=command)
 
 
-_HEARTBEAT_INTERVAL_SECONDS = 300  # 5 minutes
+def _thread_status() -> Optional[Dict[str, bool]]:
+    if _tracked_threads is None:
+        return None
+    thread_status: Dict[str, bool] = {}
+    for name, entry in _tracked_threads.items():
+        thread_obj = entry[0] if isinstance(entry, tuple) else entry
+        thread_status[name] = thread_obj.is_alive() if hasattr(thread_obj, "is_alive") else False
+    return thread_status
 
 
-def _heartbeat_loop() -> None:
-    """Periodically POST heartbeat to command center to update last_seen.
+def _heartbeat_state() -> Tuple[Any, ...]:
+    """What the CC needs to hear about promptly when it changes."""
+    from core.runtime_state import is_busy
+    from services.update_service import update_status
 
-    The response may carry a `pending_update` block the CC wants us to apply;
-    the handler in update_service picks that up (added in a later step — for
-    now the response is ignored).
-    """
+    return (is_busy(), update_status(), tuple(sorted((_thread_status() or {}).items())))
+
+
+def _send_heartbeat(reason: str) -> bool:
+    """POST one heartbeat (with telemetry since the last one). True if CC accepted it."""
     from clients.rest_client import RestClient
     from core.runtime_state import is_busy
+    from core.telemetry import Telemetry, get_telemetry
     from core.version import version_info
-    from services.update_service import maybe_apply_update
+    from services.heartbeat_scheduler import get_heartbeat_scheduler
+    from services.update_service import maybe_apply_update, update_status
     from utils.service_discovery import get_command_center_url
 
+    base_url: str = get_command_center_url() or ""
+    if not base_url:
+        return False
+    url = f"{base_url.rstrip('/')}/api/v0/admin/nodes/heartbeat"
+
+    telemetry = get_telemetry()
+    snapshot = telemetry.snapshot()
+    data: Dict[str, Any] = {
+        "version_info": version_info().to_dict(),
+        "is_busy": is_busy(),
+        "update_status": update_status(),
+        "heartbeat": {"reason": reason, **get_heartbeat_scheduler().stats()},
+        "telemetry": Telemetry.payload(snapshot),
+    }
+    thread_status = _thread_status()
+    if thread_status is not None:
+        data["thread_status"] = thread_status
+    runtime_stats = get_async_runtime_stats()
+    if runtime_stats is not None:
+        data["async_runtime"] = runtime_stats
+    state_cache_stats = get_device_state_cache_stats()
+    if state_cache_stats is not None:
+        data["device_state_cache"] = state_cache_stats
+    config_push_stats = get_config_push_stats()
+    if config_push_stats is not None:
+        data["config_push"] = config_push_stats
+    chunked_stats = get_chunked_response_stats()
+    if chunked_stats is not None:
+        data["chunked_responses"] = chunked_stats
+    music_stats = get_music_assistant_session_stats()
+    if music_stats is not None:
+        data["music_assistant"] = music_stats
+    arbitration_stats = get_wake_arbiter_stats()
+    if arbitration_stats is not None:
+        data["wake_arbitration"] = arbitration_stats
+    tts_cache_stats = get_tts_cache_stats()
+    if tts_cache_stats is not None:
+        data["tts_cache"] = tts_cache_stats
+    execution_stats = get_execution_policy_stats()
+    if execution_stats is not None:
+        data["execution_policy"] = execution_stats
+
+    response = RestClient.post(url, data=data, timeout=10)
+    if response is None:
+        return False
+    telemetry.commit(snapshot)
+    # CC may return a pending_update block when the mobile app has
+    # queued an upgrade. Hand it off to update_service, which forks
+    # a detached installer and lets systemd do the restart dance.
+    if isinstance(response, dict):
+        pending = response.get("pending_update")
+        if pending:
+            maybe_apply_update(pending)
+    return True
+
+
+def _heartbeat_loop() -> None:
+    """POST heartbeats to command center to update last_seen and report stats.
+
+    Event-driven (see services/heartbeat_scheduler.py): sent immediately
+    when busy/idle, update status or thread health changes, otherwise on
+    an interval that backs off while nothing changes. Each heartbeat
+    carries the telemetry summary for the interval since the last one.
+    """
+    from services.heartbeat_scheduler import get_heartbeat_scheduler
+
     # Initial delay: let service discovery initialize
     if _shutdown_event is not None:
         _shutdown_event.wait(timeout=10)
@@ -1485,37 +1597,20 @@ def _heartbeat_loop() -> None:
     else:
         time.sleep(10)
 
+    scheduler = get_heartbeat_scheduler()
     while not (_shutdown_event is not None and _shutdown_event.is_set()):
         try:
-            base_url: str = get_command_center_url() or ""
-            if base_url:
-                url = f"{base_url.rstrip('/')}/api/v0/admin/nodes/heartbeat"
-
-                data: Dict[str, Any] = {
-                    "version_info": version_info().to_dict(),
-                    "is_busy": is_busy(),
-                }
-                if _tracked_threads is not None:
-                    thread_status: Dict[str, bool] = {}
-                    for name, entry in _tracked_threads.items():
-                        thread_obj = entry[0] if isinstance(entry, tuple) else entry
-                        thread_status[name] = thread_obj.is_alive() if hasattr(thread_obj, "is_alive") else False
-                    data["thread_status"] = thread_status
-
-                response = RestClient.post(url, data=data, timeout=10)
-                # CC may return a pending_update block when the mobile app has
-                # queued an upgrade. Hand it off to update_service, which forks
-                # a detached installer and lets systemd do the restart dance.
-                if response and isinstance(response, dict):
-                    pending = response.get("pending_update")
-                    if pending:
-                        maybe_apply_update(pending)
+            state = _heartbeat_state()
+            reason = scheduler.due(state)
+            if reason is not None:
+                try:
+                    ok = _send_heartbeat(reason)
+                except Exception:
+                    ok = False  # Heartbeat is best-effort; the scheduler backs off and retries
+                scheduler.sent(state, reason, ok=ok)
         except Exception:
-            pass  # Heartbeat is best-effort, retries next interval
-        if _shutdown_event is not None:
-            _shutdown_event.wait(timeout=_HEARTBEAT_INTERVAL_SECONDS)
-        else:
-            time.sleep(_HEARTBEAT_INTERVAL_SECONDS)
+            pass
+        scheduler.wait()
 
 
 _TEST_CLEANUP_INTERVAL_SECONDS = 1200  # 20 minutes
@@ -1550,7 +1645,7 @@ def start_mqtt_listener(ma_service: MusicAssistantService) -> None:
     # Start heartbeat thread before MQTT (runs even if broker is unreachable)
     heartbeat_thread = threading.Thread(target=_heartbeat_loop, daemon=True)
     heartbeat_thread.start()
-    logger.info("Heartbeat thread started", interval_seconds=_HEARTBEAT_INTERVAL_SECONDS)
+    logger.info("Heartbeat thread started")
 
     # Start test command cleanup thread (removes expired test installs every 20 min)
     cleanup_thread = threading.Thread(target=_test_command_cleanup_loop, daemon=True)
@@ -2,6 +2,7 @@
 import argparse
 import json
 import os
+import platform
 import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -14,6 +15,7 @@ from clients.jarvis_command_center_client import JarvisCommandCenterClient
 from clients.rest_client import RestClient
 from utils.command_discovery_service import get_command_discovery_service
 from utils.config_service import Config
+from utils.tool_router import DEFAULT_CONFIDENCE_THRESHOLD
 
 
 def _repo_root() -> Path:
@@ -72,6 +74,79 @@ def _build_available_commands(date_context) -> List[Dict[str, Any]]:
     return sorted(available_commands, key=lambda c: c.get("command_name", ""))
 
 
+def _extra_jsonl_entries(content: Optional[str]) -> List[Dict[str, str]]:
+    entries: List[Dict[str, str]] = []
+    for line in (content or "").splitlines():
+        line = line.strip()
+        if line:
+            entries.append(json.loads(line))
+    return entries
+
+
+def _train_local(args: argparse.Namespace) -> None:
+    """Train the on-node router artifact and report accuracy + latency.
+
+    Accuracy is reported both on the training set and k-fold held out —
+    with a few hundred utterances a linear model memorises the training
+    set, so the held-out numbers are the ones to trust. Latency is
+    measured on this machine; run it on the Pi to get Pi numbers.
+    """
+    from utils.tool_router import (
+        cross_validate_tool_router,
+        evaluate_tool_router,
+        get_tool_router_model_path,
+        train_tool_router,
+    )
+
+    test_entries: List[Dict[str, str]] = []
+    if not args.no_test_utterances:
+        # Date context only changes expected params, not tool names, so
+        # the offline fallback is fine for routing data.
+        test_entries = _load_test_utterances(None)
+
+    extra_entries: List[Dict[str, str]] = []
+    if not args.no_extra_jsonl:
+        extra_entries = _extra_jsonl_entries(_load_extra_jsonl(args.extra_jsonl))
+
+    entries = _dedupe_entries(test_entries + extra_entries)
+    if not entries:
+        raise SystemExit("No training utterances.")
+
+    model = train_tool_router(entries)
+    output = Path(args.local_output) if args.local_output else get_tool_router_model_path()
+    model.save(output)
+
+    train_eval = evaluate_tool_router(model, entries, args.threshold)
+    suite_eval = evaluate_tool_router(model, test_entries, args.threshold) if test_entries else None
+    cv_eval = cross_validate_tool_router(entries, folds=args.cv_folds, threshold=args.threshold)
+
+    def _summary(result) -> Dict[str, Any]:
+        return {
+            "total": result.total,
+            "accuracy": round(result.accuracy, 4),
+            "confident": result.confident,
+            "confident_accuracy": round(result.confident_accuracy, 4),
+            "latency_p50_ms": round(result.latency_p50_ms, 3),
+            "latency_p95_ms": round(result.latency_p95_ms, 3),
+        }
+
+    report: Dict[str, Any] = {
+        "artifact": str(output),
+        "artifact_bytes": output.stat().st_size,
+        "labels": model.labels,
+        "threshold": args.threshold,
+        "machine": platform.machine(),
+        "train": _summary(train_eval),
+        "cross_validated": _summary(cv_eval),
+        "cross_validated_confident_misses": [
+            m for m in cv_eval.misses if float(m["confidence"]) >= args.threshold
+        ],
+    }
+    if suite_eval is not None:
+        report["test_command_parsing"] = _summary(suite_eval)
+    print(json.dumps(report, indent=2))
+
+
 def main() -> None:
     default_jsonl = _repo_root() / "training" / "tool_router_extra_utterances.jsonl"
     parser = argparse.ArgumentParser(description="Train tool router via JCC endpoint.")
@@ -104,8 +179,25 @@ def main() -> None:
     parser.add_argument("--word-ngrams", type=int, help="FastText word ngrams.")
     parser.add_argument("--timeout", type=int, default=120, help="Request timeout.")
     parser.add_argument("--dry-run", action="store_true", help="Print payload and exit.")
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Train the on-node router artifact instead of calling the JCC endpoint.",
+    )
+    parser.add_argument(
+        "--local-output",
+        help="Where to write the on-node router artifact (default: tool_router_model_path).",
+    )
+    parser.add_argument("--cv-folds", type=int, default=5, help="Folds for held-out accuracy (--local).")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_CONFIDENCE_THRESHOLD, help="Confidence threshold to report against (--local).",
+    )
     args = parser.parse_args()
 
+    if args.local:
+        _train_local(args)
+        return
+
     base_url = Config.get_str("jarvis_command_center_api_url")
     if not base_url:
         raise SystemExit("Missing jarvis_command_center_api_url in config.")
@@ -5,28 +5,33 @@ import sys
 import threading
 import time
 import uuid
+from collections import deque
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Callable, Dict, Iterator
 
-import numpy as np
 import openwakeword
 from openwakeword.model import Model as OWWModel
 import pyaudio
-from scipy.signal import resample_poly
 from jarvis_log_client import JarvisLogger
 
-from clients.rest_client import RestClient
 from core.audio_bus import AudioBus
 from core.barge_in import BargeInMonitor
+from core.capture_process import DEFAULT_RING_SECS, CaptureProcessAudio
+from core.execution_policy import get_execution_policy
+from core.runtime_state import mark_active
+from core.telemetry import get_telemetry
+from core.wake_arbitration import get_wake_arbiter
+from core.wake_scorer import WakeScorer
+from core.wake_words import WakeEvent, WakeWordDetector, load_wake_word_specs
 from core.helpers import get_tts_provider, get_stt_provider, get_wake_response_provider
 from core.platform_audio import platform_audio
 from scripts.speech_to_text import RecordingResult, listen, listen_for_follow_up
 from services.alert_queue_service import get_alert_queue_service
+from services.tts_peer_cache import get_tts_cache
 from utils.config_service import Config
 from utils.command_execution_service import CommandExecutionService
 from utils.encryption_utils import get_cache_dir
-from utils.service_discovery import get_command_center_url
 from clients.responses.jarvis_command_center import ValidationRequest
 
 logger = JarvisLogger(service="jarvis-node")
@@ -48,8 +53,11 @@ _PROCESSING_ACK_POOL: list[str] = [
     "Give me a second.",
 ]
 
-WAKE_WORD_MODEL = Config.get_str("wake_word_model", "hey_jarvis") or "hey_jarvis"
-WAKE_WORD_THRESHOLD = Config.get_float("wake_word_threshold", 0.4)
+# One or more wake words, each with its own threshold and debounce
+# (``wake_words`` config; falls back to wake_word_model/wake_word_threshold).
+WAKE_WORDS = load_wake_word_specs()
+WAKE_WORD_MODELS = [spec.model for spec in WAKE_WORDS]
+_WAKE_PROMPT = " / ".join(spec.display_name for spec in WAKE_WORDS)
 
 # Barge-in: allow interrupting TTS with wake word
 BARGE_IN_ENABLED = Config.get_str("barge_in_enabled", "true").lower() in ("true", "1", "yes")
@@ -150,6 +158,32 @@ def _run_warmup(
         result["success"] = False
 
 
+def _begin_turn_warmup(
+    command_service: CommandExecutionService,
+) -> tuple[str, threading.Thread | None, dict]:
+    """Get a conversation ready for this turn.
+
+    Checks out a pre-registered conversation from the warm pool; on a miss
+    falls back to registering one in a background thread during recording.
+
+    Returns:
+        (conversation_id, warmup_thread or None, warmup_result)
+    """
+    conversation_id = command_service.checkout_warm_conversation(_last_speaker_user_id)
+    if conversation_id is not None:
+        return conversation_id, None, {"success": True, "pooled": True}
+
+    conversation_id = str(uuid.uuid4())
+    warmup_result: dict = {"success": False}
+    warmup_thread = threading.Thread(
+        target=_run_warmup,
+        args=(command_service, conversation_id, _last_speaker_user_id, warmup_result),
+        daemon=True,
+    )
+    warmup_thread.start()
+    return conversation_id, warmup_thread, warmup_result
+
+
 def _bundled_wake_chimes() -> list[Path]:
     """List the pre-generated wake chime WAVs bundled with the node."""
     if not _WAKE_CHIMES_DIR.exists():
@@ -297,16 +331,9 @@ def fetch_next_wake_response():
         WAKE_FILE.write_text(response_text)
         logger.debug("Stored next wake response", response=response_text)
 
-        # Pre-generate audio so next wake word plays instantly
-        command_center_url = get_command_center_url()
-        if not command_center_url:
-            return
-
-        audio_bytes: bytes | None = RestClient.post_binary(
-            f"{command_center_url}/api/v0/media/tts/speak",
-            data={"text": response_text},
-            timeout=30,
-        )
+        # Pre-generate audio so next wake word plays instantly (household
+        # peers may already hold it — see services/tts_peer_cache.py)
+        audio_bytes: bytes | None = get_tts_cache().synthesize(response_text, timeout=30)
         if audio_bytes:
             original_size = len(audio_bytes)
             try:
@@ -351,20 +378,13 @@ def _fetch_next_processing_ack() -> None:
     """Pre-generate a processing ack WAV for the next interaction.
 
     Mirrors :func:`fetch_next_wake_response` — picks a random short ack,
-    synthesises audio via TTS, and caches it to disk so the next wake
-    cycle can play it instantly after recording ends.
+    synthesises audio via the shared TTS cache (the pool is small, so after
+    warm-up this rarely reaches the TTS server), and stages it on disk so
+    the next wake cycle can play it instantly after recording ends.
     """
     try:
-        command_center_url = get_command_center_url()
-        if not command_center_url:
-            return
-
         text = random.choice(_PROCESSING_ACK_POOL)
-        audio_bytes: bytes | None = RestClient.post_binary(
-            f"{command_center_url}/api/v0/media/tts/speak",
-            data={"text": text},
-            timeout=15,
-        )
+        audio_bytes: bytes | None = get_tts_cache().synthesize(text, timeout=15)
         if audio_bytes:
             PROCESSING_ACK_FILE.write_bytes(audio_bytes)
             logger.debug("Cached processing ack audio", text=text, size_bytes=len(audio_bytes))
@@ -543,7 +563,7 @@ def _follow_up_loop(
     command_service: CommandExecutionService,
     stt_provider,
     validation_handler: Callable[[ValidationRequest], str],
-    oww=None,
+    barge_in: BargeInMonitor | None = None,
     tts_end_ts: float | None = None,
 ) -> None:
     """Listen for follow-up speech after TTS completes.
@@ -552,9 +572,9 @@ def _follow_up_loop(
     continuation of the conversation. Each successful follow-up restarts
     the timer. Silence or error breaks out to wake word mode.
 
-    If ``oww`` is provided, barge-in monitoring is active during TTS
-    playback — the wake word interrupts the response and returns to the
-    main wake detection loop.
+    If ``barge_in`` is provided, it is armed during TTS playback — the
+    wake word interrupts the response and returns to the main wake
+    detection loop.
     """
     # Default bumped 5→10s on 2026-04-25: the window opens as soon as the
     # caller returns from playing the response, but in practice the user
@@ -569,13 +589,12 @@ def _follow_up_loop(
     if initial_result and initial_result.get("success"):
         conversation_id = initial_result.get("conversation_id")
 
-    # The AudioBus ring buffer is already capturing post-TTS audio. Track
-    # when TTS ended so each iteration can ask the bus for "everything
-    # since then" via history_secs, capping at the bus's 2s ring capacity.
-    # Without this, anything the user said in the gap between TTS-end and
-    # listener-attach (~1.5s typical, dominated by barge_in.stop drain)
-    # was lost. The caller passes its own measurement of "TTS just ended"
-    # because by the time we're called the gap may already be ~1.5s old.
+    # The AudioBus ring buffer is already capturing post-TTS audio. Each
+    # iteration asks the bus for everything since TTS ended via
+    # history_secs (capped at the bus's 2s ring capacity), so speech in
+    # the gap before the listener attaches isn't lost. The caller stamps
+    # ``tts_end_ts`` when playback returns; later iterations re-stamp it
+    # after each follow-up response.
     if tts_end_ts is None:
         tts_end_ts = time.monotonic()
     iteration = 0
@@ -616,15 +635,9 @@ def _follow_up_loop(
         speaker_user_id = transcription_result.speaker_user_id
         logger.info("Follow-up speech received", text=text, conversation_id=conversation_id)
 
-        # Start barge-in monitor for TTS playback (if OWW available)
-        barge_in: BargeInMonitor | None = None
-        if oww and BARGE_IN_ENABLED:
-            barge_in = BargeInMonitor(
-                bus, oww, WAKE_WORD_MODEL,
-                threshold=BARGE_IN_THRESHOLD,
-                energy_threshold=BARGE_IN_ENERGY_THRESHOLD,
-            )
-            barge_in.start()
+        # Arm barge-in for TTS playback (if OWW available)
+        if barge_in:
+            barge_in.arm()
 
         try:
             # Try pre-routing first (e.g., "stop", "pause")
@@ -648,12 +661,8 @@ def _follow_up_loop(
                 command_service.speak_result(result)
                 conversation_id = result.get("conversation_id") if result.get("success") else None
 
-            # Capture TTS-end timestamp HERE (right after speak_result), not
-            # after the finally block. barge_in.stop() routinely takes ~1.5s
-            # to drain (oww.reset + thread.join), and that 1.5s is exactly
-            # the window the user uses to start their next follow-up. If we
-            # mark tts_end_ts after the finally, elapsed≈0 → history_secs≈0
-            # → the user's speech in the gap is dropped on iter 2+.
+            # Capture TTS-end timestamp HERE (right after speak_result):
+            # anything the user says from now on is a follow-up candidate.
             tts_end_ts = time.monotonic()
 
         except Exception as e:
@@ -661,7 +670,7 @@ def _follow_up_loop(
             break
         finally:
             if barge_in:
-                barge_in.stop()
+                barge_in.disarm()
 
         if barge_in and barge_in.was_interrupted:
             logger.info("Barge-in during follow-up, returning to wake word mode")
@@ -739,6 +748,26 @@ def _drain_alert_announcements(
     return True
 
 
+def _new_audio_bus() -> AudioBus:
+    """Mic bus for the node.
+
+    With ``audio_capture_process: true`` the mic is read by a child
+    process and handed over through shared memory, so GIL stalls in the
+    node can't overrun the ALSA buffer (see ``core.capture_process``).
+    """
+    if not Config.get_bool("audio_capture_process", False):
+        return AudioBus(rate=MIC_RATE, chunk_samples=MIC_CHUNK, history_secs=2.0)
+    capture = CaptureProcessAudio(
+        ring_secs=Config.get_float("audio_capture_ring_secs", DEFAULT_RING_SECS),
+        plan=get_execution_policy().plan("audio").to_dict(),
+    )
+    get_telemetry().gauge("audio_capture", capture.stats)
+    return AudioBus(
+        rate=MIC_RATE, chunk_samples=MIC_CHUNK, history_secs=2.0,
+        pyaudio_factory=lambda: capture,
+    )
+
+
 def _start_keyboard_listener(bus: AudioBus | None = None) -> None:
     """Fallback listener: press Enter to trigger a command (no wake word).
 
@@ -751,10 +780,12 @@ def _start_keyboard_listener(bus: AudioBus | None = None) -> None:
 
     owns_bus = bus is None
     if bus is None:
-        bus = AudioBus(rate=MIC_RATE, chunk_samples=MIC_CHUNK, history_secs=2.0)
+        get_execution_policy()
+        bus = _new_audio_bus()
         bus.start()
 
     command_service = CommandExecutionService()
+    command_service.conversation_pool.start()
     stt_provider = get_stt_provider()
     validation_handler = _make_validation_handler(bus, stt_provider)
 
@@ -766,15 +797,8 @@ def _start_keyboard_listener(bus: AudioBus | None = None) -> None:
             except Exception as e:
                 logger.warning("Wake response TTS failed, continuing", error=str(e))
 
-            # Parallel warmup during recording
-            conversation_id = str(uuid.uuid4())
-            warmup_result: dict = {"success": False}
-            warmup_thread = threading.Thread(
-                target=_run_warmup,
-                args=(command_service, conversation_id, _last_speaker_user_id, warmup_result),
-                daemon=True,
-            )
-            warmup_thread.start()
+            # Warm conversation from the pool, else parallel warmup during recording
+            conversation_id, warmup_thread, warmup_result = _begin_turn_warmup(command_service)
 
             recording = listen(bus, history_secs=0.0, skip_secs=0.3)
 
@@ -815,25 +839,31 @@ def start_voice_listener(ma_service):
     stream. This eliminates the concurrent-dsnoop-open race that caused
     BLANK_AUDIO captures in the pre-AudioBus implementation.
 
+    One ``WakeScorer`` owns the openWakeWord model: it subscribes to the
+    bus, downsamples to 16 kHz, scores every frame once and fans the
+    scores out to the wake loop and barge-in.
+
     Flow per iteration:
-      1. Subscribe ``wake`` on the bus (48 kHz chunks).
-      2. Downsample each chunk to 16 kHz and score with openWakeWord.
-      3. On wake, unsubscribe ``wake`` so the wake detector doesn't
-         fight the command listener for the queue.
+      1. Subscribe ``wake`` on the scorer and request a model reset.
+      2. Wait for a post-reset score above the wake threshold.
+      3. On wake, unsubscribe ``wake`` so stale scores don't queue up
+         while the command is handled.
       4. Play wake response (blocking TTS).
       5. Record the command via ``listen(bus, history_secs=0.0, skip_secs=0.3)`` —
          the 0.3s skip dodges TTS-tail bleed / AEC recovery without
          replaying the tail of the wake response into the recording
          (which would otherwise cause the node to transcribe its own
          TTS and respond to itself — "talking to itself" bug).
-      6. Start barge-in monitor (also a bus subscriber) during
-         STT → CC → TTS response playback.
+      6. Arm the long-lived barge-in monitor (a second subscriber on the
+         shared scorer) during STT → CC → TTS response playback.
       7. On barge-in OR normal completion, run the follow-up loop.
       8. Back to step 1 with a fresh ``wake`` subscription.
     """
     try:
-        openwakeword.utils.download_models(model_names=[WAKE_WORD_MODEL])
-        oww = OWWModel(wakeword_models=[WAKE_WORD_MODEL], inference_framework="onnx")
+        openwakeword.utils.download_models(model_names=WAKE_WORD_MODELS)
+        # All wake words in one model: the front-end runs once per frame
+        # and only the per-word heads are repeated.
+        oww = OWWModel(wakeword_models=WAKE_WORD_MODELS, inference_framework="onnx")
     except Exception as e:
         logger.warning("openWakeWord init failed, falling back to keyboard trigger", error=str(e))
         if sys.stdin and sys.stdin.isatty():
@@ -842,12 +872,16 @@ def start_voice_listener(ma_service):
             logger.error("No TTY available for keyboard fallback, exiting")
         return
 
+    # Before any audio thread starts: the bus producer and the wake
+    # scorer pick up their scheduling role from it.
+    get_execution_policy()
+
     # Retry bus start — USB mic may not be ready immediately after boot.
     _audio_retry_delays: list[int] = [2, 2, 5, 5, 10, 10, 15, 15, 30, 30, 30, 30]
     bus: AudioBus | None = None
     for attempt, delay in enumerate(_audio_retry_delays):
         try:
-            bus = AudioBus(rate=MIC_RATE, chunk_samples=MIC_CHUNK, history_secs=2.0)
+            bus = _new_audio_bus()
             bus.start()
             break
         except OSError as e:
@@ -872,24 +906,42 @@ def start_voice_listener(ma_service):
     # audio (e.g. MQTT-triggered voice enrollment).
     global _audio_bus
     _audio_bus = bus
+    # Drops, consumer lag, overruns and producer jitter ride on the
+    # heartbeat — the first place CPU starvation shows up.
+    get_telemetry().gauge("audio_bus", bus.stats)
 
     command_service = CommandExecutionService()
     stt_provider = get_stt_provider()
     validation_handler = _make_validation_handler(bus, stt_provider)
 
-    # Pre-warm the LLM's KV cache and processing ack on boot.
-    threading.Thread(
-        target=_run_warmup,
-        args=(command_service, str(uuid.uuid4()), None, {}),
-        daemon=True,
-    ).start()
+    # One scorer runs openWakeWord per frame; wake detection and barge-in
+    # consume its scores instead of sharing (and resetting) the model.
+    scorer = WakeScorer(bus, oww)
+    scorer.start()
+
+    barge_in: BargeInMonitor | None = None
+    if BARGE_IN_ENABLED:
+        barge_in = BargeInMonitor(
+            scorer, WAKE_WORD_MODELS,
+            threshold=BARGE_IN_THRESHOLD,
+            energy_threshold=BARGE_IN_ENERGY_THRESHOLD,
+        )
+        barge_in.start()
+
+    # Pre-warm the LLM's KV cache and processing ack on boot. The pool's
+    # first fill is that warmup, and keeps a registered conversation ready.
+    command_service.conversation_pool.start()
     threading.Thread(target=_fetch_next_processing_ack, daemon=True).start()
 
-    logger.info("Waiting for wake word", model=WAKE_WORD_MODEL,
-                threshold=WAKE_WORD_THRESHOLD)
-    print(f"Ready — say '{WAKE_WORD_MODEL.replace('_', ' ')}' (threshold={WAKE_WORD_THRESHOLD})")
+    detector = WakeWordDetector(WAKE_WORDS)
+    # Household arbitration: several nodes hearing the same wake word let
+    # only the best-placed one answer. None when no household is configured.
+    arbiter = get_wake_arbiter()
+    telemetry = get_telemetry()
+    logger.info("Waiting for wake word",
+                models={spec.model: spec.threshold for spec in WAKE_WORDS})
+    print(f"Ready — say '{_WAKE_PROMPT}'")
 
-    resample_down = bus.rate // OWW_RATE  # 3 for 48 kHz → 16 kHz
     alert_check_interval = 60             # ~every 5s at 80 ms chunks
     alert_check_counter = 0
 
@@ -899,8 +951,14 @@ def start_voice_listener(ma_service):
             # barge-in prevents wake-response or other audio.
             platform_audio.reset_cancel()
 
-            wake_q = bus.subscribe("wake")
-            score = 0.0
+            wake_q = scorer.subscribe("wake")
+            # Fresh model context for every wait: drops the previous wake
+            # word / turn audio so it can't immediately re-trigger.
+            reset_epoch = scorer.request_reset()
+            wake: WakeEvent | None = None
+            # Peak speech energy over roughly the wake phrase (~0.8 s) —
+            # the arbitration claim's second signal after the score.
+            recent_rms: deque[int] = deque(maxlen=10)
             try:
                 was_paused = False
                 while True:
@@ -917,82 +975,76 @@ def start_voice_listener(ma_service):
                             has_announcements = False
                         if has_announcements:
                             # Let the alert drain run — it uses the bus too.
-                            break  # ← exits inner loop with score==0; see below
+                            break  # ← exits inner loop with wake=None; see below
 
                     try:
-                        raw_data = wake_q.get(timeout=0.5)
+                        event = wake_q.get(timeout=0.5)
                     except queue.Empty:
                         continue
 
-                    # While paused, drop the chunk and don't score it. The
-                    # queue still drains so we don't process stale audio
-                    # the moment we resume.
+                    # While paused, drop the scores. The queue still drains
+                    # so we don't act on stale frames the moment we resume.
                     if _wake_paused.is_set():
                         was_paused = True
                         continue
 
-                    # First chunk after a pause: reset the openWakeWord LSTM
+                    # First chunk after a pause: reset the openWakeWord
                     # state. Without this, residual context from before the
                     # pause (often the wake response audio echoing back)
                     # immediately re-triggers a wake event.
                     if was_paused:
-                        oww.reset()
+                        reset_epoch = scorer.request_reset()
                         was_paused = False
 
-                    samples = np.frombuffer(raw_data, dtype=np.int16)
-                    if resample_down > 1:
-                        resampled = resample_poly(samples, up=1, down=resample_down)
-                        samples = np.clip(resampled, -32768, 32767).astype(np.int16)
+                    if event.epoch < reset_epoch:
+                        continue
 
-                    predictions = oww.predict(samples)
-                    score = predictions.get(WAKE_WORD_MODEL, 0)
+                    recent_rms.append(event.rms)
+                    score = detector.max_score(event)
                     if score > 0.05:
-                        logger.debug(
-                            "Wake word score",
-                            score=round(float(score), 3),
-                            threshold=WAKE_WORD_THRESHOLD,
-                        )
-                    if score > WAKE_WORD_THRESHOLD:
+                        logger.debug("Wake word scores", scores={
+                            m: round(event.scores.get(m, 0.0), 3) for m in WAKE_WORD_MODELS
+                        })
+                    wake = detector.check(event)
+                    if wake is not None:
                         break
             finally:
-                bus.unsubscribe("wake")
+                scorer.unsubscribe("wake")
 
             # If we broke out without a wake (alert-drain case), handle
             # alerts and loop.
-            if score <= WAKE_WORD_THRESHOLD:
+            if wake is None:
                 try:
                     _drain_alert_announcements(
                         bus, command_service, stt_provider, validation_handler,
                     )
                 except Exception as e:
                     logger.warning("Alert drain failed", error=str(e))
-                oww.reset()
-                print(f"Ready — say '{WAKE_WORD_MODEL.replace('_', ' ')}'")
+                print(f"Ready — say '{_WAKE_PROMPT}'")
                 continue
 
-            oww.reset()
+            logger.info("Wake word detected", model=wake.model, score=round(wake.score, 3),
+                        threshold=wake.threshold, frame=wake.frame_cursor)
+
+            telemetry.counter("wakes").inc()
+            if arbiter is not None:
+                arbitration = arbiter.arbitrate(wake.score, max(recent_rms, default=0))
+                telemetry.histogram("wake_arbitration_ms").observe(arbitration.delay_ms)
+                if not arbitration.won:
+                    # Another node in the household is answering — go
+                    # straight back to listening (fresh scorer context).
+                    telemetry.counter("wakes_suppressed").inc()
+                    continue
+
+            mark_active()
 
             try:
-                handle_keyword_detected()
+                with telemetry.histogram("wake_response_ms").time():
+                    handle_keyword_detected()
             except Exception as e:
                 logger.warning("Wake response TTS failed, continuing", error=str(e))
 
-            conversation_id = str(uuid.uuid4())
-            warmup_result: dict = {"success": False}
-            warmup_thread = threading.Thread(
-                target=_run_warmup,
-                args=(command_service, conversation_id, _last_speaker_user_id, warmup_result),
-                daemon=True,
-            )
-            warmup_thread.start()
-
-            barge_in: BargeInMonitor | None = None
-            if BARGE_IN_ENABLED:
-                barge_in = BargeInMonitor(
-                    bus, oww, WAKE_WORD_MODEL,
-                    threshold=BARGE_IN_THRESHOLD,
-                    energy_threshold=BARGE_IN_ENERGY_THRESHOLD,
-                )
+            conversation_id, warmup_thread, warmup_result = _begin_turn_warmup(command_service)
 
             result = None
             try:
@@ -1004,7 +1056,7 @@ def start_voice_listener(ma_service):
                 ack_played = _play_processing_ack()
 
                 if barge_in:
-                    barge_in.start()
+                    barge_in.arm()
 
                 start = time.perf_counter()
                 result = send_for_transcription(
@@ -1018,21 +1070,22 @@ def start_voice_listener(ma_service):
                 # returns (which is right after speak_result completes).
                 # The follow-up loop uses this to know how far back to look
                 # in the bus history for speech the user uttered before the
-                # listener subscribed. barge_in.stop() in the finally below
-                # routinely costs ~1.5s — that 1.5s is exactly the gap users
-                # speak into.
+                # listener subscribed.
                 tts_end_ts = time.monotonic()
                 end = time.perf_counter()
+                telemetry.histogram("turn_ms").observe((end - start) * 1000)
                 logger.info("Transcription complete", duration_seconds=round(end - start, 2))
             except Exception as e:
+                telemetry.counter("turn_errors").inc()
                 logger.warning("Command processing failed, resuming listener", error=str(e))
                 print(f"Command failed: {e}")
                 tts_end_ts = time.monotonic()
             finally:
                 if barge_in:
-                    barge_in.stop()
+                    barge_in.disarm()
 
             if barge_in and barge_in.was_interrupted:
+                telemetry.counter("barge_ins").inc()
                 logger.info("Barge-in: TTS interrupted, returning to wake word")
                 platform_audio.reset_cancel()
                 # Don't try to capture a new command here — the user
@@ -1040,16 +1093,20 @@ def start_voice_listener(ma_service):
                 # wake word again when they're ready.
             else:
                 try:
-                    _follow_up_loop(bus, result, command_service, stt_provider, validation_handler, oww=oww, tts_end_ts=tts_end_ts)
+                    _follow_up_loop(bus, result, command_service, stt_provider, validation_handler, barge_in=barge_in, tts_end_ts=tts_end_ts)
                 except Exception as e:
                     logger.warning("Follow-up loop error, resuming wake word", error=str(e))
 
+            mark_active()  # idle timer counts from the end of the turn
             threading.Thread(target=_fetch_next_processing_ack, daemon=True).start()
-            print(f"Ready — say '{WAKE_WORD_MODEL.replace('_', ' ')}'")
+            print(f"Ready — say '{_WAKE_PROMPT}'")
 
     except KeyboardInterrupt:
         logger.info("Stopping voice listener")
     finally:
+        if barge_in:
+            barge_in.close()
+        scorer.stop()
         bus.stop()
         pa.terminate()
         del oww
@@ -6,10 +6,12 @@ Manages the lifecycle of IJarvisAgent implementations:
 - Runs agents on their configured schedules
 - Aggregates context data for voice request injection
 
-Uses asyncio event loop in a daemon thread (Pi Zero compatible).
+Runs on the node-wide AsyncRuntime loop (core.async_runtime), shared with
+device protocol calls and MQTT-triggered device queries.
 """
 
 import asyncio
+import concurrent.futures
 import threading
 import time
 from datetime import datetime, timezone
@@ -17,6 +19,7 @@ from typing import Any, Dict, Optional
 
 from jarvis_log_client import JarvisLogger
 
+from core.async_runtime import get_async_runtime
 from core.ijarvis_agent import IJarvisAgent
 from services.alert_queue_service import AlertQueueService
 from utils.agent_discovery_service import get_agent_discovery_service
@@ -30,11 +33,11 @@ SCHEDULER_CHECK_INTERVAL = 10
 class AgentSchedulerService:
     """Singleton service for scheduling and running background agents.
 
-    Creates a dedicated asyncio event loop in a daemon thread to run
-    async agents without blocking the main thread.
+    Runs its scheduling coroutine on the node-wide async runtime so
+    async agents never block the main thread.
 
     Thread safety:
-        - Agent runs happen in the asyncio thread
+        - Agent runs happen in the runtime thread
         - Context access (get_aggregated_context) is thread-safe via lock
         - Lifecycle methods (start, stop) are thread-safe
         - Running state uses threading.Event for thread-safe flag access
@@ -59,10 +62,12 @@ class AgentSchedulerService:
             self._agents: Dict[str, IJarvisAgent] = {}
             self._last_run: Dict[str, float] = {}  # agent_name -> timestamp
             self._context_cache: Dict[str, Dict[str, Any]] = {}
+            self._context_version = 0  # bumped on every context cache write
             self._context_lock = threading.Lock()
 
             self._loop: Optional[asyncio.AbstractEventLoop] = None
-            self._thread: Optional[threading.Thread] = None
+            self._thread: Optional[threading.Thread] = None  # the runtime thread while running
+            self._future: Optional[concurrent.futures.Future] = None
             self._running_event = threading.Event()  # Thread-safe running flag
             self._stop_event: Optional[asyncio.Event] = None
             self._alert_queue: Optional[AlertQueueService] = None
@@ -89,8 +94,8 @@ class AgentSchedulerService:
     def start(self) -> None:
         """Start the agent scheduler.
 
-        Discovers agents, creates the asyncio event loop, and starts
-        the background scheduler thread.
+        Discovers agents and submits the scheduler coroutine to the
+        node-wide async runtime.
         """
         if self._running:
             logger.warning("Agent scheduler already running")
@@ -106,10 +111,13 @@ class AgentSchedulerService:
 
         logger.info("Starting agent scheduler", agent_count=len(self._agents))
 
-        # Create and start the scheduler thread
+        runtime = get_async_runtime()
         self._running = True
-        self._thread = threading.Thread(target=self._run_event_loop, daemon=True)
-        self._thread.start()
+        self._loop = runtime.loop
+        self._thread = runtime.thread
+        self._stop_event = asyncio.Event()
+        self._future = runtime.submit(self._scheduler_loop())
+        self._future.add_done_callback(self._on_scheduler_done)
 
     def stop(self) -> None:
         """Stop the agent scheduler gracefully."""
@@ -119,30 +127,30 @@ class AgentSchedulerService:
         logger.info("Stopping agent scheduler")
         self._running = False
 
-        # Signal the event loop to stop
-        if self._loop and self._stop_event:
+        # Signal the scheduler coroutine to stop
+        if self._loop and self._stop_event and not self._loop.is_closed():
             self._loop.call_soon_threadsafe(self._stop_event.set)
 
-        # Wait for thread to finish (with timeout)
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=5.0)
+        # Wait for the coroutine to finish (with timeout); the runtime
+        # thread itself keeps running for other subsystems.
+        if self._future is not None and not get_async_runtime().in_runtime_thread():
+            try:
+                self._future.result(timeout=5.0)
+            except concurrent.futures.TimeoutError:
+                self._future.cancel()
+                logger.warning("Agent scheduler did not stop in time, cancelled")
+            except Exception:
+                pass  # already logged by _on_scheduler_done
 
         self._loop = None
         self._thread = None
+        self._future = None
         logger.info("Agent scheduler stopped")
 
-    def _run_event_loop(self) -> None:
-        """Run the asyncio event loop in the background thread."""
-        self._loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self._loop)
-        self._stop_event = asyncio.Event()
-
-        try:
-            self._loop.run_until_complete(self._scheduler_loop())
-        except Exception as e:
-            logger.error("Agent scheduler loop error", error=str(e))
-        finally:
-            self._loop.close()
+    @staticmethod
+    def _on_scheduler_done(future: concurrent.futures.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Agent scheduler loop error", error=str(future.exception()))
 
     async def _scheduler_loop(self) -> None:
         """Main scheduler loop - runs agents on their schedules."""
@@ -214,6 +222,7 @@ class AgentSchedulerService:
                 context = agent.get_context_data()
                 with self._context_lock:
                     self._context_cache[agent.name] = context
+                    self._context_version += 1
 
             # Collect alerts from the agent
             if self._alert_queue is not None:
@@ -238,6 +247,7 @@ class AgentSchedulerService:
                     "last_error": str(e),
                     "error_time": datetime.now(timezone.utc).isoformat()
                 }
+                self._context_version += 1
 
     def get_aggregated_context(self) -> Dict[str, Dict[str, Any]]:
         """Get aggregated context data from all agents.
@@ -250,6 +260,10 @@ class AgentSchedulerService:
         with self._context_lock:
             return self._context_cache.copy()
 
+    def get_context_version(self) -> int:
+        """Counter that changes whenever the aggregated context may have."""
+        return self._context_version
+
     def run_agent_now(self, agent_name: str) -> bool:
         """Trigger an immediate run of a specific agent.
 
@@ -268,11 +282,8 @@ class AgentSchedulerService:
             logger.warning("Scheduler not running, cannot trigger agent")
             return False
 
-        # Schedule the agent run on the event loop
-        asyncio.run_coroutine_threadsafe(
-            self._run_agent_safe(agent),
-            self._loop
-        )
+        # Schedule the agent run on the runtime loop
+        get_async_runtime().submit(self._run_agent_safe(agent))
         return True
 
     def update_agents(self, new_agents: Dict[str, IJarvisAgent]) -> None:
@@ -288,6 +299,7 @@ class AgentSchedulerService:
             removed = set(self._agents.keys()) - set(new_agents.keys())
             for name in removed:
                 self._context_cache.pop(name, None)
+                self._context_version += 1
                 logger.info("Removed stale agent context", agent=name)
             self._agents = new_agents
 
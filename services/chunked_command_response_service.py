@@ -1,9 +1,16 @@
+import bisect
+import threading
+import time
 import uuid
-from typing import Optional, Tuple
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from jarvis_log_client import JarvisLogger
 
 from db import SessionLocal
 from models.chunked_command_response import (
     ChunkedCommandResponse,
+    ChunkedContentUpdate,
     CreateChunkedCommandResponse,
     UpdateChunkedCommandResponse,
     ChunkedCommandResponseSession
@@ -11,32 +18,257 @@ from models.chunked_command_response import (
 from repositories.chunked_command_response_repository import ChunkedCommandResponseRepository
 from scripts.text_to_speech import speak
 
+logger = JarvisLogger(service="jarvis-node")
+
+# How often accumulated deltas are written behind to the database
+FLUSH_INTERVAL_SECONDS = 1.0
+# Fully persisted buffers untouched this long are dropped from memory;
+# they're reloaded from the database if anyone asks for them again
+BUFFER_IDLE_SECONDS = 300.0
+
+
+class _ResponseBuffer:
+    """
+    Append-only, in-memory content of one chunked response session.
+
+    Producers append chunks and notify ``cond``; speakers wait on it for
+    new content instead of polling the database. Deltas that haven't been
+    persisted yet are kept in ``pending`` for the write-behind flusher.
+    """
+
+    def __init__(self, record: ChunkedCommandResponse, closed: bool = False):
+        self.record_id = record.id
+        self.command_name = record.command_name
+        self.created_at = record.created_at
+        self.updated_at = record.updated_at
+        self.cond = threading.Condition()
+        self.closed = closed
+        self._chunks: List[str] = [record.full_content] if record.full_content else []
+        self._ends: List[int] = [len(record.full_content)] if record.full_content else []
+        # Write-behind state: deltas not yet in the DB, or a replace that
+        # needs the whole content written
+        self.pending: List[str] = []
+        self.needs_full_write = False
+        self.flush_lock = threading.Lock()
+        # (content end offset, perf_counter at append) for speech latency
+        self.appended_at: List[Tuple[int, float]] = []
+
+    @property
+    def length(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    def append(self, chunk: str) -> None:
+        """Append a chunk (caller holds ``cond``)."""
+        if not chunk:
+            return
+        self._chunks.append(chunk)
+        self._ends.append(self.length + len(chunk))
+        self.pending.append(chunk)
+        self.appended_at.append((self.length, time.perf_counter()))
+        self.updated_at = datetime.now()
+
+    def replace(self, content: str) -> None:
+        """Replace the whole content (caller holds ``cond``)."""
+        self._chunks = [content] if content else []
+        self._ends = [len(content)] if content else []
+        self.pending = []
+        self.needs_full_write = True
+        self.appended_at = [(len(content), time.perf_counter())] if content else []
+        self.updated_at = datetime.now()
+
+    def content(self) -> str:
+        """Full content so far (caller holds ``cond``)."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+            self._ends = [self._ends[-1]]
+        return self._chunks[0] if self._chunks else ""
+
+    def read_from(self, offset: int) -> str:
+        """Content after ``offset`` without joining what was already read (caller holds ``cond``)."""
+        if offset >= self.length:
+            return ""
+        index = bisect.bisect_right(self._ends, offset)
+        start = self._ends[index - 1] if index > 0 else 0
+        return "".join([self._chunks[index][offset - start:], *self._chunks[index + 1:]])
+
+    def pop_appended_before(self, offset: int) -> List[float]:
+        """Append timestamps of chunks that end at or before ``offset`` (caller holds ``cond``)."""
+        index = bisect.bisect_right([end for end, _ in self.appended_at], offset)
+        taken = [at for _, at in self.appended_at[:index]]
+        del self.appended_at[:index]
+        return taken
+
+    def update_record(self, session_id: str, offset: int) -> ChunkedContentUpdate:
+        """Where the last write landed, without copying the content (caller holds ``cond``)."""
+        return ChunkedContentUpdate(
+            session_id=session_id,
+            offset=offset,
+            length=self.length - offset,
+            total_length=self.length,
+            updated_at=self.updated_at,
+        )
+
+
+class _SpeechLatencyStats:
+    """Time from a chunk being appended to it being handed to TTS."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.chunks: int = 0
+            self.latency_ms_total: float = 0.0
+            self.latency_ms_max: float = 0.0
+            self.flushes: int = 0
+            self.flush_failures: int = 0
+
+    def record_latencies(self, latencies_ms: List[float]) -> None:
+        if not latencies_ms:
+            return
+        with self._lock:
+            self.chunks += len(latencies_ms)
+            self.latency_ms_total += sum(latencies_ms)
+            self.latency_ms_max = max(self.latency_ms_max, *latencies_ms)
+
+    def record_flush(self, ok: bool) -> None:
+        with self._lock:
+            self.flushes += 1
+            if not ok:
+                self.flush_failures += 1
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if self.chunks == 0 and self.flushes == 0:
+                return None
+            return {
+                "chunks_spoken": self.chunks,
+                "avg_append_to_speech_ms": round(self.latency_ms_total / self.chunks, 1) if self.chunks else 0.0,
+                "max_append_to_speech_ms": round(self.latency_ms_max, 1),
+                "flushes": self.flushes,
+                "flush_failures": self.flush_failures,
+            }
+
+
+# Buffers are shared by every service instance: the command producing a
+# response and the caller speaking it usually hold different instances.
+_buffers: Dict[str, _ResponseBuffer] = {}
+# Sessions started here and not yet finished, so a buffer reloaded after
+# idle eviction is still open to its producer (guarded by _buffers_lock)
+_open_sessions: Set[str] = set()
+_buffers_lock = threading.Lock()
+_stats = _SpeechLatencyStats()
+_flusher: Optional[threading.Thread] = None
+_flusher_lock = threading.Lock()
+
+
+def get_chunked_response_stats() -> Optional[Dict[str, Any]]:
+    """Append-to-speech latency and write-behind counters, or None if unused."""
+    return _stats.to_dict()
+
+
+def _flush_buffer(session_id: str, buffer: _ResponseBuffer) -> bool:
+    """Write a buffer's unpersisted content to the DB. Returns False on failure."""
+    with buffer.flush_lock:
+        with buffer.cond:
+            full = buffer.content() if buffer.needs_full_write else None
+            delta = "".join(buffer.pending)
+            buffer.needs_full_write = False
+            buffer.pending = []
+        if full is None and not delta:
+            return True
+
+        try:
+            with SessionLocal() as session:
+                repo = ChunkedCommandResponseRepository(session)
+                if full is not None:
+                    repo.update_content(session_id, UpdateChunkedCommandResponse(full_content=full, append=False))
+                else:
+                    repo.append_delta(session_id, delta)
+        except Exception as e:
+            logger.warning("Chunked response flush failed", session_id=session_id, error=str(e))
+            with buffer.cond:
+                # Retry on the next flush; a replace supersedes any delta
+                if full is not None:
+                    buffer.needs_full_write = True
+                elif not buffer.needs_full_write:
+                    buffer.pending.insert(0, delta)
+            _stats.record_flush(ok=False)
+            return False
+
+        _stats.record_flush(ok=True)
+        return True
+
+
+def flush_pending(session_id: Optional[str] = None) -> None:
+    """Persist unflushed content for one session (or all) now."""
+    with _buffers_lock:
+        if session_id is None:
+            targets = list(_buffers.items())
+        else:
+            targets = [(session_id, _buffers[session_id])] if session_id in _buffers else []
+    for sid, buffer in targets:
+        _flush_buffer(sid, buffer)
+
+
+def _evict_idle_buffers() -> None:
+    now = datetime.now()
+    with _buffers_lock:
+        for session_id, buffer in list(_buffers.items()):
+            with buffer.cond:
+                idle = (now - buffer.updated_at).total_seconds() > BUFFER_IDLE_SECONDS
+                if idle and not buffer.pending and not buffer.needs_full_write:
+                    del _buffers[session_id]
+
+
+def _flush_loop() -> None:
+    while True:
+        time.sleep(FLUSH_INTERVAL_SECONDS)
+        flush_pending()
+        _evict_idle_buffers()
+
+
+def _ensure_flusher() -> None:
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _flusher_lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(target=_flush_loop, daemon=True, name="chunked-response-flush")
+            _flusher.start()
+
 
 class ChunkedCommandResponseService:
     """
     Service for managing chunked command responses and handling the speaking logic.
-    
+
     This service coordinates between commands that generate content incrementally
     and the speaking system that needs to read and speak that content.
+
+    Content lives in an in-memory append-only buffer per session. The speaker
+    waits on the buffer's condition variable for new chunks, and the database
+    copy is kept up to date by a periodic write-behind of deltas so a session
+    can still be recovered after a crash.
     """
-    
+
     def __init__(self):
         """Initialize the service with a repository."""
         self._active_sessions: dict[str, ChunkedCommandResponseSession] = {}
-    
+
     def start_session(self, command_name: str, initial_content: str = "") -> str:
         """
         Start a new chunked command response session.
-        
+
         Args:
             command_name: Name of the command starting the session
             initial_content: Initial content for the first chunk
-            
+
         Returns:
             Session ID for the new session
         """
         session_id = str(uuid.uuid4())
-        
+
         with SessionLocal() as session:
             repo = ChunkedCommandResponseRepository(session)
             # Create the database record
@@ -45,221 +277,276 @@ class ChunkedCommandResponseService:
                 session_id=session_id,
                 full_content=initial_content
             )
-            
+
             db_record = repo.create(create_data)
-            
-            # Create the in-memory session
-            session_obj = ChunkedCommandResponseSession(session_id=session_id)
-            self._active_sessions[session_id] = session_obj
-            
-            return session_id
-    
-    def append_content(self, session_id: str, new_content: str) -> ChunkedCommandResponse:
+
+        with _buffers_lock:
+            _buffers[session_id] = _ResponseBuffer(db_record)
+            _open_sessions.add(session_id)
+
+        # Create the in-memory session
+        self._active_sessions[session_id] = ChunkedCommandResponseSession(session_id=session_id)
+        _ensure_flusher()
+        return session_id
+
+    def append_content(self, session_id: str, new_content: str) -> ChunkedContentUpdate:
         """
         Append new content to an existing session.
-        
+
+        The chunk is visible to speakers immediately; it reaches the
+        database with the next write-behind flush.
+
         Args:
             session_id: The session identifier
             new_content: New content to append
-            
+
         Returns:
-            The updated database record
-            
+            Offset and length of the appended chunk
+
         Raises:
-            Exception: If session not found or database operation fails
+            Exception: If session not found
         """
-        with SessionLocal() as session:
-            repo = ChunkedCommandResponseRepository(session)
-            update_data = UpdateChunkedCommandResponse(
-                full_content=new_content,
-                append=True
-            )
-            
-            return repo.update_content(session_id, update_data)
-    
-    def replace_content(self, session_id: str, new_content: str) -> ChunkedCommandResponse:
+        buffer = self._get_buffer(session_id)
+        with buffer.cond:
+            offset = buffer.length
+            buffer.append(new_content)
+            buffer.cond.notify_all()
+            return buffer.update_record(session_id, offset)
+
+    def replace_content(self, session_id: str, new_content: str) -> ChunkedContentUpdate:
         """
         Replace the content of an existing session.
-        
+
         Args:
             session_id: The session identifier
             new_content: New content to replace existing content
-            
+
         Returns:
-            The updated database record
-            
+            Offset (0) and length of the new content
+
         Raises:
-            Exception: If session not found or database operation fails
+            Exception: If session not found
         """
-        with SessionLocal() as session:
-            repo = ChunkedCommandResponseRepository(session)
-            update_data = UpdateChunkedCommandResponse(
-                full_content=new_content,
-                append=False
-            )
-            
-            return repo.update_content(session_id, update_data)
-    
-    def speak_session(self, session_id: str) -> Tuple[str, bool]:
+        buffer = self._get_buffer(session_id)
+        with buffer.cond:
+            buffer.replace(new_content)
+            buffer.cond.notify_all()
+            return buffer.update_record(session_id, 0)
+
+    def finish_session(self, session_id: str) -> None:
+        """
+        Mark a session's content as complete and persist it.
+
+        Speakers waiting for more content return once they've caught up.
+
+        Args:
+            session_id: The session identifier
+        """
+        buffer = self._get_buffer(session_id)
+        with _buffers_lock:
+            _open_sessions.discard(session_id)
+        with buffer.cond:
+            buffer.closed = True
+            buffer.cond.notify_all()
+        _flush_buffer(session_id, buffer)
+
+    def speak_session(self, session_id: str, wait_seconds: float = 0.0) -> Tuple[str, bool]:
         """
         Speak the content from a session, starting from where we left off.
-        
-        This implements the "do-while" logic we discussed:
-        1. Read current state from DB
+
+        1. Take the unspoken content from the in-memory buffer, waiting up
+           to ``wait_seconds`` for more if we're caught up and the
+           producer hasn't finished the session
         2. Speak new content
         3. Update speaking position
-        4. Check if we're caught up
-        5. Repeat if needed
-        
+        4. Report whether we're caught up
+
         Args:
             session_id: The session identifier
-            
+            wait_seconds: How long to wait for new content when caught up
+
         Returns:
             Tuple of (spoken_content, is_caught_up)
-            
+
         Raises:
-            Exception: If session not found or database operation fails
+            Exception: If session not found
         """
-        # Get the in-memory session
+        buffer = self._get_buffer(session_id)
         session = self._active_sessions.get(session_id)
         if not session:
-            raise Exception(f"Session {session_id} not found in active sessions")
-        
-        # Get the database record
-        with SessionLocal() as db_session:
-            repo = ChunkedCommandResponseRepository(db_session)
-            db_record = repo.get_by_session_id(session_id)
-            
-            if not db_record:
-                raise Exception(f"Session {session_id} not found in database")
-            
-            # Check if we're caught up
-            if session.is_caught_up(db_record.updated_at):
-                return "", True
-            
-            # Get new content to speak
-            new_content = session.get_new_content(db_record.full_content)
-            if not new_content:
-                return "", True
-            
-            # Speak the new content
-            speak(new_content)
-            
-            # Update the session state
-            session.mark_spoken(len(new_content))
-            
-            # Check if we're now caught up
-            is_caught_up = session.is_caught_up(db_record.updated_at)
-            
-            return new_content, is_caught_up
-    
-    def speak_session_until_caught_up(self, session_id: str) -> str:
+            session = self._active_sessions[session_id] = ChunkedCommandResponseSession(session_id=session_id)
+
+        with buffer.cond:
+            if session.last_spoken_token >= buffer.length and not buffer.closed and wait_seconds > 0:
+                buffer.cond.wait_for(
+                    lambda: buffer.length > session.last_spoken_token or buffer.closed,
+                    timeout=wait_seconds,
+                )
+            new_content = buffer.read_from(session.last_spoken_token)
+            appended = buffer.pop_appended_before(session.last_spoken_token + len(new_content))
+
+        if not new_content:
+            return "", True
+
+        now = time.perf_counter()
+        _stats.record_latencies([(now - at) * 1000 for at in appended])
+
+        # Speak the new content
+        speak(new_content)
+
+        # Update the session state
+        session.mark_spoken(len(new_content))
+
+        # Check if we're now caught up
+        with buffer.cond:
+            is_caught_up = session.last_spoken_token >= buffer.length and (buffer.closed or wait_seconds <= 0)
+
+        return new_content, is_caught_up
+
+    def speak_session_until_caught_up(self, session_id: str, wait_seconds: float = 0.0) -> str:
         """
-        Speak a session until we're caught up with the database.
-        
-        This is the main method that implements the complete do-while loop.
-        
+        Speak a session until we're caught up with its content.
+
+        With ``wait_seconds`` > 0 this keeps speaking as chunks arrive and
+        returns once the session is finished (``finish_session``) or no new
+        content has arrived for ``wait_seconds``.
+
         Args:
             session_id: The session identifier
-            
+            wait_seconds: How long to wait for each new chunk
+
         Returns:
             All content that was spoken
-            
+
         Raises:
-            Exception: If session not found or database operation fails
+            Exception: If session not found
         """
         all_spoken_content = []
-        
+
         while True:
-            spoken_content, is_caught_up = self.speak_session(session_id)
-            
+            spoken_content, is_caught_up = self.speak_session(session_id, wait_seconds)
+
             if spoken_content:
                 all_spoken_content.append(spoken_content)
-            
+
             if is_caught_up:
                 break
-        
+
         return " ".join(all_spoken_content)
-    
+
     def get_session_status(self, session_id: str) -> Optional[dict]:
         """
         Get the current status of a session.
-        
+
         Args:
             session_id: The session identifier
-            
+
         Returns:
             Dictionary with session status information, or None if not found
         """
         session = self._active_sessions.get(session_id)
         if not session:
             return None
-        
-        with SessionLocal() as db_session:
-            repo = ChunkedCommandResponseRepository(db_session)
-            db_record = repo.get_by_session_id(session_id)
-            
-            if not db_record:
-                return None
-            
+
+        try:
+            buffer = self._get_buffer(session_id)
+        except Exception:
+            return None
+
+        with buffer.cond:
+            total = buffer.length
             return {
                 "session_id": session_id,
-                "command_name": db_record.command_name,
-                "total_content_length": len(db_record.full_content),
+                "command_name": buffer.command_name,
+                "total_content_length": total,
                 "last_spoken_position": session.last_spoken_token,
-                "remaining_content_length": len(db_record.full_content) - session.last_spoken_token,
-                "is_caught_up": session.is_caught_up(db_record.updated_at),
+                "remaining_content_length": total - session.last_spoken_token,
+                "is_caught_up": session.last_spoken_token >= total,
+                "is_finished": buffer.closed,
                 "last_spoken_at": session.last_spoken_at,
-                "last_updated_at": db_record.updated_at,
-                "created_at": db_record.created_at
+                "last_updated_at": buffer.updated_at,
+                "created_at": buffer.created_at
             }
-    
+
     def end_session(self, session_id: str) -> bool:
         """
         End a session and clean up resources.
-        
+
+        Unflushed content is persisted before the buffer is released.
+
         Args:
             session_id: The session identifier
-            
+
         Returns:
             True if session was ended, False if not found
         """
+        with _buffers_lock:
+            buffer = _buffers.pop(session_id, None)
+            _open_sessions.discard(session_id)
+        if buffer is not None:
+            with buffer.cond:
+                buffer.closed = True
+                buffer.cond.notify_all()
+            _flush_buffer(session_id, buffer)
+
         if session_id in self._active_sessions:
             del self._active_sessions[session_id]
             return True
         return False
-    
+
     def cleanup_expired_sessions(self, days_old: int = 7) -> int:
         """
         Clean up expired sessions from the database.
-        
+
         Args:
             days_old: Number of days old to consider for cleanup
-            
+
         Returns:
             Number of sessions cleaned up
         """
         with SessionLocal() as session:
             repo = ChunkedCommandResponseRepository(session)
             return repo.cleanup_old_sessions(days_old)
-    
+
     def get_active_sessions(self) -> list[str]:
         """
         Get list of active session IDs.
-        
+
         Returns:
             List of active session IDs
         """
         return list(self._active_sessions.keys())
-    
+
     def is_session_active(self, session_id: str) -> bool:
         """
         Check if a session is currently active.
-        
+
         Args:
             session_id: The session identifier
-            
+
         Returns:
             True if session is active, False otherwise
         """
         return session_id in self._active_sessions
+
+    def _get_buffer(self, session_id: str) -> _ResponseBuffer:
+        """
+        The session's in-memory buffer, recovered from the database if this
+        process doesn't hold it (e.g. after a restart).
+        """
+        with _buffers_lock:
+            buffer = _buffers.get(session_id)
+        if buffer is not None:
+            return buffer
+
+        with SessionLocal() as db_session:
+            repo = ChunkedCommandResponseRepository(db_session)
+            db_record = repo.get_by_session_id(session_id)
+        if not db_record:
+            raise Exception(f"Session {session_id} not found")
+
+        # Still open only if its producer is in this process (the buffer was
+        # evicted while idle); after a restart nobody will append to it
+        with _buffers_lock:
+            closed = session_id not in _open_sessions
+            return _buffers.setdefault(session_id, _ResponseBuffer(db_record, closed=closed))
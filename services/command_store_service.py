@@ -7,17 +7,20 @@ Bundles scatter components to their type-specific directories.
 
 from __future__ import annotations
 
-import io
+import hashlib
 import json
 import os
+import re
 import shutil
 import subprocess
 import sys
 import tarfile
 import tempfile
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Iterator
 
 import yaml
 from jarvis_log_client import JarvisLogger
@@ -47,6 +50,13 @@ PACKAGES_DIR = Path.home() / ".jarvis" / "packages"
 # Metadata file written alongside installed commands
 STORE_METADATA_FILE = ".store_metadata.json"
 
+# Persistent wheelhouse: every dependency wheel downloaded or built for a
+# package install lands here, so reinstalls and upgrades install offline.
+WHEEL_CACHE_DIR = Path.home() / ".jarvis" / "cache" / "wheels"
+
+# Read size when streaming a package archive into the tar extractor
+_ARCHIVE_CHUNK_SIZE = 64 * 1024
+
 
 def register_package_lib_paths() -> None:
     """Add all installed package lib dirs to sys.path.
@@ -76,10 +86,43 @@ class RemoveError(CommandStoreError):
     """Error during command removal."""
 
 
-def _download_archive(repo_url: str, tag: str | None = None) -> Path | None:
+class _HashingReader:
+    """File-like wrapper that SHA-256 hashes bytes as they are read."""
+
+    def __init__(self, raw: BinaryIO):
+        self._raw = raw
+        self._hash = hashlib.sha256()
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._raw.read(size)
+        self._hash.update(chunk)
+        self.bytes_read += len(chunk)
+        return chunk
+
+    def drain(self) -> None:
+        """Read (and hash) whatever the extractor left, e.g. gzip trailer padding."""
+        while self.read(_ARCHIVE_CHUNK_SIZE):
+            pass
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def _download_archive(
+    repo_url: str,
+    tag: str | None = None,
+    expected_sha256: str | None = None,
+) -> Path | None:
     """Download a GitHub repo as a tarball (no git/auth required).
 
+    The response is streamed straight into the tar extractor (never
+    buffered whole in memory) and SHA-256 hashed on the way through.
+
     Returns path to extracted repo dir, or None if download fails.
+
+    Raises:
+        InstallError: If ``expected_sha256`` is given and the archive doesn't match.
     """
     import urllib.request
     import urllib.error
@@ -92,9 +135,19 @@ def _download_archive(repo_url: str, tag: str | None = None) -> Path | None:
     tmpdir = Path(tempfile.mkdtemp(prefix="jarvis-cmd-"))
     try:
         with urllib.request.urlopen(archive_url, timeout=60) as resp:
-            data = resp.read()
-        with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as tar:
-            tar.extractall(path=str(tmpdir), filter="data")
+            reader = _HashingReader(resp)
+            # "r|gz": sequential stream mode, no seeking / full read
+            with tarfile.open(fileobj=reader, mode="r|gz", bufsize=_ARCHIVE_CHUNK_SIZE) as tar:
+                tar.extractall(path=str(tmpdir), filter="data")
+            reader.drain()
+
+        digest = reader.hexdigest()
+        logger.info("Archive downloaded", url=archive_url, bytes=reader.bytes_read, sha256=digest)
+        if expected_sha256 and digest != expected_sha256.lower():
+            shutil.rmtree(tmpdir, ignore_errors=True)
+            raise InstallError(
+                f"Archive hash mismatch for {archive_url}: expected {expected_sha256}, got {digest}"
+            )
 
         # GitHub archives extract to {repo}-{ref}/ — find the single directory
         subdirs = [d for d in tmpdir.iterdir() if d.is_dir()]
@@ -107,20 +160,24 @@ def _download_archive(repo_url: str, tag: str | None = None) -> Path | None:
         return None
 
 
-def _clone_repo(repo_url: str, tag: str | None = None) -> Path:
+def _clone_repo(repo_url: str, tag: str | None = None, archive_sha256: str | None = None) -> Path:
     """Download a repo — tries archive download first, falls back to git clone.
 
     Args:
         repo_url: GitHub HTTPS URL.
         tag: Optional git tag to checkout.
+        archive_sha256: Expected SHA-256 of the release tarball. When set,
+            there is no git clone fallback (a clone can't be verified).
 
     Returns:
         Path to the repo directory.
     """
     # Try archive download first (no git/auth needed)
-    result_path = _download_archive(repo_url, tag)
+    result_path = _download_archive(repo_url, tag, expected_sha256=archive_sha256)
     if result_path:
         return result_path
+    if archive_sha256:
+        raise InstallError("Archive download failed and a verified archive was required")
 
     # Fallback to git clone
     tmpdir = Path(tempfile.mkdtemp(prefix="jarvis-cmd-"))
@@ -286,11 +343,9 @@ def _is_custom_installed(obj: object, package_dir: str, custom_subdir: str) -> b
         return False
 
 
-def _install_pip_deps(manifest: CommandManifest) -> None:
-    """Install pip dependencies declared in the manifest."""
+def _manifest_requirements(manifest: CommandManifest) -> list[str]:
+    """pip requirement strings for the manifest's packages."""
     deps: list[str] = []
-
-    # From manifest packages
     for pkg in manifest.packages:
         if pkg.version:
             if pkg.version[0].isdigit():
@@ -299,24 +354,80 @@ def _install_pip_deps(manifest: CommandManifest) -> None:
                 deps.append(f"{pkg.name}{pkg.version}")
         else:
             deps.append(pkg.name)
+    return deps
 
-    if not deps:
-        return
 
-    logger.info("Installing pip dependencies", packages=deps)
-    # --prefer-binary: grab pre-built wheels instead of compiling C
-    # extensions from source (lxml, etc.). ARM64 wheels exist for most
-    # packages and avoid the 100% CPU + swap thrashing that kills the
-    # node service on Pi Zero 2 W (512 MB).
+def _run_pip(args: list[str], timeout: int) -> subprocess.CompletedProcess[str]:
     # nice -n 15: lower priority so the install doesn't starve the voice
     # pipeline, MQTT, SSH, and other threads sharing the same 4 cores.
-    result = subprocess.run(
-        ["nice", "-n", "15", sys.executable, "-m", "pip", "install",
-         "--quiet", "--prefer-binary"] + deps,
+    return subprocess.run(
+        ["nice", "-n", "15", sys.executable, "-m", "pip", *args],
         capture_output=True,
         text=True,
-        timeout=300,
+        timeout=timeout,
     )
+
+
+def _cached_pin(requirement: str) -> bool:
+    """True if ``requirement`` is an exact ``name==version`` pin already in ``WHEEL_CACHE_DIR``."""
+    name, sep, version = requirement.partition("==")
+    if not sep or not version or "*" in version or any(c in version for c in "<>=!~;, "):
+        return False
+    project = re.sub(r"[-_.]+", "_", name.split("[", 1)[0].strip()).lower()
+    prefix = f"{project}-{version.strip()}-".lower()
+    return any(wheel.name.lower().startswith(prefix) for wheel in WHEEL_CACHE_DIR.glob("*.whl"))
+
+
+def _install_pip_deps(manifest: CommandManifest) -> None:
+    """Install pip dependencies declared in the manifest via the local wheelhouse.
+
+    1. If every requirement is an exact ``==`` pin with a wheel in
+       ``WHEEL_CACHE_DIR``, install offline (``--no-index``). Reinstalls
+       and upgrades that don't change dependencies stop here. Unpinned or
+       ranged requirements never take this path: offline they would stick
+       to whatever version happened to be cached first.
+    2. Otherwise ``pip wheel`` only the requirements not in the cache into
+       the wheelhouse (also looking at the optional LAN wheelhouse in
+       ``package_wheelhouse_url``) and install everything offline from it.
+    """
+    deps = _manifest_requirements(manifest)
+    if not deps:
+        return
+
+    WHEEL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    offline_install = ["install", "--quiet", "--no-index", "--find-links", str(WHEEL_CACHE_DIR)] + deps
+
+    missing = [dep for dep in deps if not _cached_pin(dep)]
+    if not missing:
+        result = _run_pip(offline_install, timeout=300)
+        if result.returncode == 0:
+            logger.info("Installed pip dependencies from wheel cache", packages=deps)
+            return
+        # A cached wheel's own dependencies are gone: rebuild them all
+        missing = deps
+
+    logger.info("Installing pip dependencies", packages=deps, fetching=missing)
+    # --prefer-binary: grab pre-built wheels instead of compiling C
+    # extensions from source (lxml, etc.). ARM64 wheels exist for most
+    # packages and avoid the 100% CPU + swap thrashing that kills the
+    # node service on Pi Zero 2 W (512 MB). Anything that does have to be
+    # built is built once and kept in the wheelhouse.
+    wheel_args = [
+        "wheel", "--quiet", "--prefer-binary",
+        "--wheel-dir", str(WHEEL_CACHE_DIR),
+        "--find-links", str(WHEEL_CACHE_DIR),
+    ]
+    from utils.config_service import Config
+
+    shared_wheelhouse: str = Config.get_str("package_wheelhouse_url", "") or ""
+    if shared_wheelhouse:
+        wheel_args += ["--find-links", shared_wheelhouse]
+
+    result = _run_pip(wheel_args + missing, timeout=600)
+    if result.returncode != 0:
+        raise InstallError(f"pip wheel failed: {result.stderr.strip()}")
+
+    result = _run_pip(offline_install, timeout=300)
     if result.returncode != 0:
         raise InstallError(f"pip install failed: {result.stderr.strip()}")
 
@@ -495,68 +606,95 @@ def _write_package_metadata(
         json.dump(metadata, f, indent=2)
 
 
-def _do_install(repo_dir: Path, source_label: str) -> CommandManifest:
+class _PhaseTimer:
+    """Wall-clock milliseconds per install phase."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    def total_ms(self) -> float:
+        return round(sum(self.phases.values()), 1)
+
+
+def _do_install(repo_dir: Path, source_label: str, timer: _PhaseTimer | None = None) -> CommandManifest:
     """Core install logic — validates, scatters components, installs deps.
 
     Args:
         repo_dir: Path to repo directory (cloned or local).
         source_label: Display label for logging (URL or path).
+        timer: Phase timer to record into (e.g. already holding "download").
 
     Returns:
         The installed manifest.
     """
-    # 1. Validate structure + manifest
-    manifest = _validate_repo_structure(repo_dir)
-
-    # 2. Check platform
-    _check_platform_compatibility(manifest)
+    timer = timer or _PhaseTimer()
 
-    # 3. Check name conflicts (skip if package already installed — it's an update)
-    already_installed: bool = (PACKAGES_DIR / f"{manifest.name}.json").exists()
-    if already_installed:
-        logger.info("Updating existing package", package=manifest.name)
-    else:
-        _check_name_conflicts(manifest)
+    with timer.phase("validate"):
+        # 1. Validate structure + manifest
+        manifest = _validate_repo_structure(repo_dir)
 
-    # 4. Install shared code for bundles (ha_shared/, etc.)
-    component_paths = [c.path for c in manifest.components]
-    shared_dirs = _collect_shared_dirs(repo_dir, component_paths)
-    if shared_dirs:
-        _install_shared_code(manifest.name, shared_dirs, repo_dir)
+        # 2. Check platform
+        _check_platform_compatibility(manifest)
 
-    # 5. Install components
-    component_dirs: dict[str, str] = {}
-    for comp in manifest.components:
-        install_dir = _install_component(repo_dir, comp.type, comp.name, comp.path)
-        # Use type:name as key to avoid collisions (e.g., agent and manager both named "home_assistant")
-        component_dirs[f"{comp.type}:{comp.name}"] = str(install_dir)
-
-    # 6. Write package metadata (for clean uninstall)
-    _write_package_metadata(manifest, source_label, component_dirs)
-
-    # 7. Also write .store_metadata.json in the first command dir
-    command_comps = [c for c in manifest.components if c.type == "command"]
-    if command_comps:
-        first_cmd_dir = _PROJECT_DIR / COMPONENT_INSTALL_DIRS["command"] / command_comps[0].name
-        if first_cmd_dir.exists():
-            _write_store_metadata(first_cmd_dir, manifest, source_label)
+        # 3. Check name conflicts (skip if package already installed — it's an update)
+        already_installed: bool = (PACKAGES_DIR / f"{manifest.name}.json").exists()
+        if already_installed:
+            logger.info("Updating existing package", package=manifest.name)
+        else:
+            _check_name_conflicts(manifest)
+
+    with timer.phase("components"):
+        # 4. Install shared code for bundles (ha_shared/, etc.)
+        component_paths = [c.path for c in manifest.components]
+        shared_dirs = _collect_shared_dirs(repo_dir, component_paths)
+        if shared_dirs:
+            _install_shared_code(manifest.name, shared_dirs, repo_dir)
+
+        # 5. Install components
+        component_dirs: dict[str, str] = {}
+        for comp in manifest.components:
+            install_dir = _install_component(repo_dir, comp.type, comp.name, comp.path)
+            # Use type:name as key to avoid collisions (e.g., agent and manager both named "home_assistant")
+            component_dirs[f"{comp.type}:{comp.name}"] = str(install_dir)
+
+        # 6. Write package metadata (for clean uninstall)
+        _write_package_metadata(manifest, source_label, component_dirs)
+
+        # 7. Also write .store_metadata.json in the first command dir
+        command_comps = [c for c in manifest.components if c.type == "command"]
+        if command_comps:
+            first_cmd_dir = _PROJECT_DIR / COMPONENT_INSTALL_DIRS["command"] / command_comps[0].name
+            if first_cmd_dir.exists():
+                _write_store_metadata(first_cmd_dir, manifest, source_label)
 
     # 8. Install pip deps
-    _install_pip_deps(manifest)
+    with timer.phase("pip_deps"):
+        _install_pip_deps(manifest)
 
-    # 9. Seed secrets
-    _seed_secrets(manifest)
+    with timer.phase("register"):
+        # 9. Seed secrets
+        _seed_secrets(manifest)
 
-    # 10. Enable commands in registry
-    for comp in manifest.components:
-        if comp.type == "command":
-            _enable_in_registry(comp.name)
+        # 10. Enable commands in registry
+        for comp in manifest.components:
+            if comp.type == "command":
+                _enable_in_registry(comp.name)
 
     logger.info(
         "Package installed successfully",
         package=manifest.name,
         version=manifest.version,
         components=len(manifest.components),
+        total_ms=timer.total_ms(),
+        phases_ms=timer.phases,
     )
     return manifest
 
@@ -565,6 +703,7 @@ def install_from_github(
     repo_url: str,
     version_tag: str | None = None,
     skip_tests: bool = False,
+    archive_sha256: str | None = None,
 ) -> CommandManifest:
     """Install a command or bundle from a GitHub repo URL.
 
@@ -572,14 +711,17 @@ def install_from_github(
         repo_url: GitHub HTTPS URL.
         version_tag: Optional git tag to checkout.
         skip_tests: Skip container tests (user accepts risk).
+        archive_sha256: Expected SHA-256 of the release tarball, if known.
 
     Returns:
         The installed command's manifest.
     """
     logger.info("Installing from GitHub", repo_url=repo_url, tag=version_tag)
-    repo_dir = _clone_repo(repo_url, version_tag)
+    timer = _PhaseTimer()
+    with timer.phase("download"):
+        repo_dir = _clone_repo(repo_url, version_tag, archive_sha256=archive_sha256)
     try:
-        return _do_install(repo_dir, repo_url)
+        return _do_install(repo_dir, repo_url, timer)
     finally:
         shutil.rmtree(repo_dir.parent, ignore_errors=True)
 
@@ -1,11 +1,29 @@
-"""Config push handler — polls CC, decrypts with K2, dispatches, ACKs.
+"""Config push handler — receives or polls configs, decrypts with K2, dispatches, ACKs.
 
 Mobile pushes encrypted config to CC, CC stores it and notifies via MQTT.
-This service handles the node side: poll → decrypt → dispatch → ACK.
+This service handles the node side: receive/poll → decrypt → dispatch → ACK.
+
+When the encrypted item fits in the MQTT notification, CC sends it inline
+(``ciphertext``/``nonce``/``tag`` on the message, or a ``pushes`` list) and
+the node skips the REST fetch entirely. Items too large to inline, older
+CCs, and inline items that failed to apply go through the
+``/config/pending`` fetch.
+
+``command_registry`` pushes are applied first (an auth push in the same
+batch may target a command they enable); the remaining config types are
+then handled concurrently, and pushes of the same type are applied in
+order so the newest value wins. Each push is acknowledged on its own
+``/config/{push_id}/ack`` as soon as it is applied. The node database
+has a single writer, so workers apply pushes one at a time under
+``_db_write_lock``; what runs in parallel is the ACK round-trips.
 """
 
 import base64
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Any
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
@@ -20,26 +38,92 @@ from utils.service_discovery import get_command_center_url
 
 logger = JarvisLogger(service="jarvis-node")
 
+# Max config types dispatched in parallel for one batch of pushes
+DISPATCH_CONCURRENCY: int = 4
 
-def process_pending_configs() -> int:
+_INLINE_FIELDS: tuple[str, ...] = ("ciphertext", "nonce", "tag")
+
+# SQLite allows one writer; pool workers take turns applying pushes
+_db_write_lock = threading.Lock()
+
+
+def process_config_push(notification: dict[str, Any] | None = None) -> int:
+    """Handle a ``config/push`` MQTT notification.
+
+    Pushes carried inline on the notification are applied directly; if
+    there are none (payload too large, older CC) or any inline push
+    fails, falls back to ``process_pending_configs``.
+
+    Returns:
+        Number of configs successfully processed.
+    """
+    received_at: float = time.monotonic()
+    inline = _inline_items(notification or {})
+    if not inline:
+        return process_pending_configs(received_at=received_at)
+
+    processed, failed = _process_items(inline, source="inline", received_at=received_at)
+    if failed:
+        # Anything not ACKed is still pending on CC; the fetch retries it
+        processed += process_pending_configs(received_at=received_at)
+    return processed
+
+
+def process_pending_configs(received_at: float | None = None) -> int:
     """Poll CC for pending configs, decrypt, dispatch, ACK.
 
+    Args:
+        received_at: ``time.monotonic()`` when the triggering notification
+            arrived (for latency stats); defaults to now.
+
     Returns:
         Number of configs successfully processed.
     """
+    if received_at is None:
+        received_at = time.monotonic()
     pending = _fetch_pending()
     if not pending:
         return 0
 
-    processed: int = 0
+    processed, _ = _process_items(pending, source="fetch", received_at=received_at)
+    return processed
+
+
+def _push_id(item: dict[str, Any]) -> str:
+    # CC returns "id", not "push_id"
+    return item.get("id", "") or item.get("push_id", "")
+
+
+def _inline_items(notification: dict[str, Any]) -> list[dict[str, Any]]:
+    """Pushes carried on the notification itself (complete ones only)."""
+    candidates = notification.get("pushes")
+    if not isinstance(candidates, list):
+        candidates = [notification]
+    return [
+        item for item in candidates
+        if isinstance(item, dict) and all(item.get(f) for f in _INLINE_FIELDS)
+    ]
+
+
+def _process_items(
+    items: list[dict[str, Any]],
+    source: str,
+    received_at: float,
+) -> tuple[int, int]:
+    """Decrypt, dispatch and ACK a batch of pushes.
+
+    Returns:
+        (processed, failed) counts.
+    """
     # Node knows its own ID; CC pending endpoint doesn't return it
     node_id: str = Config.get_str("node_id", "") or ""
 
-    for item in pending:
-        # CC returns "id", not "push_id"
-        push_id: str = item.get("id", "") or item.get("push_id", "")
+    # Group by config type, preserving arrival order within a type
+    groups: dict[str, list[tuple[dict[str, Any], dict[str, str]]]] = {}
+    failed: int = 0
+    for item in items:
+        push_id: str = _push_id(item)
         config_type: str = item.get("config_type", "")
-
         try:
             config_data = _decrypt_config(
                 ciphertext_b64=item.get("ciphertext", ""),
@@ -48,23 +132,146 @@ def process_pending_configs() -> int:
                 node_id=node_id,
                 config_type=config_type,
             )
-            _dispatch_config(config_type, config_data)
-            _ack_config(push_id)
-            processed += 1
-            logger.info(
-                "Config push processed",
+        except Exception as e:
+            failed += 1
+            logger.error(
+                "Failed to process config push",
                 push_id=push_id[:8],
                 config_type=config_type,
+                error=str(e),
             )
+            continue
+        groups.setdefault(config_type, []).append((item, config_data))
+
+    results: list[tuple[list[tuple[dict[str, Any], float]], int]] = []
+    # Registry pushes go first, with one discovery refresh for all of them:
+    # an auth:* push in the same batch may target a command they just enabled.
+    registry = groups.pop("command_registry", None)
+    if registry is not None:
+        results.append(_dispatch_group(("command_registry", registry)))
+        from utils.command_discovery_service import get_command_discovery_service
+        get_command_discovery_service().refresh_now()
+
+    if len(groups) > 1:
+        workers = min(DISPATCH_CONCURRENCY, len(groups))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="config-push") as pool:
+            results.extend(pool.map(_dispatch_group, groups.items()))
+    else:
+        results.extend(_dispatch_group(group) for group in groups.items())
+
+    done: list[tuple[dict[str, Any], float]] = [entry for ok, _ in results for entry in ok]
+    failed += sum(n for _, n in results)
+
+    for item, acked_at in done:
+        latency_ms = (acked_at - received_at) * 1000
+        end_to_end_ms = _since_created_ms(item.get("created_at"))
+        _stats.record(source, latency_ms, end_to_end_ms)
+        logger.info(
+            "Config push processed",
+            push_id=_push_id(item)[:8],
+            config_type=item.get("config_type", ""),
+            source=source,
+            latency_ms=round(latency_ms, 1),
+            end_to_end_ms=round(end_to_end_ms, 1) if end_to_end_ms is not None else None,
+        )
+    _stats.record_failures(failed)
+    return len(done), failed
+
+
+def _dispatch_group(
+    group: tuple[str, list[tuple[dict[str, Any], dict[str, str]]]],
+) -> tuple[list[tuple[dict[str, Any], float]], int]:
+    """Apply and ACK one config type's pushes in order.
+
+    Returns:
+        ((item, acked_at) for each succeeded push, failure count).
+    """
+    config_type, entries = group
+    ok: list[tuple[dict[str, Any], float]] = []
+    failed: int = 0
+    for item, config_data in entries:
+        push_id: str = _push_id(item)
+        try:
+            with _db_write_lock:
+                _dispatch_config(config_type, config_data, refresh_discovery=False)
+            _ack_config(push_id)
+            ok.append((item, time.monotonic()))
         except Exception as e:
+            failed += 1
             logger.error(
                 "Failed to process config push",
                 push_id=push_id[:8],
                 config_type=config_type,
                 error=str(e),
             )
+    return ok, failed
 
-    return processed
+
+def _since_created_ms(created_at: Any) -> float | None:
+    """Milliseconds since CC stored the push (ISO-8601 or epoch seconds), if known."""
+    if created_at is None:
+        return None
+    try:
+        if isinstance(created_at, (int, float)):
+            created = float(created_at)
+        else:
+            created = datetime.fromisoformat(str(created_at).replace("Z", "+00:00")).timestamp()
+    except (TypeError, ValueError):
+        return None
+    # Clock skew between CC and node can make this negative; clamp
+    return max(0.0, (time.time() - created) * 1000)
+
+
+class _ConfigPushStats:
+    """Counters and latency for config pushes (reported in the heartbeat)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.processed: dict[str, int] = {"inline": 0, "fetch": 0}
+            self.failed: int = 0
+            self.latency_ms_total: float = 0.0
+            self.latency_ms_max: float = 0.0
+            self.end_to_end_ms_last: float | None = None
+
+    def record(self, source: str, latency_ms: float, end_to_end_ms: float | None) -> None:
+        with self._lock:
+            self.processed[source] = self.processed.get(source, 0) + 1
+            self.latency_ms_total += latency_ms
+            self.latency_ms_max = max(self.latency_ms_max, latency_ms)
+            if end_to_end_ms is not None:
+                self.end_to_end_ms_last = end_to_end_ms
+
+    def record_failures(self, count: int) -> None:
+        if count:
+            with self._lock:
+                self.failed += count
+
+    def to_dict(self) -> dict[str, Any] | None:
+        with self._lock:
+            total = sum(self.processed.values())
+            if total == 0 and self.failed == 0:
+                return None
+            return {
+                "processed": dict(self.processed),
+                "failed": self.failed,
+                "avg_latency_ms": round(self.latency_ms_total / total, 1) if total else 0.0,
+                "max_latency_ms": round(self.latency_ms_max, 1),
+                "last_end_to_end_ms": (
+                    round(self.end_to_end_ms_last, 1) if self.end_to_end_ms_last is not None else None
+                ),
+            }
+
+
+_stats = _ConfigPushStats()
+
+
+def get_config_push_stats() -> dict[str, Any] | None:
+    """Config push counters/latency, or None if nothing has been pushed yet."""
+    return _stats.to_dict()
 
 
 def _fetch_pending() -> list[dict[str, Any]]:
@@ -137,24 +344,31 @@ def _decrypt_config(
     return json.loads(plaintext_bytes)
 
 
-def _dispatch_config(config_type: str, config_data: dict[str, str]) -> None:
+def _dispatch_config(
+    config_type: str,
+    config_data: dict[str, str],
+    refresh_discovery: bool = True,
+) -> None:
     """Route decrypted config to the appropriate handler.
 
     - auth:* types → find command with matching authentication.provider,
       call store_auth_values().
     - command_registry → update enabled/disabled state for a command.
     - Other types → store each key-value pair as a secret.
+
+    ``refresh_discovery=False`` skips the per-push discovery refresh after
+    a registry change (the batch caller refreshes once).
     """
     if config_type.startswith("auth:"):
         provider = config_type[len("auth:"):]  # e.g., "home_assistant"
         _dispatch_auth(provider, config_data)
     elif config_type == "command_registry":
-        _dispatch_command_registry(config_data)
+        _dispatch_command_registry(config_data, refresh_discovery=refresh_discovery)
     else:
         _dispatch_secrets(config_data)
 
 
-def _dispatch_command_registry(config_data: dict[str, str]) -> None:
+def _dispatch_command_registry(config_data: dict[str, str], refresh_discovery: bool = True) -> None:
     """Update command enabled/disabled state in the registry."""
     command_name = config_data.get("command_name", "")
     enabled_str = config_data.get("enabled", "true")
@@ -174,8 +388,9 @@ def _dispatch_command_registry(config_data: dict[str, str]) -> None:
     logger.info("Command registry updated", command=command_name, enabled=enabled)
 
     # Refresh discovery cache so the change takes effect immediately
-    from utils.command_discovery_service import get_command_discovery_service
-    get_command_discovery_service().refresh_now()
+    if refresh_discovery:
+        from utils.command_discovery_service import get_command_discovery_service
+        get_command_discovery_service().refresh_now()
 
 
 def _dispatch_auth(provider: str, config_data: dict[str, str]) -> None:
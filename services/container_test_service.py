@@ -2,6 +2,8 @@
 
 Builds a Docker container with the command and jarvis-command-sdk,
 then runs test_harness.py inside it with strict resource and network limits.
+Nodes without Docker can use the subprocess sandbox instead
+(``mode="sandbox"`` / ``"auto"``, see sandbox_test_service).
 """
 
 from __future__ import annotations
@@ -61,6 +63,39 @@ CMD ["python", "test_harness.py"]
 """
 
 
+def _copy_command_files(command_dir: Path, dest: Path) -> None:
+    """Copy the command's Python files and manifest into ``dest``."""
+    dest.mkdir(parents=True, exist_ok=True)
+    for f in command_dir.iterdir():
+        if f.suffix == ".py" or f.name == "jarvis_command.yaml":
+            shutil.copy2(f, dest / f.name)
+
+
+def _parse_harness_output(stdout: str, stderr: str) -> ContainerTestResult:
+    """Turn test_harness.py's JSON report into a ContainerTestResult."""
+    try:
+        test_results = json.loads(stdout)
+        return ContainerTestResult(
+            passed=test_results.get("failed", 1) == 0,
+            summary=test_results.get("summary", "Unknown"),
+            test_count=test_results.get("passed", 0) + test_results.get("failed", 0),
+            pass_count=test_results.get("passed", 0),
+            fail_count=test_results.get("failed", 0),
+            errors=test_results.get("errors", []),
+            raw_output=stdout,
+        )
+    except json.JSONDecodeError:
+        return ContainerTestResult(
+            passed=False,
+            summary="FAIL - Could not parse test output",
+            test_count=0,
+            pass_count=0,
+            fail_count=1,
+            errors=[stdout, stderr],
+            raw_output=stdout + stderr,
+        )
+
+
 def _check_docker_available() -> bool:
     """Check if Docker is available."""
     try:
@@ -78,6 +113,7 @@ def run_container_tests(
     command_dir: Path,
     packages: list[str] | None = None,
     timeout_seconds: int = 60,
+    mode: str = "docker",
 ) -> ContainerTestResult:
     """Run container tests on a command directory.
 
@@ -85,10 +121,20 @@ def run_container_tests(
         command_dir: Path to directory containing command.py and manifest.
         packages: Additional pip packages to install in the container.
         timeout_seconds: Maximum time for the container to run.
+        mode: ``"docker"`` (skip when Docker is missing), ``"sandbox"``
+            (local subprocess, see sandbox_test_service) or ``"auto"``
+            (Docker when available, otherwise the sandbox).
 
     Returns:
         ContainerTestResult with test outcomes.
     """
+    if mode not in ("docker", "sandbox", "auto"):
+        raise ValueError(f"Unknown test mode: {mode}")
+    if mode == "sandbox" or (mode == "auto" and not _check_docker_available()):
+        from services.sandbox_test_service import run_sandbox_tests
+
+        return run_sandbox_tests(command_dir, packages, timeout_seconds)
+
     if not _check_docker_available():
         logger.warning("Docker not available, skipping container tests")
         return ContainerTestResult(
@@ -116,11 +162,7 @@ def run_container_tests(
         ))
 
         # Copy command files
-        cmd_dest = context_dir / "command_files"
-        cmd_dest.mkdir()
-        for f in command_dir.iterdir():
-            if f.suffix == ".py" or f.name == "jarvis_command.yaml":
-                shutil.copy2(f, cmd_dest / f.name)
+        _copy_command_files(command_dir, context_dir / "command_files")
 
         # Copy test harness
         shutil.copy2(HARNESS_SCRIPT, context_dir / "test_harness.py")
@@ -169,28 +211,7 @@ def run_container_tests(
             timeout=timeout_seconds,
         )
 
-        # Parse output
-        try:
-            test_results = json.loads(run_result.stdout)
-            return ContainerTestResult(
-                passed=test_results.get("failed", 1) == 0,
-                summary=test_results.get("summary", "Unknown"),
-                test_count=test_results.get("passed", 0) + test_results.get("failed", 0),
-                pass_count=test_results.get("passed", 0),
-                fail_count=test_results.get("failed", 0),
-                errors=test_results.get("errors", []),
-                raw_output=run_result.stdout,
-            )
-        except json.JSONDecodeError:
-            return ContainerTestResult(
-                passed=False,
-                summary="FAIL - Could not parse test output",
-                test_count=0,
-                pass_count=0,
-                fail_count=1,
-                errors=[run_result.stdout, run_result.stderr],
-                raw_output=run_result.stdout + run_result.stderr,
-            )
+        return _parse_harness_output(run_result.stdout, run_result.stderr)
 
     except subprocess.TimeoutExpired:
         return ContainerTestResult(
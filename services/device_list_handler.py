@@ -8,13 +8,13 @@ Flow:
 Mirrors device_scan_handler.py.
 """
 
-import asyncio
 from dataclasses import asdict
 from typing import Any
 
 from jarvis_log_client import JarvisLogger
 
 from clients.rest_client import RestClient
+from core.async_runtime import get_async_runtime
 from utils.device_manager_discovery_service import get_device_manager_discovery_service
 from utils.service_discovery import get_command_center_url
 
@@ -23,10 +23,8 @@ logger = JarvisLogger(service="jarvis-node")
 
 def run_collect_and_upload(request_id: str, manager_name: str) -> None:
     """Run device collection and upload results to CC.  Meant to run in a background thread."""
-    loop = asyncio.new_event_loop()
     try:
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(_async_collect_and_upload(request_id, manager_name))
+        get_async_runtime().run(_async_collect_and_upload(request_id, manager_name))
     except Exception as e:
         logger.error(
             "Device list handler failed",
@@ -35,8 +33,6 @@ def run_collect_and_upload(request_id: str, manager_name: str) -> None:
             error=str(e),
         )
         _upload_error(request_id, str(e))
-    finally:
-        loop.close()
 
 
 async def _async_collect_and_upload(request_id: str, manager_name: str) -> None:
@@ -13,7 +13,9 @@ from typing import Any
 from jarvis_log_client import JarvisLogger
 
 from clients.rest_client import RestClient
+from core.async_runtime import get_async_runtime
 from device_families.base import DiscoveredDevice
+from services.device_scanner_service import device_key, notify_devices_changed
 from utils.device_family_discovery_service import get_device_family_discovery_service
 from utils.service_discovery import get_command_center_url
 
@@ -25,18 +27,17 @@ SCAN_TIMEOUT: float = 10.0
 def run_scan_and_upload(request_id: str) -> None:
     """Run device scan and upload results to CC. Meant to run in a background thread."""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(_async_scan_and_upload(request_id))
+        get_async_runtime().run(_async_scan_and_upload(request_id))
     except Exception as e:
         logger.error("Device scan handler failed", request_id=request_id[:8], error=str(e))
         _upload_error(request_id, str(e))
-    finally:
-        loop.close()
 
 
 async def _async_scan_and_upload(request_id: str) -> None:
     """Async: discover devices via protocol adapters and POST results to CC."""
+    # The user is looking for devices; have the periodic scanner look sooner too
+    notify_devices_changed()
+
     discovery = get_device_family_discovery_service()
     families = discovery.get_all_families()
 
@@ -58,17 +59,10 @@ async def _async_scan_and_upload(request_id: str) -> None:
         logger.info("Protocol scan complete", protocol=protocol_name, device_count=len(result))
         all_devices.extend(result)
 
-    # Deduplicate (same logic as DeviceScannerService.scan)
+    # Deduplicate (same key as DeviceScannerService.scan)
     by_key: dict[str, DiscoveredDevice] = {}
     for dev in all_devices:
-        if dev.mac_address:
-            by_key[dev.mac_address.lower()] = dev
-        elif dev.local_ip:
-            by_key[dev.local_ip] = dev
-        elif dev.cloud_id:
-            by_key[dev.cloud_id] = dev
-        else:
-            by_key[dev.entity_id] = dev
+        by_key[device_key(dev)] = dev
 
     unique = list(by_key.values())
     logger.info("Device scan complete", request_id=request_id[:8], device_count=len(unique))
@@ -3,13 +3,34 @@
 Runs periodic mDNS + protocol-specific scans, deduplicates by MAC address,
 and reports discovered devices to the command center via the bulk import API.
 
+Scanning is incremental:
+  - Each protocol's discovery result is fingerprinted and cached. A
+    protocol is only re-scanned when its own interval is due; the others
+    contribute their cached devices.
+  - Intervals adapt: every scan that finds nothing new doubles the
+    protocol's interval (up to ``max_interval``); a change snaps it back
+    to ``min_interval``. ``tighten()`` (called when CC reports a device
+    add or the user runs a scan from the app) does the same for all
+    protocols and wakes the periodic loop.
+  - Only the diff since the last successful report (added + changed
+    devices) is sent to the command center. Devices that disappear are
+    dropped from the reported snapshot; their entity_ids are sent as a
+    ``removed`` list only when ``report_removals`` is set, because the
+    bulk import API does not accept that field on older command centers.
+
 Usage:
     scanner = DeviceScannerService(cc_base_url, node_id, api_key, household_id)
     await scanner.scan_and_report()  # one-shot
-    await scanner.start_periodic(interval=300)  # every 5 min
+    await scanner.start_periodic(interval=300)  # adaptive, starting at 5 min
 """
 
 import asyncio
+import hashlib
+import json
+import threading
+import time
+import weakref
+from dataclasses import asdict, dataclass, field
 from typing import Any
 
 import httpx
@@ -20,6 +41,70 @@ from utils.device_family_discovery_service import get_device_family_discovery_se
 
 logger = JarvisLogger(service="jarvis-node")
 
+DEFAULT_INTERVAL_SECONDS = 300
+DEFAULT_MIN_INTERVAL_SECONDS = 60
+DEFAULT_MAX_INTERVAL_SECONDS = 3600
+BACKOFF_FACTOR = 2.0
+# A LAN device that misses one scan is often just asleep; only report it
+# removed once it has been absent this many scans in a row.
+REMOVE_AFTER_MISSED_SCANS = 2
+
+
+def device_key(dev: DiscoveredDevice) -> str:
+    """Identity used for dedup and diffing: MAC, else IP, else cloud_id, else entity_id."""
+    if dev.mac_address:
+        return dev.mac_address.lower()
+    if dev.local_ip:
+        # No MAC — use IP as fallback key
+        return dev.local_ip
+    if dev.cloud_id:
+        # Cloud-only device — use cloud_id as key
+        return dev.cloud_id
+    # Last resort — use entity_id
+    return dev.entity_id
+
+
+def device_fingerprint(dev: DiscoveredDevice) -> str:
+    """Hash of the reported fields (``extra`` is internal and excluded)."""
+    data = asdict(dev)
+    data.pop("extra", None)
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+@dataclass
+class ScanDiff:
+    """Devices that differ from the last successful report."""
+
+    added: list[DiscoveredDevice] = field(default_factory=list)
+    changed: list[DiscoveredDevice] = field(default_factory=list)
+    removed: list[DiscoveredDevice] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+
+@dataclass
+class _ProtocolScanState:
+    interval: float
+    fingerprint: str = ""
+    devices: list[DiscoveredDevice] = field(default_factory=list)
+    next_due: float = 0.0
+    scans: int = 0
+    unchanged_scans: int = 0
+    failures: int = 0
+    last_scan_ms: float = 0.0
+
+
+# Scanners running start_periodic(), so notify_devices_changed() can reach them
+_active_scanners: "weakref.WeakSet[DeviceScannerService]" = weakref.WeakSet()
+
+
+def notify_devices_changed() -> None:
+    """Tighten every running scanner's intervals (a device was just added/removed)."""
+    for scanner in list(_active_scanners):
+        scanner.tighten()
+
 
 class DeviceScannerService:
     """Discovers LAN devices and registers them with the command center."""
@@ -32,6 +117,10 @@ class DeviceScannerService:
         household_id: str,
         admin_key: str = "",
         scan_timeout: float = 5.0,
+        min_interval: float = DEFAULT_MIN_INTERVAL_SECONDS,
+        max_interval: float = DEFAULT_MAX_INTERVAL_SECONDS,
+        report_removals: bool = False,
+        clock: Any = time.monotonic,
     ) -> None:
         self._cc_base_url = cc_base_url.rstrip("/")
         self._node_id = node_id
@@ -44,46 +133,58 @@ class DeviceScannerService:
         self._known_macs: dict[str, DiscoveredDevice] = {}
         self._running = False
 
+        self._base_interval: float = DEFAULT_INTERVAL_SECONDS
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._report_removals = report_removals
+        self._clock = clock
+        self._protocol_state: dict[str, _ProtocolScanState] = {}
+        # Last successfully reported snapshot: device_key -> fingerprint
+        self._reported: dict[str, str] = {}
+        self._reported_devices: dict[str, DiscoveredDevice] = {}
+        self._missing_scans: dict[str, int] = {}
+        self._reports_sent = 0
+        self._devices_uploaded = 0
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        self._state_lock = threading.Lock()
+
     @property
     def protocol_count(self) -> int:
         return len(self._protocols)
 
-    async def scan(self) -> list[DiscoveredDevice]:
-        """Run all protocol scanners and deduplicate by MAC address.
+    async def scan(self, force: bool = False) -> list[DiscoveredDevice]:
+        """Run due protocol scanners and deduplicate by MAC address.
+
+        Args:
+            force: Re-scan every protocol regardless of its interval.
 
         Returns:
-            List of unique discovered devices.
+            List of unique discovered devices (fresh results for scanned
+            protocols, cached results for the rest).
         """
         if not self._protocols:
             logger.warning("No device protocols available — install lifxlan or python-kasa")
             return []
 
-        all_devices: list[DiscoveredDevice] = []
-        scan_tasks = [p.discover(timeout=self._scan_timeout) for p in self._protocols]
+        now = self._clock()
+        due = [p for p in self._protocols if force or self._state_for(p.protocol_name).next_due <= now]
+
+        scan_tasks = [self._timed_discover(p) for p in due]
         results = await asyncio.gather(*scan_tasks, return_exceptions=True)
 
-        for i, result in enumerate(results):
-            protocol_name = self._protocols[i].protocol_name
-            if isinstance(result, Exception):
-                logger.error("Protocol scan failed", protocol=protocol_name, error=str(result))
-                continue
-            logger.info("Protocol scan complete", protocol=protocol_name, device_count=len(result))
-            all_devices.extend(result)
+        for protocol, result in zip(due, results):
+            self._record_protocol_scan(protocol.protocol_name, result)
+
+        all_devices: list[DiscoveredDevice] = []
+        for protocol in self._protocols:
+            all_devices.extend(self._state_for(protocol.protocol_name).devices)
 
         # Deduplicate by MAC address (prefer latest scan data)
         by_mac: dict[str, DiscoveredDevice] = {}
         for dev in all_devices:
-            if dev.mac_address:
-                by_mac[dev.mac_address.lower()] = dev
-            elif dev.local_ip:
-                # No MAC — use IP as fallback key
-                by_mac[dev.local_ip] = dev
-            elif dev.cloud_id:
-                # Cloud-only device — use cloud_id as key
-                by_mac[dev.cloud_id] = dev
-            else:
-                # Last resort — use entity_id
-                by_mac[dev.entity_id] = dev
+            by_mac[device_key(dev)] = dev
 
         # Resolve entity_id collisions (e.g., two "light.living_room")
         unique = list(by_mac.values())
@@ -92,6 +193,104 @@ class DeviceScannerService:
         self._known_macs = by_mac
         return unique
 
+    async def _timed_discover(self, protocol: IJarvisDeviceProtocol) -> tuple[list[DiscoveredDevice], float]:
+        start = time.perf_counter()
+        devices = await protocol.discover(timeout=self._scan_timeout)
+        return devices, (time.perf_counter() - start) * 1000
+
+    def _state_for(self, protocol_name: str) -> _ProtocolScanState:
+        state = self._protocol_state.get(protocol_name)
+        if state is None:
+            state = self._protocol_state[protocol_name] = _ProtocolScanState(interval=self._base_interval)
+        return state
+
+    def _record_protocol_scan(self, protocol_name: str, result: Any) -> None:
+        """Update a protocol's cached devices, fingerprint and next interval."""
+        state = self._state_for(protocol_name)
+        now = self._clock()
+        with self._state_lock:
+            state.scans += 1
+            if isinstance(result, BaseException):
+                # Keep the cached devices: a failed scan says nothing about
+                # whether they are still there.
+                state.failures += 1
+                state.next_due = now + state.interval
+                logger.error("Protocol scan failed", protocol=protocol_name, error=str(result))
+                return
+
+            devices, elapsed_ms = result
+            state.last_scan_ms = elapsed_ms
+            fingerprint = hashlib.sha256(
+                "".join(sorted(device_fingerprint(d) for d in devices)).encode()
+            ).hexdigest()
+
+            if state.fingerprint and fingerprint == state.fingerprint:
+                state.unchanged_scans += 1
+                state.interval = min(state.interval * BACKOFF_FACTOR, self._max_interval)
+            else:
+                if state.fingerprint:
+                    # Something moved — look again soon
+                    state.interval = self._min_interval
+                state.unchanged_scans = 0
+                state.fingerprint = fingerprint
+            state.devices = list(devices)
+            state.next_due = now + state.interval
+
+        logger.info(
+            "Protocol scan complete", protocol=protocol_name, device_count=len(devices),
+            changed=state.unchanged_scans == 0, next_scan_s=round(state.interval),
+            scan_ms=round(elapsed_ms, 1),
+        )
+
+    def tighten(self) -> None:
+        """Drop every protocol to the minimum interval and rescan now.
+
+        Safe to call from any thread.
+        """
+        now = self._clock()
+        with self._state_lock:
+            for state in self._protocol_state.values():
+                state.interval = self._min_interval
+                state.next_due = now
+        loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wake.set)
+        logger.info("Device scan intervals tightened")
+
+    def diff(self, devices: list[DiscoveredDevice]) -> ScanDiff:
+        """Compare ``devices`` with the last successful report."""
+        result = ScanDiff()
+        current: dict[str, DiscoveredDevice] = {device_key(d): d for d in devices}
+        for key, dev in current.items():
+            previous = self._reported.get(key)
+            if previous is None:
+                result.added.append(dev)
+            elif previous != device_fingerprint(dev):
+                result.changed.append(dev)
+        for key, dev in self._reported_devices.items():
+            if key not in current and self._missing_scans.get(key, 0) + 1 >= REMOVE_AFTER_MISSED_SCANS:
+                result.removed.append(dev)
+        return result
+
+    def _commit_report(self, devices: list[DiscoveredDevice], diff: ScanDiff) -> None:
+        """Record ``devices`` as the reported snapshot after CC accepted the diff."""
+        for dev in diff.removed:
+            key = device_key(dev)
+            self._missing_scans.pop(key, None)
+            self._reported.pop(key, None)
+            self._reported_devices.pop(key, None)
+        for key, dev in {device_key(d): d for d in devices}.items():
+            self._reported[key] = device_fingerprint(dev)
+            self._reported_devices[key] = dev
+
+    def _note_missing(self, devices: list[DiscoveredDevice]) -> None:
+        current = {device_key(d) for d in devices}
+        for key in self._reported_devices:
+            if key in current:
+                self._missing_scans.pop(key, None)
+            else:
+                self._missing_scans[key] = self._missing_scans.get(key, 0) + 1
+
     def _resolve_entity_collisions(self, devices: list[DiscoveredDevice]) -> list[DiscoveredDevice]:
         """Append protocol suffix to entity_id if duplicates exist."""
         seen: dict[str, int] = {}
@@ -103,16 +302,25 @@ class DeviceScannerService:
                 seen[dev.entity_id] = 1
         return devices
 
-    async def report_to_cc(self, devices: list[DiscoveredDevice]) -> dict[str, Any]:
+    async def report_to_cc(
+        self,
+        devices: list[DiscoveredDevice],
+        removed: list[DiscoveredDevice] | None = None,
+    ) -> dict[str, Any]:
         """Send discovered devices to command center via bulk import API.
 
         Args:
-            devices: Devices to register.
+            devices: Devices to register (new or changed).
+            removed: Previously reported devices no longer found; sent as
+                ``removed`` entity_ids alongside the import if the scanner
+                was created with ``report_removals``, otherwise ignored.
 
         Returns:
             CC response dict with created/updated counts.
         """
-        if not devices:
+        if not self._report_removals:
+            removed = None
+        if not devices and not removed:
             return {"created": 0, "updated": 0}
 
         import_items = []
@@ -140,9 +348,13 @@ class DeviceScannerService:
         auth_key = self._admin_key or self._api_key
         headers = {"X-API-Key": auth_key}
 
+        payload: dict[str, Any] = {"devices": import_items}
+        if removed:
+            payload["removed"] = [dev.entity_id for dev in removed]
+
         try:
             async with httpx.AsyncClient(timeout=15) as client:
-                resp = await client.post(url, json={"devices": import_items}, headers=headers)
+                resp = await client.post(url, json=payload, headers=headers)
                 resp.raise_for_status()
                 result = resp.json()
                 logger.info(
@@ -150,6 +362,7 @@ class DeviceScannerService:
                     created=result.get("created", 0),
                     updated=result.get("updated", 0),
                     total=len(devices),
+                    removed=len(removed or []),
                 )
                 return result
         except httpx.HTTPStatusError as e:
@@ -159,39 +372,100 @@ class DeviceScannerService:
             logger.error("CC device import failed", error=str(e))
             return {"error": str(e)}
 
-    async def scan_and_report(self) -> dict[str, Any]:
-        """One-shot: scan LAN and report to command center.
+    async def scan_and_report(self, force: bool = False) -> dict[str, Any]:
+        """Scan (due protocols only unless ``force``) and report changes to CC.
 
         Returns:
-            Dict with scan results and CC response.
+            Dict with scan results, diff counts and the CC response (if sent).
         """
-        devices = await self.scan()
-        if not devices:
-            logger.info("No devices discovered on LAN")
-            return {"discovered": 0}
-
-        logger.info("Devices discovered on LAN", count=len(devices),
-                     protocols=[d.protocol for d in devices])
-
-        cc_result = await self.report_to_cc(devices)
-        return {"discovered": len(devices), "cc_result": cc_result}
-
-    async def start_periodic(self, interval: int = 300) -> None:
+        devices = await self.scan(force=force)
+        diff = self.diff(devices)
+        summary: dict[str, Any] = {
+            "discovered": len(devices),
+            "added": len(diff.added),
+            "changed": len(diff.changed),
+            "removed": len(diff.removed),
+        }
+
+        if diff.is_empty:
+            self._note_missing(devices)
+            logger.debug("No device changes since last report", discovered=len(devices))
+            return summary
+
+        logger.info("Device changes detected", **summary,
+                    protocols=sorted({d.protocol for d in diff.added + diff.changed}))
+
+        cc_result = await self.report_to_cc(diff.added + diff.changed, removed=diff.removed)
+        if "error" not in cc_result:
+            # Only a report CC accepted becomes the new baseline; on failure
+            # the same diff is retried next cycle.
+            self._commit_report(devices, diff)
+            self._reports_sent += 1
+            self._devices_uploaded += len(diff.added) + len(diff.changed)
+        self._note_missing(devices)
+        summary["cc_result"] = cc_result
+        return summary
+
+    def _seconds_until_next_due(self) -> float:
+        if not self._protocol_state:
+            return self._base_interval
+        next_due = min(state.next_due for state in self._protocol_state.values())
+        return max(1.0, next_due - self._clock())
+
+    async def start_periodic(self, interval: int = DEFAULT_INTERVAL_SECONDS) -> None:
         """Start periodic scanning in the background.
 
         Args:
-            interval: Seconds between scans (default: 5 minutes).
+            interval: Starting per-protocol interval in seconds (default: 5
+                minutes); each protocol then backs off or tightens on its own.
         """
         self._running = True
-        logger.info("Starting periodic device scan", interval_s=interval)
+        self._base_interval = float(interval)
+        for state in self._protocol_state.values():
+            state.interval = self._base_interval
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        _active_scanners.add(self)
+        logger.info("Starting periodic device scan", interval_s=interval,
+                    min_interval_s=self._min_interval, max_interval_s=self._max_interval)
 
-        while self._running:
-            try:
-                await self.scan_and_report()
-            except Exception as e:
-                logger.error("Periodic scan failed", error=str(e))
-            await asyncio.sleep(interval)
+        try:
+            while self._running:
+                try:
+                    await self.scan_and_report()
+                except Exception as e:
+                    logger.error("Periodic scan failed", error=str(e))
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self._seconds_until_next_due())
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            _active_scanners.discard(self)
 
     def stop(self) -> None:
         """Stop periodic scanning."""
         self._running = False
+        loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wake.set)
+
+    def stats(self) -> dict[str, Any]:
+        """Per-protocol intervals and scan counts, plus report totals."""
+        now = self._clock()
+        return {
+            "reports_sent": self._reports_sent,
+            "devices_uploaded": self._devices_uploaded,
+            "protocols": {
+                name: {
+                    "interval_s": round(state.interval),
+                    "next_scan_in_s": round(max(0.0, state.next_due - now)),
+                    "device_count": len(state.devices),
+                    "scans": state.scans,
+                    "unchanged_scans": state.unchanged_scans,
+                    "failures": state.failures,
+                    "last_scan_ms": round(state.last_scan_ms, 1),
+                }
+                for name, state in self._protocol_state.items()
+            },
+        }
@@ -0,0 +1,310 @@
+"""Per-entity device state cache with request coalescing and batched fetches.
+
+Opening a room view in the mobile app fires one ``device-state`` MQTT
+message per device, and every one of them used to become its own LAN or
+cloud round trip. This cache sits in front of those fetches:
+
+  - **TTL** — a state fetched less than ``ttl_seconds`` ago is served
+    from memory (``device_state_cache_ttl_seconds``, default 5 s).
+  - **Coalescing** — concurrent requests for the same entity share one
+    in-flight fetch instead of each querying the device.
+  - **Batching** — adapters that expose an optional
+    ``async get_states(requests) -> {entity_id: state}`` (e.g. Nest's
+    single ``devices`` list call) get one call per protocol for all
+    misses that arrive within ``device_state_batch_window_ms``.
+
+Error results (``None`` or a dict with an ``"error"`` key) are shared
+with coalesced waiters but never cached. Control paths call
+``invalidate(entity_id)`` after changing a device so the next read is
+fresh.
+
+All methods run on the node-wide ``AsyncRuntime`` loop; in-flight
+futures are bound to it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from jarvis_log_client import JarvisLogger
+
+logger = JarvisLogger(service="jarvis-node")
+
+DEFAULT_TTL_SECONDS = 5.0
+DEFAULT_BATCH_WINDOW_MS = 25
+
+StateDict = Dict[str, Any]
+Fetch = Callable[[], Awaitable[Optional[StateDict]]]
+
+
+def _is_cacheable(state: Optional[StateDict]) -> bool:
+    return state is not None and "error" not in state
+
+
+@dataclass
+class _Entry:
+    state: StateDict
+    fetched_at: float
+
+
+@dataclass
+class _ProtocolStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    fetches: int = 0
+    batch_calls: int = 0
+    errors: int = 0
+    fetch_ms_total: float = 0.0
+    fetch_ms_max: float = 0.0
+
+    def record_fetch(self, elapsed_ms: float, ok: bool) -> None:
+        self.fetches += 1
+        self.fetch_ms_total += elapsed_ms
+        self.fetch_ms_max = max(self.fetch_ms_max, elapsed_ms)
+        if not ok:
+            self.errors += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.coalesced + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            # Share of lookups answered without a fetch of their own
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+            "fetches": self.fetches,
+            "batch_calls": self.batch_calls,
+            "errors": self.errors,
+            "avg_fetch_ms": round(self.fetch_ms_total / self.fetches, 1) if self.fetches else 0.0,
+            "max_fetch_ms": round(self.fetch_ms_max, 1),
+        }
+
+
+@dataclass
+class _PendingBatch:
+    requests: List[StateDict] = field(default_factory=list)
+    futures: Dict[str, "asyncio.Future[Optional[StateDict]]"] = field(default_factory=dict)
+
+
+class DeviceStateCache:
+    """TTL cache + in-flight coalescing + per-protocol batching for device state."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        batch_window_ms: int = DEFAULT_BATCH_WINDOW_MS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.batch_window_seconds = batch_window_ms / 1000.0
+        self._clock = clock
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._inflight: Dict[Tuple[str, str], "asyncio.Future[Optional[StateDict]]"] = {}
+        self._batches: Dict[str, _PendingBatch] = {}
+        self._stats: Dict[str, _ProtocolStats] = {}
+        # Bumped by invalidate(); a fetch that started before an
+        # invalidation (e.g. raced a control command) is not cached.
+        self._versions: Dict[str, int] = {}
+        self._global_version = 0
+
+    # ── Reads ────────────────────────────────────────────────────────
+
+    async def get(self, source: str, entity_id: str, fetch: Fetch) -> Optional[StateDict]:
+        """State for ``entity_id`` from ``source`` (a protocol name or ``"home_assistant"``)."""
+        key = (source, entity_id)
+        stats = self._stats_for(source)
+
+        cached = self._fresh(key)
+        if cached is not None:
+            stats.hits += 1
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            stats.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        stats.misses += 1
+        future: asyncio.Future[Optional[StateDict]] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        version = self._version(entity_id)
+        start = time.perf_counter()
+        try:
+            state = await fetch()
+        except asyncio.CancelledError:
+            future.set_result(None)
+            raise
+        except Exception as e:
+            logger.warning("Device state fetch failed", source=source, entity_id=entity_id, error=str(e))
+            state = None
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        stats.record_fetch((time.perf_counter() - start) * 1000, _is_cacheable(state))
+        if self._version(entity_id) == version:
+            self._store(key, state)
+        future.set_result(state)
+        return state
+
+    async def get_direct(
+        self,
+        protocol_name: str,
+        adapter: Any,
+        entity_id: str,
+        **kwargs: Any,
+    ) -> Optional[StateDict]:
+        """State from a direct-device protocol adapter.
+
+        ``kwargs`` are passed through to ``adapter.get_state(ip, **kwargs)``
+        (or included in the batch request for ``get_states``).
+        """
+        if not callable(getattr(adapter, "get_states", None)):
+            ip = kwargs.pop("ip", "")
+            return await self.get(
+                protocol_name, entity_id,
+                lambda: adapter.get_state(ip, entity_id=entity_id, **kwargs),
+            )
+        return await self.get(
+            protocol_name, entity_id,
+            lambda: self._enqueue_batch(protocol_name, adapter, {"entity_id": entity_id, **kwargs}),
+        )
+
+    # ── Invalidation / metrics ───────────────────────────────────────
+
+    def invalidate(self, entity_id: Optional[str] = None) -> None:
+        """Drop cached state for one entity (all sources), or everything.
+
+        Fetches already in flight still answer their waiters, but their
+        result is not cached and new requests start a fresh fetch.
+        Runtime loop only; other threads use ``invalidate_threadsafe``.
+        """
+        if entity_id is None:
+            self._global_version += 1
+            self._entries.clear()
+            self._inflight.clear()
+            return
+        self._versions[entity_id] = self._versions.get(entity_id, 0) + 1
+        for key in [k for k in list(self._entries) if k[1] == entity_id]:
+            self._entries.pop(key, None)
+        for key in [k for k in list(self._inflight) if k[1] == entity_id]:
+            self._inflight.pop(key, None)
+
+    def invalidate_threadsafe(self, entity_id: Optional[str] = None) -> None:
+        """``invalidate()`` from outside the runtime loop (e.g. an MQTT handler thread)."""
+        from core.async_runtime import get_async_runtime
+
+        get_async_runtime().loop.call_soon_threadsafe(self.invalidate, entity_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-protocol hit/miss counts and fetch latency."""
+        return {
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl_seconds,
+            "protocols": {name: s.to_dict() for name, s in self._stats.items()},
+        }
+
+    # ── Internals ────────────────────────────────────────────────────
+
+    def _stats_for(self, source: str) -> _ProtocolStats:
+        stats = self._stats.get(source)
+        if stats is None:
+            stats = self._stats[source] = _ProtocolStats()
+        return stats
+
+    def _version(self, entity_id: str) -> Tuple[int, int]:
+        return (self._global_version, self._versions.get(entity_id, 0))
+
+    def _fresh(self, key: Tuple[str, str]) -> Optional[StateDict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._clock() - entry.fetched_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        return entry.state
+
+    def _store(self, key: Tuple[str, str], state: Optional[StateDict]) -> None:
+        if _is_cacheable(state) and self.ttl_seconds > 0:
+            self._entries[key] = _Entry(state=state, fetched_at=self._clock())
+
+    async def _enqueue_batch(
+        self, protocol_name: str, adapter: Any, request: StateDict,
+    ) -> Optional[StateDict]:
+        """Join (or open) the protocol's batch window and wait for its result."""
+        loop = asyncio.get_running_loop()
+        batch = self._batches.get(protocol_name)
+        if batch is None:
+            batch = self._batches[protocol_name] = _PendingBatch()
+            loop.call_later(
+                self.batch_window_seconds,
+                lambda: loop.create_task(self._flush_batch(protocol_name, adapter)),
+            )
+        # A second fetch for an entity already in this window (after an
+        # invalidate() dropped the in-flight entry) shares its answer.
+        future = batch.futures.get(request["entity_id"])
+        if future is None:
+            future = loop.create_future()
+            batch.requests.append(request)
+            batch.futures[request["entity_id"]] = future
+        return await asyncio.shield(future)
+
+    async def _flush_batch(self, protocol_name: str, adapter: Any) -> None:
+        batch = self._batches.pop(protocol_name, None)
+        if batch is None or not batch.requests:
+            return
+        self._stats_for(protocol_name).batch_calls += 1
+        try:
+            states: Dict[str, Optional[StateDict]] = await adapter.get_states(batch.requests) or {}
+        except Exception as e:
+            logger.warning("Batched device state fetch failed", protocol=protocol_name,
+                           count=len(batch.requests), error=str(e))
+            states = {}
+
+        for request in batch.requests:
+            entity_id = request["entity_id"]
+            future = batch.futures[entity_id]
+            if future.done():
+                continue
+            state = states.get(entity_id)
+            if state is None:
+                # Missing from the batch answer — fall back to a single query
+                try:
+                    kwargs = {k: v for k, v in request.items() if k not in ("entity_id", "ip")}
+                    state = await adapter.get_state(request.get("ip", ""), entity_id=entity_id, **kwargs)
+                except Exception as e:
+                    logger.warning("Device state fetch failed", source=protocol_name,
+                                   entity_id=entity_id, error=str(e))
+                    state = None
+            future.set_result(state)
+
+
+_device_state_cache: Optional[DeviceStateCache] = None
+
+
+def get_device_state_cache() -> DeviceStateCache:
+    """Return the process-wide DeviceStateCache, creating it on first call."""
+    global _device_state_cache
+    if _device_state_cache is None:
+        from utils.config_service import Config
+
+        _device_state_cache = DeviceStateCache(
+            ttl_seconds=Config.get_float("device_state_cache_ttl_seconds", DEFAULT_TTL_SECONDS),
+            batch_window_ms=Config.get_int("device_state_batch_window_ms", DEFAULT_BATCH_WINDOW_MS),
+        )
+    return _device_state_cache
+
+
+def get_device_state_cache_stats() -> Optional[Dict[str, Any]]:
+    """Cache stats if the cache has been created, else None."""
+    return _device_state_cache.stats() if _device_state_cache is not None else None
+
+
+def reset_device_state_cache() -> None:
+    """Drop the singleton (test hook). Production code should not call this."""
+    global _device_state_cache
+    _device_state_cache = None
@@ -3,32 +3,33 @@
 Flow:
 1. CC publishes to jarvis/nodes/{node_id}/device-state with {request_id, entity_id, ...}
 2. This handler queries the adapter's get_state() or HA get_state()
+   through the shared DeviceStateCache (TTL, coalescing, batching)
 3. Normalizes via DomainHandler and POSTs result back to CC
 """
 
-import asyncio
 from typing import Any
 
 from jarvis_log_client import JarvisLogger
 
 from clients.rest_client import RestClient
+from core.async_runtime import get_async_runtime
 from device_families.domains import UIControlHints, get_domain_handler
+from services.device_state_cache import get_device_state_cache
 from utils.service_discovery import get_command_center_url
 
 logger = JarvisLogger(service="jarvis-node")
 
+# Upper bound on one query; a wedged adapter must not hold the MQTT worker forever.
+QUERY_TIMEOUT_SECONDS = 30.0
+
 
 def run_state_query_and_upload(request_id: str, details: dict[str, Any]) -> None:
     """Run device state query and upload results to CC. Runs in a background thread."""
-    loop = asyncio.new_event_loop()
     try:
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(_async_query_and_upload(request_id, details))
+        get_async_runtime().run(_async_query_and_upload(request_id, details), timeout=QUERY_TIMEOUT_SECONDS)
     except Exception as e:
         logger.error("Device state handler failed", request_id=request_id[:8], error=str(e))
         _upload_result(request_id, {"error": str(e)})
-    finally:
-        loop.close()
 
 
 async def _async_query_and_upload(request_id: str, details: dict[str, Any]) -> None:
@@ -100,9 +101,9 @@ async def _query_direct_device(details: dict[str, Any]) -> dict[str, Any] | None
         adapter = discovery.get_family(protocol_name) if protocol_name else None
 
         if adapter:
-            return await adapter.get_state(
+            return await get_device_state_cache().get_direct(
+                protocol_name, adapter, entity_id,
                 ip=details.get("local_ip", ""),
-                entity_id=entity_id,
                 cloud_id=details.get("cloud_id", ""),
                 mac_address=details.get("mac_address", ""),
             )
@@ -115,7 +116,13 @@ async def _query_direct_device(details: dict[str, Any]) -> dict[str, Any] | None
 
 
 async def _query_ha_device(entity_id: str) -> dict[str, Any] | None:
-    """Query state from Home Assistant."""
+    """Query state from Home Assistant (cached per entity)."""
+    return await get_device_state_cache().get(
+        "home_assistant", entity_id, lambda: _fetch_ha_state(entity_id),
+    )
+
+
+async def _fetch_ha_state(entity_id: str) -> dict[str, Any] | None:
     try:
         from ha_shared.home_assistant_service import HomeAssistantService
 
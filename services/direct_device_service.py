@@ -16,6 +16,7 @@ import httpx
 from jarvis_log_client import JarvisLogger
 
 from device_families.base import DeviceControlResult, IJarvisDeviceProtocol
+from services.device_state_cache import get_device_state_cache
 from utils.device_family_discovery_service import get_device_family_discovery_service
 
 logger = JarvisLogger(service="jarvis-node")
@@ -181,7 +182,10 @@ class DirectDeviceService:
             local_ip=device.local_ip,
             mac_address=device.mac_address,
         )
-        return await adapter.control(discovered, action, data or {})
+        result = await adapter.control(discovered, action, data or {})
+        # The device just changed; don't serve its pre-control state
+        get_device_state_cache().invalidate(entity_id)
+        return result
 
     def invalidate_cache(self) -> None:
         """Drop the cached device registry.
@@ -193,7 +197,7 @@ class DirectDeviceService:
         self._device_cache = {}
 
     async def get_state(self, entity_id: str) -> dict[str, Any] | None:
-        """Query current state of a direct device.
+        """Query current state of a direct device (via the shared state cache).
 
         Args:
             entity_id: Device entity ID.
@@ -209,9 +213,11 @@ class DirectDeviceService:
         if not adapter:
             return None
 
-        return await adapter.get_state(
+        return await get_device_state_cache().get_direct(
+            device.protocol, adapter, entity_id,
             ip=device.local_ip or "",
             device=device,
+            cloud_id=device.cloud_id,
             mac_address=device.mac_address,
         )
 
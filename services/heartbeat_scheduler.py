@@ -0,0 +1,150 @@
+"""When to send the next heartbeat.
+
+The heartbeat used to go out every 300 s regardless of what was going
+on. Now it is event-driven with a backoff:
+
+  - **State change** — the node's state (busy/idle, update deferred or
+    in flight, supervised-thread health) is sampled every
+    ``poll_seconds``; a change sends a heartbeat right away, so the
+    command center sees "idle again" in seconds and can dispatch a
+    deferred update without waiting out an interval.
+  - **Requested** — ``request_heartbeat()`` wakes the loop for an
+    immediate send (e.g. after something the CC should hear about now).
+  - **Quiet** — with nothing changing, the interval starts at
+    ``heartbeat_interval_seconds`` and doubles after each uneventful
+    heartbeat up to ``heartbeat_max_interval_seconds``. Any change drops
+    it back to the base interval.
+
+``min_spacing_seconds`` rate-limits change-triggered sends so a
+flapping state can't turn into a request storm; the change is still
+picked up on the next permitted poll. A failed send backs off from
+``min_spacing_seconds``, doubling, up to the base interval.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+DEFAULT_INTERVAL_SECONDS = 300.0
+DEFAULT_MAX_INTERVAL_SECONDS = 600.0
+DEFAULT_POLL_SECONDS = 5.0
+DEFAULT_MIN_SPACING_SECONDS = 10.0
+
+
+class HeartbeatScheduler:
+    """Decide, from sampled node state, whether a heartbeat is due."""
+
+    def __init__(
+        self,
+        *,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+        max_interval_seconds: float = DEFAULT_MAX_INTERVAL_SECONDS,
+        poll_seconds: float = DEFAULT_POLL_SECONDS,
+        min_spacing_seconds: float = DEFAULT_MIN_SPACING_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.base_interval = interval_seconds
+        self.max_interval = max(max_interval_seconds, interval_seconds)
+        self.poll_seconds = poll_seconds
+        self.min_spacing = min_spacing_seconds
+        self.interval = interval_seconds
+        self._clock = clock
+        self._wake = threading.Event()
+        self._requested: Optional[str] = None
+        self._last_state: Optional[Hashable] = None
+        self._last_sent: Optional[float] = None
+        self._retry_at = 0.0
+        self._failures = 0
+
+        self._sent = 0
+        self._failed = 0
+        self._by_reason: Dict[str, int] = {}
+
+    def request(self, reason: str = "requested") -> None:
+        """Ask for a heartbeat as soon as possible."""
+        self._requested = reason
+        self._wake.set()
+
+    def wait(self) -> None:
+        """Sleep until the next poll (or an explicit request)."""
+        self._wake.wait(timeout=self.poll_seconds)
+        self._wake.clear()
+
+    def due(self, state: Hashable) -> Optional[str]:
+        """Why a heartbeat should be sent now, or None."""
+        now = self._clock()
+        if now < self._retry_at:
+            return None
+        if self._last_sent is None:
+            return self._requested or "startup"
+        spaced = now - self._last_sent >= self.min_spacing
+        if self._requested is not None and spaced:
+            return self._requested
+        if state != self._last_state and spaced:
+            return "state_change"
+        if now - self._last_sent >= self.interval:
+            return "interval"
+        return None
+
+    def sent(self, state: Hashable, reason: str, ok: bool = True) -> None:
+        """Record a send attempt; adapts the quiet interval."""
+        now = self._clock()
+        if not ok:
+            # Back off (spacing, doubling, capped at the base interval) and
+            # keep the old state so whatever triggered this send retries.
+            self._failures += 1
+            delay = min(self.min_spacing * 2 ** (self._failures - 1), self.base_interval)
+            self._retry_at = now + delay
+            self._failed += 1
+            return
+        self._failures = 0
+        self._retry_at = 0.0
+        self._last_sent = now
+        self._requested = None
+        self._last_state = state
+        self._sent += 1
+        self._by_reason[reason] = self._by_reason.get(reason, 0) + 1
+        if reason == "interval":
+            self.interval = min(self.interval * 2, self.max_interval)
+        else:
+            self.interval = self.base_interval
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sent": self._sent,
+            "failed": self._failed,
+            "by_reason": dict(self._by_reason),
+            "interval_seconds": self.interval,
+        }
+
+
+_scheduler: Optional[HeartbeatScheduler] = None
+
+
+def get_heartbeat_scheduler() -> HeartbeatScheduler:
+    """Return the process-wide scheduler, creating it on first call."""
+    global _scheduler
+    if _scheduler is None:
+        from utils.config_service import Config
+
+        _scheduler = HeartbeatScheduler(
+            interval_seconds=Config.get_float("heartbeat_interval_seconds", DEFAULT_INTERVAL_SECONDS),
+            max_interval_seconds=Config.get_float("heartbeat_max_interval_seconds",
+                                                  DEFAULT_MAX_INTERVAL_SECONDS),
+            poll_seconds=Config.get_float("heartbeat_poll_seconds", DEFAULT_POLL_SECONDS),
+        )
+    return _scheduler
+
+
+def request_heartbeat(reason: str = "requested") -> None:
+    """Send a heartbeat soon (no-op until the heartbeat loop has started)."""
+    if _scheduler is not None:
+        _scheduler.request(reason)
+
+
+def reset_heartbeat_scheduler() -> None:
+    """Drop the singleton (test hook). Production code should not call this."""
+    global _scheduler
+    _scheduler = None
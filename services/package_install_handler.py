@@ -11,6 +11,7 @@ from typing import Any
 from jarvis_log_client import JarvisLogger
 
 from clients.rest_client import RestClient
+from core.execution_policy import current_background_job
 from utils.service_discovery import get_command_center_url
 
 logger = JarvisLogger(service="jarvis-node")
@@ -21,13 +22,14 @@ def run_install_and_upload(
     command_name: str,
     github_repo_url: str,
     git_tag: str | None,
+    archive_sha256: str | None = None,
 ) -> None:
     """Run package install and upload results to CC. Meant to run in a background thread."""
     print(f"[INSTALL] starting install: {command_name} from {github_repo_url} tag={git_tag}", flush=True)
     try:
         from services.command_store_service import install_from_github
 
-        manifest = install_from_github(github_repo_url, version_tag=git_tag)
+        manifest = install_from_github(github_repo_url, version_tag=git_tag, archive_sha256=archive_sha256)
         print(f"[INSTALL] success: {manifest.name} v{manifest.version}", flush=True)
         logger.info(
             "Package installed successfully",
@@ -91,6 +93,10 @@ def run_install_and_upload(
         except Exception as e:
             logger.warning("Device family refresh after install failed (non-fatal)", error=str(e))
 
+        # New commands/families/managers change the settings snapshot
+        from services.settings_snapshot_service import invalidate_snapshot_cache
+        invalidate_snapshot_cache()
+
         _upload_result(request_id, success=True, details={
             "package_name": manifest.name,
             "version": manifest.version,
@@ -160,6 +166,11 @@ def _upload_result(
 
     url = f"{cc_url.rstrip('/')}/api/v0/nodes/{node_id}/package-{action}/{request_id}/results"
 
+    # How long the job waited on the background pool, for CC to surface
+    queue = current_background_job()
+    if queue:
+        details = {**(details or {}), "queue": queue}
+
     payload: dict[str, Any] = {"success": success}
     if error:
         payload["error"] = error
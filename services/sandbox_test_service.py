@@ -0,0 +1,259 @@
+"""Sandbox test service — runs the command test harness without Docker.
+
+``container_test_service`` builds a fresh Docker image for every test,
+which most Pi nodes can't do and which takes minutes everywhere else.
+The sandbox runs the same ``test_harness.py`` in a subprocess instead:
+
+  - **Cached interpreter** — a virtualenv with jarvis-command-sdk is
+    built once under ``~/.jarvis/cache/sandbox-venvs/`` and keyed by the
+    Python version and the SDK source, so it is rebuilt only when either
+    changes. Package dependencies are installed into a sibling
+    ``--target`` directory keyed by the requirement list (from the
+    node's wheelhouse when possible) and put on ``PYTHONPATH``.
+  - **Resource limits** — the harness applies rlimits for CPU seconds,
+    address space and open files before importing the command.
+  - **No network** — an in-process socket guard refuses IPv4/IPv6
+    connects and DNS lookups.
+  - **Parallel** — ``run_sandbox_tests_parallel`` tests several
+    packages at once on a small thread pool.
+
+Results use the same ``ContainerTestResult`` contract as the Docker path.
+The socket guard is a safety net for honest mistakes, not a security
+boundary against hostile code — use Docker where that matters.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from jarvis_log_client import JarvisLogger
+
+from services.command_store_service import WHEEL_CACHE_DIR
+from services.container_test_service import (
+    HARNESS_SCRIPT,
+    SDK_DIR,
+    ContainerTestResult,
+    _copy_command_files,
+    _parse_harness_output,
+)
+
+logger = JarvisLogger(service="jarvis-node")
+
+SANDBOX_CACHE_DIR = Path.home() / ".jarvis" / "cache" / "sandbox-venvs"
+
+# Limits applied inside the harness process
+SANDBOX_MEMORY_MB = 512
+SANDBOX_MAX_OPEN_FILES = 256
+
+# Harnesses run at once by run_sandbox_tests_parallel
+DEFAULT_PARALLELISM = min(4, os.cpu_count() or 1)
+
+# Serialises venv / dependency builds; test runs themselves don't take it
+_build_lock = threading.Lock()
+
+
+class SandboxSetupError(Exception):
+    """The cached sandbox interpreter or dependency dir could not be built."""
+
+
+def _venv_python(venv_dir: Path) -> Path:
+    if sys.platform == "win32":
+        return venv_dir / "Scripts" / "python.exe"
+    return venv_dir / "bin" / "python"
+
+
+def _sdk_fingerprint() -> str:
+    """Fingerprint of the local SDK checkout (paths + mtimes), or the index name."""
+    if not SDK_DIR.is_dir():
+        return "jarvis-command-sdk"
+    digest = hashlib.sha256()
+    for path in sorted(SDK_DIR.rglob("*")):
+        if path.suffix in (".py", ".toml", ".cfg") and ".venv" not in path.parts:
+            digest.update(str(path.relative_to(SDK_DIR)).encode())
+            digest.update(str(path.stat().st_mtime_ns).encode())
+    return digest.hexdigest()
+
+
+def _venv_key() -> str:
+    python = f"{sys.implementation.name}-{sys.version_info.major}.{sys.version_info.minor}"
+    return hashlib.sha256(f"{python}:{_sdk_fingerprint()}".encode()).hexdigest()[:16]
+
+
+def _deps_key(venv_key: str, packages: list[str]) -> str:
+    return hashlib.sha256(f"{venv_key}:{'|'.join(sorted(packages))}".encode()).hexdigest()[:16]
+
+
+def _run(args: list[str], timeout: int) -> None:
+    result = subprocess.run(args, capture_output=True, text=True, timeout=timeout)
+    if result.returncode != 0:
+        raise SandboxSetupError((result.stderr or result.stdout).strip()[-2000:])
+
+
+def _build_atomically(final_dir: Path, build) -> None:
+    """Run ``build(tmp_dir)`` and move the result into place, so a half-built
+    directory from an interrupted build is never mistaken for a cached one."""
+    tmp_dir = final_dir.with_name(final_dir.name + ".building")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    try:
+        build(tmp_dir)
+        tmp_dir.rename(final_dir)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def ensure_sandbox_venv() -> Path:
+    """Return the cached sandbox interpreter, building the venv on first use."""
+    venv_dir = SANDBOX_CACHE_DIR / f"sdk-{_venv_key()}"
+    python = _venv_python(venv_dir)
+    if python.exists():
+        return python
+
+    with _build_lock:
+        if python.exists():
+            return python
+        SANDBOX_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        sdk_source = str(SDK_DIR) if SDK_DIR.is_dir() else "jarvis-command-sdk"
+
+        def build(tmp_dir: Path) -> None:
+            _run([sys.executable, "-m", "venv", str(tmp_dir)], timeout=120)
+            # venv scripts embed their own path; install via the module so
+            # nothing depends on the pre-rename location
+            _run([str(_venv_python(tmp_dir)), "-m", "pip", "install", "--quiet",
+                  "--find-links", str(WHEEL_CACHE_DIR), sdk_source], timeout=300)
+
+        logger.info("Building sandbox virtualenv", path=str(venv_dir), sdk=sdk_source)
+        _build_atomically(venv_dir, build)
+
+        # Drop venvs for older SDKs / Python versions
+        for stale in SANDBOX_CACHE_DIR.glob("sdk-*"):
+            if stale != venv_dir:
+                shutil.rmtree(stale, ignore_errors=True)
+    return python
+
+
+def ensure_sandbox_deps(python: Path, packages: list[str]) -> Path | None:
+    """Return a ``--target`` dir with ``packages`` installed, cached by requirement list."""
+    if not packages:
+        return None
+    deps_dir = SANDBOX_CACHE_DIR / "deps" / _deps_key(python.parent.parent.name, packages)
+    if deps_dir.is_dir():
+        return deps_dir
+
+    with _build_lock:
+        if deps_dir.is_dir():
+            return deps_dir
+        deps_dir.parent.mkdir(parents=True, exist_ok=True)
+
+        def build(tmp_dir: Path) -> None:
+            _run([str(python), "-m", "pip", "install", "--quiet", "--target", str(tmp_dir),
+                  "--find-links", str(WHEEL_CACHE_DIR), *packages], timeout=300)
+
+        logger.info("Installing sandbox dependencies", packages=packages)
+        _build_atomically(deps_dir, build)
+    return deps_dir
+
+
+def _sandbox_env(work_dir: Path, deps_dir: Path | None, timeout_seconds: int) -> dict[str, str]:
+    """Minimal environment for the harness: no inherited secrets or proxies."""
+    env = {
+        "PATH": os.environ.get("PATH", "/usr/bin:/bin"),
+        "HOME": str(work_dir),
+        "TMPDIR": str(work_dir),
+        "PYTHONDONTWRITEBYTECODE": "1",
+        "JARVIS_TEST_COMMAND_DIR": str(work_dir / "command"),
+        "JARVIS_TEST_BLOCK_NETWORK": "1",
+        "JARVIS_TEST_RLIMIT_CPU": str(timeout_seconds),
+        "JARVIS_TEST_RLIMIT_AS_MB": str(SANDBOX_MEMORY_MB),
+        "JARVIS_TEST_RLIMIT_NOFILE": str(SANDBOX_MAX_OPEN_FILES),
+    }
+    if deps_dir is not None:
+        env["PYTHONPATH"] = str(deps_dir)
+    return env
+
+
+def _fail(summary: str, errors: list[str], raw_output: str = "") -> ContainerTestResult:
+    return ContainerTestResult(
+        passed=False,
+        summary=summary,
+        test_count=0,
+        pass_count=0,
+        fail_count=1,
+        errors=errors,
+        raw_output=raw_output,
+    )
+
+
+def run_sandbox_tests(
+    command_dir: Path,
+    packages: list[str] | None = None,
+    timeout_seconds: int = 60,
+) -> ContainerTestResult:
+    """Run the command test harness in a local sandboxed subprocess.
+
+    Args:
+        command_dir: Path to directory containing command.py and manifest.
+        packages: Additional pip packages the command needs.
+        timeout_seconds: Wall-clock limit (also the CPU-seconds rlimit).
+
+    Returns:
+        ContainerTestResult with test outcomes.
+    """
+    try:
+        python = ensure_sandbox_venv()
+        deps_dir = ensure_sandbox_deps(python, packages or [])
+    except (SandboxSetupError, subprocess.TimeoutExpired, OSError) as e:
+        logger.error("Sandbox setup failed", error=str(e))
+        return _fail("FAIL - Sandbox setup failed", [str(e)])
+
+    work_dir = Path(tempfile.mkdtemp(prefix="jarvis-sandbox-"))
+    try:
+        _copy_command_files(command_dir, work_dir / "command")
+        run_result = subprocess.run(
+            [str(python), "-s", str(HARNESS_SCRIPT)],
+            cwd=work_dir,
+            env=_sandbox_env(work_dir, deps_dir, timeout_seconds),
+            capture_output=True,
+            text=True,
+            timeout=timeout_seconds,
+        )
+        if run_result.returncode < 0 and not run_result.stdout.strip():
+            # Killed by a limit (SIGXCPU, SIGKILL on OOM) before reporting
+            return _fail(
+                f"FAIL - Sandbox killed by signal {-run_result.returncode}",
+                [run_result.stderr],
+                run_result.stderr,
+            )
+        return _parse_harness_output(run_result.stdout, run_result.stderr)
+
+    except subprocess.TimeoutExpired:
+        return _fail(f"FAIL - Sandbox timed out after {timeout_seconds}s", ["Sandbox exceeded timeout"])
+
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def run_sandbox_tests_parallel(
+    jobs: list[tuple[Path, list[str] | None]],
+    timeout_seconds: int = 60,
+    max_workers: int = DEFAULT_PARALLELISM,
+) -> list[ContainerTestResult]:
+    """Run several ``(command_dir, packages)`` harnesses concurrently.
+
+    Returns results in the order of ``jobs``.
+    """
+    if not jobs:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="sandbox-test") as pool:
+        futures = [
+            pool.submit(run_sandbox_tests, command_dir, packages, timeout_seconds)
+            for command_dir, packages in jobs
+        ]
+        return [future.result() for future in futures]
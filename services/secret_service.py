@@ -9,6 +9,21 @@ from repositories.secrets_repository import SecretRepository
 if TYPE_CHECKING:
     from core.ijarvis_secret import IJarvisSecret
 
+# Bumped on every write so callers that cache derived data (the settings
+# snapshot) can tell when secrets changed without re-reading them.
+_generation: int = 0
+
+
+def _bump_generation() -> None:
+    global _generation
+    _generation += 1
+
+
+def get_secrets_generation() -> int:
+    """Counter that changes whenever a secret is written or deleted in this process."""
+    return _generation
+
+
 def set_secret(key: str, value: str, scope: str, value_type: str = "string", user_id: int | None = None):
     # Validate scope
     allowed_scopes = {"integration", "node", "user"}
@@ -44,6 +59,7 @@ def set_secret(key: str, value: str, scope: str, value_type: str = "string", use
         repo = SecretRepository(session)
         repo.add_or_update(key, store_value, scope, value_type, user_id=user_id)
         session.commit()
+    _bump_generation()
 
 
 def get_secret(key: str, scope: str, user_id: int | None = None) -> Secret:
@@ -68,6 +84,18 @@ def delete_secret(key: str, scope: str, user_id: int | None = None):
         repo = SecretRepository(session)
         repo.delete(key, scope, user_id=user_id)
         session.commit()
+    _bump_generation()
+
+def get_secret_values(user_id: int | None = None) -> dict[tuple[str, str], str]:
+    """Load every visible secret value in one query.
+
+    Returns a dict keyed by ``(key, scope)``. User-scoped rows are only
+    included for ``user_id`` (none when it is None), matching what
+    ``get_secret_value`` would return for each key.
+    """
+    with SessionLocal() as session:
+        rows = SecretRepository(session).get_all_visible(user_id=user_id)
+        return {(row.key, row.scope): row.value for row in rows}
 
 def get_all_secrets(scope: str, user_id: int | None = None) -> list[Secret]:
     with SessionLocal() as session:
@@ -91,6 +119,7 @@ def ensure_secret_exists(key: str, scope: str, value_type: str) -> None:
         if existing is None:
             repo.add_or_update(key, "", scope, value_type)
             session.commit()
+            _bump_generation()
 
 
 def get_secret_scope(key: str) -> str | None:
@@ -131,4 +160,5 @@ def seed_command_secrets(secrets: list[IJarvisSecret]) -> int:
                 inserted += 1
         if inserted > 0:
             session.commit()
+            _bump_generation()
     return inserted
@@ -6,11 +6,21 @@ When the mobile app requests a settings snapshot, the node:
 3. Builds a snapshot JSON
 4. Encrypts with K2 (AES-256-GCM)
 5. Uploads to CC for mobile to poll
+
+Steps 1-3 are memoized per (include_values, user_id) by ``get_snapshot``.
+The memo is keyed on generation counters that change when a secret is
+written, the command registry changes or commands are re-discovered, so
+a repeated request (the app re-opening settings) only pays for
+encryption and upload. ``invalidate_snapshot_cache`` drops it after
+package installs; a TTL covers writes made by other processes.
 """
 
 import base64
 import json
 import os
+import threading
+import time
+from dataclasses import dataclass
 from typing import Any
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
@@ -18,9 +28,9 @@ from jarvis_log_client import JarvisLogger
 
 from clients.rest_client import RestClient
 from db import SessionLocal
-from repositories.command_registry_repository import CommandRegistryRepository
-from services.secret_service import get_secret_value
-from utils.command_discovery_service import get_command_discovery_service
+from repositories.command_registry_repository import CommandRegistryRepository, get_registry_generation
+from services.secret_service import get_secret_values, get_secrets_generation
+from utils.command_discovery_service import get_command_discovery_service, get_discovery_generation
 from utils.config_service import Config
 from utils.device_family_discovery_service import get_device_family_discovery_service
 from utils.device_manager_discovery_service import get_device_manager_discovery_service
@@ -32,6 +42,9 @@ logger = JarvisLogger(service="jarvis-node")
 SCHEMA_VERSION: int = 1
 COMMANDS_SCHEMA_VERSION: int = 2
 
+# Safety net for secret/registry writes made by other processes (CLI scripts)
+SNAPSHOT_CACHE_TTL_SECONDS: float = 300.0
+
 
 def _b64url_encode(data: bytes) -> str:
     """Base64url encode without padding."""
@@ -52,10 +65,18 @@ def build_snapshot(include_values: bool = False, user_id: int | None = None) ->
     from jarvis_command_sdk.context import set_current_user_id
     set_current_user_id(user_id)
 
+    # Discovery is kept current by installs / toggles (refresh_now there);
+    # re-scanning every package here made each snapshot cost a full import pass.
     service = get_command_discovery_service()
-    service.refresh_now()
     commands = service.get_all_commands(include_disabled=True)
 
+    # One query for every secret instead of one per required secret
+    try:
+        secret_values = get_secret_values(user_id=user_id)
+    except Exception as e:
+        logger.warning("Failed to read secrets", error=str(e))
+        secret_values = {}
+
     # Get enabled states from registry
     try:
         db = SessionLocal()
@@ -72,8 +93,7 @@ def build_snapshot(include_values: bool = False, user_id: int | None = None) ->
     for cmd in commands.values():
         secrets_list: list[dict[str, Any]] = []
         for secret in cmd.required_secrets:
-            secret_user_id = user_id if secret.scope == "user" else None
-            value: str | None = get_secret_value(secret.key, secret.scope, user_id=secret_user_id)
+            value: str | None = secret_values.get((secret.key, secret.scope))
             entry: dict[str, Any] = {
                 "key": secret.key,
                 "scope": secret.scope,
@@ -122,7 +142,10 @@ def build_snapshot(include_values: bool = False, user_id: int | None = None) ->
             try:
                 secrets_list_f: list[dict[str, Any]] = []
                 for secret in family.required_secrets:
-                    value_f: str | None = get_secret_value(secret.key, secret.scope)
+                    # Families/managers never read user-scoped values
+                    value_f: str | None = (
+                        secret_values.get((secret.key, secret.scope)) if secret.scope != "user" else None
+                    )
                     entry_f: dict[str, Any] = {
                         "key": secret.key,
                         "scope": secret.scope,
@@ -176,7 +199,9 @@ def build_snapshot(include_values: bool = False, user_id: int | None = None) ->
             try:
                 secrets_list_m: list[dict[str, Any]] = []
                 for secret in mgr.required_secrets:
-                    value_m: str | None = get_secret_value(secret.key, secret.scope)
+                    value_m: str | None = (
+                        secret_values.get((secret.key, secret.scope)) if secret.scope != "user" else None
+                    )
                     entry_m: dict[str, Any] = {
                         "key": secret.key,
                         "scope": secret.scope,
@@ -218,7 +243,19 @@ def build_snapshot(include_values: bool = False, user_id: int | None = None) ->
 
     set_current_user_id(None)  # reset context
 
-    node_config: dict[str, Any] = {
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "commands_schema_version": COMMANDS_SCHEMA_VERSION,
+        "commands": command_entries,
+        "device_families": family_entries,
+        "device_managers": manager_entries,
+        "node_config": _build_node_config(),
+    }
+
+
+def _build_node_config() -> dict[str, Any]:
+    """Current node settings (read fresh on every request; config reads are cheap)."""
+    return {
         "wake_word_threshold": Config.get_float("wake_word_threshold", 0.5),
         "silence_threshold": Config.get_int("silence_threshold", 300),
         "silence_duration": Config.get_float("silence_duration", 0.8),
@@ -229,14 +266,63 @@ def build_snapshot(include_values: bool = False, user_id: int | None = None) ->
         "volume_percent": Config.get_int("volume_percent", 100),
     }
 
-    return {
-        "schema_version": SCHEMA_VERSION,
-        "commands_schema_version": COMMANDS_SCHEMA_VERSION,
-        "commands": command_entries,
-        "device_families": family_entries,
-        "device_managers": manager_entries,
-        "node_config": node_config,
-    }
+
+@dataclass
+class _CachedSnapshot:
+    snapshot: dict[str, Any]
+    version: tuple[int, ...]
+    built_at: float
+
+
+_snapshot_cache: dict[tuple[bool, int | None], _CachedSnapshot] = {}
+_snapshot_cache_lock = threading.Lock()
+# Bumped by invalidate_snapshot_cache() (package installs, device family changes)
+_invalidations: int = 0
+
+
+def _snapshot_version() -> tuple[int, ...]:
+    return (
+        _invalidations,
+        get_secrets_generation(),
+        get_registry_generation(),
+        get_discovery_generation(),
+    )
+
+
+def get_snapshot(include_values: bool = False, user_id: int | None = None) -> dict[str, Any]:
+    """``build_snapshot`` memoized per (include_values, user_id).
+
+    A cached snapshot is reused while no secret, registry or discovery
+    change has happened since it was built (and it is younger than
+    ``SNAPSHOT_CACHE_TTL_SECONDS``). ``node_config`` is always re-read.
+    """
+    key = (include_values, user_id)
+    # Read the version before building: a write that races the build
+    # moves the version on, so the next request rebuilds.
+    version = _snapshot_version()
+    now = time.monotonic()
+    with _snapshot_cache_lock:
+        cached = _snapshot_cache.get(key)
+    if (
+        cached is not None
+        and cached.version == version
+        and now - cached.built_at < SNAPSHOT_CACHE_TTL_SECONDS
+    ):
+        logger.debug("Settings snapshot served from cache", user_id=user_id, include_values=include_values)
+        return {**cached.snapshot, "node_config": _build_node_config()}
+
+    snapshot = build_snapshot(include_values=include_values, user_id=user_id)
+    with _snapshot_cache_lock:
+        _snapshot_cache[key] = _CachedSnapshot(snapshot=snapshot, version=version, built_at=now)
+    return snapshot
+
+
+def invalidate_snapshot_cache() -> None:
+    """Drop all memoized snapshots (call after installs that add commands/families/managers)."""
+    global _invalidations
+    with _snapshot_cache_lock:
+        _invalidations += 1
+        _snapshot_cache.clear()
 
 
 def encrypt_snapshot(snapshot: dict[str, Any], node_id: str) -> dict[str, str]:
@@ -327,8 +413,9 @@ def handle_snapshot_request(request_id: str, include_values: bool = False, user_
 
     logger.info("Snapshot request confirmed", request_id=request_id[:8])
 
-    # Build snapshot
-    snapshot: dict[str, Any] = build_snapshot(include_values=include_values, user_id=user_id)
+    # Build snapshot (memoized; only encryption and upload are per-request)
+    build_start = time.perf_counter()
+    snapshot: dict[str, Any] = get_snapshot(include_values=include_values, user_id=user_id)
     logger.info(
         "Snapshot built",
         request_id=request_id[:8],
@@ -336,6 +423,7 @@ def handle_snapshot_request(request_id: str, include_values: bool = False, user_
         family_count=len(snapshot.get("device_families", [])),
         manager_count=len(snapshot.get("device_managers", [])),
         node_config_keys=len(snapshot.get("node_config", {})),
+        build_ms=round((time.perf_counter() - build_start) * 1000, 1),
     )
 
     # Encrypt
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Test harness that runs inside the Docker container during command testing.
+"""Test harness that runs inside the Docker container (or local sandbox) during command testing.
 
 This script validates that a command is well-formed and safe:
 - Imports successfully
@@ -12,14 +12,70 @@ Exit code 0 = all tests pass, non-zero = failures.
 """
 
 import json
+import os
+import socket
 import sys
 import time
 import traceback
 from pathlib import Path
 
-# The command module is mounted at /test/command/
-sys.path.insert(0, "/test/command")
-sys.path.insert(0, "/test")
+# The command module is mounted at /test/command/ in Docker; the local
+# sandbox points JARVIS_TEST_COMMAND_DIR at its own copy.
+COMMAND_DIR = os.environ.get("JARVIS_TEST_COMMAND_DIR", "/test/command")
+sys.path.insert(0, COMMAND_DIR)
+sys.path.insert(0, str(Path(COMMAND_DIR).parent))
+
+
+def _apply_resource_limits() -> None:
+    """Apply the sandbox's rlimits (CPU seconds, address space, open files).
+
+    Set from inside the harness rather than a ``preexec_fn`` so the parent
+    can launch several sandboxes from worker threads safely.
+    """
+    try:
+        import resource
+    except ImportError:
+        return
+    limits = (
+        ("JARVIS_TEST_RLIMIT_CPU", "RLIMIT_CPU", 1),
+        ("JARVIS_TEST_RLIMIT_AS_MB", "RLIMIT_AS", 1024 * 1024),
+        ("JARVIS_TEST_RLIMIT_NOFILE", "RLIMIT_NOFILE", 1),
+    )
+    for env_key, name, scale in limits:
+        value = os.environ.get(env_key)
+        if not value or not hasattr(resource, name):
+            continue
+        limit = int(value) * scale
+        try:
+            resource.setrlimit(getattr(resource, name), (limit, limit))
+        except (ValueError, OSError):
+            pass  # e.g. RLIMIT_AS is not enforceable on macOS
+
+
+def _block_network() -> None:
+    """Refuse outbound IP traffic and DNS for the rest of the process."""
+    def _denied(*args, **kwargs):
+        raise PermissionError("Network access is disabled in the command test sandbox")
+
+    def _guarded(original):
+        def method(self, *args, **kwargs):
+            if self.family in (socket.AF_INET, socket.AF_INET6):
+                _denied()
+            return original(self, *args, **kwargs)
+        return method
+
+    socket.socket.connect = _guarded(socket.socket.connect)
+    socket.socket.connect_ex = _guarded(socket.socket.connect_ex)
+    socket.socket.sendto = _guarded(socket.socket.sendto)
+    socket.getaddrinfo = _denied
+    socket.gethostbyname = _denied
+    socket.gethostbyname_ex = _denied
+    socket.create_connection = _denied
+
+
+if os.environ.get("JARVIS_TEST_BLOCK_NETWORK") == "1":
+    _block_network()
+_apply_resource_limits()
 
 
 def _find_command_class():
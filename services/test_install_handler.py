@@ -20,6 +20,7 @@ from typing import Any
 from jarvis_log_client import JarvisLogger
 
 from clients.rest_client import RestClient
+from core.execution_policy import current_background_job
 from utils.service_discovery import get_command_center_url
 
 logger = JarvisLogger(service="jarvis-node")
@@ -205,6 +206,11 @@ def _upload_result(
 
     url = f"{cc_url.rstrip('/')}/api/v0/nodes/{node_id}/test-install/{request_id}/results"
 
+    # How long the job waited on the background pool, for CC to surface
+    queue = current_background_job()
+    if queue:
+        details = {**(details or {}), "queue": queue}
+
     payload: dict[str, Any] = {"success": success}
     if error:
         payload["error"] = error
@@ -0,0 +1,521 @@
+"""Household-shared cache of synthesized TTS audio.
+
+Every node pre-synthesizes the same short phrases — processing acks
+("One moment.") and wake responses — and used to ask the command
+center's TTS proxy for each one separately. This cache makes the
+household share that work:
+
+  - **Local store** — audio is kept on disk under ``~/.jarvis/cache/tts``,
+    keyed by a hash of the voice identity (``tts_provider`` and
+    ``tts_voice``) and the phrase, LRU-evicted past ``tts_cache_max_mb``.
+    Entries expire after ``tts_cache_ttl_hours`` so a voice change on the
+    command center (which the node can't see) ages out. Phrases longer
+    than ``tts_cache_max_chars`` are synthesized but not kept.
+  - **Advertisement** — each node publishes its inventory (phrase key →
+    SHA-256 of the audio) as a *retained* message on
+    ``jarvis/households/<household>/tts-cache/<node_id>``, so a freshly
+    booted node learns what its peers hold the moment it subscribes.
+  - **Peer fetch** — a miss that a peer advertises is fetched from that
+    peer's small HTTP endpoint (FastAPI/uvicorn, as the provisioning
+    server), verified against the advertised digest, and stored. The
+    endpoint listens on the LAN interface only and requires the token the
+    peer advertised (or ``tts_peer_cache_token`` when configured), so
+    only household members that can read the inventory topic can fetch.
+  - **Fallback** — if no peer has it (or every peer fails), the command
+    center synthesizes it as before.
+
+Only those fixed phrase pools go through the cache. Spoken replies are
+synthesized directly by the TTS provider: they may be personal, are
+rarely repeated, and would otherwise be stored in plaintext, served to
+every peer, and evict the ack phrases.
+
+``synthesize(text)`` is the single entry point for callers of the phrase
+pools; it returns WAV bytes or None.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+import re
+import secrets
+import socket
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from jarvis_log_client import JarvisLogger
+
+logger = JarvisLogger(service="jarvis-node")
+
+DEFAULT_MAX_MB = 32
+DEFAULT_MAX_CHARS = 120
+DEFAULT_PORT = 7780
+DEFAULT_TTL_HOURS = 24 * 7
+DEFAULT_VOICE = "jarvis-tts-api"
+PEER_TIMEOUT_SECONDS = 2.0
+# Peers that fail this many fetches in a row are skipped until they re-advertise.
+PEER_MAX_FAILURES = 3
+
+CACHE_PATH = "/api/v1/tts-cache"
+TOKEN_HEADER = "X-TTS-Cache-Token"
+_KEY_RE = re.compile(r"^[0-9a-f]{64}$")
+
+Publisher = Callable[[str, bytes, bool], None]
+RemoteFetch = Callable[[str, int], Optional[bytes]]
+
+
+def phrase_key(text: str, voice: str = DEFAULT_VOICE) -> str:
+    """Cache key for a phrase in a voice: whitespace-normalized, case-sensitive (casing affects prosody)."""
+    normalized = " ".join(text.split())
+    return hashlib.sha256(f"{voice}\n{normalized}".encode()).hexdigest()
+
+
+def inventory_topic(household_id: str, node_id: str = "+") -> str:
+    return f"jarvis/households/{household_id}/tts-cache/{node_id}"
+
+
+@dataclass
+class _Entry:
+    digest: str
+    size: int
+    stored_at: float
+
+
+@dataclass
+class _Peer:
+    url: str
+    entries: Dict[str, str] = field(default_factory=dict)    # key -> digest
+    token: str = ""
+    failures: int = 0
+
+
+def _fetch_from_command_center(text: str, timeout: int) -> Optional[bytes]:
+    from clients.rest_client import RestClient
+    from utils.service_discovery import get_command_center_url
+
+    command_center_url = get_command_center_url()
+    if not command_center_url:
+        return None
+    return RestClient.post_binary(
+        f"{command_center_url}/api/v0/media/tts/speak",
+        data={"text": text},
+        timeout=timeout,
+    )
+
+
+class TtsPeerCache:
+    """Local TTS audio store that shares entries with household peers."""
+
+    def __init__(
+        self,
+        directory: Path,
+        node_id: str,
+        household_id: str = "",
+        *,
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+        max_text_chars: int = DEFAULT_MAX_CHARS,
+        ttl_seconds: float = DEFAULT_TTL_HOURS * 3600,
+        voice: str = DEFAULT_VOICE,
+        token: Optional[str] = None,
+        peer_timeout: float = PEER_TIMEOUT_SECONDS,
+        fetch_remote: RemoteFetch = _fetch_from_command_center,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.node_id = node_id
+        self.household_id = household_id
+        self.max_bytes = max_bytes
+        self.max_text_chars = max_text_chars
+        self.ttl_seconds = ttl_seconds
+        self.voice = voice
+        # Peers must present this to the HTTP endpoint; it travels in the
+        # (household-scoped) inventory message.
+        self.token = token or secrets.token_urlsafe(32)
+        self.peer_timeout = peer_timeout
+        self._fetch_remote = fetch_remote
+        self._clock = clock
+
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()   # LRU: oldest first
+        self._bytes = 0
+        self._peers: Dict[str, _Peer] = {}
+        self._publisher: Optional[Publisher] = None
+        self._http = requests.Session()
+        self.url: Optional[str] = None
+        self._server: Optional[Any] = None
+
+        self._local_hits = 0
+        self._peer_hits = 0
+        self._peer_failures = 0
+        self._remote_fetches = 0
+        self._remote_failures = 0
+        self._served = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._advertisements = 0
+        self._unauthorized = 0
+
+        self._load()
+
+    # ── Local store ────────────────────────────────────────────────────
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.wav"
+
+    def _load(self) -> None:
+        files = sorted(self.directory.glob("*.wav"), key=lambda p: p.stat().st_mtime)
+        for path in files:
+            if not _KEY_RE.match(path.stem):
+                continue
+            stored_at = path.stat().st_mtime
+            if self._expired(stored_at):
+                self._expirations += 1
+                path.unlink(missing_ok=True)
+                continue
+            audio = path.read_bytes()
+            self._entries[path.stem] = _Entry(hashlib.sha256(audio).hexdigest(), len(audio), stored_at)
+            self._bytes += len(audio)
+        self._evict()
+
+    def _expired(self, stored_at: float) -> bool:
+        return self._clock() - stored_at > self.ttl_seconds
+
+    def _store(self, key: str, audio: bytes) -> None:
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(audio)
+        tmp.replace(path)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = _Entry(hashlib.sha256(audio).hexdigest(), len(audio), self._clock())
+            self._bytes += len(audio)
+            self._evict()
+        self.advertise()
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self._evictions += 1
+            self._path(key).unlink(missing_ok=True)
+
+    def read(self, key: str) -> Optional[bytes]:
+        """Cached audio for ``key`` (marks it recently used), or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry.stored_at):
+                del self._entries[key]
+                self._bytes -= entry.size
+                self._expirations += 1
+                self._path(key).unlink(missing_ok=True)
+                return None
+            self._entries.move_to_end(key)
+        try:
+            return self._path(key).read_bytes()
+        except OSError:
+            with self._lock:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self._bytes -= entry.size
+            return None
+
+    def digest(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.digest if entry else None
+
+    # ── Lookup ─────────────────────────────────────────────────────────
+
+    def synthesize(self, text: str, timeout: int = 30) -> Optional[bytes]:
+        """WAV audio for ``text``: local cache, then peers, then the command center."""
+        key = phrase_key(text, self.voice)
+        audio = self.read(key)
+        if audio is not None:
+            self._local_hits += 1
+            return audio
+
+        cacheable = len(text) <= self.max_text_chars
+        if cacheable:
+            audio = self._fetch_from_peers(key)
+            if audio is not None:
+                self._peer_hits += 1
+                self._store(key, audio)
+                return audio
+
+        self._remote_fetches += 1
+        audio = self._fetch_remote(text, timeout)
+        if not audio:
+            self._remote_failures += 1
+            return None
+        if cacheable:
+            self._store(key, audio)
+        return audio
+
+    def _fetch_from_peers(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            candidates = [
+                (node_id, peer.url, peer.token, peer.entries[key])
+                for node_id, peer in self._peers.items()
+                if key in peer.entries and peer.failures < PEER_MAX_FAILURES
+            ]
+        for node_id, url, token, digest in candidates:
+            try:
+                response = self._http.get(
+                    f"{url}{CACHE_PATH}/{key}", headers={TOKEN_HEADER: token}, timeout=self.peer_timeout,
+                )
+                if response.status_code == 404:
+                    # Evicted or expired since it advertised; not the peer's fault.
+                    with self._lock:
+                        peer = self._peers.get(node_id)
+                        if peer is not None:
+                            peer.entries.pop(key, None)
+                    continue
+                response.raise_for_status()
+                audio = response.content
+                if hashlib.sha256(audio).hexdigest() != digest:
+                    raise ValueError("digest mismatch")
+            except (requests.RequestException, ValueError) as e:
+                self._peer_failures += 1
+                with self._lock:
+                    peer = self._peers.get(node_id)
+                    if peer is not None:
+                        peer.failures += 1
+                logger.debug("TTS peer fetch failed", peer=node_id, error=str(e))
+                continue
+            with self._lock:
+                peer = self._peers.get(node_id)
+                if peer is not None:
+                    peer.failures = 0
+            return audio
+        return None
+
+    # ── Peer protocol ──────────────────────────────────────────────────
+
+    @property
+    def topic(self) -> Optional[str]:
+        return inventory_topic(self.household_id) if self.household_id else None
+
+    def attach(self, publisher: Optional[Publisher]) -> None:
+        """Set the MQTT publish function and advertise the current inventory."""
+        self._publisher = publisher
+        if publisher is not None:
+            self.advertise()
+
+    def advertise(self) -> None:
+        """Publish (retained) this node's inventory, if we are serving it."""
+        publisher = self._publisher
+        if publisher is None or self.url is None or not self.household_id:
+            return
+        with self._lock:
+            entries = {key: entry.digest for key, entry in self._entries.items()}
+        payload = json.dumps({
+            "node_id": self.node_id, "url": self.url, "token": self.token, "entries": entries,
+        }).encode()
+        try:
+            publisher(inventory_topic(self.household_id, self.node_id), payload, True)
+            self._advertisements += 1
+        except Exception as e:
+            logger.debug("TTS cache advertisement failed", error=str(e))
+
+    def receive(self, topic: str, payload: bytes) -> None:
+        """Apply a peer's inventory message (an empty payload removes the peer)."""
+        node_id = topic.rsplit("/", 1)[-1]
+        if node_id == self.node_id:
+            return
+        if not payload:
+            with self._lock:
+                self._peers.pop(node_id, None)
+            return
+        try:
+            data = json.loads(payload.decode())
+            url = str(data["url"]).rstrip("/")
+            token = str(data.get("token", ""))
+            entries = {
+                str(k): str(v) for k, v in dict(data.get("entries", {})).items() if _KEY_RE.match(str(k))
+            }
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.debug("Ignoring malformed TTS cache inventory", peer=node_id, error=str(e))
+            return
+        with self._lock:
+            self._peers[node_id] = _Peer(url=url, entries=entries, token=token)
+
+    # ── HTTP endpoint ──────────────────────────────────────────────────
+
+    def create_app(self) -> Any:
+        """FastAPI app serving cached audio by phrase key to callers holding the token."""
+        from fastapi import FastAPI, Header, HTTPException
+        from fastapi.responses import Response
+
+        app = FastAPI(title="Jarvis Node TTS Cache", docs_url=None, redoc_url=None, openapi_url=None)
+
+        @app.get(CACHE_PATH + "/{key}")
+        async def get_audio(key: str, token: str = Header("", alias=TOKEN_HEADER)) -> Response:
+            if not hmac.compare_digest(token.encode(), self.token.encode()):
+                self._unauthorized += 1
+                raise HTTPException(status_code=401, detail="invalid token")
+            if not _KEY_RE.match(key):
+                raise HTTPException(status_code=400, detail="invalid key")
+            audio = self.read(key)
+            if audio is None:
+                raise HTTPException(status_code=404, detail="not cached")
+            self._served += 1
+            return Response(
+                content=audio,
+                media_type="audio/wav",
+                headers={"X-Audio-SHA256": hashlib.sha256(audio).hexdigest()},
+            )
+
+        return app
+
+    def start_server(self, port: int = DEFAULT_PORT, host: Optional[str] = None,
+                     advertise_host: Optional[str] = None, probe_host: str = "8.8.8.8") -> None:
+        """Serve the cache to peers from a daemon thread (idempotent, non-blocking).
+
+        Binds the LAN interface (the default route's source address) unless
+        ``host`` is given. ``url`` is set and the inventory advertised once
+        the server is up; if it never comes up (e.g. port in use) the cache
+        still works locally and from peers, it just isn't advertised.
+        """
+        if self._server is not None:
+            return
+        import uvicorn
+
+        bind_host = host or _local_ip(probe_host)
+        if not advertise_host and bind_host == "0.0.0.0":
+            advertise_host = _local_ip(probe_host)
+        url = f"http://{advertise_host or bind_host}:{port}"
+        config = uvicorn.Config(self.create_app(), host=bind_host, port=port, log_level="warning")
+        server = uvicorn.Server(config)
+        server.install_signal_handlers = lambda: None  # not the main thread
+        self._server = server
+
+        def run() -> None:
+            try:
+                asyncio.run(self._serve(server, url))
+            except (Exception, SystemExit) as e:  # uvicorn exits when it can't bind
+                logger.warning("TTS peer cache server failed", port=port, error=str(e))
+            else:
+                if self.url is None and not server.should_exit:
+                    logger.warning("TTS peer cache server failed to start", port=port)
+
+        threading.Thread(target=run, name="tts-peer-cache", daemon=True).start()
+
+    async def _serve(self, server: Any, url: str) -> None:
+        announce = asyncio.ensure_future(self._announce_when_started(server, url))
+        try:
+            await server.serve()
+        finally:
+            announce.cancel()
+
+    async def _announce_when_started(self, server: Any, url: str) -> None:
+        while not server.started:
+            await asyncio.sleep(0.02)
+        if self._server is server:
+            self.url = url
+            logger.info("TTS peer cache serving", url=url, entries=len(self._entries))
+            self.advertise()
+
+    def stop_server(self) -> None:
+        if self._server is not None:
+            self._server.should_exit = True
+            self._server = None
+            self.url = None
+
+    # ── Diagnostics ────────────────────────────────────────────────────
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._local_hits + self._peer_hits + self._remote_fetches
+        with self._lock:
+            peers = len(self._peers)
+            peer_entries = sum(len(p.entries) for p in self._peers.values())
+            entries = len(self._entries)
+            size = self._bytes
+        return {
+            "entries": entries,
+            "bytes": size,
+            "local_hits": self._local_hits,
+            "peer_hits": self._peer_hits,
+            "peer_failures": self._peer_failures,
+            "remote_fetches": self._remote_fetches,
+            "remote_failures": self._remote_failures,
+            # Share of lookups that didn't need the TTS server
+            "offload_rate": round((self._local_hits + self._peer_hits) / lookups, 3) if lookups else 0.0,
+            "served": self._served,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "advertisements": self._advertisements,
+            "unauthorized": self._unauthorized,
+            "peers": peers,
+            "peer_entries": peer_entries,
+            "serving": self.url is not None,
+        }
+
+
+def _local_ip(probe_host: str) -> str:
+    """Address peers can reach us on: the source IP of the default route."""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect((probe_host, 80))  # UDP connect sends nothing
+            return s.getsockname()[0]
+    except OSError:
+        return socket.gethostbyname(socket.gethostname())
+
+
+_tts_cache: Optional[TtsPeerCache] = None
+_tts_cache_lock = threading.Lock()
+
+
+def get_tts_cache() -> TtsPeerCache:
+    """Return the process-wide TTS cache, creating it on first call.
+
+    Peer sharing needs ``household_id``; without it (or with
+    ``tts_peer_cache_enabled: false``) this is a plain local cache.
+    """
+    global _tts_cache
+    if _tts_cache is None:
+        from utils.config_service import Config
+        from utils.encryption_utils import get_cache_dir
+
+        with _tts_cache_lock:
+            if _tts_cache is None:
+                shared = Config.get_bool("tts_peer_cache_enabled", True)
+                voice = "/".join(filter(None, (
+                    Config.get_str("tts_provider", "") or DEFAULT_VOICE,
+                    Config.get_str("tts_voice", ""),
+                )))
+                _tts_cache = TtsPeerCache(
+                    get_cache_dir() / "tts",
+                    node_id=Config.get_str("node_id", "unknown") or "unknown",
+                    household_id=(Config.get_str("household_id", "") or "") if shared else "",
+                    max_bytes=Config.get_int("tts_cache_max_mb", DEFAULT_MAX_MB) * 1024 * 1024,
+                    max_text_chars=Config.get_int("tts_cache_max_chars", DEFAULT_MAX_CHARS),
+                    ttl_seconds=Config.get_int("tts_cache_ttl_hours", DEFAULT_TTL_HOURS) * 3600,
+                    voice=voice,
+                    token=Config.get_str("tts_peer_cache_token", "") or None,
+                )
+    return _tts_cache
+
+
+def get_tts_cache_stats() -> Optional[Dict[str, Any]]:
+    """Cache stats if the cache has been created, else None."""
+    return _tts_cache.stats() if _tts_cache is not None else None
+
+
+def reset_tts_cache() -> None:
+    """Drop the singleton (test hook). Production code should not call this."""
+    global _tts_cache
+    if _tts_cache is not None:
+        _tts_cache.stop_server()
+    _tts_cache = None
@@ -48,6 +48,18 @@ STATE_FILE = Path("/var/lib/jarvis-node/update-state.json")
 # loop runs one more time before systemd tears us down.
 _in_flight = threading.Event()
 
+# task_id of an update we had to defer because the node was busy. Part of
+# the heartbeat state, so going idle triggers a heartbeat that lets CC
+# re-dispatch it promptly.
+_deferred_task_id: str | None = None
+
+
+def update_status() -> str:
+    """``in_flight``, ``deferred`` or ``none`` — reported on the heartbeat."""
+    if _in_flight.is_set():
+        return "in_flight"
+    return "deferred" if _deferred_task_id else "none"
+
 
 def _write_state(payload: dict[str, Any]) -> None:
     try:
@@ -162,9 +174,12 @@ def maybe_apply_update(pending: dict[str, Any]) -> None:
         )
         return
 
+    global _deferred_task_id
     if is_busy():
         logger.info("Deferring update — node is busy", task_id=task_id)
+        _deferred_task_id = task_id
         return
+    _deferred_task_id = None
 
     if current.version == target_version:
         logger.info("Already at target version — nothing to do", version=current.version)
@@ -10,6 +10,7 @@ import ast
 import datetime
 import json
 import time
+from pathlib import Path
 from typing import Dict, Any, List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -1925,6 +1926,24 @@ def main():
     parser.add_argument('--no-adapter', action='store_true',
                        help='Force a baseline run (no adapter even if household has one deployed). '
                             'Honored only when JARVIS_TEST_MODE=1 is set on the server.')
+    parser.add_argument('--concurrency', '-j', type=int, default=4,
+                       help='Number of conversations in flight at once (default: 4; 1 = serial)')
+    parser.add_argument('--warmup-delay', type=float, default=1.5,
+                       help='Seconds between tool registration and sending each command (default: 1.5)')
+    parser.add_argument('--checkpoint', type=str, default=None,
+                       help='JSONL checkpoint of finished tests (default: <output>.checkpoint.jsonl)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Reuse finished tests from the checkpoint of an interrupted run')
+    parser.add_argument('--with-router', action='store_true',
+                       help='Let the on-node tool router answer confident hits. By default it is '
+                            'bypassed so every test that is not pre-routed measures the model; '
+                            'router hits are reported separately')
+    parser.add_argument('--cache', action='store_true',
+                       help='Reuse results from the result cache for unchanged tests. The key covers '
+                            'utterance, command schema and adapter but not the server-side model, '
+                            'so only use it while the model is unchanged')
+    parser.add_argument('--cache-file', type=str, default='.eval_cache.jsonl',
+                       help='Result cache file used with --cache (default: .eval_cache.jsonl)')
     args = parser.parse_args()
 
     # Build adapter_settings payload once (None when not specified)
@@ -1950,6 +1969,8 @@ def main():
 
     # Only import heavy modules when actually running tests
     from utils.command_execution_service import CommandExecutionService
+    from utils.eval_runner import EvalCase, EvalRecord, EvalRunner, ResultStore, case_cache_key
+    from utils.tool_schema_builder import command_schema_hashes
 
     # Initialize the shared service (discovers commands, connects to CC)
     try:
@@ -2025,109 +2046,134 @@ def main():
         print(f"\n🧪 Running {len(test_commands_to_run)} command parsing tests...")
     print("=" * 60)
     
-    passed_tests = 0
-    failed_tests = 0
-    all_test_results = []  # Store ALL test results for file output
-    failed_test_details = []
-    response_times = []
-    for i, test in test_commands_to_run:
+    def parse_case(case: EvalCase) -> Any:
+        # Runs on a runner worker: pre-route → register → warmup → send → post-process
+        return service.parse_voice_command(
+            case.test.voice_command,
+            agents=case.test.ha_context if case.test.ha_context else None,
+            warmup_delay=args.warmup_delay,
+            adapter_settings=adapter_settings,
+            use_local_router=args.with_router,
+        )
+
+    def evaluate_case(case: EvalCase, result: Any, response_time: float) -> tuple[dict, dict | None]:
+        i, test = case.index, case.test
         print(f"\n📝 Test {i}/{len(test_commands_to_run)}")
 
-        try:
-            # Use the shared production code path: pre-route → register → send → post-process
-            start_time = time.time()
-            result = service.parse_voice_command(
-                test.voice_command,
-                agents=test.ha_context if test.ha_context else None,
-                warmup_delay=1.5,
-                adapter_settings=adapter_settings,
-            )
-            response_time = time.time() - start_time
-            response_times.append(response_time)
-
-            # Evaluate the result against expectations
-            test_success, failure_reason = evaluate_parse_result(
-                result, test, date_context, i,
-                service=service,
-                available_commands=available_commands,
-                validate=args.validate,
-            )
-
-            # Build response dict for reporting
-            raw_response_dict = result.raw_response.model_dump() if result.raw_response and hasattr(result.raw_response, 'model_dump') else None
-
-            # Store comprehensive test result
-            test_result = {
-                "test_number": i,
-                "passed": test_success,
-                "description": test.description,
-                "voice_command": test.voice_command,
-                "expected": {
-                    "command": test.expected_command,
-                    "parameters": test.expected_params
-                },
-                "actual": {
-                    "command": result.tool_name,
-                    "parameters": result.tool_arguments
-                },
-                "pre_routed": result.pre_routed,
-                "response_time_seconds": round(response_time, 3),
-                "conversation_id": result.conversation_id,
-                "failure_reason": failure_reason if not test_success else None,
-                "full_response": raw_response_dict
-            }
-            all_test_results.append(test_result)
-
-            if test_success:
-                passed_tests += 1
-                pre_tag = " [pre-routed]" if result.pre_routed else ""
-                print(f"   ✅ Test PASSED{pre_tag} (⏱️  {response_time:.2f}s)")
+        # Evaluate the result against expectations
+        test_success, failure_reason = evaluate_parse_result(
+            result, test, date_context, i,
+            service=service,
+            available_commands=available_commands,
+            validate=args.validate,
+        )
+
+        # Build response dict for reporting
+        raw_response_dict = result.raw_response.model_dump() if result.raw_response and hasattr(result.raw_response, 'model_dump') else None
+
+        # Store comprehensive test result
+        test_result = {
+            "test_number": i,
+            "passed": test_success,
+            "description": test.description,
+            "voice_command": test.voice_command,
+            "expected": {
+                "command": test.expected_command,
+                "parameters": test.expected_params
+            },
+            "actual": {
+                "command": result.tool_name,
+                "parameters": result.tool_arguments
+            },
+            "pre_routed": result.pre_routed,
+            "local_router": result.router_confidence is not None,
+            "response_time_seconds": round(response_time, 3),
+            "conversation_id": result.conversation_id,
+            "failure_reason": failure_reason if not test_success else None,
+            "full_response": raw_response_dict
+        }
+
+        if test_success:
+            if result.router_confidence is not None:
+                pre_tag = " [local router]"
             else:
-                failed_tests += 1
-                print(f"   ❌ Test FAILED (⏱️  {response_time:.2f}s)")
-                failed_test_details.append({
-                    "test_number": i,
-                    "description": test.description,
-                    "voice_command": test.voice_command,
-                    "expected_command": test.expected_command,
-                    "expected_params": test.expected_params,
-                    "failure_reason": failure_reason,
-                    "actual_response": raw_response_dict,
-                    "conversation_id": result.conversation_id
-                })
-
-        except Exception as e:
-            print(e)
-            print(f"❌ Error during test {i}: {e}")
-            failed_tests += 1
-            error_result = {
-                "test_number": i,
-                "passed": False,
-                "description": test.description,
-                "voice_command": test.voice_command,
-                "expected": {
-                    "command": test.expected_command,
-                    "parameters": test.expected_params
-                },
-                "actual": {
-                    "command": None,
-                    "parameters": None
-                },
-                "pre_routed": False,
-                "response_time_seconds": 0,
-                "conversation_id": "",
-                "failure_reason": f"Exception: {str(e)}",
-                "full_response": None
-            }
-            all_test_results.append(error_result)
-            failed_test_details.append({
-                "test_number": i,
-                "description": test.description,
-                "voice_command": test.voice_command,
-                "error": str(e),
-                "conversation_id": ""
-            })
-    
+                pre_tag = " [pre-routed]" if result.pre_routed else ""
+            print(f"   ✅ Test PASSED{pre_tag} (⏱️  {response_time:.2f}s)")
+            return test_result, None
+
+        print(f"   ❌ Test FAILED (⏱️  {response_time:.2f}s)")
+        return test_result, {
+            "test_number": i,
+            "description": test.description,
+            "voice_command": test.voice_command,
+            "expected_command": test.expected_command,
+            "expected_params": test.expected_params,
+            "failure_reason": failure_reason,
+            "actual_response": raw_response_dict,
+            "conversation_id": result.conversation_id
+        }
+
+    def error_case(case: EvalCase, e: BaseException) -> tuple[dict, dict]:
+        i, test = case.index, case.test
+        print(f"\n📝 Test {i}/{len(test_commands_to_run)}")
+        print(f"❌ Error during test {i}: {e}")
+        error_result = {
+            "test_number": i,
+            "passed": False,
+            "description": test.description,
+            "voice_command": test.voice_command,
+            "expected": {
+                "command": test.expected_command,
+                "parameters": test.expected_params
+            },
+            "actual": {
+                "command": None,
+                "parameters": None
+            },
+            "pre_routed": False,
+            "response_time_seconds": 0,
+            "conversation_id": "",
+            "failure_reason": f"Exception: {str(e)}",
+            "full_response": None
+        }
+        return error_result, {
+            "test_number": i,
+            "description": test.description,
+            "voice_command": test.voice_command,
+            "error": str(e),
+            "conversation_id": ""
+        }
+
+    def report_cached(record: EvalRecord) -> None:
+        if record.cached:
+            status = "PASSED" if record.test_result.get("passed") else "FAILED"
+            print(f"\n📝 Test {record.index}/{len(test_commands_to_run)}: ♻️  {status} (cached)")
+
+    schema_hashes = command_schema_hashes(available_commands, date_context)
+    cases = [
+        EvalCase(
+            index=i, test=test,
+            key=case_cache_key(test, schema_hashes, adapter_settings, local_router=args.with_router),
+        )
+        for i, test in test_commands_to_run
+    ]
+    checkpoint_path = Path(args.checkpoint) if args.checkpoint else Path(args.output).with_suffix(".checkpoint.jsonl")
+    runner = EvalRunner(
+        parse_case, evaluate_case, error_case,
+        concurrency=args.concurrency,
+        checkpoint=ResultStore(checkpoint_path),
+        resume=args.resume,
+        cache=ResultStore(Path(args.cache_file)) if args.cache else None,
+    )
+    records = runner.run(cases, on_record=report_cached)
+
+    all_test_results = [r.test_result for r in records]  # Store ALL test results for file output
+    failed_test_details = [r.failure_detail for r in records if r.failure_detail]
+    passed_tests = sum(1 for r in all_test_results if r["passed"])
+    failed_tests = len(all_test_results) - passed_tests
+    router_hits = sum(1 for r in all_test_results if r.get("local_router"))
+    response_times = [r.test_result["response_time_seconds"] for r in records if not r.errored]
+
     # Print summary
     print(f"\n" + "=" * 60)
     print(f"📊 TEST SUMMARY")
@@ -2135,6 +2181,8 @@ def main():
     print(f"   Passed: {passed_tests}")
     print(f"   Failed: {failed_tests}")
     print(f"   Success Rate: {(passed_tests/len(test_commands_to_run)*100):.1f}%")
+    if args.with_router:
+        print(f"   Local Router Hits: {router_hits} (answered on-node, not by the model)")
     
     # Performance metrics
     if response_times:
@@ -2146,6 +2194,10 @@ def main():
         print(f"   Min Response Time: {min_response_time:.2f}s")
         print(f"   Max Response Time: {max_response_time:.2f}s")
         print(f"   Total Test Time: {sum(response_times):.2f}s")
+    stats = runner.stats()
+    print(f"   Wall Clock: {stats['wall_seconds']:.2f}s "
+          f"(concurrency {stats['concurrency']}, executed {stats['executed']}, "
+          f"resumed {stats['from_checkpoint']}, cached {stats['from_cache']})")
     
     # Failure summary
     if failed_test_details:
@@ -2188,6 +2240,7 @@ def main():
             "avg_response_time": round(sum(response_times) / len(response_times), 3) if response_times else 0,
             "min_response_time": round(min(response_times), 3) if response_times else 0,
             "max_response_time": round(max(response_times), 3) if response_times else 0,
+            "local_router_hits": router_hits,
             "test_run_timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
         },
         "test_results": all_test_results,
@@ -2208,6 +2261,7 @@ def main():
             "avg_response_time": round(sum(response_times) / len(response_times), 3) if response_times else 0,
             "min_response_time": round(min(response_times), 3) if response_times else 0,
             "max_response_time": round(max(response_times), 3) if response_times else 0,
+            "local_router_hits": router_hits,
             "test_run_timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
         },
         "test_results": all_test_results,
@@ -2230,6 +2284,10 @@ if __name__ == "__main__":
     print("  python3 test_command_parsing.py -c calculate      # Run only calculator tests")
     print("  python3 test_command_parsing.py -o results.json   # Write results to custom file")
     print("  python3 test_command_parsing.py -c get_sports -o sports_results.json")
+    print("  python3 test_command_parsing.py -j 8               # 8 conversations in flight")
+    print("  python3 test_command_parsing.py --resume           # Continue an interrupted run")
+    print("  python3 test_command_parsing.py --cache            # Skip tests unchanged since the last run")
+    print("  python3 test_command_parsing.py --with-router      # Let the on-node router answer confident hits")
     print("=" * 50)
     print()
     
@@ -224,6 +224,19 @@ class TestContextAggregation:
         assert all(r == 2 for r in results)
 
 
+    def test_context_version_bumps_on_writes(self, fresh_scheduler):
+        """get_context_version changes when an agent run or removal rewrites the cache"""
+        agent = MockAgent(name="agent1")
+        fresh_scheduler._agents = {"agent1": agent}
+        before = fresh_scheduler.get_context_version()
+
+        asyncio.run(fresh_scheduler._run_agent_safe(agent))
+        after_run = fresh_scheduler.get_context_version()
+        fresh_scheduler.update_agents({})
+
+        assert before < after_run < fresh_scheduler.get_context_version()
+
+
 class TestRunAgentNow:
     """Test run_agent_now method"""
 
@@ -0,0 +1,125 @@
+"""Tests for core.async_runtime.AsyncRuntime."""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+import pytest
+
+from core.async_runtime import AsyncRuntime
+
+
+@pytest.fixture
+def runtime():
+    rt = AsyncRuntime(name="test-runtime", lag_probe_interval=0.05)
+    rt.start()
+    yield rt
+    rt.stop()
+
+
+class TestBridge:
+    def test_run_returns_result(self, runtime: AsyncRuntime) -> None:
+        async def add(a: int, b: int) -> int:
+            await asyncio.sleep(0)
+            return a + b
+
+        assert runtime.run(add(2, 3)) == 5
+
+    def test_run_propagates_exception(self, runtime: AsyncRuntime) -> None:
+        async def boom() -> None:
+            raise ValueError("nope")
+
+        with pytest.raises(ValueError, match="nope"):
+            runtime.run(boom())
+        assert runtime.stats()["failed"] == 1
+
+    def test_all_coroutines_share_one_loop_and_thread(self, runtime: AsyncRuntime) -> None:
+        async def where() -> tuple:
+            return asyncio.get_running_loop(), threading.current_thread()
+
+        first = runtime.run(where())
+        second = runtime.run(where())
+        assert first == second
+        assert first[0] is runtime.loop
+        assert first[1] is runtime.thread
+
+    def test_submit_returns_future(self, runtime: AsyncRuntime) -> None:
+        async def value() -> str:
+            return "ok"
+
+        future = runtime.submit(value())
+        assert isinstance(future, concurrent.futures.Future)
+        assert future.result(timeout=1) == "ok"
+
+    def test_run_timeout_cancels(self, runtime: AsyncRuntime) -> None:
+        async def slow() -> None:
+            await asyncio.sleep(10)
+
+        with pytest.raises(concurrent.futures.TimeoutError):
+            runtime.run(slow(), timeout=0.05)
+        assert _wait_for(lambda: runtime.stats()["in_flight"] == 0)
+
+    def test_run_from_runtime_thread_raises(self, runtime: AsyncRuntime) -> None:
+        async def noop() -> None:
+            return None
+
+        async def nested() -> None:
+            runtime.run(noop())
+
+        with pytest.raises(RuntimeError):
+            runtime.run(nested())
+
+    def test_start_is_idempotent(self, runtime: AsyncRuntime) -> None:
+        thread = runtime.thread
+        runtime.start()
+        assert runtime.thread is thread
+
+
+class TestStats:
+    def test_in_flight_counts(self, runtime: AsyncRuntime) -> None:
+        gate = threading.Event()
+
+        async def wait_for_gate() -> None:
+            while not gate.is_set():
+                await asyncio.sleep(0.01)
+
+        futures = [runtime.submit(wait_for_gate()) for _ in range(3)]
+        assert runtime.stats()["in_flight"] == 3
+        gate.set()
+        for f in futures:
+            f.result(timeout=1)
+        stats = runtime.stats()
+        assert stats["in_flight"] == 0
+        assert stats["submitted"] == 3
+        assert stats["completed"] == 3
+
+    def test_loop_lag_detects_blocking_call(self, runtime: AsyncRuntime) -> None:
+        async def block() -> None:
+            time.sleep(0.3)  # deliberately blocks the loop
+
+        runtime.run(block())
+        assert _wait_for(lambda: runtime.stats()["loop_lag_max_ms"] >= 100, timeout=2.0)
+
+    def test_stop_cancels_pending_tasks(self) -> None:
+        rt = AsyncRuntime(name="test-stop")
+        rt.start()
+
+        async def forever() -> None:
+            await asyncio.sleep(60)
+
+        future = rt.submit(forever())
+        rt.stop()
+        assert future.cancelled()
+        assert not rt.running
+
+
+def _wait_for(predicate, timeout: float = 1.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
@@ -218,3 +218,93 @@ class TestLifecycle:
             assert "input_device_index" not in kwargs
         finally:
             bus.stop()
+
+
+class TestStats:
+    def test_per_subscriber_counters(self) -> None:
+        bus = _bus()
+        fast = bus.subscribe("fast", maxsize=100)
+        bus.subscribe("slow", maxsize=3)
+        for i in range(10):
+            bus.push(bytes([i]))
+        for _ in range(4):
+            fast.get_nowait()
+
+        stats = bus.stats()
+        assert stats["chunks"] == 10
+        assert stats["subscribers"]["fast"] == {
+            "active": True, "enqueued": 10, "dropped": 0, "depth": 6, "max_depth": 10,
+            "lag_ms": stats["subscribers"]["fast"]["lag_ms"],
+        }
+        assert stats["subscribers"]["fast"]["lag_ms"]["n"] == 4
+        assert stats["subscribers"]["slow"]["dropped"] == 7
+        assert stats["subscribers"]["slow"]["max_depth"] == 3
+        assert stats["subscribers"]["slow"]["lag_ms"] is None  # drops aren't consumption
+
+    def test_consumer_lag_measured_from_enqueue(self) -> None:
+        now = [0.0]
+        bus = _bus(clock=lambda: now[0])
+        q = bus.subscribe("wake")
+        bus.push(b"a")
+        now[0] += 0.25
+        q.get_nowait()
+        assert bus.stats()["subscribers"]["wake"]["lag_ms"]["max"] == 250.0
+
+    def test_stats_survive_resubscribe(self) -> None:
+        bus = _bus()
+        bus.subscribe("listen")
+        bus.push(b"a")
+        bus.unsubscribe("listen")
+        assert bus.stats()["subscribers"]["listen"]["active"] is False
+        bus.subscribe("listen")
+        bus.push(b"b")
+        assert bus.stats()["subscribers"]["listen"]["enqueued"] == 2
+
+
+class TestOverrunDetection:
+    # 16 kHz, 320-sample chunks → 20 ms per read. Each step is
+    # (time spent outside read(), time read() blocked).
+    CHUNK = 0.02
+    STEADY = (0.0, 0.02)
+    BUFFERED = (0.0, 0.0)
+
+    def _replay(self, steps: list[tuple[float, float]]) -> AudioBus:
+        now = [100.0]
+        bus = _bus(clock=lambda: now[0])
+        for gap, blocked in [self.STEADY] + steps:
+            now[0] += gap
+            started = now[0]
+            now[0] += blocked
+            bus._record_read(started, now[0])
+        return bus
+
+    def test_steady_stream_has_no_overruns(self) -> None:
+        bus = self._replay([self.STEADY] * 200)
+        stats = bus.stats()
+        assert stats["overruns"] == 0
+        assert stats["jitter_ms"]["max"] < 0.01
+
+    def test_stall_within_buffer_recovers(self) -> None:
+        # Producer stalled 100 ms, then drained the 5 chunks ALSA buffered.
+        bus = self._replay([self.STEADY] * 20 + [(0.1, 0.0)] + [self.BUFFERED] * 4 + [self.STEADY] * 20)
+        stats = bus.stats()
+        assert stats["overruns"] == 0
+        assert stats["jitter_ms"]["max"] == pytest.approx(80.0, abs=0.1)
+
+    def test_stall_past_buffer_counts_lost_audio(self) -> None:
+        # Stalled 200 ms but only 3 chunks were still buffered: 140 ms lost.
+        bus = self._replay([self.STEADY] * 20 + [(0.2, 0.0)] + [self.BUFFERED] * 2 + [self.STEADY] * 20)
+        stats = bus.stats()
+        assert stats["overruns"] == 1
+        assert stats["overrun_lost_ms"] == pytest.approx(140.0, abs=0.5)
+
+    def test_slow_return_alone_is_not_an_overrun(self) -> None:
+        # One read held past its chunk (e.g. waiting for the GIL), then
+        # the queued chunk is read instantly: no audio lost.
+        bus = self._replay([self.STEADY] * 20 + [(0.0, 0.06), self.BUFFERED, self.BUFFERED] + [self.STEADY] * 5)
+        assert bus.stats()["overruns"] == 0
+
+    def test_mic_clock_skew_is_not_an_overrun(self) -> None:
+        # Mic clock 0.1 % slow relative to wall clock, for ~10 minutes.
+        bus = self._replay([(0.0, self.CHUNK * 1.001)] * 30000)
+        assert bus.stats()["overruns"] == 0
@@ -0,0 +1,193 @@
+"""Tests for core.barge_in.BargeInMonitor (long-lived, arm/disarm).
+
+The bus is driven via ``AudioBus.push()`` at 16 kHz so no resampling or
+PyAudio is involved; the shared ``WakeScorer`` runs a fake openWakeWord
+model that scores a chunk as the wake word when it is loud.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from core.audio_bus import AudioBus
+from core.barge_in import BargeInMonitor
+from core.wake_scorer import WakeScorer
+
+_CHUNK = 1280
+
+
+class _FakeOWW:
+    """Scores 0.9 for loud chunks, 0.0 otherwise; records calls per thread."""
+
+    def __init__(self) -> None:
+        self.predict_calls = 0
+        self.reset_calls = 0
+        self.reset_threads: list[str] = []
+
+    def predict(self, samples: np.ndarray) -> dict[str, float]:
+        self.predict_calls += 1
+        loud = np.abs(samples.astype(np.int32)).max() > 1000
+        return {"hey_jarvis": 0.9 if loud else 0.0}
+
+    def reset(self) -> None:
+        self.reset_calls += 1
+        self.reset_threads.append(threading.current_thread().name)
+
+
+def _chunk(amplitude: int) -> bytes:
+    return np.full(_CHUNK, amplitude, dtype=np.int16).tobytes()
+
+
+@pytest.fixture
+def bus() -> AudioBus:
+    return AudioBus(rate=16000, chunk_samples=_CHUNK, history_secs=1.0)
+
+
+@pytest.fixture
+def oww() -> _FakeOWW:
+    return _FakeOWW()
+
+
+@pytest.fixture
+def scorer(bus: AudioBus, oww: _FakeOWW):
+    s = WakeScorer(bus, oww)
+    s.start()
+    yield s
+    s.stop()
+
+
+@pytest.fixture
+def monitor(scorer: WakeScorer, oww: _FakeOWW):
+    m = BargeInMonitor(scorer, "hey_jarvis", skip_seconds=0.0)
+    with patch("core.barge_in.platform_audio") as audio:
+        m.start()
+        m.audio = audio
+        m.oww = oww
+        yield m
+        m.close()
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class TestLifecycle:
+    def test_consumes_scores_only_while_armed(self, monitor, scorer: WakeScorer) -> None:
+        assert scorer.subscribers() == []
+        monitor.arm()
+        assert scorer.subscribers() == ["barge_in"]
+        monitor.disarm()
+        assert scorer.subscribers() == []
+
+    def test_thread_survives_arm_disarm_cycles(self, monitor) -> None:
+        thread = monitor._thread
+        for _ in range(3):
+            monitor.arm()
+            monitor.disarm()
+        assert monitor._thread is thread
+        assert thread.is_alive()
+
+    def test_close_drops_subscription(self, scorer: WakeScorer) -> None:
+        m = BargeInMonitor(scorer, "hey_jarvis")
+        m.start()
+        m.start()  # idempotent
+        m.arm()
+        m.close()
+        assert scorer.subscribers() == []
+
+
+class TestArmDisarm:
+    def test_detects_while_armed(self, monitor, bus: AudioBus) -> None:
+        monitor.arm()
+        start = time.perf_counter()
+        bus.push(_chunk(3000))
+        assert monitor.wait_for_detection(timeout=1.0)
+        arm_to_detect_ms = (time.perf_counter() - start) * 1000
+
+        assert monitor.was_interrupted
+        assert not monitor.armed
+        monitor.audio.cancel_playback.assert_called_once()
+        assert arm_to_detect_ms < 500
+
+    def test_ignores_audio_while_disarmed(self, monitor, bus: AudioBus) -> None:
+        for _ in range(5):
+            bus.push(_chunk(3000))
+        time.sleep(0.05)
+        assert monitor.oww.predict_calls == 0
+        assert not monitor.was_interrupted
+        monitor.audio.cancel_playback.assert_not_called()
+
+    def test_quiet_audio_does_not_trigger(self, monitor, bus: AudioBus) -> None:
+        monitor.arm()
+        for _ in range(5):
+            bus.push(_chunk(100))
+        assert _wait_for(lambda: monitor.oww.predict_calls == 5)
+        assert not monitor.was_interrupted
+
+    def test_disarm_is_fast(self, monitor, bus: AudioBus) -> None:
+        monitor.arm()
+        for _ in range(3):
+            bus.push(_chunk(100))
+        assert _wait_for(lambda: monitor.oww.predict_calls == 3)
+
+        start = time.perf_counter()
+        monitor.disarm()
+        disarm_ms = (time.perf_counter() - start) * 1000
+
+        assert disarm_ms < 5
+        # Arming asked the scorer for a reset; it ran on the scorer thread
+        assert monitor.oww.reset_threads == ["WakeScorer"]
+
+    def test_no_scoring_after_disarm(self, monitor, bus: AudioBus) -> None:
+        monitor.arm()
+        bus.push(_chunk(100))
+        assert _wait_for(lambda: monitor.oww.predict_calls == 1)
+        monitor.disarm()
+        bus.push(_chunk(3000))
+        time.sleep(0.05)
+        assert monitor.oww.predict_calls == 1
+        assert not monitor.was_interrupted
+
+    def test_rearm_clears_interrupt_and_resets_model(self, monitor, bus: AudioBus) -> None:
+        monitor.arm()
+        bus.push(_chunk(3000))
+        assert monitor.wait_for_detection(timeout=1.0)
+
+        monitor.arm()
+        assert not monitor.was_interrupted
+        bus.push(_chunk(100))
+        assert _wait_for(lambda: monitor.oww.reset_calls == 2)
+        assert not monitor.was_interrupted
+
+    def test_skip_window_after_arm(self, scorer: WakeScorer, bus: AudioBus) -> None:
+        m = BargeInMonitor(scorer, "hey_jarvis", skip_seconds=10.0)
+        with patch("core.barge_in.platform_audio") as audio:
+            m.start()
+            try:
+                m.arm()
+                bus.push(_chunk(3000))
+                assert not m.wait_for_detection(timeout=0.2)
+                audio.cancel_playback.assert_not_called()
+            finally:
+                m.close()
+
+    def test_any_configured_wake_word_interrupts(self, scorer: WakeScorer, bus: AudioBus) -> None:
+        m = BargeInMonitor(scorer, ["alexa", "hey_jarvis"], skip_seconds=0.0)
+        with patch("core.barge_in.platform_audio"):
+            m.start()
+            try:
+                m.arm()
+                bus.push(_chunk(3000))
+                assert m.wait_for_detection(timeout=1.0)
+            finally:
+                m.close()
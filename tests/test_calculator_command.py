@@ -0,0 +1,56 @@
+"""
+Unit tests for CalculatorCommand.route_locally (on-node routing without the LLM).
+"""
+
+import pytest
+
+from commands.calculator_command import CalculatorCommand
+
+
+@pytest.fixture
+def calculator_command():
+    """Create a CalculatorCommand instance"""
+    return CalculatorCommand()
+
+
+class TestRouteLocally:
+    """route_locally fills num1/num2/operation or defers to the LLM"""
+
+    @pytest.mark.parametrize("utterance, num1, num2, operation", [
+        ("what's 5 plus 3", 5, 3, "add"),
+        ("what is 6 times 7", 6, 7, "multiply"),
+        ("calculate 10 minus 4", 10, 4, "subtract"),
+        ("what's 5-3", 5, 3, "subtract"),
+        ("divide 20 by 5", 20, 5, "divide"),
+        ("subtract 7 from 22", 22, 7, "subtract"),
+        ("what is 12.5 times 2", 12.5, 2, "multiply"),
+    ])
+    def test_plain_operands(self, calculator_command, utterance, num1, num2, operation):
+        result = calculator_command.route_locally(utterance)
+        assert result is not None
+        assert result.arguments == {"num1": num1, "num2": num2, "operation": operation}
+
+    @pytest.mark.parametrize("utterance, num1, num2, operation", [
+        ("twenty five plus three", 25, 3, "add"),
+        ("two hundred plus 5", 200, 5, "add"),
+        ("twenty-one plus 4", 21, 4, "add"),
+        ("twenty-one divided by three", 21, 3, "divide"),
+        ("add twenty five and three", 25, 3, "add"),
+        ("ninety nine times two", 99, 2, "multiply"),
+        ("one thousand two hundred thirty four minus 34", 1234, 34, "subtract"),
+    ])
+    def test_compound_number_words(self, calculator_command, utterance, num1, num2, operation):
+        result = calculator_command.route_locally(utterance)
+        assert result is not None
+        assert result.arguments == {"num1": num1, "num2": num2, "operation": operation}
+
+    @pytest.mark.parametrize("utterance", [
+        "twenty 5 plus 3",
+        "five five plus 3",
+        "two hundred and five plus 3",
+        "minus 5 plus 3",
+        "5 plus 3 percent",
+        "what's twenty percent of eighty",
+    ])
+    def test_ambiguous_operands_go_to_llm(self, calculator_command, utterance):
+        assert calculator_command.route_locally(utterance) is None
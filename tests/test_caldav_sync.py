@@ -0,0 +1,442 @@
+"""Tests for calendar_shared.caldav_sync (incremental CalDAV sync + event index)."""
+
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from calendar_shared.caldav_sync import (
+    CalDAVSyncEngine,
+    CalendarIndex,
+    MultistatusError,
+    MultistatusStream,
+    expand_occurrences,
+    iter_calendar_events,
+    parse_vevents,
+)
+from calendar_shared.icloud_calendar_service import ICloudCalendarService, reset_sync_engines
+
+CALENDAR_PATH = "/123/calendars/home/"
+CALENDAR_URL = f"https://caldav.example.com{CALENDAR_PATH}"
+NOW = datetime(2026, 3, 2, 8, 0)  # a Monday
+
+
+def _ical(uid: str, start: str, end: str, summary: str = "Event", extra: str = "") -> str:
+    return (
+        "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nBEGIN:VEVENT\r\n"
+        f"UID:{uid}\r\nSUMMARY:{summary}\r\n"
+        f"DTSTART;TZID=America/New_York:{start}\r\nDTEND;TZID=America/New_York:{end}\r\n"
+        f"{extra}END:VEVENT\r\nEND:VCALENDAR\r\n"
+    )
+
+
+class FakeCalDAV:
+    """Minimal CalDAV collection: ctag, RFC 6578 sync tokens, multiget."""
+
+    def __init__(self, supports_sync: bool = True):
+        self.supports_sync = supports_sync
+        self.resources: Dict[str, Tuple[str, str]] = {}
+        self.changes: List[Tuple[int, str]] = []  # (version, href) log
+        self.version = 0
+        self.requests: List[Tuple[str, str]] = []
+        self.multiget_status = 207
+
+    def put(self, name: str, ical: str) -> None:
+        self.version += 1
+        href = f"{CALENDAR_PATH}{name}.ics"
+        self.resources[href] = (f'"etag-{self.version}"', ical)
+        self.changes.append((self.version, href))
+
+    def delete(self, name: str) -> None:
+        self.version += 1
+        href = f"{CALENDAR_PATH}{name}.ics"
+        del self.resources[href]
+        self.changes.append((self.version, href))
+
+    def client(self) -> httpx.Client:
+        return httpx.Client(transport=httpx.MockTransport(self.handle))
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        body = request.content.decode()
+        kind = re.search(r"<\w+:(propfind|sync-collection|calendar-multiget)", body).group(1)
+        self.requests.append((request.method, kind if kind != "propfind" else f"propfind-{request.headers['Depth']}"))
+
+        if kind == "propfind" and request.headers["Depth"] == "0":
+            token = f"<d:sync-token>v{self.version}</d:sync-token>" if self.supports_sync else ""
+            return self._multistatus(
+                f"<d:response><d:href>{CALENDAR_PATH}</d:href><d:propstat><d:prop>"
+                f"<cs:getctag>ctag-{self.version}</cs:getctag>{token}"
+                "</d:prop><d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>"
+            )
+        if kind == "propfind":
+            rows = [f"<d:response><d:href>{CALENDAR_PATH}</d:href></d:response>"]
+            rows += [self._etag_row(href, etag) for href, (etag, _) in self.resources.items()]
+            return self._multistatus("".join(rows))
+        if kind == "sync-collection":
+            if not self.supports_sync:
+                return httpx.Response(403)
+            token = re.search(r"<d:sync-token>(.*?)</d:sync-token>", body).group(1)
+            if token and not token.startswith("v"):
+                return httpx.Response(403)
+            since = int(token[1:]) if token else 0
+            rows = []
+            for href in dict.fromkeys(h for v, h in self.changes if v > since):
+                if href in self.resources:
+                    rows.append(self._etag_row(href, self.resources[href][0]))
+                else:
+                    rows.append(f"<d:response><d:href>{href}</d:href><d:status>HTTP/1.1 404 Not Found</d:status></d:response>")
+            return self._multistatus("".join(rows) + f"<d:sync-token>v{self.version}</d:sync-token>")
+        if self.multiget_status != 207:
+            return httpx.Response(self.multiget_status)
+        hrefs = re.findall(r"<d:href>(.*?)</d:href>", body)
+        rows = []
+        for href in hrefs:
+            etag, ical = self.resources[href]
+            rows.append(
+                f"<d:response><d:href>{href}</d:href><d:propstat><d:prop><d:getetag>{etag}</d:getetag>"
+                f"<c:calendar-data>{ical}</c:calendar-data></d:prop>"
+                "<d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>"
+            )
+        return self._multistatus("".join(rows))
+
+    @staticmethod
+    def _etag_row(href: str, etag: str) -> str:
+        return (
+            f"<d:response><d:href>{href}</d:href><d:propstat><d:prop><d:getetag>{etag}</d:getetag></d:prop>"
+            "<d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>"
+        )
+
+    @staticmethod
+    def _multistatus(inner: str) -> httpx.Response:
+        return httpx.Response(207, text=(
+            '<?xml version="1.0"?><d:multistatus xmlns:d="DAV:" '
+            'xmlns:c="urn:ietf:params:xml:ns:caldav" xmlns:cs="http://calendarserver.org/ns/">'
+            f"{inner}</d:multistatus>"
+        ))
+
+
+@pytest.fixture
+def server() -> FakeCalDAV:
+    server = FakeCalDAV()
+    server.put("standup", _ical("standup", "20260302T093000", "20260302T094500", "Standup"))
+    server.put("dentist", _ical("dentist", "20260303T140000", "20260303T150000", "Dentist"))
+    return server
+
+
+def _engine(server: FakeCalDAV) -> CalDAVSyncEngine:
+    return CalDAVSyncEngine(server.client(), CALENDAR_URL, CalendarIndex(clock=lambda: NOW))
+
+
+def _summaries(events) -> List[str]:
+    return [e.summary for e in events]
+
+
+class TestSync:
+    def test_initial_sync_fetches_everything(self, server):
+        engine = _engine(server)
+        assert engine.sync() is True
+        assert engine.last_sync == "full"
+        assert server.requests == [("PROPFIND", "propfind-0"), ("REPORT", "sync-collection"),
+                                   ("REPORT", "calendar-multiget")]
+        assert _summaries(engine.index.query(NOW, NOW + timedelta(days=2))) == ["Standup", "Dentist"]
+
+    def test_unchanged_calendar_costs_one_request(self, server):
+        engine = _engine(server)
+        engine.sync()
+        server.requests.clear()
+
+        assert engine.sync() is False
+        assert engine.last_sync == "unchanged"
+        assert server.requests == [("PROPFIND", "propfind-0")]
+
+    def test_incremental_fetches_only_changes(self, server):
+        engine = _engine(server)
+        engine.sync()
+        server.put("dentist", _ical("dentist", "20260303T160000", "20260303T170000", "Dentist (moved)"))
+        server.put("lunch", _ical("lunch", "20260302T120000", "20260302T130000", "Lunch"))
+        server.delete("standup")
+        server.requests.clear()
+
+        with patch.object(engine, "_multiget", wraps=engine._multiget) as multiget:
+            assert engine.sync() is True
+
+        assert sorted(multiget.call_args.args[0]) == [f"{CALENDAR_PATH}dentist.ics", f"{CALENDAR_PATH}lunch.ics"]
+        assert engine.last_sync == "incremental"
+        assert _summaries(engine.index.query(NOW, NOW + timedelta(days=2))) == ["Lunch", "Dentist (moved)"]
+
+    def test_rejected_token_triggers_full_resync(self, server):
+        engine = _engine(server)
+        engine.sync()
+        engine.sync_token = "stale"
+        server.delete("standup")
+
+        engine.sync()
+
+        assert engine.last_sync == "full"
+        assert _summaries(engine.index.query(NOW, NOW + timedelta(days=2))) == ["Dentist"]
+
+    def test_sync_token_is_xml_escaped(self, server):
+        bodies: List[str] = []
+        handle = server.handle
+        server.handle = lambda request: bodies.append(request.content.decode()) or handle(request)
+        engine = _engine(server)
+        engine.sync()
+        token = "https://caldav.example.com/sync?a=1&b=<2>"
+        engine.sync_token = token
+        server.delete("standup")
+        bodies.clear()
+
+        engine.sync()
+
+        # The fake rejects the token, so a full resync with an empty token follows
+        reports = [ET.fromstring(b.encode()) for b in bodies if "sync-collection" in b]
+        assert [r.findtext("{DAV:}sync-token") for r in reports] == [token, ""]
+
+    def test_etag_listing_without_sync_collection(self):
+        server = FakeCalDAV(supports_sync=False)
+        server.put("standup", _ical("standup", "20260302T093000", "20260302T094500", "Standup"))
+        engine = _engine(server)
+        engine.sync()
+        server.put("lunch", _ical("lunch", "20260302T120000", "20260302T130000", "Lunch"))
+        server.requests.clear()
+
+        engine.sync()
+
+        assert ("PROPFIND", "propfind-1") in server.requests
+        assert _summaries(engine.index.query(NOW, NOW + timedelta(days=1))) == ["Standup", "Lunch"]
+
+    def test_failed_check_raises_and_keeps_index(self, server):
+        engine = _engine(server)
+        engine.sync()
+        engine.session = httpx.Client(transport=httpx.MockTransport(lambda r: httpx.Response(503)))
+        with pytest.raises(ValueError):
+            engine.sync()
+        assert len(engine.index.query(NOW, NOW + timedelta(days=2))) == 2
+
+    def test_failed_multiget_retries_same_changes(self, server):
+        engine = _engine(server)
+        engine.sync()
+        token, ctag = engine.sync_token, engine.ctag
+        server.put("lunch", _ical("lunch", "20260302T120000", "20260302T130000", "Lunch"))
+        server.delete("standup")
+
+        server.multiget_status = 503
+        with pytest.raises(ValueError):
+            engine.sync()
+        assert (engine.sync_token, engine.ctag) == (token, ctag)
+        assert _summaries(engine.index.query(NOW, NOW + timedelta(days=2))) == ["Standup", "Dentist"]
+
+        server.multiget_status = 207
+        assert engine.sync() is True
+        assert _summaries(engine.index.query(NOW, NOW + timedelta(days=2))) == ["Lunch", "Dentist"]
+
+
+class TestIndex:
+    def _index(self, *icals: str) -> CalendarIndex:
+        index = CalendarIndex(clock=lambda: NOW)
+        for i, ical in enumerate(icals):
+            index.set_resource(f"/r{i}.ics", parse_vevents(ical.splitlines()))
+        return index
+
+    def test_long_event_overlapping_range_start(self):
+        index = self._index(
+            _ical("trip", "20260301T080000", "20260305T080000", "Trip"),
+            _ical("call", "20260302T100000", "20260302T103000", "Call"),
+        )
+        assert _summaries(index.query(datetime(2026, 3, 2, 9), datetime(2026, 3, 2, 11))) == ["Trip", "Call"]
+
+    def test_weekly_byday_with_exdate_and_override(self):
+        index = self._index(
+            _ical("gym", "20260302T070000", "20260302T080000", "Gym",
+                  "RRULE:FREQ=WEEKLY;BYDAY=MO,WE,FR;COUNT=6\r\n"
+                  "EXDATE;TZID=America/New_York:20260304T070000\r\n")
+            + _ical("gym", "20260306T090000", "20260306T100000", "Gym (late)",
+                    "RECURRENCE-ID;TZID=America/New_York:20260306T070000\r\n"),
+        )
+        events = index.query(datetime(2026, 3, 1), datetime(2026, 3, 15))
+        assert [(e.summary, e.start_time.day, e.start_time.hour) for e in events] == [
+            ("Gym", 2, 7), ("Gym (late)", 6, 9), ("Gym", 9, 7), ("Gym", 11, 7), ("Gym", 13, 7),
+        ]
+
+    def test_query_outside_window_expands_on_demand(self):
+        index = self._index(_ical("rent", "20260101T090000", "20260101T091500", "Rent", "RRULE:FREQ=MONTHLY\r\n"))
+        events = index.query(datetime(2026, 9, 1), datetime(2026, 9, 30))
+        assert [e.start_time for e in events] == [datetime(2026, 9, 1, 9)]
+
+    def test_remove_resource(self):
+        index = self._index(_ical("call", "20260302T100000", "20260302T103000", "Call"))
+        assert len(index.query(NOW, NOW + timedelta(days=1))) == 1
+        index.remove_resource("/r0.ics")
+        assert index.query(NOW, NOW + timedelta(days=1)) == []
+
+
+class TestParsing:
+    def test_folded_lines_and_nested_alarm(self):
+        ical = (
+            "BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nUID:x\r\nSUMMARY:Parent-teacher\r\n  conference\r\n"
+            "DTSTART:20260302T170000\r\nDTEND:20260302T180000\r\n"
+            "BEGIN:VALARM\r\nSUMMARY:Alarm\r\nTRIGGER:-PT15M\r\nEND:VALARM\r\n"
+            "END:VEVENT\r\nEND:VCALENDAR\r\n"
+        )
+        [event] = parse_vevents(ical.splitlines())
+        assert event.summary == "Parent-teacher conference"
+
+    def test_all_day_without_dtend(self):
+        ical = "BEGIN:VEVENT\nUID:h\nSUMMARY:Holiday\nDTSTART;VALUE=DATE:20260302\nEND:VEVENT\n"
+        [event] = parse_vevents(ical.splitlines())
+        assert event.is_all_day
+        assert event.end - event.start == timedelta(days=1)
+
+    def test_until_limits_daily_rule(self):
+        [event] = parse_vevents(
+            _ical("d", "20260302T090000", "20260302T091000", extra="RRULE:FREQ=DAILY;UNTIL=20260304T235959Z\r\n").splitlines()
+        )
+        assert len(expand_occurrences(event, datetime(2026, 3, 1), datetime(2026, 4, 1))) == 3
+
+    def test_old_dtstart_jumps_to_window(self):
+        [event] = parse_vevents(
+            _ical("d", "20100104T090000", "20100104T093000", extra="RRULE:FREQ=DAILY\r\n").splitlines()
+        )
+        week = expand_occurrences(event, datetime(2026, 10, 19), datetime(2026, 10, 26))
+        assert week == [datetime(2026, 10, d, 9, 0) for d in range(19, 26)]
+
+    @pytest.mark.parametrize("start, rule", [
+        ("20100104T090000", "FREQ=DAILY;INTERVAL=3"),
+        ("20100106T090000", "FREQ=WEEKLY;BYDAY=MO,WE,FR"),
+        ("20100106T090000", "FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,TH"),
+        ("20100131T090000", "FREQ=MONTHLY"),
+        ("20100104T090000", "FREQ=YEARLY"),
+    ])
+    def test_count_still_applies_from_dtstart(self, start, rule):
+        [event] = parse_vevents(_ical("r", start, start[:9] + "100000", extra=f"RRULE:{rule}\r\n").splitlines())
+        window = (datetime(2025, 1, 1), datetime(2027, 1, 1))
+        every = expand_occurrences(event, datetime(2010, 1, 1), window[1])
+        assert len(every) < 5000
+        # COUNT ends mid-window: the jump must agree with walking from DTSTART
+        count = len(expand_occurrences(event, datetime(2010, 1, 1), datetime(2026, 1, 1))) + 2
+        event.rrule = f"{rule};COUNT={count}"
+        assert expand_occurrences(event, *window) == [o for o in every[:count] if o >= window[0]]
+
+
+def _report_body(count: int) -> bytes:
+    rows = "".join(
+        f"<d:response><d:href>{CALENDAR_PATH}e{i}.ics</d:href><d:propstat><d:prop>"
+        f"<d:getetag>\"{i}\"</d:getetag><c:calendar-data>"
+        + _ical(f"e{i}", f"202603{2 + i % 5:02d}T{8 + i % 9:02d}0000", f"202603{2 + i % 5:02d}T{9 + i % 9:02d}0000", f"Event {i}")
+        + "</c:calendar-data></d:prop><d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>"
+        for i in range(count)
+    )
+    return FakeCalDAV._multistatus(rows + "<d:sync-token>v9</d:sync-token>").content
+
+
+def _chunks(body: bytes, size: int, consumed: List[int]):
+    for offset in range(0, len(body), size):
+        consumed.append(offset)
+        yield body[offset:offset + size]
+
+
+class TestStreaming:
+    def test_responses_yielded_across_arbitrary_chunk_boundaries(self):
+        body = _report_body(3)
+        stream = MultistatusStream(_chunks(body, 7, []))
+        hrefs = [href for href, _, props in stream if "{urn:ietf:params:xml:ns:caldav}calendar-data" in props]
+        assert hrefs == [f"{CALENDAR_PATH}e{i}.ics" for i in range(3)]
+        assert stream.sync_token == "v9"
+
+    def test_first_response_available_before_body_is_read(self):
+        body = _report_body(50)
+        consumed: List[int] = []
+        href, _, _ = next(iter(MultistatusStream(_chunks(body, 256, consumed))))
+        assert href == f"{CALENDAR_PATH}e0.ics"
+        assert len(consumed) * 256 < len(body) / 10
+
+    def test_limit_stops_reading(self):
+        body = _report_body(200)
+        consumed: List[int] = []
+        events = list(iter_calendar_events(_chunks(body, 1024, consumed), datetime(2026, 3, 1), datetime(2026, 4, 1), limit=5))
+        assert _summaries(events) == [f"Event {i}" for i in range(5)]
+        assert len(consumed) * 1024 < len(body) / 10
+
+    def test_range_filter_and_recurrence(self):
+        body = FakeCalDAV._multistatus(
+            f"<d:response><d:href>{CALENDAR_PATH}gym.ics</d:href><d:propstat><d:prop><c:calendar-data>"
+            + _ical("gym", "20260302T070000", "20260302T080000", "Gym", "RRULE:FREQ=DAILY;COUNT=10\r\n")
+            + "</c:calendar-data></d:prop><d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>"
+        ).content
+        events = list(iter_calendar_events([body], datetime(2026, 3, 4), datetime(2026, 3, 6)))
+        assert [e.start_time.day for e in events] == [4, 5]
+
+    def test_malformed_body_raises(self):
+        with pytest.raises(MultistatusError):
+            list(MultistatusStream([b"<d:multistatus xmlns:d='DAV:'><d:response>"]))
+
+    def test_service_parse_raises_instead_of_returning_empty(self):
+        service = ICloudCalendarService("user", "pass")
+        with pytest.raises(ValueError):
+            service._parse_calendar_response("<not xml", datetime(2026, 3, 1), datetime(2026, 3, 2))
+
+    def test_service_parse_sorts_events(self):
+        service = ICloudCalendarService("user", "pass")
+        events = service._parse_calendar_response(_report_body(5), datetime(2026, 3, 1), datetime(2026, 4, 1))
+        assert [e.start_time for e in events] == sorted(e.start_time for e in events)
+        assert len(events) == 5
+
+
+class TestICloudFetch:
+    @pytest.fixture(autouse=True)
+    def fresh_engines(self):
+        reset_sync_engines()
+        yield
+        reset_sync_engines()
+
+    def test_fetches_through_index(self, server):
+        service = ICloudCalendarService("user", "pass")
+        service.session = server.client()
+        service._authenticated = True
+        start, end = datetime(2026, 3, 2), datetime(2026, 3, 3)
+        with patch.object(service, "_discover_calendar_url", return_value=CALENDAR_URL) as discover:
+            first = service._fetch_range(start, end)
+            server.requests.clear()
+            second = service._fetch_range(start, end)
+
+        assert _summaries(first) == _summaries(second) == ["Standup"]
+        assert discover.call_count == 1
+        assert server.requests == [("PROPFIND", "propfind-0")]
+
+    def test_index_outlives_service_instance(self, server):
+        start, end = datetime(2026, 3, 2), datetime(2026, 3, 3)
+        services = [ICloudCalendarService("user", "pass") for _ in range(2)]
+        for service in services:
+            service.session = server.client()
+            service._authenticated = True
+
+        with patch.object(ICloudCalendarService, "_discover_calendar_url", return_value=CALENDAR_URL) as discover:
+            services[0]._fetch_range(start, end)
+            server.requests.clear()
+            assert _summaries(services[1]._fetch_range(start, end)) == ["Standup"]
+
+        assert discover.call_count == 1
+        assert server.requests == [("PROPFIND", "propfind-0")]
+        assert ICloudCalendarService("other", "pass")._get_sync_engine() is None
+
+    def test_sync_failure_serves_last_copy(self, server):
+        service = ICloudCalendarService("user", "pass")
+        service.session = server.client()
+        service._authenticated = True
+        start, end = datetime(2026, 3, 2), datetime(2026, 3, 3)
+        with patch.object(service, "_discover_calendar_url", return_value=CALENDAR_URL):
+            service._fetch_range(start, end)
+            with patch.object(service._get_sync_engine(), "sync", side_effect=httpx.ConnectError("down")):
+                assert _summaries(service._fetch_range(start, end)) == ["Standup"]
+
+    def test_first_sync_failure_raises(self, server):
+        service = ICloudCalendarService("user", "pass")
+        service._authenticated = True
+        service.session = httpx.Client(transport=httpx.MockTransport(lambda r: httpx.Response(503)))
+        with patch.object(service, "_discover_calendar_url", return_value=CALENDAR_URL):
+            with pytest.raises(ValueError):
+                service._fetch_range(datetime(2026, 3, 2), datetime(2026, 3, 3))
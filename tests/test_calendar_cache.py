@@ -0,0 +1,179 @@
+"""Tests for calendar_shared.calendar_cache (shared stale-while-revalidate cache)."""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+
+from calendar_shared.calendar_cache import CalendarCache, get_calendar_cache, reset_calendar_cache
+from calendar_shared.calendar_event import CalendarEvent
+
+DAY = datetime(2026, 3, 2)
+
+
+def _event(summary: str, hour: int, day: int = 2) -> CalendarEvent:
+    start = datetime(2026, 3, day, hour)
+    return CalendarEvent(id=summary, summary=summary, start_time=start, end_time=start + timedelta(hours=1))
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeFetch:
+    def __init__(self, events: List[CalendarEvent]) -> None:
+        self.events = events
+        self.calls: List[tuple] = []
+        self.error: Exception = None
+        self.gate: threading.Event = None
+
+    def __call__(self, start: datetime, end: datetime) -> List[CalendarEvent]:
+        self.calls.append((start, end))
+        if self.gate is not None:
+            self.gate.wait(2)
+        if self.error is not None:
+            raise self.error
+        return [e for e in self.events if e.start_time < end and e.end_time > start]
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+@pytest.fixture
+def cache(clock) -> CalendarCache:
+    return CalendarCache(freshness_seconds={"icloud": 60, "google": 300}, stale_limit_seconds=1800, clock=clock)
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def _summaries(events) -> List[str]:
+    return [e.summary for e in events]
+
+
+class TestRead:
+    def test_fresh_entry_is_served_from_memory(self, cache):
+        fetch = FakeFetch([_event("Standup", 9)])
+        cache.read("k", "icloud", DAY, DAY + timedelta(days=1), fetch)
+        assert _summaries(cache.read("k", "icloud", DAY, DAY + timedelta(days=1), fetch)) == ["Standup"]
+        assert len(fetch.calls) == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_miss_prefetches_a_week_and_serves_subranges(self, cache):
+        fetch = FakeFetch([_event("Standup", 9), _event("Lunch", 12), _event("Dentist", 14, day=3)])
+        assert _summaries(cache.read("k", "google", DAY.replace(hour=11), DAY.replace(hour=18), fetch)) == ["Lunch"]
+        assert fetch.calls == [(DAY, DAY + timedelta(days=7))]
+
+        tomorrow = DAY + timedelta(days=1)
+        assert _summaries(cache.read("k", "google", tomorrow, tomorrow + timedelta(days=1), fetch)) == ["Dentist"]
+        assert len(fetch.calls) == 1
+
+    def test_range_outside_entry_refetches(self, cache):
+        fetch = FakeFetch([])
+        cache.read("k", "google", DAY, DAY + timedelta(days=1), fetch)
+        later = DAY + timedelta(days=10)
+        cache.read("k", "google", later, later + timedelta(days=1), fetch)
+        assert len(fetch.calls) == 2
+
+    def test_freshness_is_per_provider(self, cache, clock):
+        icloud, google = FakeFetch([]), FakeFetch([])
+        cache.read("a", "icloud", DAY, DAY + timedelta(days=1), icloud)
+        cache.read("b", "google", DAY, DAY + timedelta(days=1), google)
+        clock.now += 120
+
+        cache.read("b", "google", DAY, DAY + timedelta(days=1), google)
+        cache.read("a", "icloud", DAY, DAY + timedelta(days=1), icloud)
+        _wait_for(lambda: len(icloud.calls) == 2)
+
+        assert len(google.calls) == 1
+        assert len(icloud.calls) == 2
+
+
+class TestRevalidation:
+    def test_stale_entry_served_while_refreshing(self, cache, clock):
+        fetch = FakeFetch([_event("Standup", 9)])
+        cache.read("k", "icloud", DAY, DAY + timedelta(days=1), fetch)
+        fetch.events = [_event("Standup (moved)", 10)]
+        fetch.gate = threading.Event()
+        clock.now += 120
+
+        assert _summaries(cache.read("k", "icloud", DAY, DAY + timedelta(days=1), fetch)) == ["Standup"]
+        assert _summaries(cache.read("k", "icloud", DAY, DAY + timedelta(days=1), fetch)) == ["Standup"]
+        fetch.gate.set()
+        _wait_for(lambda: cache.stats()["refreshes"] == 1 and not cache._refreshing)
+
+        assert len(fetch.calls) == 2  # both stale reads shared one refresh
+        assert _summaries(cache.read("k", "icloud", DAY, DAY + timedelta(days=1), fetch)) == ["Standup (moved)"]
+
+    def test_failed_refresh_keeps_entry(self, cache, clock):
+        fetch = FakeFetch([_event("Standup", 9)])
+        cache.read("k", "icloud", DAY, DAY + timedelta(days=1), fetch)
+        fetch.error = ConnectionError("offline")
+        clock.now += 120
+
+        assert _summaries(cache.read("k", "icloud", DAY, DAY + timedelta(days=1), fetch)) == ["Standup"]
+        _wait_for(lambda: not cache._refreshing)
+        assert cache.stats()["errors"] == 1
+        assert _summaries(cache.read("k", "icloud", DAY, DAY + timedelta(days=1), fetch)) == ["Standup"]
+
+    def test_entry_past_stale_limit_is_refetched(self, cache, clock):
+        fetch = FakeFetch([_event("Standup", 9)])
+        cache.read("k", "icloud", DAY, DAY + timedelta(days=1), fetch)
+        clock.now += 3600
+        fetch.events = []
+        assert cache.read("k", "icloud", DAY, DAY + timedelta(days=1), fetch) == []
+        assert len(fetch.calls) == 2
+
+    def test_failed_first_fetch_returns_empty(self, cache):
+        fetch = FakeFetch([])
+        fetch.error = ValueError("auth")
+        assert cache.read("k", "google", DAY, DAY + timedelta(days=1), fetch) == []
+        assert cache.stats()["entries"] == 0
+
+
+class TestConcurrency:
+    def test_concurrent_misses_share_one_fetch(self, cache):
+        fetch = FakeFetch([_event("Standup", 9)])
+        fetch.gate = threading.Event()
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.read("k", "google", DAY, DAY + timedelta(days=1), fetch)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        _wait_for(lambda: len(fetch.calls) >= 1)
+        fetch.gate.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(fetch.calls) == 1
+        assert [_summaries(r) for r in results] == [["Standup"]] * 4
+
+
+class TestInvalidate:
+    def test_invalidate_forces_refetch(self, cache):
+        fetch = FakeFetch([])
+        cache.read("k", "icloud", DAY, DAY + timedelta(days=1), fetch)
+        cache.invalidate("k")
+        cache.read("k", "icloud", DAY, DAY + timedelta(days=1), fetch)
+        assert len(fetch.calls) == 2
+
+    def test_singleton_and_reset(self):
+        reset_calendar_cache()
+        first = get_calendar_cache()
+        assert get_calendar_cache() is first
+        reset_calendar_cache()
+        assert get_calendar_cache() is not first
+        reset_calendar_cache()
@@ -0,0 +1,159 @@
+"""Tests for core.capture_process (spawns a real child with a simulated mic)."""
+
+from __future__ import annotations
+
+import struct
+import time
+
+import pyaudio
+import pytest
+
+from core.audio_bus import AudioBus
+from core.capture_process import CaptureProcessAudio
+
+RATE = 16000
+FRAMES = 160          # 10 ms chunks
+OPEN_KWARGS = dict(format=pyaudio.paInt16, channels=1, rate=RATE, input=True, frames_per_buffer=FRAMES)
+
+
+class _PacedStream:
+    """Delivers chunks at the device's real-time pace; first 4 bytes carry the sequence number."""
+
+    def __init__(self) -> None:
+        self._seq = 0
+        self._t0 = time.monotonic()
+
+    def read(self, frames: int, exception_on_overflow: bool = True) -> bytes:
+        self._seq += 1
+        delay = self._t0 + self._seq * frames / RATE - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        return struct.pack("<I", self._seq) + bytes(frames * 2 - 4)
+
+    def stop_stream(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class FakeMic:
+    """Loaded in the child via ``device_factory``."""
+
+    def open(self, **kwargs) -> _PacedStream:
+        return _PacedStream()
+
+    def terminate(self) -> None:
+        pass
+
+
+class BrokenMic(FakeMic):
+    def open(self, **kwargs) -> _PacedStream:
+        raise OSError("Invalid input device (no default output device)")
+
+
+def _seq(chunk: bytes) -> int:
+    return struct.unpack("<I", chunk[:4])[0]
+
+
+@pytest.fixture
+def capture():
+    audio = CaptureProcessAudio(device_factory="tests.test_capture_process:FakeMic", ring_secs=0.2)
+    yield audio
+    audio.terminate()
+
+
+class TestCaptureProcess:
+    def test_chunks_arrive_in_order(self, capture):
+        stream = capture.open(**OPEN_KWARGS)
+        seqs = [_seq(stream.read(FRAMES)) for _ in range(20)]
+        assert seqs == list(range(seqs[0], seqs[0] + 20))
+        assert stream.stats()["alive"]
+        assert stream.stats()["lapped_chunks"] == 0
+
+    def test_slow_reader_skips_to_oldest_intact_chunk(self, capture):
+        stream = capture.open(**OPEN_KWARGS)       # 20-slot ring
+        first = _seq(stream.read(FRAMES))
+        time.sleep(0.5)                            # ~50 chunks written meanwhile
+        resumed = _seq(stream.read(FRAMES))
+        assert resumed - first > 20
+        assert stream.stats()["lapped_chunks"] == resumed - first - 1
+        following = [_seq(stream.read(FRAMES)) for _ in range(5)]
+        assert following == list(range(resumed + 1, resumed + 6))
+
+    def test_terminate_stops_child(self, capture):
+        stream = capture.open(**OPEN_KWARGS)
+        stream.read(FRAMES)
+        proc = stream._proc
+        capture.terminate()
+        assert proc.poll() is not None
+        with pytest.raises(OSError):
+            stream.read(FRAMES)
+
+    def test_killed_child_is_respawned(self, capture):
+        stream = capture.open(**OPEN_KWARGS)
+        stream.read(FRAMES)
+        old = stream._proc
+        old.kill()
+        old.wait()
+        # The new child's mic starts counting from 1 again
+        deadline = time.monotonic() + 10
+        while _seq(stream.read(FRAMES)) != 1:
+            assert time.monotonic() < deadline
+        seqs = [_seq(stream.read(FRAMES)) for _ in range(5)]
+        assert seqs == [2, 3, 4, 5, 6]
+        assert stream.stats()["restarts"] == 1
+        assert stream.stats()["alive"] and stream._proc.pid != old.pid
+
+    def test_respawn_is_rate_limited(self, capture):
+        stream = capture.open(**OPEN_KWARGS)
+        stream._proc.kill()
+        stream._proc.wait()
+        stream._respawn = lambda: (_ for _ in ()).throw(OSError("no device"))
+        with pytest.raises(OSError, match="restart failed: no device"):
+            stream.read(FRAMES)
+        with pytest.raises(OSError, match="exited"):
+            stream.read(FRAMES)     # within the backoff: no second spawn attempt
+        assert stream.stats()["restarts"] == 0
+
+    def test_open_failure_is_oserror(self):
+        audio = CaptureProcessAudio(device_factory="tests.test_capture_process:BrokenMic")
+        with pytest.raises(OSError, match="Invalid input device"):
+            audio.open(**OPEN_KWARGS)
+
+    def test_drives_audio_bus(self):
+        bus = AudioBus(
+            rate=RATE,
+            chunk_samples=FRAMES,
+            device_index_resolver=lambda: None,
+            pyaudio_factory=lambda: CaptureProcessAudio(device_factory="tests.test_capture_process:FakeMic"),
+        )
+        bus.start()
+        try:
+            q = bus.subscribe("wake")
+            seqs = [_seq(q.get(timeout=2)) for _ in range(10)]
+            assert seqs == list(range(seqs[0], seqs[0] + 10))
+        finally:
+            bus.stop()
+        assert bus.stats()["read_errors"] == 0
+
+    def test_audio_bus_resumes_after_child_dies(self):
+        audio = CaptureProcessAudio(device_factory="tests.test_capture_process:FakeMic")
+        bus = AudioBus(
+            rate=RATE,
+            chunk_samples=FRAMES,
+            device_index_resolver=lambda: None,
+            pyaudio_factory=lambda: audio,
+        )
+        bus.start()
+        try:
+            q = bus.subscribe("wake")
+            q.get(timeout=2)
+            audio.stream._proc.kill()
+            deadline = time.monotonic() + 10
+            while _seq(q.get(timeout=5)) != 1:
+                assert time.monotonic() < deadline
+            assert [_seq(q.get(timeout=2)) for _ in range(3)] == [2, 3, 4]
+            assert audio.stats()["restarts"] == 1
+        finally:
+            bus.stop()
@@ -0,0 +1,214 @@
+"""Tests for ChunkedCommandResponseService (in-memory buffers + write-behind)."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import services.chunked_command_response_service as svc
+from models.chunked_command_response import Base, ChunkedCommandResponseDB
+from services.chunked_command_response_service import ChunkedCommandResponseService
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with patch.object(svc, "SessionLocal", factory), \
+            patch.object(svc, "_ensure_flusher"):
+        yield factory
+    svc._buffers.clear()
+    svc._open_sessions.clear()
+    svc._stats.reset()
+
+
+@pytest.fixture
+def spoken():
+    said: list[str] = []
+    with patch.object(svc, "speak", side_effect=said.append):
+        yield said
+
+
+def _stored(factory, session_id: str) -> str:
+    with factory() as session:
+        return session.query(ChunkedCommandResponseDB).filter_by(session_id=session_id).one().full_content
+
+
+class TestBuffer:
+    def test_append_is_visible_without_db_write(self, db, spoken):
+        service = ChunkedCommandResponseService()
+        sid = service.start_session("story", "Once ")
+
+        with patch.object(svc.ChunkedCommandResponseRepository, "update_content") as update:
+            record = service.append_content(sid, "upon a time")
+            assert service.speak_session_until_caught_up(sid) == "Once upon a time"
+
+        update.assert_not_called()
+        assert (record.offset, record.length, record.total_length) == (5, 11, 16)
+        assert _stored(db, sid) == "Once "
+
+    def test_append_and_read_do_not_join_the_buffer(self, db, spoken):
+        service = ChunkedCommandResponseService()
+        sid = service.start_session("story")
+        chunks = [f"{i:02d} " for i in range(50)]
+        for i, chunk in enumerate(chunks):
+            service.append_content(sid, chunk)
+            if i == 24:
+                assert service.speak_session(sid)[0] == "".join(chunks[:25])
+
+        buffer = svc._buffers[sid]
+        assert len(buffer._chunks) == 50  # never compacted by a join
+        assert buffer.read_from(76) == "".join(chunks)[76:]  # mid-chunk
+        assert service.speak_session(sid)[0] == "".join(chunks[25:])
+
+    def test_speaks_only_new_content(self, db, spoken):
+        service = ChunkedCommandResponseService()
+        sid = service.start_session("story", "One. ")
+        service.speak_session(sid)
+        service.append_content(sid, "Two. ")
+        service.append_content(sid, "Three.")
+
+        assert service.speak_session(sid) == ("Two. Three.", True)
+        assert service.speak_session(sid) == ("", True)
+        assert spoken == ["One. ", "Two. Three."]
+
+    def test_replace_content(self, db, spoken):
+        service = ChunkedCommandResponseService()
+        sid = service.start_session("story", "draft")
+        record = service.replace_content(sid, "final answer")
+        assert (record.offset, record.length, record.total_length) == (0, 12, 12)
+        assert service.speak_session_until_caught_up(sid) == "final answer"
+
+    def test_other_instance_shares_buffer(self, db, spoken):
+        sid = ChunkedCommandResponseService().start_session("story", "shared")
+        assert ChunkedCommandResponseService().speak_session_until_caught_up(sid) == "shared"
+
+    def test_unknown_session(self, db):
+        with pytest.raises(Exception, match="not found"):
+            ChunkedCommandResponseService().append_content("nope", "x")
+
+
+class TestWaiting:
+    def test_speaker_waits_for_chunks_until_finished(self, db, spoken):
+        producer = ChunkedCommandResponseService()
+        sid = producer.start_session("story")
+
+        def produce():
+            for word in ("alpha ", "beta ", "gamma"):
+                time.sleep(0.02)
+                producer.append_content(sid, word)
+            producer.finish_session(sid)
+
+        thread = threading.Thread(target=produce)
+        thread.start()
+        result = ChunkedCommandResponseService().speak_session_until_caught_up(sid, wait_seconds=2.0)
+        thread.join()
+
+        assert "".join(spoken) == "alpha beta gamma"
+        assert result.replace(" ", "") == "alphabetagamma"
+
+    def test_wait_times_out_when_idle(self, db, spoken):
+        service = ChunkedCommandResponseService()
+        sid = service.start_session("story", "hello")
+        start = time.monotonic()
+        assert service.speak_session_until_caught_up(sid, wait_seconds=0.05) == "hello"
+        assert time.monotonic() - start < 1.0
+
+    def test_append_to_speech_latency_recorded(self, db, spoken):
+        service = ChunkedCommandResponseService()
+        sid = service.start_session("story")
+        service.append_content(sid, "a")
+        service.append_content(sid, "b")
+        service.speak_session(sid)
+
+        stats = svc.get_chunked_response_stats()
+        assert stats["chunks_spoken"] == 2
+        assert stats["max_append_to_speech_ms"] >= 0
+
+
+class TestWriteBehind:
+    def test_flush_appends_deltas(self, db):
+        service = ChunkedCommandResponseService()
+        sid = service.start_session("story", "a")
+        service.append_content(sid, "b")
+        service.append_content(sid, "c")
+        svc.flush_pending()
+        service.append_content(sid, "d")
+
+        with patch.object(svc.ChunkedCommandResponseRepository, "append_delta",
+                          wraps=svc.ChunkedCommandResponseRepository.append_delta, autospec=True) as append:
+            svc.flush_pending(sid)
+
+        assert append.call_args.args[1:] == (sid, "d")
+        assert _stored(db, sid) == "abcd"
+
+    def test_replace_writes_full_content(self, db):
+        service = ChunkedCommandResponseService()
+        sid = service.start_session("story", "draft")
+        service.append_content(sid, " more")
+        service.replace_content(sid, "final")
+        service.append_content(sid, "!")
+        svc.flush_pending()
+        assert _stored(db, sid) == "final!"
+
+    def test_failed_flush_is_retried(self, db):
+        service = ChunkedCommandResponseService()
+        sid = service.start_session("story", "a")
+        service.append_content(sid, "b")
+        with patch.object(svc.ChunkedCommandResponseRepository, "append_delta", side_effect=Exception("locked")):
+            svc.flush_pending()
+        service.append_content(sid, "c")
+        svc.flush_pending()
+
+        assert _stored(db, sid) == "abc"
+        assert svc.get_chunked_response_stats()["flush_failures"] == 1
+
+    def test_end_session_flushes_and_recovers_from_db(self, db, spoken):
+        service = ChunkedCommandResponseService()
+        sid = service.start_session("story", "persisted ")
+        service.append_content(sid, "content")
+        assert service.end_session(sid) is True
+        assert sid not in svc._buffers
+
+        assert _stored(db, sid) == "persisted content"
+        assert ChunkedCommandResponseService().speak_session_until_caught_up(sid, wait_seconds=5) == "persisted content"
+
+    def test_evicted_open_session_stays_open(self, db, spoken):
+        service = ChunkedCommandResponseService()
+        sid = service.start_session("story", "first ")
+        svc.flush_pending()
+        with patch.object(svc, "BUFFER_IDLE_SECONDS", -1):
+            svc._evict_idle_buffers()
+        assert sid not in svc._buffers
+
+        assert service.get_session_status(sid)["is_finished"] is False
+        service.append_content(sid, "second")
+        service.finish_session(sid)
+        assert service.speak_session_until_caught_up(sid, wait_seconds=5) == "first second"
+
+    def test_recovered_after_restart_is_finished(self, db):
+        service = ChunkedCommandResponseService()
+        sid = service.start_session("story", "orphan")
+        svc.flush_pending()
+        svc._buffers.clear()
+        svc._open_sessions.clear()  # a fresh process
+
+        assert service.get_session_status(sid)["is_finished"] is True
+
+    def test_idle_flushed_buffers_evicted(self, db):
+        service = ChunkedCommandResponseService()
+        sid = service.start_session("story", "x")
+        service.append_content(sid, "y")
+        with patch.object(svc, "BUFFER_IDLE_SECONDS", -1):
+            svc._evict_idle_buffers()
+            assert sid in svc._buffers  # unflushed delta keeps it
+            svc.flush_pending()
+            svc._evict_idle_buffers()
+        assert sid not in svc._buffers
@@ -8,6 +8,7 @@ process_voice_command return shape, and continue_conversation behavior.
 from unittest.mock import MagicMock, patch, PropertyMock
 
 import pytest
+from jarvis_command_sdk import PreRouteResult
 
 from clients.responses.jarvis_command_center import (
     ToolCall,
@@ -18,6 +19,7 @@ from clients.responses.jarvis_command_center import (
 from core.command_response import CommandResponse
 from core.request_information import RequestInformation
 from utils.command_execution_service import CommandExecutionService, ToolExecutionResult
+from utils.tool_router import RouterPrediction
 
 
 # ---------- ToolExecutionResult tests ----------
@@ -300,6 +302,21 @@ class TestProcessVoiceCommand:
         assert "message" in result
         assert "conversation_id" in result
 
+    def test_pooled_conversation_skips_registration(self, mock_deps):
+        """A conversation checked out of the warm pool is not re-registered."""
+        service = CommandExecutionService()
+
+        mock_deps["client"].send_command_unified.return_value = ("error", "boom")
+
+        service.process_voice_command(
+            "test", speaker_user_id=3, conversation_id="warm-1",
+            warmup_result={"success": True, "pooled": True}, skip_ack=True,
+        )
+
+        mock_deps["client"].start_conversation.assert_not_called()
+        mock_deps["client"].send_command_unified.assert_called_once()
+        assert service._conversation_users["warm-1"] == 3
+
 
 # ---------- continue_conversation tests ----------
 
@@ -404,3 +421,120 @@ class TestContinueConversation:
 
         assert result["wait_for_input"] is True
         assert result["clear_history"] is False
+
+
+# ---------- on-node tool router tests ----------
+
+
+def _router_predicting(tool_name: str, confidence: float) -> MagicMock:
+    router = MagicMock()
+    router.predict.return_value = RouterPrediction(
+        tool_name=tool_name, confidence=confidence, latency_ms=0.05,
+    )
+    return router
+
+
+class TestTryLocalRoute:
+    """Test the confident on-node router path that skips the CC round trip."""
+
+    def _service(self) -> CommandExecutionService:
+        service = CommandExecutionService()
+        service.tool_router_threshold = 0.85
+        return service
+
+    def test_no_artifact_falls_through(self, mock_deps):
+        service = self._service()
+        with patch("utils.command_execution_service.get_tool_router", return_value=None):
+            assert service.try_local_route("what's 5 plus 3", "conv-1") is None
+
+    def test_low_confidence_falls_through(self, mock_deps):
+        service = self._service()
+        mock_command = MagicMock()
+        mock_deps["discovery"].get_command.return_value = mock_command
+
+        with patch(
+            "utils.command_execution_service.get_tool_router",
+            return_value=_router_predicting("calculate", 0.6),
+        ):
+            assert service.try_local_route("what's 5 plus 3", "conv-1") is None
+        mock_command.route_locally.assert_not_called()
+        mock_command.execute.assert_not_called()
+
+    def test_command_without_local_filler_falls_through(self, mock_deps):
+        service = self._service()
+        mock_deps["discovery"].get_command.return_value = MagicMock(spec=["execute", "command_name"])
+
+        with patch(
+            "utils.command_execution_service.get_tool_router",
+            return_value=_router_predicting("get_weather", 0.99),
+        ):
+            assert service.try_local_route("weather in miami", "conv-1") is None
+
+    def test_unfillable_parameters_fall_through(self, mock_deps):
+        service = self._service()
+        mock_command = MagicMock()
+        mock_command.route_locally.return_value = None
+        mock_deps["discovery"].get_command.return_value = mock_command
+
+        with patch(
+            "utils.command_execution_service.get_tool_router",
+            return_value=_router_predicting("calculate", 0.99),
+        ):
+            assert service.try_local_route("what's 15 percent of 200", "conv-1") is None
+        mock_command.execute.assert_not_called()
+
+    def test_confident_hit_executes_locally(self, mock_deps):
+        service = self._service()
+        mock_command = MagicMock()
+        mock_command.command_name = "calculate"
+        mock_command.required_secrets = []
+        mock_command.route_locally.return_value = PreRouteResult(
+            arguments={"num1": 5.0, "num2": 3.0, "operation": "add"},
+        )
+        mock_command.execute.return_value = CommandResponse(
+            context_data={"message": "5 plus 3 is 8"}, success=True,
+        )
+        mock_deps["discovery"].get_command.return_value = mock_command
+
+        with patch(
+            "utils.command_execution_service.get_tool_router",
+            return_value=_router_predicting("calculate", 0.97),
+        ):
+            result = service.process_voice_command("what's 5 plus 3")
+
+        assert result["success"] is True
+        assert result["message"] == "5 plus 3 is 8"
+        assert mock_command.execute.call_args.kwargs["num1"] == 5.0
+        mock_deps["client"].send_command_unified.assert_not_called()
+
+    def test_parse_voice_command_reports_router_confidence(self, mock_deps):
+        service = self._service()
+        mock_command = MagicMock()
+        mock_command.command_name = "set_timer"
+        mock_command.route_locally.return_value = PreRouteResult(arguments={"duration_seconds": 300})
+        mock_deps["discovery"].get_command.return_value = mock_command
+
+        with patch(
+            "utils.command_execution_service.get_tool_router",
+            return_value=_router_predicting("set_timer", 0.93),
+        ):
+            result = service.parse_voice_command("five minute pasta")
+
+        assert result.pre_routed is True
+        assert result.tool_name == "set_timer"
+        assert result.tool_arguments == {"duration_seconds": 300}
+        assert result.router_confidence == pytest.approx(0.93)
+        mock_deps["client"].start_conversation.assert_not_called()
+
+    def test_parse_voice_command_can_bypass_router(self, mock_deps):
+        service = self._service()
+        router = _router_predicting("set_timer", 0.93)
+        mock_deps["client"].send_command.return_value = _make_final_response("Sure thing!")
+
+        with patch("utils.command_execution_service.get_tool_router", return_value=router), \
+                patch.object(service, "register_tools_for_conversation", return_value=True):
+            result = service.parse_voice_command("five minute pasta", use_local_router=False)
+
+        router.predict.assert_not_called()
+        assert result.router_confidence is None
+        mock_deps["client"].send_command.assert_called_once()
@@ -195,6 +195,163 @@ class TestInstallFromGithub:
         assert (test_custom_dir / "test_cmd" / "command.py").exists()
 
 
+def _tarball(files: dict[str, bytes], top: str = "repo-main") -> bytes:
+    import io
+    import tarfile
+
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(f"{top}/{name}")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+class _Response:
+    """urlopen() stand-in that refuses whole-body reads."""
+
+    def __init__(self, body: bytes):
+        import io
+        self._body = io.BytesIO(body)
+
+    def read(self, size: int = -1) -> bytes:
+        assert size is not None and size > 0, "archive must be streamed, not read whole"
+        return self._body.read(size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class TestDownloadArchive:
+    def test_streams_and_extracts(self):
+        from services.command_store_service import _download_archive
+
+        body = _tarball({"command.py": b"print('hi')\n"})
+        with patch("urllib.request.urlopen", return_value=_Response(body)):
+            repo = _download_archive("https://github.com/test/repo", "v1")
+        try:
+            assert (repo / "command.py").read_bytes() == b"print('hi')\n"
+        finally:
+            shutil.rmtree(repo.parent, ignore_errors=True)
+
+    def test_matching_hash_accepted(self):
+        import hashlib
+        from services.command_store_service import _download_archive
+
+        body = _tarball({"command.py": b"x"})
+        digest = hashlib.sha256(body).hexdigest()
+        with patch("urllib.request.urlopen", return_value=_Response(body)):
+            repo = _download_archive("https://github.com/test/repo", expected_sha256=digest.upper())
+        assert repo is not None
+        shutil.rmtree(repo.parent, ignore_errors=True)
+
+    def test_hash_mismatch_raises(self):
+        from services.command_store_service import _download_archive
+
+        body = _tarball({"command.py": b"x"})
+        with patch("urllib.request.urlopen", return_value=_Response(body)):
+            with pytest.raises(InstallError, match="hash mismatch"):
+                _download_archive("https://github.com/test/repo", expected_sha256="0" * 64)
+
+    @patch("services.command_store_service._download_archive", return_value=None)
+    @patch("services.command_store_service.subprocess.run")
+    def test_no_git_fallback_when_hash_required(self, mock_run, mock_download):
+        from services.command_store_service import _clone_repo
+
+        with pytest.raises(InstallError, match="verified archive"):
+            _clone_repo("https://github.com/test/repo", archive_sha256="ab" * 32)
+        mock_run.assert_not_called()
+
+
+class TestInstallPipDeps:
+    @staticmethod
+    def _manifest(*packages: tuple) -> CommandManifest:
+        from core.command_manifest import ManifestPackage
+
+        packages = packages or (("requests", "2.31.0"), ("numpy", None))
+        return CommandManifest(
+            name="x", description="x",
+            packages=[ManifestPackage(name=name, version=version) for name, version in packages],
+        )
+
+    @staticmethod
+    def _cache(tmp_path, *wheels: str) -> None:
+        for wheel in wheels:
+            (tmp_path / wheel).touch()
+
+    def test_offline_install_when_every_pin_is_cached(self, tmp_path):
+        from services.command_store_service import _install_pip_deps
+
+        self._cache(tmp_path, "requests-2.31.0-py3-none-any.whl", "zope_interface-6.1-cp311-cp311-linux_aarch64.whl")
+        ok = MagicMock(returncode=0, stderr="")
+        with patch("services.command_store_service.WHEEL_CACHE_DIR", tmp_path), \
+                patch("services.command_store_service.subprocess.run", return_value=ok) as mock_run:
+            _install_pip_deps(self._manifest(("requests", "2.31.0"), ("zope.interface", "6.1")))
+
+        mock_run.assert_called_once()
+        args = mock_run.call_args.args[0]
+        assert args[:3] == ["nice", "-n", "15"]
+        assert "--no-index" in args and str(tmp_path) in args
+        assert args[-2:] == ["requests==2.31.0", "zope.interface==6.1"]
+
+    def test_only_missing_requirements_are_wheeled(self, tmp_path):
+        from services.command_store_service import _install_pip_deps
+
+        # numpy is unpinned: even a cached wheel must not be trusted offline
+        self._cache(tmp_path, "requests-2.31.0-py3-none-any.whl", "numpy-1.26.0-cp311-cp311-linux_aarch64.whl")
+        ok = MagicMock(returncode=0, stderr="")
+        with patch("services.command_store_service.WHEEL_CACHE_DIR", tmp_path), \
+                patch("utils.config_service.Config.get_str", return_value="http://nas.local/wheels"), \
+                patch("services.command_store_service.subprocess.run", return_value=ok) as mock_run:
+            _install_pip_deps(self._manifest())
+
+        wheel, install = [c.args[0] for c in mock_run.call_args_list]
+        assert "wheel" in wheel and wheel[-1] == "numpy" and "requests==2.31.0" not in wheel
+        assert wheel[wheel.index("--wheel-dir") + 1] == str(tmp_path)
+        assert "http://nas.local/wheels" in wheel
+        assert "--no-index" in install and install[-2:] == ["requests==2.31.0", "numpy"]
+
+    def test_ranged_and_other_versions_are_not_cache_hits(self, tmp_path):
+        from services.command_store_service import _cached_pin
+
+        self._cache(tmp_path, "requests-2.31.0-py3-none-any.whl")
+        with patch("services.command_store_service.WHEEL_CACHE_DIR", tmp_path):
+            assert _cached_pin("requests==2.31.0")
+            assert not _cached_pin("requests==2.32.0")
+            assert not _cached_pin("requests>=2.31.0")
+            assert not _cached_pin("requests==2.*")
+
+    def test_failed_offline_install_rebuilds_everything(self, tmp_path):
+        from services.command_store_service import _install_pip_deps
+
+        self._cache(tmp_path, "requests-2.31.0-py3-none-any.whl")
+        results = [MagicMock(returncode=1, stderr="no matching distribution for urllib3"),
+                   MagicMock(returncode=0, stderr=""), MagicMock(returncode=0, stderr="")]
+        with patch("services.command_store_service.WHEEL_CACHE_DIR", tmp_path), \
+                patch("utils.config_service.Config.get_str", return_value=""), \
+                patch("services.command_store_service.subprocess.run", side_effect=results) as mock_run:
+            _install_pip_deps(self._manifest(("requests", "2.31.0")))
+
+        calls = [c.args[0] for c in mock_run.call_args_list]
+        assert "--no-index" in calls[0]
+        assert "wheel" in calls[1] and calls[1][-1] == "requests==2.31.0"
+        assert "--no-index" in calls[2]
+
+    def test_wheel_failure_raises(self, tmp_path):
+        from services.command_store_service import _install_pip_deps
+
+        results = [MagicMock(returncode=1, stderr="build failed")]
+        with patch("services.command_store_service.WHEEL_CACHE_DIR", tmp_path), \
+                patch("utils.config_service.Config.get_str", return_value=""), \
+                patch("services.command_store_service.subprocess.run", side_effect=results):
+            with pytest.raises(InstallError, match="pip wheel failed: build failed"):
+                _install_pip_deps(self._manifest())
+
+
 class TestRemove:
     def test_remove_success(self, tmp_path):
         test_custom_dir = tmp_path / "custom_commands"
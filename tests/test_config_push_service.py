@@ -1,12 +1,15 @@
 """Unit tests for config push service.
 
-Tests AES-256-GCM decryption, dispatch routing, and end-to-end
-process_pending_configs with mocked dependencies.
+Tests AES-256-GCM decryption, dispatch routing, per-push ACKs, and
+end-to-end process_pending_configs / process_config_push with mocked
+dependencies.
 """
 
 import base64
 import json
 import os
+import threading
+import time
 from datetime import datetime
 from typing import Any
 from unittest.mock import MagicMock, patch
@@ -15,9 +18,12 @@ import pytest
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from services.config_push_service import (
+    _ack_config,
     _b64url_decode,
     _decrypt_config,
     _dispatch_config,
+    get_config_push_stats,
+    process_config_push,
     process_pending_configs,
 )
 from utils.encryption_utils import K2Data
@@ -246,9 +252,8 @@ class TestProcessPendingConfigs:
         assert count == 2
         assert mock_decrypt.call_count == 2
         assert mock_dispatch.call_count == 2
-        assert mock_ack.call_count == 2
-        mock_ack.assert_any_call("push-1")
-        mock_ack.assert_any_call("push-2")
+        # Each push is ACKed on its own endpoint
+        assert sorted(c.args[0] for c in mock_ack.call_args_list) == ["push-1", "push-2"]
 
     @patch("services.config_push_service._fetch_pending")
     def test_process_empty_returns_zero(self, mock_fetch: MagicMock) -> None:
@@ -295,6 +300,210 @@ class TestProcessPendingConfigs:
         assert count == 1
         mock_ack.assert_called_once_with("push-good")
 
+    @patch("utils.command_discovery_service.get_command_discovery_service")
+    @patch("services.config_push_service._ack_config")
+    @patch("services.config_push_service._dispatch_config")
+    @patch("services.config_push_service._decrypt_config")
+    @patch("services.config_push_service._fetch_pending")
+    def test_same_type_applied_in_order_and_registry_refreshed_once(
+        self,
+        mock_fetch: MagicMock,
+        mock_decrypt: MagicMock,
+        mock_dispatch: MagicMock,
+        mock_ack: MagicMock,
+        mock_discovery: MagicMock,
+    ) -> None:
+        mock_fetch.return_value = [
+            {"id": f"push-{i}", "config_type": "command_registry", "ciphertext": "c", "nonce": "n", "tag": "t"}
+            for i in range(3)
+        ]
+        mock_decrypt.side_effect = [{"command_name": "a", "enabled": str(i % 2 == 0)} for i in range(3)]
+
+        assert process_pending_configs() == 3
+
+        assert [c.args[1]["enabled"] for c in mock_dispatch.call_args_list] == ["True", "False", "True"]
+        assert all(c.kwargs == {"refresh_discovery": False} for c in mock_dispatch.call_args_list)
+        mock_discovery.return_value.refresh_now.assert_called_once()
+        assert [c.args[0] for c in mock_ack.call_args_list] == ["push-0", "push-1", "push-2"]
+
+    @patch("services.config_push_service._ack_config")
+    @patch("services.config_push_service._dispatch_config")
+    @patch("services.config_push_service._decrypt_config")
+    @patch("services.config_push_service._fetch_pending")
+    def test_independent_types_ack_concurrently(
+        self,
+        mock_fetch: MagicMock,
+        mock_decrypt: MagicMock,
+        mock_dispatch: MagicMock,
+        mock_ack: MagicMock,
+    ) -> None:
+        types = ["auth:home_assistant", "settings:display", "settings:audio"]
+        mock_fetch.return_value = [
+            {"id": t, "config_type": t, "ciphertext": "c", "nonce": "n", "tag": "t"} for t in types
+        ]
+        mock_decrypt.return_value = {"k": "v"}
+        barrier = threading.Barrier(len(types), timeout=2)
+        # Deadlocks (BrokenBarrierError) unless all three ACKs are in flight at once
+        mock_ack.side_effect = lambda push_id: barrier.wait()
+
+        assert process_pending_configs() == 3
+
+    @patch("services.config_push_service._ack_config")
+    @patch("services.config_push_service._dispatch_config")
+    @patch("services.config_push_service._decrypt_config")
+    @patch("services.config_push_service._fetch_pending")
+    def test_db_writes_are_serialized(
+        self,
+        mock_fetch: MagicMock,
+        mock_decrypt: MagicMock,
+        mock_dispatch: MagicMock,
+        mock_ack: MagicMock,
+    ) -> None:
+        types = ["auth:home_assistant", "settings:display", "settings:audio", "settings:led"]
+        mock_fetch.return_value = [
+            {"id": t, "config_type": t, "ciphertext": "c", "nonce": "n", "tag": "t"} for t in types
+        ]
+        mock_decrypt.return_value = {"k": "v"}
+        lock = threading.Lock()
+        active: list[int] = [0, 0]  # current, peak
+
+        def write(*args: Any, **kwargs: Any) -> None:
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+        mock_dispatch.side_effect = write
+
+        assert process_pending_configs() == 4
+        assert active[1] == 1
+
+    @patch("utils.command_discovery_service.get_command_discovery_service")
+    @patch("services.config_push_service._ack_config")
+    @patch("services.config_push_service._dispatch_config")
+    @patch("services.config_push_service._decrypt_config")
+    @patch("services.config_push_service._fetch_pending")
+    def test_registry_applied_and_refreshed_before_auth(
+        self,
+        mock_fetch: MagicMock,
+        mock_decrypt: MagicMock,
+        mock_dispatch: MagicMock,
+        mock_ack: MagicMock,
+        mock_discovery: MagicMock,
+    ) -> None:
+        # Auth arrives first in the batch but targets the command being enabled
+        mock_fetch.return_value = [
+            {"id": "push-auth", "config_type": "auth:spotify", "ciphertext": "c", "nonce": "n", "tag": "t"},
+            {"id": "push-reg", "config_type": "command_registry", "ciphertext": "c", "nonce": "n", "tag": "t"},
+        ]
+        mock_decrypt.side_effect = [{"access_token": "tok"}, {"command_name": "play_music", "enabled": "true"}]
+        events: list[str] = []
+        mock_dispatch.side_effect = lambda config_type, *args, **kwargs: events.append(config_type)
+        mock_discovery.return_value.refresh_now.side_effect = lambda: events.append("refresh")
+
+        assert process_pending_configs() == 2
+
+        assert events == ["command_registry", "refresh", "auth:spotify"]
+        assert [c.args[0] for c in mock_ack.call_args_list] == ["push-reg", "push-auth"]
+
+
+class TestProcessConfigPush:
+    """Test process_config_push with inline payloads on the notification."""
+
+    @patch("services.config_push_service._ack_config")
+    @patch("services.config_push_service._dispatch_config")
+    @patch("services.config_push_service.get_k2")
+    @patch("services.config_push_service.Config")
+    @patch("services.config_push_service._fetch_pending")
+    def test_inline_payload_skips_fetch(
+        self,
+        mock_fetch: MagicMock,
+        mock_config: MagicMock,
+        mock_get_k2: MagicMock,
+        mock_dispatch: MagicMock,
+        mock_ack: MagicMock,
+    ) -> None:
+        mock_config.get_str.return_value = TEST_NODE_ID
+        mock_get_k2.return_value = TEST_K2_DATA
+        config = {"access_token": "tok"}
+        # Native crypto bridge encrypts raw JSON bytes
+        raw_nonce = os.urandom(12)
+        sealed = AESGCM(TEST_K2).encrypt(
+            raw_nonce, json.dumps(config).encode("utf-8"), f"{TEST_NODE_ID}:{TEST_CONFIG_TYPE}".encode("utf-8"),
+        )
+        ct, nonce, tag = (
+            base64.urlsafe_b64encode(part).rstrip(b"=").decode("ascii")
+            for part in (sealed[:-16], raw_nonce, sealed[-16:])
+        )
+
+        count = process_config_push({
+            "id": "push-1", "config_type": TEST_CONFIG_TYPE,
+            "ciphertext": ct, "nonce": nonce, "tag": tag,
+        })
+
+        assert count == 1
+        mock_fetch.assert_not_called()
+        mock_dispatch.assert_called_once()
+        assert mock_dispatch.call_args.args[:2] == (TEST_CONFIG_TYPE, config)
+        mock_ack.assert_called_once_with("push-1")
+        assert get_config_push_stats()["processed"]["inline"] >= 1
+
+    @patch("services.config_push_service.process_pending_configs")
+    def test_notification_without_payload_fetches(self, mock_process: MagicMock) -> None:
+        mock_process.return_value = 2
+        assert process_config_push({"config_type": "settings:display", "inline": False}) == 2
+        mock_process.assert_called_once()
+
+    @patch("services.config_push_service.process_pending_configs")
+    @patch("services.config_push_service._ack_config")
+    @patch("services.config_push_service._dispatch_config")
+    @patch("services.config_push_service._decrypt_config")
+    def test_inline_failure_falls_back_to_fetch(
+        self,
+        mock_decrypt: MagicMock,
+        mock_dispatch: MagicMock,
+        mock_ack: MagicMock,
+        mock_process: MagicMock,
+    ) -> None:
+        mock_decrypt.side_effect = [ValueError("bad tag"), {"k": "v"}]
+        mock_process.return_value = 1
+
+        count = process_config_push({"pushes": [
+            {"id": "push-bad", "config_type": "settings:a", "ciphertext": "c", "nonce": "n", "tag": "t"},
+            {"id": "push-ok", "config_type": "settings:b", "ciphertext": "c", "nonce": "n", "tag": "t"},
+        ]})
+
+        assert count == 2
+        mock_ack.assert_called_once_with("push-ok")
+        mock_process.assert_called_once()
+
+
+class TestAckConfig:
+    """Test the per-push ACK."""
+
+    @patch("services.config_push_service.Config")
+    @patch("services.config_push_service.get_command_center_url")
+    @patch("services.config_push_service.RestClient")
+    def test_posts_to_push_ack_endpoint(
+        self,
+        mock_rest: MagicMock,
+        mock_cc_url: MagicMock,
+        mock_config: MagicMock,
+    ) -> None:
+        mock_cc_url.return_value = "http://localhost:7703"
+        mock_config.get_str.return_value = TEST_NODE_ID
+        mock_rest.post.return_value = {}
+
+        _ack_config("push-1")
+
+        mock_rest.post.assert_called_once_with(
+            f"http://localhost:7703/api/v0/nodes/{TEST_NODE_ID}/config/push-1/ack",
+            data={},
+            timeout=10,
+        )
+
 
 class TestFetchPending:
     """Test _fetch_pending with mocked RestClient."""
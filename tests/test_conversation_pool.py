@@ -0,0 +1,163 @@
+"""Tests for utils.conversation_pool (pre-registered conversation pool)."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from utils.conversation_pool import WarmConversationPool, context_fingerprint
+
+
+class _Context:
+    """Mutable fingerprint source for tests."""
+
+    def __init__(self) -> None:
+        self.value = "fp-1"
+
+    def __call__(self) -> str:
+        return self.value
+
+
+def _pool(register=None, size: int = 1, ttl: float = 600) -> tuple[WarmConversationPool, MagicMock, _Context]:
+    register = register or MagicMock(return_value=True)
+    context = _Context()
+    pool = WarmConversationPool(register, context, size=size, ttl_seconds=ttl, refresh_interval=60)
+    return pool, register, context
+
+
+class TestContextFingerprint:
+    def test_order_of_commands_does_not_matter(self) -> None:
+        assert context_fingerprint({"a": "1", "b": "2"}) == context_fingerprint({"b": "2", "a": "1"})
+
+    def test_changes_with_commands_and_agents(self) -> None:
+        base = context_fingerprint({"a": "1"}, {"ha": {"lights": 1}})
+        assert context_fingerprint({"a": "1", "b": "2"}, {"ha": {"lights": 1}}) != base
+        assert context_fingerprint({"a": "1"}, {"ha": {"lights": 2}}) != base
+
+    def test_changes_with_command_schema(self) -> None:
+        assert context_fingerprint({"a": "1"}) != context_fingerprint({"a": "2"})
+
+
+class TestVersionedFingerprint:
+    """With a version token, checkout compares tokens instead of re-hashing."""
+
+    def _versioned(self) -> tuple[WarmConversationPool, MagicMock, dict]:
+        state = {"version": 1, "fingerprint": "fp-1"}
+        fingerprint = MagicMock(side_effect=lambda: state["fingerprint"])
+        pool = WarmConversationPool(
+            MagicMock(return_value=True), fingerprint, size=1, ttl_seconds=600,
+            refresh_interval=60, version=lambda: state["version"],
+        )
+        return pool, fingerprint, state
+
+    def test_checkout_reuses_fingerprint_from_fill(self) -> None:
+        pool, fingerprint, _ = self._versioned()
+        pool.fill()
+        for _ in range(3):
+            pool.checkout()
+            pool.fill()
+        # One hash per fill; none on checkout
+        assert fingerprint.call_count == 4
+        assert pool.stats()["fingerprints_computed"] == 4
+
+    def test_version_change_recomputes_on_checkout(self) -> None:
+        pool, fingerprint, state = self._versioned()
+        pool.fill()
+        state.update(version=2, fingerprint="fp-2")
+        assert pool.checkout() is None
+        assert fingerprint.call_count == 2
+
+    def test_unchanged_fingerprint_survives_version_bump(self) -> None:
+        pool, _, state = self._versioned()
+        pool.fill()
+        state["version"] = 2
+        assert pool.checkout() is not None
+
+
+class TestCheckout:
+    def test_miss_when_empty(self) -> None:
+        pool, _, _ = _pool()
+        assert pool.checkout() is None
+        assert pool.misses == 1
+        assert pool.hit_rate == 0.0
+
+    def test_hit_after_fill(self) -> None:
+        pool, register, _ = _pool()
+        assert pool.fill() == 1
+        registered_id = register.call_args.args[0]
+
+        assert pool.checkout() == registered_id
+        assert pool.hits == 1
+        assert pool.stats()["pooled"] == 0
+
+    def test_each_entry_is_checked_out_once(self) -> None:
+        pool, _, _ = _pool()
+        pool.fill()
+        assert pool.checkout() is not None
+        assert pool.checkout() is None
+
+    def test_fingerprint_change_discards_entry(self) -> None:
+        pool, _, context = _pool()
+        pool.fill()
+        context.value = "fp-2"
+        assert pool.checkout() is None
+
+    def test_expired_entry_is_discarded(self) -> None:
+        pool, _, _ = _pool(ttl=10)
+        with patch("utils.conversation_pool.time.monotonic", return_value=1000.0):
+            pool.fill()
+        with patch("utils.conversation_pool.time.monotonic", return_value=1011.0):
+            assert pool.checkout() is None
+
+    def test_speaker_falls_back_to_anonymous_entry(self) -> None:
+        pool, _, _ = _pool()
+        pool.fill()
+        assert pool.checkout(speaker_user_id=7) is not None
+
+    def test_speaker_keyed_entries_after_first_sighting(self) -> None:
+        pool, register, _ = _pool()
+        pool.checkout(speaker_user_id=7)  # miss, but remembers the speaker
+        pool.fill()
+        speakers = sorted(str(c.args[1]) for c in register.call_args_list)
+        assert speakers == ["7", "None"]
+
+        conversation_id = pool.checkout(speaker_user_id=7)
+        speaker_for_id = {c.args[0]: c.args[1] for c in register.call_args_list}
+        assert speaker_for_id[conversation_id] == 7
+
+
+class TestFill:
+    def test_tops_up_to_size(self) -> None:
+        pool, register, _ = _pool(size=2)
+        assert pool.fill() == 2
+        assert pool.fill() == 0
+        assert register.call_count == 2
+
+    def test_registration_failure_stops_fill(self) -> None:
+        pool, register, _ = _pool(register=MagicMock(return_value=False), size=3)
+        assert pool.fill() == 0
+        assert register.call_count == 1
+        assert pool.checkout() is None
+
+    def test_registration_exception_is_contained(self) -> None:
+        pool, _, _ = _pool(register=MagicMock(side_effect=ConnectionError("down")))
+        assert pool.fill() == 0
+
+    def test_context_change_invalidates_and_refills(self) -> None:
+        pool, register, context = _pool()
+        pool.fill()
+        context.value = "fp-2"
+        assert pool.fill() == 1
+        assert register.call_count == 2
+        assert pool.checkout() == register.call_args.args[0]
+
+    def test_wait_saved_accumulates_register_latency(self) -> None:
+        pool, _, _ = _pool()
+        pool.fill()
+        pool.checkout()
+        assert pool.wait_saved_ms >= 0.0
+        assert pool.expected_register_ms is not None
+
+    def test_disabled_pool_does_not_start(self) -> None:
+        pool, _, _ = _pool(size=0)
+        pool.start()
+        assert pool._thread is None
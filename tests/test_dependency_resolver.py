@@ -311,3 +311,123 @@ class TestResolveAll:
         }
         result = resolve_all(str(req), commands)
         assert result.success is False
+
+    def test_beyond_old_sampling_range(self):
+        from utils.dependency_resolver import check_compatibility
+
+        assert check_compatibility([">=150.0"]) is True
+        assert check_compatibility(["==2024.1.15", ">=2023"]) is True
+
+    def test_compatible_release(self):
+        from utils.dependency_resolver import check_compatibility
+
+        assert check_compatibility(["~=1.4.2", "<1.5"]) is True
+        assert check_compatibility(["~=1.4.2", ">=1.5"]) is False
+
+    def test_exclusions_and_wildcards(self):
+        from utils.dependency_resolver import check_compatibility
+
+        assert check_compatibility(["==1.5.0", "!=1.5.0"]) is False
+        assert check_compatibility([">=1.0", "!=1.5.0"]) is True
+        assert check_compatibility(["==1.4.*", "<1.4.5"]) is True
+        assert check_compatibility(["==1.4.*", ">=1.5"]) is False
+        assert check_compatibility([">=1.4,<1.4.9", "!=1.4.*"]) is False
+
+
+# ── Incremental resolution ───────────────────────────────────────────
+
+
+class TestIncrementalResolution:
+    @staticmethod
+    def _roundtrip(snapshot):
+        import json
+
+        return json.loads(json.dumps(snapshot))
+
+    @staticmethod
+    def _installed(versions):
+        return lambda name: versions.get(name)
+
+    def test_unchanged_run_resolves_nothing(self, tmp_path):
+        from utils.dependency_resolver import resolve_all
+
+        req = tmp_path / "requirements.txt"
+        req.write_text("httpx\n")
+        commands = {
+            "news": _FakeCommand("news", [JarvisPackage("feedparser", ">=6.0")]),
+            "music": _FakeCommand("music", [JarvisPackage("music-assistant-client", "1.0.0")]),
+        }
+        first = resolve_all(str(req), commands, installed_version=self._installed({}))
+        assert first.resolved_packages == ["feedparser", "music-assistant-client"]
+        assert first.install_specs == first.merged_specs
+
+        installed = {"feedparser": "6.0.11", "music-assistant-client": "1.0.0"}
+        second = resolve_all(
+            str(req), commands, self._roundtrip(first.snapshot), installed_version=self._installed(installed),
+        )
+        assert second.resolved_packages == []
+        assert second.install_specs == []
+        assert second.merged_specs == first.merged_specs
+
+    def test_new_command_costs_only_its_delta(self, tmp_path):
+        from utils.dependency_resolver import resolve_all
+
+        req = tmp_path / "requirements.txt"
+        req.write_text("httpx\n")
+        commands = {"news": _FakeCommand("news", [JarvisPackage("feedparser")])}
+        first = resolve_all(str(req), commands, installed_version=self._installed({}))
+
+        commands["weather"] = _FakeCommand("weather", [JarvisPackage("pyowm", ">=3.0")])
+        second = resolve_all(
+            str(req), commands, self._roundtrip(first.snapshot),
+            installed_version=self._installed({"feedparser": "6.0.11"}),
+        )
+        assert second.resolved_packages == ["pyowm"]
+        assert second.install_specs == ["pyowm>=3.0"]
+        assert second.merged_specs == ["feedparser", "pyowm>=3.0"]
+
+    def test_removed_command_drops_packages(self, tmp_path):
+        from utils.dependency_resolver import resolve_all
+
+        req = tmp_path / "requirements.txt"
+        req.write_text("")
+        commands = {
+            "news": _FakeCommand("news", [JarvisPackage("feedparser")]),
+            "weather": _FakeCommand("weather", [JarvisPackage("pyowm")]),
+        }
+        first = resolve_all(str(req), commands)
+        del commands["weather"]
+        second = resolve_all(str(req), commands, self._roundtrip(first.snapshot))
+        assert second.resolved_packages == ["pyowm"]
+        assert second.merged_specs == ["feedparser"]
+
+    def test_base_change_resolves_overlapping_packages(self, tmp_path):
+        from utils.dependency_resolver import resolve_all
+
+        req = tmp_path / "requirements.txt"
+        req.write_text("httpx>=0.24\n")
+        commands = {"cmd1": _FakeCommand("cmd1", [JarvisPackage("httpx", "<0.30")])}
+        first = resolve_all(str(req), commands)
+        assert first.success is True
+
+        req.write_text("httpx>=0.30\n")
+        second = resolve_all(str(req), commands, self._roundtrip(first.snapshot))
+        assert second.success is False
+        assert second.conflicts[0].package_name == "httpx"
+
+    def test_conflict_persisted_and_fixed_incrementally(self, tmp_path):
+        from utils.dependency_resolver import resolve_all
+
+        req = tmp_path / "requirements.txt"
+        req.write_text("")
+        commands = {
+            "cmd1": _FakeCommand("cmd1", [JarvisPackage("aiohttp", ">=4.0")]),
+            "cmd2": _FakeCommand("cmd2", [JarvisPackage("aiohttp", "<3.0")]),
+        }
+        first = resolve_all(str(req), commands)
+        assert first.success is False
+
+        commands["cmd2"] = _FakeCommand("cmd2", [JarvisPackage("aiohttp", ">=4.1")])
+        second = resolve_all(str(req), commands, self._roundtrip(first.snapshot))
+        assert second.success is True
+        assert second.merged_specs == ["aiohttp>=4.0,>=4.1"]
@@ -239,7 +239,7 @@ class TestUploadError:
 
 class TestRunCollectAndUpload:
     def test_runs_async_collect(self) -> None:
-        """Sync wrapper runs the async collect in a new event loop."""
+        """Sync wrapper runs the async collect on the node async runtime."""
         devices = [_make_device()]
         mgr = _make_mock_manager(devices=devices)
 
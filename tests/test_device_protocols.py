@@ -194,6 +194,178 @@ class TestDeviceScannerService:
             assert payload["devices"][0]["protocol"] == "lifx"
 
 
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _light(name: str, mac: str, ip: str = "192.168.1.50") -> DiscoveredDevice:
+    return DiscoveredDevice(
+        name=name, domain="light", manufacturer="LIFX", model="A19",
+        protocol="lifx", local_ip=ip, mac_address=mac,
+        entity_id=f"light.{name.lower().replace(' ', '_')}",
+    )
+
+
+class TestIncrementalScanning:
+    def _make_scanner(self, *protocol_results: list[DiscoveredDevice], **kwargs):
+        mock_discovery = MagicMock()
+        mock_discovery.get_all_families.return_value = {}
+        with patch(
+            "services.device_scanner_service.get_device_family_discovery_service",
+            return_value=mock_discovery,
+        ):
+            scanner = DeviceScannerService(
+                cc_base_url="http://localhost:7703",
+                node_id="test-node",
+                api_key="test-key",
+                household_id="test-household",
+                min_interval=60,
+                max_interval=1200,
+                **kwargs,
+            )
+        clock = _Clock()
+        scanner._clock = clock
+        protocol = MagicMock(spec=IJarvisDeviceProtocol)
+        protocol.protocol_name = "lifx"
+        protocol.discover = AsyncMock(side_effect=list(protocol_results))
+        scanner._protocols = [protocol]
+        scanner.report_to_cc = AsyncMock(return_value={"created": 1, "updated": 0})
+        return scanner, protocol, clock
+
+    @pytest.mark.asyncio
+    async def test_protocol_not_rescanned_before_due(self) -> None:
+        a = _light("A", "aa:aa:aa:aa:aa:01")
+        scanner, protocol, clock = self._make_scanner([a])
+
+        await scanner.scan()
+        clock.now += 100
+        devices = await scanner.scan()
+
+        assert protocol.discover.await_count == 1
+        assert [d.entity_id for d in devices] == ["light.a"]
+
+    @pytest.mark.asyncio
+    async def test_interval_backs_off_then_tightens_on_change(self) -> None:
+        a = _light("A", "aa:aa:aa:aa:aa:01")
+        b = _light("B", "aa:aa:aa:aa:aa:02", ip="192.168.1.51")
+        scanner, protocol, clock = self._make_scanner([a], [a], [a], [a, b])
+
+        intervals = []
+        for _ in range(4):
+            await scanner.scan(force=True)
+            intervals.append(scanner.stats()["protocols"]["lifx"]["interval_s"])
+
+        assert intervals == [300, 600, 1200, 60]
+
+    @pytest.mark.asyncio
+    async def test_only_diff_is_reported(self) -> None:
+        a = _light("A", "aa:aa:aa:aa:aa:01")
+        b = _light("B", "aa:aa:aa:aa:aa:02", ip="192.168.1.51")
+        b_moved = _light("B", "aa:aa:aa:aa:aa:02", ip="192.168.1.99")
+        scanner, protocol, clock = self._make_scanner([a, b], [a, b], [a, b_moved])
+
+        first = await scanner.scan_and_report(force=True)
+        assert first["added"] == 2
+        assert scanner.report_to_cc.await_count == 1
+
+        second = await scanner.scan_and_report(force=True)
+        assert (second["added"], second["changed"], second["removed"]) == (0, 0, 0)
+        assert scanner.report_to_cc.await_count == 1
+
+        await scanner.scan_and_report(force=True)
+        sent, kwargs = scanner.report_to_cc.call_args
+        assert [d.local_ip for d in sent[0]] == ["192.168.1.99"]
+        assert kwargs["removed"] == []
+
+    @pytest.mark.asyncio
+    async def test_removed_after_consecutive_misses(self) -> None:
+        a = _light("A", "aa:aa:aa:aa:aa:01")
+        b = _light("B", "aa:aa:aa:aa:aa:02", ip="192.168.1.51")
+        scanner, protocol, clock = self._make_scanner([a, b], [a], [a])
+
+        await scanner.scan_and_report(force=True)
+        once = await scanner.scan_and_report(force=True)
+        assert once["removed"] == 0
+
+        twice = await scanner.scan_and_report(force=True)
+        assert twice["removed"] == 1
+        assert [d.entity_id for d in scanner.report_to_cc.call_args.kwargs["removed"]] == ["light.b"]
+
+    @pytest.mark.asyncio
+    async def test_failed_report_is_retried(self) -> None:
+        a = _light("A", "aa:aa:aa:aa:aa:01")
+        scanner, protocol, clock = self._make_scanner([a], [a])
+        scanner.report_to_cc = AsyncMock(side_effect=[{"error": "503"}, {"created": 1, "updated": 0}])
+
+        await scanner.scan_and_report(force=True)
+        retry = await scanner.scan_and_report(force=True)
+
+        assert retry["added"] == 1
+        assert scanner.report_to_cc.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_protocol_scan_keeps_cached_devices(self) -> None:
+        a = _light("A", "aa:aa:aa:aa:aa:01")
+        scanner, protocol, clock = self._make_scanner([a], RuntimeError("Network error"))
+
+        await scanner.scan_and_report(force=True)
+        result = await scanner.scan_and_report(force=True)
+
+        assert result["discovered"] == 1
+        assert result["removed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_tighten_makes_protocols_due(self) -> None:
+        a = _light("A", "aa:aa:aa:aa:aa:01")
+        scanner, protocol, clock = self._make_scanner([a], [a])
+
+        await scanner.scan()
+        scanner.tighten()
+        await scanner.scan()
+
+        assert protocol.discover.await_count == 2
+        assert scanner.stats()["protocols"]["lifx"]["interval_s"] == 120
+
+    @staticmethod
+    async def _post_payload(scanner, devices, removed):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"created": 0, "updated": 0}
+        mock_response.raise_for_status = MagicMock()
+
+        with patch("services.device_scanner_service.httpx.AsyncClient") as mock_client_cls:
+            mock_client = AsyncMock()
+            mock_client.post = AsyncMock(return_value=mock_response)
+            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+            mock_client.__aexit__ = AsyncMock(return_value=False)
+            mock_client_cls.return_value = mock_client
+
+            await scanner.report_to_cc(devices, removed=removed)
+            return mock_client.post.call_args[1]["json"] if mock_client.post.await_count else None
+
+    @pytest.mark.asyncio
+    async def test_report_includes_removed_entity_ids(self) -> None:
+        scanner, _, _ = self._make_scanner(report_removals=True)
+        del scanner.report_to_cc  # use the real method
+
+        payload = await self._post_payload(scanner, [], [_light("Gone", "aa:aa:aa:aa:aa:09")])
+
+        assert payload == {"devices": [], "removed": ["light.gone"]}
+
+    @pytest.mark.asyncio
+    async def test_removals_not_sent_by_default(self) -> None:
+        scanner, _, _ = self._make_scanner()
+        del scanner.report_to_cc  # use the real method
+        gone = [_light("Gone", "aa:aa:aa:aa:aa:09")]
+
+        assert await self._post_payload(scanner, [], gone) is None
+        payload = await self._post_payload(scanner, [_light("A", "aa:aa:aa:aa:aa:01")], gone)
+        assert "removed" not in payload
+
+
 # =============================================================================
 # Direct device service tests
 # =============================================================================
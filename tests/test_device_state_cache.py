@@ -0,0 +1,190 @@
+"""Tests for services.device_state_cache.DeviceStateCache."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from services.device_state_cache import DeviceStateCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Adapter:
+    """Per-device adapter: one round trip per get_state call."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls: list[str] = []
+
+    async def get_state(self, ip: str, **kwargs: Any) -> dict[str, Any] | None:
+        self.calls.append(kwargs["entity_id"])
+        await asyncio.sleep(self.delay)
+        return {"state": "on", "ip": ip}
+
+
+class _BatchAdapter(_Adapter):
+    """Cloud adapter with a list endpoint (like Nest)."""
+
+    def __init__(self, known: set[str]) -> None:
+        super().__init__()
+        self.known = known
+        self.batches: list[list[str]] = []
+
+    async def get_states(self, requests: list[dict[str, Any]]) -> dict[str, dict[str, Any] | None]:
+        self.batches.append([r["entity_id"] for r in requests])
+        return {r["entity_id"]: {"state": "heat"} if r["entity_id"] in self.known else None for r in requests}
+
+
+class TestTtl:
+    @pytest.mark.asyncio
+    async def test_hit_within_ttl(self) -> None:
+        clock = _Clock()
+        cache = DeviceStateCache(ttl_seconds=5, clock=clock)
+        adapter = _Adapter()
+
+        await cache.get_direct("lifx", adapter, "light.a", ip="10.0.0.2")
+        clock.now += 4
+        state = await cache.get_direct("lifx", adapter, "light.a", ip="10.0.0.2")
+
+        assert state == {"state": "on", "ip": "10.0.0.2"}
+        assert adapter.calls == ["light.a"]
+        stats = cache.stats()["protocols"]["lifx"]
+        assert (stats["hits"], stats["misses"], stats["fetches"]) == (1, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_refetch_after_ttl(self) -> None:
+        clock = _Clock()
+        cache = DeviceStateCache(ttl_seconds=5, clock=clock)
+        adapter = _Adapter()
+
+        await cache.get_direct("lifx", adapter, "light.a")
+        clock.now += 6
+        await cache.get_direct("lifx", adapter, "light.a")
+        assert adapter.calls == ["light.a", "light.a"]
+
+    @pytest.mark.asyncio
+    async def test_errors_not_cached(self) -> None:
+        cache = DeviceStateCache(ttl_seconds=5)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return {"error": "token expired"}
+
+        await cache.get("nest", "climate.hall", fetch)
+        await cache.get("nest", "climate.hall", fetch)
+        assert calls == 2
+        assert cache.stats()["protocols"]["nest"]["errors"] == 2
+
+    @pytest.mark.asyncio
+    async def test_fetch_exception_returns_none(self) -> None:
+        cache = DeviceStateCache()
+
+        async def fetch():
+            raise OSError("unreachable")
+
+        assert await cache.get("govee", "light.a", fetch) is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self) -> None:
+        cache = DeviceStateCache(ttl_seconds=60)
+        adapter = _Adapter()
+        await cache.get_direct("lifx", adapter, "light.a")
+        cache.invalidate("light.a")
+        await cache.get_direct("lifx", adapter, "light.a")
+        assert adapter.calls == ["light.a", "light.a"]
+
+
+class TestCoalescing:
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_fetch(self) -> None:
+        cache = DeviceStateCache()
+        adapter = _Adapter(delay=0.02)
+
+        results = await asyncio.gather(*[cache.get_direct("lifx", adapter, "light.a") for _ in range(5)])
+
+        assert adapter.calls == ["light.a"]
+        assert all(r == results[0] for r in results)
+        stats = cache.stats()["protocols"]["lifx"]
+        assert stats["coalesced"] == 4
+        assert stats["hit_rate"] == 0.8
+
+    @pytest.mark.asyncio
+    async def test_fetch_racing_invalidate_is_not_cached(self) -> None:
+        cache = DeviceStateCache(ttl_seconds=60)
+        adapter = _Adapter(delay=0.02)
+
+        pending = asyncio.create_task(cache.get_direct("lifx", adapter, "light.a"))
+        await asyncio.sleep(0.005)
+        cache.invalidate("light.a")
+        await pending
+
+        await cache.get_direct("lifx", adapter, "light.a")
+        assert adapter.calls == ["light.a", "light.a"]
+
+
+class TestBatching:
+    @pytest.mark.asyncio
+    async def test_misses_in_window_share_one_call(self) -> None:
+        cache = DeviceStateCache(batch_window_ms=10)
+        adapter = _BatchAdapter(known={"climate.hall", "climate.den", "camera.door"})
+
+        states = await asyncio.gather(
+            cache.get_direct("nest", adapter, "climate.hall", cloud_id="c1"),
+            cache.get_direct("nest", adapter, "climate.den", cloud_id="c2"),
+            cache.get_direct("nest", adapter, "camera.door", cloud_id="c3"),
+        )
+
+        assert adapter.batches == [["climate.hall", "climate.den", "camera.door"]]
+        assert adapter.calls == []
+        assert all(s == {"state": "heat"} for s in states)
+        stats = cache.stats()["protocols"]["nest"]
+        assert stats["batch_calls"] == 1
+        assert stats["misses"] == 3
+
+    @pytest.mark.asyncio
+    async def test_missing_entity_falls_back_to_single_query(self) -> None:
+        cache = DeviceStateCache(batch_window_ms=5)
+        adapter = _BatchAdapter(known={"climate.hall"})
+
+        hall, gone = await asyncio.gather(
+            cache.get_direct("nest", adapter, "climate.hall", cloud_id="c1"),
+            cache.get_direct("nest", adapter, "climate.gone", ip="", cloud_id="c9"),
+        )
+
+        assert hall == {"state": "heat"}
+        assert gone == {"state": "on", "ip": ""}
+        assert adapter.calls == ["climate.gone"]
+
+    @pytest.mark.asyncio
+    async def test_separate_windows_separate_calls(self) -> None:
+        cache = DeviceStateCache(ttl_seconds=0, batch_window_ms=5)
+        adapter = _BatchAdapter(known={"climate.hall"})
+
+        await cache.get_direct("nest", adapter, "climate.hall")
+        await cache.get_direct("nest", adapter, "climate.hall")
+        assert adapter.batches == [["climate.hall"], ["climate.hall"]]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_during_window_answers_every_waiter(self) -> None:
+        cache = DeviceStateCache(batch_window_ms=20)
+        adapter = _BatchAdapter(known={"climate.hall"})
+
+        first = asyncio.create_task(cache.get_direct("nest", adapter, "climate.hall"))
+        await asyncio.sleep(0.005)
+        cache.invalidate("climate.hall")       # drops the in-flight entry, batch still pending
+        second = asyncio.create_task(cache.get_direct("nest", adapter, "climate.hall"))
+
+        states = await asyncio.wait_for(asyncio.gather(first, second), timeout=1)
+        assert states == [{"state": "heat"}, {"state": "heat"}]
+        assert adapter.batches == [["climate.hall"]]
@@ -0,0 +1,223 @@
+"""Tests for utils.eval_runner (concurrent, resumable command-parsing eval)."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pytest
+
+from utils.eval_runner import (
+    EvalCase,
+    EvalRunner,
+    ResultStore,
+    case_cache_key,
+)
+from utils.tool_schema_builder import command_schema_hashes
+
+
+@dataclass
+class _Test:
+    voice_command: str
+    expected_command: str
+    expected_params: Dict[str, Any] = field(default_factory=dict)
+    ha_context: Optional[Dict[str, Any]] = None
+
+
+class _Command:
+    def __init__(self, name: str, description: str):
+        self.command_name = name
+        self.description = description
+
+    def to_openai_tool_schema(self, date_context=None):
+        return {"type": "function", "function": {"name": self.command_name, "description": self.description}}
+
+    def get_command_schema(self, date_context=None):
+        return {"command_name": self.command_name, "description": self.description}
+
+
+class _Parser:
+    """Fake parse_voice_command: sleeps, tracks peak concurrency, optional failures."""
+
+    def __init__(self, delay: float = 0.0, fail_on: tuple[str, ...] = ()):
+        self.delay = delay
+        self.fail_on = set(fail_on)
+        self.calls: list[str] = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, case: EvalCase) -> str:
+        with self._lock:
+            self.calls.append(case.test.voice_command)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if case.test.voice_command in self.fail_on:
+                raise ConnectionError("CC unreachable")
+            return case.test.expected_command
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _evaluate(case: EvalCase, result: str, elapsed: float):
+    passed = result == case.test.expected_command
+    test_result = {"test_number": case.index, "passed": passed, "response_time_seconds": round(elapsed, 3)}
+    return test_result, None if passed else {"test_number": case.index}
+
+
+def _on_error(case: EvalCase, e: BaseException):
+    return (
+        {"test_number": case.index, "passed": False, "failure_reason": f"Exception: {e}"},
+        {"test_number": case.index, "error": str(e)},
+    )
+
+
+def _cases(n: int, schema_hashes: Optional[Dict[str, str]] = None) -> list[EvalCase]:
+    hashes = schema_hashes or {"calculate": "a", "get_weather": "b"}
+    tests = [_Test(f"utterance {i}", "calculate" if i % 2 else "get_weather") for i in range(n)]
+    return [EvalCase(i, t, case_cache_key(t, hashes)) for i, t in enumerate(tests)]
+
+
+def _runner(parser: _Parser, tmp_path: Path, **kwargs) -> EvalRunner:
+    kwargs.setdefault("checkpoint", ResultStore(tmp_path / "run.checkpoint.jsonl"))
+    return EvalRunner(parser, _evaluate, _on_error, **kwargs)
+
+
+class TestConcurrency:
+    def test_bounded_in_flight(self, tmp_path: Path) -> None:
+        parser = _Parser(delay=0.05)
+        records = _runner(parser, tmp_path, concurrency=3).run(_cases(9))
+
+        assert parser.peak == 3
+        assert [r.index for r in records] == list(range(9))
+        assert all(r.test_result["passed"] for r in records)
+
+    def test_overlaps_waits(self, tmp_path: Path) -> None:
+        parser = _Parser(delay=0.1)
+        runner = _runner(parser, tmp_path, concurrency=4)
+        runner.run(_cases(8))
+        # Serial would take 0.8 s
+        assert runner.wall_seconds < 0.5
+
+    def test_evaluate_runs_on_calling_thread(self, tmp_path: Path) -> None:
+        threads: set[str] = set()
+
+        def evaluate(case, result, elapsed):
+            threads.add(threading.current_thread().name)
+            return _evaluate(case, result, elapsed)
+
+        EvalRunner(_Parser(), evaluate, _on_error, concurrency=4).run(_cases(6))
+        assert threads == {threading.current_thread().name}
+
+
+class TestCheckpoint:
+    def test_resume_skips_finished_cases(self, tmp_path: Path) -> None:
+        cases = _cases(6)
+        _runner(_Parser(), tmp_path).run(cases[:4])
+
+        parser = _Parser()
+        runner = _runner(parser, tmp_path, resume=True)
+        records = runner.run(cases)
+
+        assert parser.calls == ["utterance 4", "utterance 5"]
+        assert runner.from_checkpoint == 4
+        assert [r.index for r in records] == list(range(6))
+
+    def test_fresh_run_clears_checkpoint(self, tmp_path: Path) -> None:
+        cases = _cases(3)
+        _runner(_Parser(), tmp_path).run(cases)
+
+        parser = _Parser()
+        _runner(parser, tmp_path).run(cases)
+        assert len(parser.calls) == 3
+
+    def test_errors_are_retried_on_resume(self, tmp_path: Path) -> None:
+        cases = _cases(3)
+        records = _runner(_Parser(fail_on=("utterance 1",)), tmp_path).run(cases)
+        assert records[1].errored
+        assert records[1].failure_detail == {"test_number": 1, "error": "CC unreachable"}
+
+        parser = _Parser()
+        _runner(parser, tmp_path, resume=True).run(cases)
+        assert parser.calls == ["utterance 1"]
+
+    def test_truncated_last_line_is_ignored(self, tmp_path: Path) -> None:
+        store = ResultStore(tmp_path / "run.checkpoint.jsonl")
+        _runner(_Parser(), tmp_path, checkpoint=store).run(_cases(2))
+        with store.path.open("a") as f:
+            f.write('{"key": "abc", "test_res')
+        assert len(store.load()) == 2
+
+
+class TestCache:
+    def test_cache_hits_skip_parse(self, tmp_path: Path) -> None:
+        cache = ResultStore(tmp_path / "cache.jsonl")
+        _runner(_Parser(), tmp_path, cache=cache).run(_cases(4))
+
+        parser = _Parser()
+        runner = _runner(parser, tmp_path, cache=cache)
+        records = runner.run(_cases(4))
+
+        assert parser.calls == []
+        assert runner.from_cache == 4
+        assert all(r.cached and r.test_result["cached"] for r in records)
+
+    def test_schema_change_reruns_only_that_command(self, tmp_path: Path) -> None:
+        cache = ResultStore(tmp_path / "cache.jsonl")
+        _runner(_Parser(), tmp_path, cache=cache).run(_cases(4, {"calculate": "a", "get_weather": "b"}))
+
+        parser = _Parser()
+        _runner(parser, tmp_path, cache=cache).run(_cases(4, {"calculate": "a2", "get_weather": "b"}))
+        assert parser.calls == ["utterance 1", "utterance 3"]
+
+    def test_errors_are_not_cached(self, tmp_path: Path) -> None:
+        cache = ResultStore(tmp_path / "cache.jsonl")
+        _runner(_Parser(fail_on=("utterance 0",)), tmp_path, cache=cache).run(_cases(2))
+        parser = _Parser()
+        _runner(parser, tmp_path, cache=cache).run(_cases(2))
+        assert parser.calls == ["utterance 0"]
+
+    def test_cached_record_takes_current_index(self, tmp_path: Path) -> None:
+        cache = ResultStore(tmp_path / "cache.jsonl")
+        cases = _cases(2)
+        _runner(_Parser(), tmp_path, cache=cache).run(cases)
+
+        moved = [EvalCase(7, cases[1].test, cases[1].key)]
+        records = _runner(_Parser(), tmp_path, cache=cache).run(moved)
+        assert records[0].test_result["test_number"] == 7
+
+
+class TestCacheKey:
+    def test_adapter_settings_change_key(self) -> None:
+        test = _Test("what's 2 plus 2", "calculate")
+        hashes = {"calculate": "a"}
+        base = case_cache_key(test, hashes, None)
+        adapter = case_cache_key(test, hashes, {"hash": "abc", "scale": 1.0, "enabled": True})
+        scaled = case_cache_key(test, hashes, {"hash": "abc", "scale": 0.5, "enabled": True})
+        assert len({base, adapter, scaled}) == 3
+
+    def test_tool_set_change_changes_key(self) -> None:
+        test = _Test("what's 2 plus 2", "calculate")
+        assert case_cache_key(test, {"calculate": "a"}) != case_cache_key(test, {"calculate": "a", "new_tool": "x"})
+
+    def test_other_command_schema_does_not_change_key(self) -> None:
+        test = _Test("what's 2 plus 2", "calculate")
+        assert case_cache_key(test, {"calculate": "a", "get_weather": "b"}) == \
+            case_cache_key(test, {"calculate": "a", "get_weather": "b2"})
+
+    def test_schema_hashes_follow_command_schema(self) -> None:
+        before = command_schema_hashes({"calculate": _Command("calculate", "Do math")})
+        after = command_schema_hashes({"calculate": _Command("calculate", "Do arithmetic")})
+        assert before["calculate"] != after["calculate"]
+        assert before == command_schema_hashes({"calculate": _Command("calculate", "Do math")})
+
+
+@pytest.mark.parametrize("concurrency", [0, -2])
+def test_concurrency_floor(concurrency: int) -> None:
+    assert EvalRunner(_Parser(), _evaluate, _on_error, concurrency=concurrency).concurrency == 1
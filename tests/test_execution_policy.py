@@ -0,0 +1,185 @@
+"""Tests for core.execution_policy."""
+
+from __future__ import annotations
+
+import os
+import threading
+
+import pytest
+
+import core.execution_policy as ep
+from core.execution_policy import BackgroundPool, ExecutionPolicy, ThreadPlan, apply_plan
+
+
+@pytest.fixture
+def kernel(monkeypatch):
+    """Record scheduling calls instead of making them; FIFO refused by default."""
+    calls = {"affinity": [], "fifo": [], "nice": []}
+    state = {"fifo_allowed": False}
+
+    def setaffinity(tid, cpus):
+        calls["affinity"].append((tid, tuple(cpus)))
+
+    def setscheduler(tid, policy, param):
+        if not state["fifo_allowed"]:
+            raise PermissionError("operation not permitted")
+        calls["fifo"].append((tid, param.sched_priority))
+
+    def setpriority(which, tid, nice):
+        calls["nice"].append((tid, nice))
+
+    monkeypatch.setattr(os, "sched_setaffinity", setaffinity, raising=False)
+    monkeypatch.setattr(os, "sched_setscheduler", setscheduler, raising=False)
+    monkeypatch.setattr(os, "setpriority", setpriority, raising=False)
+    calls["state"] = state
+    return calls
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    ep.reset_execution_policy()
+    yield
+    ep.reset_execution_policy()
+
+
+class TestPlans:
+    def test_reserves_one_core_for_audio(self):
+        policy = ExecutionPolicy(cpus=frozenset({0, 1, 2, 3}))
+        assert policy.plan("audio").cpus == (3,)
+        assert policy.plan("wake").cpus == (3,)
+        assert policy.plan("background").cpus == (0, 1, 2)
+        assert policy.plan("background").nice == 15
+
+    def test_configured_audio_cpu(self):
+        policy = ExecutionPolicy(cpus=frozenset({0, 1, 2, 3}), audio_cpu=1)
+        assert policy.plan("audio").cpus == (1,)
+        assert policy.plan("background").cpus == (0, 2, 3)
+
+    def test_single_cpu_is_not_pinned(self):
+        policy = ExecutionPolicy(cpus=frozenset({0}))
+        assert policy.plan("audio").cpus is None
+        assert policy.plan("background").cpus is None
+
+    def test_disabled_plans_are_empty(self):
+        policy = ExecutionPolicy(enabled=False, cpus=frozenset({0, 1}))
+        assert policy.plan("audio") == ThreadPlan()
+
+    def test_unknown_role(self):
+        with pytest.raises(ValueError):
+            ExecutionPolicy().plan("gpu")
+
+    def test_plan_round_trips(self):
+        plan = ThreadPlan(cpus=(3,), fifo_priority=20, nice=-10)
+        assert ThreadPlan.from_dict(plan.to_dict()) == plan
+
+
+class TestApply:
+    def test_fifo_refused_falls_back_to_nice(self, kernel):
+        outcome = apply_plan(ThreadPlan(cpus=(3,), fifo_priority=20, nice=-10), tid=42)
+        assert outcome == {"scheduler": "other", "nice": -10, "cpus": [3], "denied": ["fifo"]}
+        assert kernel["affinity"] == [(42, (3,))]
+        assert kernel["nice"] == [(42, -10)]
+
+    def test_fifo_granted_skips_nice(self, kernel):
+        kernel["state"]["fifo_allowed"] = True
+        outcome = apply_plan(ThreadPlan(fifo_priority=20, nice=-10), tid=42)
+        assert outcome["scheduler"] == "fifo"
+        assert kernel["fifo"] == [(42, 20)]
+        assert kernel["nice"] == []
+
+    def test_defaults_to_calling_thread(self, kernel):
+        apply_plan(ThreadPlan(nice=15))
+        assert kernel["nice"] == [(threading.get_native_id(), 15)]
+
+    def test_policy_records_outcome_per_role(self, kernel):
+        policy = ExecutionPolicy(cpus=frozenset({0, 1}))
+        policy.apply("background")
+        policy.apply("background")
+        roles = policy.stats()["roles"]
+        assert roles["background"]["threads"] == 2
+        assert roles["background"]["cpus"] == [0]
+        assert roles["background"]["nice"] == 15
+
+    def test_thread_role_is_noop_without_policy(self, kernel):
+        assert ep.apply_thread_role("audio") is None
+        assert kernel["nice"] == [] and kernel["affinity"] == []
+        assert ep.get_execution_policy_stats() is None
+
+
+class TestBackgroundPool:
+    def test_workers_run_initializer(self):
+        names = []
+        pool = BackgroundPool(max_workers=1, initializer=lambda: names.append(threading.current_thread().name))
+        try:
+            assert pool.submit(lambda x: x * 2, 21).result(timeout=5) == 42
+            assert names and names[0].startswith("background")
+        finally:
+            pool.shutdown(wait=True)
+
+    def test_failures_are_counted_not_raised(self):
+        pool = BackgroundPool(max_workers=1)
+        try:
+            assert pool.submit(lambda: 1 / 0, name="divide").result(timeout=5) is None
+            pool.submit(lambda: None).result(timeout=5)
+            stats = pool.stats()
+            assert {k: stats[k] for k in ("workers", "submitted", "completed", "failed", "running", "queued")} \
+                == {"workers": 1, "submitted": 2, "completed": 2, "failed": 1, "running": 0, "queued": 0}
+        finally:
+            pool.shutdown(wait=True)
+
+    def test_queued_behind_busy_worker(self):
+        pool = BackgroundPool(max_workers=1)
+        gate = threading.Event()
+        try:
+            first = pool.submit(gate.wait, 5)
+            second = pool.submit(lambda: None)
+            stats = pool.stats()
+            assert stats["queued"] + stats["running"] == 2
+            gate.set()
+            first.result(timeout=5)
+            second.result(timeout=5)
+        finally:
+            pool.shutdown(wait=True)
+
+    def test_job_sees_its_queue_wait(self):
+        pool = BackgroundPool(max_workers=1, lane="long")
+        gate = threading.Event()
+        try:
+            first = pool.submit(gate.wait, 5)
+            second = pool.submit(ep.current_background_job)
+            threading.Timer(0.05, gate.set).start()
+            first.result(timeout=5)
+            job = second.result(timeout=5)
+        finally:
+            pool.shutdown(wait=True)
+
+        assert job["lane"] == "long" and job["jobs_ahead"] == 1
+        assert job["wait_ms"] >= 40
+        assert pool.stats()["wait_ms_max"] >= 40
+        assert ep.current_background_job() is None
+
+
+class TestLanes:
+    @pytest.fixture(autouse=True)
+    def fresh(self, kernel):
+        ep.set_execution_policy(ExecutionPolicy(enabled=False))
+        yield
+        ep.reset_execution_policy()
+
+    def test_long_jobs_do_not_block_short_lane(self):
+        gate = threading.Event()
+        try:
+            long_jobs = [ep.run_in_background(gate.wait, 5, lane="long") for _ in range(4)]
+            assert ep.run_in_background(lambda: "scanned").result(timeout=2) == "scanned"
+        finally:
+            gate.set()
+        for job in long_jobs:
+            job.result(timeout=5)
+
+        stats = ep.get_execution_policy_stats()
+        assert stats["background_pool"]["submitted"] == 1
+        assert stats["background_pool_long"]["submitted"] == 4
+
+    def test_unknown_lane(self):
+        with pytest.raises(ValueError):
+            ep.run_in_background(lambda: None, lane="bulk")
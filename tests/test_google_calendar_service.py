@@ -0,0 +1,67 @@
+"""Tests for calendar_shared.google_calendar_service."""
+
+from datetime import datetime
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from calendar_shared.google_calendar_service import GoogleCalendarService
+
+START = datetime(2026, 3, 2)
+END = datetime(2026, 3, 9)
+
+
+def _item(summary: str, day: int) -> Dict[str, Any]:
+    return {
+        "id": summary,
+        "summary": summary,
+        "start": {"dateTime": f"2026-03-0{day}T09:00:00Z"},
+        "end": {"dateTime": f"2026-03-0{day}T10:00:00Z"},
+    }
+
+
+class FakeEventsApi:
+    """Serves ``pages`` in order, linked by nextPageToken."""
+
+    def __init__(self, pages: List[List[Dict[str, Any]]], status: int = 200) -> None:
+        self.pages = pages
+        self.status = status
+        self.requests: List[Dict[str, str]] = []
+
+    def __call__(self, url: str, params: Dict[str, str], **kwargs: Any) -> httpx.Response:
+        self.requests.append(dict(params))
+        index = int(params.get("pageToken", "0"))
+        body: Dict[str, Any] = {"items": self.pages[index]}
+        if index + 1 < len(self.pages):
+            body["nextPageToken"] = str(index + 1)
+        return httpx.Response(self.status, json=body, request=httpx.Request("GET", url))
+
+
+@pytest.fixture
+def service() -> GoogleCalendarService:
+    return GoogleCalendarService(access_token="at", refresh_token="rt", client_id="cid")
+
+
+class TestFetchRange:
+    def test_follows_next_page_token(self, service):
+        api = FakeEventsApi([[_item("Standup", 2), _item("Review", 3)], [_item("Retro", 6)]])
+        with patch("calendar_shared.google_calendar_service.httpx.get", api):
+            events = service._fetch_range(START, END)
+
+        assert [e.summary for e in events] == ["Standup", "Review", "Retro"]
+        assert [r.get("pageToken") for r in api.requests] == [None, "1"]
+        assert api.requests[1]["timeMin"] == api.requests[0]["timeMin"]
+
+    def test_single_page(self, service):
+        api = FakeEventsApi([[_item("Standup", 2)]])
+        with patch("calendar_shared.google_calendar_service.httpx.get", api):
+            assert [e.summary for e in service._fetch_range(START, END)] == ["Standup"]
+        assert len(api.requests) == 1
+
+    def test_error_raises(self, service):
+        api = FakeEventsApi([[]], status=500)
+        with patch("calendar_shared.google_calendar_service.httpx.get", api):
+            with pytest.raises(httpx.HTTPStatusError):
+                service._fetch_range(START, END)
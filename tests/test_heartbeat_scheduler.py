@@ -0,0 +1,94 @@
+"""Tests for services.heartbeat_scheduler."""
+
+from __future__ import annotations
+
+from services.heartbeat_scheduler import HeartbeatScheduler
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _scheduler(clock: Clock) -> HeartbeatScheduler:
+    return HeartbeatScheduler(interval_seconds=300, max_interval_seconds=1200,
+                              min_spacing_seconds=10, clock=clock)
+
+
+def _send(s: HeartbeatScheduler, state, ok: bool = True):
+    reason = s.due(state)
+    if reason is not None:
+        s.sent(state, reason, ok=ok)
+    return reason
+
+
+class TestHeartbeatScheduler:
+    def test_quiet_interval_backs_off_to_max(self):
+        clock = Clock()
+        s = _scheduler(clock)
+        idle = (False, "none")
+        assert _send(s, idle) == "startup"
+
+        clock.now += 299
+        assert _send(s, idle) is None
+        gaps = []
+        for _ in range(4):
+            gap = 0
+            while _send(s, idle) is None:
+                clock.now += 5
+                gap += 5
+            gaps.append(gap)
+        assert gaps == [5, 600, 1200, 1200]  # first: 299 s + one 5 s poll
+        assert s.stats()["by_reason"] == {"startup": 1, "interval": 4}
+
+    def test_state_change_sends_immediately_and_resets_interval(self):
+        clock = Clock()
+        s = _scheduler(clock)
+        _send(s, (False, "none"))
+        clock.now += 300
+        _send(s, (False, "none"))
+        assert s.interval == 600
+
+        clock.now += 30
+        assert _send(s, (True, "none")) == "state_change"
+        assert s.interval == 300
+        clock.now += 30
+        assert _send(s, (True, "none")) is None
+        assert _send(s, (False, "deferred")) == "state_change"
+
+    def test_changes_are_rate_limited(self):
+        clock = Clock()
+        s = _scheduler(clock)
+        _send(s, "a")
+        clock.now += 3
+        assert _send(s, "b") is None
+        clock.now += 7
+        assert _send(s, "b") == "state_change"
+
+    def test_request(self):
+        clock = Clock()
+        s = _scheduler(clock)
+        _send(s, "a")
+        clock.now += 60
+        s.request("update_deferred")
+        assert _send(s, "a") == "update_deferred"
+        assert _send(s, "a") is None
+
+    def test_failures_back_off_and_keep_the_change(self):
+        clock = Clock()
+        s = _scheduler(clock)
+        _send(s, "a")
+        clock.now += 60
+        assert _send(s, "b", ok=False) == "state_change"
+        clock.now += 9
+        assert s.due("b") is None
+        clock.now += 1
+        assert _send(s, "b", ok=False) == "state_change"
+        clock.now += 10
+        assert s.due("b") is None          # second failure: 20 s
+        clock.now += 10
+        assert _send(s, "b") == "state_change"
+        assert s.stats()["failed"] == 2
@@ -0,0 +1,228 @@
+"""Tests for music_assistant_shared.music_assistant_session."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+import pytest
+from websockets.asyncio.server import serve
+
+from core.async_runtime import AsyncRuntime
+import music_assistant_shared.music_assistant_session as ma
+from music_assistant_shared.music_assistant_service import MusicAssistantService
+from music_assistant_shared.music_assistant_session import (
+    MusicAssistantError,
+    MusicAssistantSession,
+    PlayerIndex,
+    normalize_player_name,
+)
+
+PLAYERS = [
+    {"player_id": "kitchen", "name": "Kitchen Speaker", "state": "playing", "active_source": "kitchen"},
+    {"player_id": "office", "name": "The Office", "state": "idle"},
+    {"player_id": "livingroom", "name": "Living Room TV", "state": "paused"},
+]
+
+
+class FakeMusicAssistant:
+    """Minimal Music Assistant websocket server running on the test runtime."""
+
+    def __init__(self) -> None:
+        self.commands: List[Dict[str, Any]] = []
+        self.connections: List[Any] = []
+        self.players = [dict(p) for p in PLAYERS]
+        self.delays: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.server: Optional[Any] = None
+        self.port = 0
+
+    async def start(self) -> None:
+        self.server = await serve(self.handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}/ws"
+
+    async def handle(self, ws: Any) -> None:
+        self.connections.append(ws)
+        await ws.send(json.dumps({"server_version": "2.5.0", "schema_version": 28}))
+        async for raw in ws:
+            message = json.loads(raw)
+            self.commands.append(message)
+            asyncio.ensure_future(self._reply(ws, message))
+
+    async def _reply(self, ws: Any, message: Dict[str, Any]) -> None:
+        command = message["command"]
+        await asyncio.sleep(self.delays.get(command, 0))
+        if command in self.errors:
+            await ws.send(json.dumps({"message_id": message["message_id"], "error_code": 999,
+                                      "details": self.errors[command]}))
+            return
+        result: Any = None
+        if command == "players/all":
+            result = self.players
+        elif command == "player_queues/all":
+            result = [{"queue_id": p["player_id"], "state": p["state"]} for p in self.players]
+        elif command == "music/search":
+            result = {"tracks": [{"name": f"{message['args']['search_query']} song", "uri": "lib://track/1",
+                                  "media_type": "track"}]}
+        await ws.send(json.dumps({"message_id": message["message_id"], "result": result}))
+
+    async def push(self, event: str, data: Dict[str, Any], object_id: Optional[str] = None) -> None:
+        for ws in self.connections:
+            await ws.send(json.dumps({"event": event, "object_id": object_id, "data": data}))
+
+    async def drop(self) -> None:
+        for ws in self.connections:
+            await ws.close()
+        self.connections.clear()
+
+    def sent(self, command: str) -> List[Dict[str, Any]]:
+        return [c for c in self.commands if c["command"] == command]
+
+
+@pytest.fixture
+def runtime():
+    rt = AsyncRuntime(name="test-ma-runtime")
+    rt.start()
+    yield rt
+    rt.stop()
+
+
+@pytest.fixture
+def server(runtime):
+    fake = FakeMusicAssistant()
+    runtime.run(fake.start())
+    yield fake
+    fake.server.close()
+
+
+@pytest.fixture
+def session(runtime, server):
+    s = MusicAssistantSession(server.url, token="tok", runtime=runtime)
+    assert s.wait_connected(timeout=5)
+    yield s
+    s.stop()
+
+
+def _wait_for(predicate, timeout: float = 3.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestPlayerIndex:
+    def test_lookup_order(self):
+        index = PlayerIndex()
+        index.replace_all(PLAYERS)
+        assert index.find("Kitchen Speaker")["player_id"] == "kitchen"
+        assert index.find("the office")["player_id"] == "office"
+        assert index.find("kitchen")["player_id"] == "kitchen"
+        assert index.find("living rom tv")["player_id"] == "livingroom"
+        assert index.find("garage") is None
+
+    def test_normalize(self):
+        assert normalize_player_name("The Kitchen!") == "kitchen"
+        assert normalize_player_name("Tom's  Room") == "tom s room"
+
+
+class TestSession:
+    def test_connect_authenticates_and_fetches_state_once(self, session, server):
+        assert [c["command"] for c in server.commands] == ["auth", "players/all", "player_queues/all"]
+        assert server.commands[0]["args"] == {"token": "tok"}
+        assert len(session.players) == 3
+        assert session.find_player("office")["name"] == "The Office"
+
+    def test_pause_is_one_round_trip(self, session, server):
+        server.commands.clear()
+        player = session.find_player("kitchen")
+        session.call("player_queues/pause", queue_id=session.queue_id_for(player))
+        assert server.commands == [
+            {"message_id": server.commands[0]["message_id"], "command": "player_queues/pause",
+             "args": {"queue_id": "kitchen"}},
+        ]
+
+    def test_events_keep_index_current(self, session, server, runtime):
+        runtime.run(server.push("player_updated", {"player_id": "office", "name": "Study"}))
+        runtime.run(server.push("player_added", {"player_id": "patio", "name": "Patio"}))
+        runtime.run(server.push("player_removed", {}, object_id="livingroom"))
+        _wait_for(lambda: session.find_player("patio") is not None and session.players.get("livingroom") is None)
+
+        assert session.find_player("study")["player_id"] == "office"
+        assert session.players.get("office")["state"] == "idle"  # update merged
+        assert session.players.get("livingroom") is None
+        assert len(server.sent("players/all")) == 1
+
+    def test_commands_are_pipelined(self, session, server, runtime):
+        server.delays["player_queues/next"] = 0.3
+
+        async def both():
+            return await asyncio.gather(
+                session.command("player_queues/next", queue_id="kitchen"),
+                session.command("players/cmd/volume_set", player_id="office", volume_level=20),
+            )
+
+        start = time.monotonic()
+        runtime.run(both())
+        assert time.monotonic() - start < 0.55
+        assert [c["command"] for c in server.commands[-2:]] == ["player_queues/next", "players/cmd/volume_set"]
+
+    def test_error_reply_raises(self, session, server):
+        server.errors["player_queues/pause"] = "No such queue"
+        with pytest.raises(MusicAssistantError, match="No such queue"):
+            session.call("player_queues/pause", queue_id="nope")
+
+    def test_search_results_cached(self, runtime, server):
+        now = [0.0]
+        s = MusicAssistantSession(server.url, runtime=runtime, clock=lambda: now[0])
+        assert s.wait_connected(timeout=5)
+        try:
+            first = runtime.run(s.search("Radiohead", ["track"]))
+            runtime.run(s.search("radiohead ", ["track"]))
+            assert len(server.sent("music/search")) == 1
+            now[0] += ma.SEARCH_CACHE_TTL_SECONDS + 1
+            runtime.run(s.search("Radiohead", ["track"]))
+            assert len(server.sent("music/search")) == 2
+            assert first["tracks"][0]["name"] == "Radiohead song"
+        finally:
+            s.stop()
+
+    def test_reconnects_after_drop(self, session, server, runtime, monkeypatch):
+        monkeypatch.setattr(ma, "RECONNECT_MIN_SECONDS", 0.05)
+        runtime.run(server.drop())
+        _wait_for(lambda: session.stats()["connects"] == 2 and session.connected)
+
+        assert session.connected
+        assert len(server.sent("players/all")) == 2
+        session.call("player_queues/resume", queue_id="kitchen")
+        assert session.stats()["disconnects"] == 1
+
+    def test_callable_from_another_loop(self, session, server):
+        async def elsewhere():
+            await session.command("player_queues/stop", queue_id="office")
+
+        asyncio.run(elsewhere())
+        assert server.sent("player_queues/stop")[0]["args"] == {"queue_id": "office"}
+
+
+class TestSharedService:
+    def test_service_attaches_to_session(self, session, server):
+        service = MusicAssistantService(server.url, session=session)
+
+        async def run():
+            await service.connect()
+            player = await service.get_player_by_name("kitchen")
+            result = await service.search_and_play("Radiohead", player["id"])
+            await service.disconnect()
+            return player, result
+
+        player, result = asyncio.run(run())
+        assert player == {"id": "kitchen", "name": "Kitchen Speaker", "state": "playing"}
+        assert result == {"success": True, "item": {"name": "Radiohead song", "type": "track"}}
+        assert server.sent("player_queues/play_media")[0]["args"]["media"] == "lib://track/1"
+        assert len(server.sent("players/all")) == 1
+        assert session.connected
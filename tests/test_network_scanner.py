@@ -0,0 +1,230 @@
+"""Tests for core.network_scanner."""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+from typing import List, Optional, Set
+from unittest.mock import patch
+
+import pytest
+
+import core.network_scanner as ns
+from core.network_scanner import (
+    NeighborEntry,
+    NetworkScanner,
+    parse_arp_output,
+    parse_proc_net_arp,
+    probe_ports,
+)
+
+PROC_ARP = """IP address       HW type     Flags       HW address            Mask     Device
+192.168.1.1      0x1         0x2         aa:bb:cc:dd:ee:01     *        wlan0
+192.168.1.20     0x1         0x2         AA:BB:CC:DD:EE:14     *        wlan0
+192.168.1.30     0x1         0x0         00:00:00:00:00:00     *        wlan0
+10.0.0.5         0x1         0x6         aa:bb:cc:dd:ee:99     *        eth0
+"""
+
+MAC_ARP = """? (192.168.1.1) at a:bb:cc:d:ee:1 on en0 ifscope [ethernet]
+? (192.168.1.40) at (incomplete) on en0 ifscope [ethernet]
+? (192.168.1.255) at ff:ff:ff:ff:ff:ff on en0 ifscope [ethernet]
+"""
+
+
+class TestNeighborTable:
+    def test_proc_net_arp_complete_entries_only(self):
+        assert parse_proc_net_arp(PROC_ARP) == [
+            NeighborEntry("192.168.1.1", "aa:bb:cc:dd:ee:01", "wlan0"),
+            NeighborEntry("192.168.1.20", "aa:bb:cc:dd:ee:14", "wlan0"),
+            NeighborEntry("10.0.0.5", "aa:bb:cc:dd:ee:99", "eth0"),
+        ]
+
+    def test_bsd_arp_output_normalizes_macs(self):
+        assert parse_arp_output(MAC_ARP) == [NeighborEntry("192.168.1.1", "0a:bb:cc:0d:ee:01", "en0")]
+
+
+@pytest.fixture
+def listening_ports():
+    servers = []
+    for _ in range(2):
+        srv = socket.socket()
+        srv.bind(("127.0.0.1", 0))
+        srv.listen()
+        servers.append(srv)
+    closed = socket.socket()
+    closed.bind(("127.0.0.1", 0))
+    closed_port = closed.getsockname()[1]
+    closed.close()
+    yield [s.getsockname()[1] for s in servers], closed_port
+    for s in servers:
+        s.close()
+
+
+class TestPortProbes:
+    def test_open_and_closed_ports(self, listening_ports):
+        open_ports, closed_port = listening_ports
+        result = asyncio.run(probe_ports([("127.0.0.1", p) for p in open_ports + [closed_port]], timeout=1.0))
+        assert result == {"127.0.0.1": sorted(open_ports)}
+
+    def test_concurrency_is_bounded_across_hosts(self):
+        active = 0
+        peak = 0
+
+        async def fake_open(ip: str, port: int, timeout: float) -> bool:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return port == 80
+
+        targets = [(f"10.0.0.{h}", p) for h in range(1, 11) for p in (22, 80, 443)]
+        with patch.object(ns, "_port_open", fake_open):
+            result = asyncio.run(probe_ports(targets, concurrency=4))
+
+        assert peak == 4
+        assert result["10.0.0.7"] == [80]
+        assert len(result) == 10
+
+
+class FakeNetwork:
+    def __init__(self, neighbors: List[NeighborEntry], icmp_alive: Optional[Set[str]] = None):
+        self.neighbors = neighbors
+        self.icmp_alive = icmp_alive
+        self.nudged: List[str] = []
+        self.probed: List[tuple] = []
+
+    async def read_neighbor_table(self):
+        return list(self.neighbors)
+
+    async def icmp_sweep(self, hosts, timeout):
+        return None if self.icmp_alive is None else {h for h in hosts if h in self.icmp_alive}
+
+    async def udp_nudge(self, hosts):
+        self.nudged.extend(hosts)
+
+    async def probe_ports(self, targets, concurrency, timeout):
+        targets = list(targets)
+        self.probed.extend(targets)
+        result = {}
+        for ip, port in targets:
+            result.setdefault(ip, [])
+            if port == 80:
+                result[ip].append(port)
+        return result
+
+
+@pytest.fixture
+def network():
+    fake = FakeNetwork([
+        NeighborEntry("192.168.1.1", "aa:00:00:00:00:01"),
+        NeighborEntry("192.168.1.20", "aa:00:00:00:00:14"),
+        NeighborEntry("10.0.0.5", "aa:00:00:00:00:99"),
+    ], icmp_alive={"192.168.1.1", "192.168.1.20", "192.168.1.50"})
+    with patch.object(ns, "read_neighbor_table", fake.read_neighbor_table), \
+            patch.object(ns, "icmp_sweep", fake.icmp_sweep), \
+            patch.object(ns, "udp_nudge", fake.udp_nudge), \
+            patch.object(ns, "probe_ports", fake.probe_ports):
+        yield fake
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestScanner:
+    def test_discover_merges_neighbors_and_icmp(self, network):
+        hosts = asyncio.run(NetworkScanner(sweep_timeout=0).discover("192.168.1.0/24"))
+        assert [(h.ip, h.mac) for h in hosts] == [
+            ("192.168.1.1", "aa:00:00:00:00:01"),
+            ("192.168.1.20", "aa:00:00:00:00:14"),
+            ("192.168.1.50", None),
+        ]
+
+    def test_udp_nudge_fallback_without_icmp(self, network):
+        network.icmp_alive = None
+        scanner = NetworkScanner(sweep_timeout=0)
+        hosts = asyncio.run(scanner.discover("192.168.1.0/28"))
+
+        assert "192.168.1.1" not in network.nudged  # already resolved
+        assert "192.168.1.2" in network.nudged
+        assert [h.ip for h in hosts] == ["192.168.1.1"]
+        assert scanner.stats()["icmp_fallbacks"] == 1
+
+    def test_repeat_scan_only_probes_new_or_moved_hosts(self, network):
+        clock = Clock()
+        scanner = NetworkScanner(sweep_timeout=0, clock=clock)
+        first = asyncio.run(scanner.scan("192.168.1.0/24", ports=[22, 80]))
+        assert {h.ip: h.open_ports for h in first}["192.168.1.20"] == [80]
+        assert len(network.probed) == 6
+
+        network.probed.clear()
+        network.neighbors.append(NeighborEntry("192.168.1.30", "aa:00:00:00:00:1e"))
+        network.neighbors[1] = NeighborEntry("192.168.1.21", "aa:00:00:00:00:14")  # DHCP moved it
+        network.icmp_alive = {"192.168.1.1", "192.168.1.21", "192.168.1.50"}
+        clock.now += 60
+        asyncio.run(scanner.scan("192.168.1.0/24", ports=[22, 80]))
+
+        assert sorted({ip for ip, _ in network.probed}) == ["192.168.1.21", "192.168.1.30"]
+        assert scanner.stats()["hosts_cached"] == 2
+
+    def test_stale_entries_and_new_ports_are_reprobed(self, network):
+        clock = Clock()
+        scanner = NetworkScanner(sweep_timeout=0, freshness_seconds=300, clock=clock)
+        asyncio.run(scanner.scan("192.168.1.0/24", ports=[80]))
+        network.probed.clear()
+
+        asyncio.run(scanner.scan("192.168.1.0/24", ports=[80, 443]))
+        assert len({ip for ip, _ in network.probed}) == 3
+
+        network.probed.clear()
+        clock.now += 301
+        asyncio.run(scanner.scan("192.168.1.0/24", ports=[80]))
+        assert len({ip for ip, _ in network.probed}) == 3
+
+    def test_ports_for_uses_mac_cache(self, network):
+        scanner = NetworkScanner(sweep_timeout=0)
+        assert asyncio.run(scanner.ports_for("192.168.1.20", [80, 8080])) == [80]
+        network.probed.clear()
+        assert asyncio.run(scanner.ports_for("192.168.1.20", [80])) == [80]
+        assert network.probed == []
+
+
+class TestDatagramIO:
+    """Real loopback sockets, on a loop without the 3.11+ datagram helpers."""
+
+    @pytest.fixture(autouse=True)
+    def python_310_loop(self, monkeypatch):
+        for name in ("sock_sendto", "sock_recvfrom"):
+            monkeypatch.delattr(asyncio.selector_events.BaseSelectorEventLoop, name, raising=False)
+
+    def test_udp_nudge_sends_one_datagram_per_host(self, monkeypatch):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as listener:
+            listener.bind(("127.0.0.1", 0))
+            listener.settimeout(2)
+            monkeypatch.setattr(ns, "NUDGE_PORT", listener.getsockname()[1])
+            asyncio.run(ns.udp_nudge(["127.0.0.1"]))
+            data, (ip, _port) = listener.recvfrom(16)
+            assert (data, ip) == (b"\x00", "127.0.0.1")
+
+    def test_icmp_sweep_collects_replies(self, monkeypatch):
+        sweep = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sweep.bind(("127.0.0.1", 0))
+        sweep.setblocking(False)
+        monkeypatch.setattr(ns, "_open_icmp_socket", lambda: sweep)
+
+        async def run() -> Optional[Set[str]]:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as peer:
+                peer.bind(("127.0.0.1", 0))
+                task = asyncio.ensure_future(ns.icmp_sweep(["127.0.0.1"], timeout=0.2))
+                await asyncio.sleep(0.05)
+                peer.sendto(b"\x08not-a-reply", sweep.getsockname())
+                peer.sendto(b"\x00\x00reply", sweep.getsockname())
+                return await task
+
+        assert asyncio.run(run()) == {"127.0.0.1"}
+        assert sweep.fileno() == -1  # closed by the sweep
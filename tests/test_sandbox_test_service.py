@@ -0,0 +1,178 @@
+"""Tests for sandbox_test_service — Docker-free command validation."""
+
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import services.sandbox_test_service as sandbox
+from services.container_test_service import ContainerTestResult, run_container_tests
+
+
+FAKE_SDK = '''
+class IJarvisCommand:
+    pass
+'''
+
+
+@pytest.fixture
+def fake_sdk(tmp_path):
+    """A stand-in SDK on the sandbox PYTHONPATH, run with the current interpreter."""
+    sdk_dir = tmp_path / "deps"
+    (sdk_dir / "jarvis_command_sdk").mkdir(parents=True)
+    (sdk_dir / "jarvis_command_sdk" / "__init__.py").write_text(FAKE_SDK)
+    with patch.object(sandbox, "ensure_sandbox_venv", return_value=Path(sys.executable)), \
+            patch.object(sandbox, "ensure_sandbox_deps", return_value=sdk_dir):
+        yield
+
+
+def _command_dir(tmp_path: Path, source: str) -> Path:
+    cmd_dir = tmp_path / "cmd"
+    cmd_dir.mkdir()
+    (cmd_dir / "command.py").write_text(source)
+    (cmd_dir / "jarvis_command.yaml").write_text("name: test")
+    return cmd_dir
+
+
+class TestRunSandboxTests:
+    def test_network_is_blocked(self, fake_sdk, tmp_path):
+        cmd_dir = _command_dir(tmp_path, "import socket\nsocket.getaddrinfo('example.com', 80)\n")
+
+        result = run_container_tests(cmd_dir, mode="sandbox")
+
+        assert result.passed is False
+        assert "Network access is disabled" in result.errors[0]
+
+    def test_rlimits_applied(self, fake_sdk, tmp_path):
+        cmd_dir = _command_dir(tmp_path, (
+            "import resource\n"
+            "soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)\n"
+            "raise RuntimeError(f'nofile={soft}')\n"
+        ))
+
+        result = sandbox.run_sandbox_tests(cmd_dir)
+
+        assert f"nofile={sandbox.SANDBOX_MAX_OPEN_FILES}" in result.errors[0]
+
+    def test_reports_harness_results(self, fake_sdk, tmp_path):
+        cmd_dir = _command_dir(tmp_path, (
+            "from jarvis_command_sdk import IJarvisCommand\n"
+            "class Cmd(IJarvisCommand):\n"
+            "    def __init__(self):\n"
+            "        raise ValueError('no config')\n"
+        ))
+
+        result = sandbox.run_sandbox_tests(cmd_dir)
+
+        assert isinstance(result, ContainerTestResult)
+        assert result.pass_count == 1
+        assert result.fail_count == 1
+        assert "Cannot instantiate" in result.summary
+
+    def test_timeout(self, fake_sdk, tmp_path):
+        cmd_dir = _command_dir(tmp_path, "# test")
+        with patch("subprocess.run", side_effect=subprocess.TimeoutExpired("python", 5)):
+            result = sandbox.run_sandbox_tests(cmd_dir, timeout_seconds=5)
+        assert result.passed is False
+        assert "timed out after 5s" in result.summary
+
+    def test_setup_failure(self, tmp_path):
+        with patch.object(sandbox, "ensure_sandbox_venv", side_effect=sandbox.SandboxSetupError("no wheel")):
+            result = sandbox.run_sandbox_tests(tmp_path)
+        assert result.passed is False
+        assert "setup failed" in result.summary.lower()
+        assert result.errors == ["no wheel"]
+
+    @patch("services.container_test_service._check_docker_available", return_value=False)
+    def test_auto_mode_falls_back_to_sandbox(self, mock_docker, tmp_path):
+        expected = ContainerTestResult(True, "PASS - 11/11 tests passed", 11, 11, 0, [], "")
+        with patch.object(sandbox, "run_sandbox_tests", return_value=expected) as run:
+            assert run_container_tests(tmp_path, mode="auto") is expected
+        run.assert_called_once_with(tmp_path, None, 60)
+
+
+class TestSandboxVenvCache:
+    @pytest.fixture
+    def cache_dir(self, tmp_path):
+        with patch.object(sandbox, "SANDBOX_CACHE_DIR", tmp_path / "venvs"):
+            yield tmp_path / "venvs"
+
+    @staticmethod
+    def _fake_run(calls):
+        def run(args, timeout):
+            calls.append(args)
+            if args[1:3] == ["-m", "venv"]:
+                python = sandbox._venv_python(Path(args[3]))
+                python.parent.mkdir(parents=True)
+                python.write_text("")
+        return run
+
+    def test_built_once(self, cache_dir):
+        calls = []
+        with patch.object(sandbox, "_run", side_effect=self._fake_run(calls)):
+            first = sandbox.ensure_sandbox_venv()
+            second = sandbox.ensure_sandbox_venv()
+
+        assert first == second
+        assert first.exists()
+        assert len(calls) == 2  # venv + SDK install, only on the first call
+
+    def test_stale_venvs_removed(self, cache_dir):
+        (cache_dir / "sdk-old").mkdir(parents=True)
+        with patch.object(sandbox, "_run", side_effect=self._fake_run([])):
+            sandbox.ensure_sandbox_venv()
+        assert [p.name for p in cache_dir.glob("sdk-*")] == [f"sdk-{sandbox._venv_key()}"]
+
+    def test_failed_build_leaves_no_cache(self, cache_dir):
+        with patch.object(sandbox, "_run", side_effect=sandbox.SandboxSetupError("offline")):
+            with pytest.raises(sandbox.SandboxSetupError):
+                sandbox.ensure_sandbox_venv()
+        assert list(cache_dir.iterdir()) == []
+
+    def test_deps_cached_by_requirements(self, cache_dir):
+        calls = []
+
+        def run(args, timeout):
+            calls.append(args)
+            Path(args[args.index("--target") + 1]).mkdir(parents=True)
+
+        python = cache_dir / "sdk-abc" / "bin" / "python"
+        with patch.object(sandbox, "_run", side_effect=run):
+            assert sandbox.ensure_sandbox_deps(python, []) is None
+            a = sandbox.ensure_sandbox_deps(python, ["requests", "pyyaml"])
+            b = sandbox.ensure_sandbox_deps(python, ["pyyaml", "requests"])
+            c = sandbox.ensure_sandbox_deps(python, ["requests"])
+
+        assert a == b != c
+        assert len(calls) == 2
+
+
+class TestParallel:
+    def test_runs_concurrently_in_job_order(self, tmp_path):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def fake_run(command_dir, packages, timeout_seconds):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return ContainerTestResult(True, command_dir.name, 0, 0, 0, [], "")
+
+        jobs = [(tmp_path / f"pkg{i}", None) for i in range(4)]
+        with patch.object(sandbox, "run_sandbox_tests", side_effect=fake_run):
+            results = sandbox.run_sandbox_tests_parallel(jobs, max_workers=4)
+
+        assert [r.summary for r in results] == ["pkg0", "pkg1", "pkg2", "pkg3"]
+        assert peak > 1
+
+    def test_empty(self):
+        assert sandbox.run_sandbox_tests_parallel([]) == []
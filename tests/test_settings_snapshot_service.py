@@ -9,11 +9,20 @@ import pytest
 from services.settings_snapshot_service import (
     build_snapshot,
     encrypt_snapshot,
+    get_snapshot,
     handle_snapshot_request,
+    invalidate_snapshot_cache,
     upload_snapshot,
 )
 
 
+@pytest.fixture(autouse=True)
+def _clear_snapshot_cache():
+    invalidate_snapshot_cache()
+    yield
+    invalidate_snapshot_cache()
+
+
 def _make_mock_secret(key: str, scope: str, description: str, value_type: str, required: bool) -> MagicMock:
     """Create a mock IJarvisSecret."""
     secret = MagicMock()
@@ -118,7 +127,7 @@ class TestBuildSnapshot:
     """Tests for build_snapshot()."""
 
     @patch("services.settings_snapshot_service.get_device_family_discovery_service")
-    @patch("services.settings_snapshot_service.get_secret_value")
+    @patch("services.settings_snapshot_service.get_secret_values")
     @patch("services.settings_snapshot_service.get_command_discovery_service")
     def test_builds_snapshot_with_set_and_unset_secrets(
         self, mock_discovery, mock_get_secret, mock_family_discovery
@@ -139,7 +148,7 @@ class TestBuildSnapshot:
         mock_service.get_all_commands.return_value = {"get_weather": cmd}
         mock_discovery.return_value = mock_service
 
-        mock_get_secret.side_effect = lambda key, scope: "abc123" if key == "API_KEY" else None
+        mock_get_secret.return_value = {("API_KEY", "integration"): "abc123"}
 
         snapshot = build_snapshot()
 
@@ -162,7 +171,7 @@ class TestBuildSnapshot:
         assert loc_entry["is_set"] is False
 
     @patch("services.settings_snapshot_service.get_device_family_discovery_service")
-    @patch("services.settings_snapshot_service.get_secret_value")
+    @patch("services.settings_snapshot_service.get_secret_values")
     @patch("services.settings_snapshot_service.get_command_discovery_service")
     def test_includes_commands_without_secrets(self, mock_discovery, mock_get_secret, mock_family_discovery):
         mock_family_service = MagicMock()
@@ -182,7 +191,7 @@ class TestBuildSnapshot:
             "weather": cmd_with_secrets,
         }
         mock_discovery.return_value = mock_service
-        mock_get_secret.return_value = None
+        mock_get_secret.return_value = {}
 
         snapshot = build_snapshot()
         assert len(snapshot["commands"]) == 2
@@ -193,7 +202,7 @@ class TestBuildSnapshot:
         assert jokes["secrets"] == []
 
     @patch("services.settings_snapshot_service.get_device_family_discovery_service")
-    @patch("services.settings_snapshot_service.get_secret_value")
+    @patch("services.settings_snapshot_service.get_secret_values")
     @patch("services.settings_snapshot_service.get_command_discovery_service")
     def test_includes_parameters_in_snapshot(self, mock_discovery, mock_get_secret, mock_family_discovery):
         """Commands with parameters include them in the snapshot."""
@@ -216,7 +225,7 @@ class TestBuildSnapshot:
         mock_service = MagicMock()
         mock_service.get_all_commands.return_value = {"get_weather": cmd}
         mock_discovery.return_value = mock_service
-        mock_get_secret.return_value = "key123"
+        mock_get_secret.return_value = {("API_KEY", "integration"): "key123"}
 
         snapshot = build_snapshot()
         weather = snapshot["commands"][0]
@@ -234,7 +243,7 @@ class TestBuildSnapshot:
         assert units["default_value"] == "fahrenheit"
 
     @patch("services.settings_snapshot_service.get_device_family_discovery_service")
-    @patch("services.settings_snapshot_service.get_secret_value")
+    @patch("services.settings_snapshot_service.get_secret_values")
     @patch("services.settings_snapshot_service.get_command_discovery_service")
     def test_omits_parameters_when_empty(self, mock_discovery, mock_get_secret, mock_family_discovery):
         """Commands with no parameters should not include a parameters key."""
@@ -247,13 +256,13 @@ class TestBuildSnapshot:
         mock_service = MagicMock()
         mock_service.get_all_commands.return_value = {"simple": cmd}
         mock_discovery.return_value = mock_service
-        mock_get_secret.return_value = None
+        mock_get_secret.return_value = {}
 
         snapshot = build_snapshot()
         assert "parameters" not in snapshot["commands"][0]
 
     @patch("services.settings_snapshot_service.get_device_family_discovery_service")
-    @patch("services.settings_snapshot_service.get_secret_value")
+    @patch("services.settings_snapshot_service.get_secret_values")
     @patch("services.settings_snapshot_service.get_command_discovery_service")
     def test_empty_commands_returns_empty_list(self, mock_discovery, mock_get_secret, mock_family_discovery):
         mock_family_service = MagicMock()
@@ -268,11 +277,121 @@ class TestBuildSnapshot:
         assert snapshot["commands"] == []
 
 
+    @patch("services.settings_snapshot_service.get_device_family_discovery_service")
+    @patch("services.settings_snapshot_service.get_secret_values")
+    @patch("services.settings_snapshot_service.get_command_discovery_service")
+    def test_reads_secrets_in_one_query_without_rediscovery(
+        self, mock_discovery, mock_get_secrets, mock_family_discovery
+    ):
+        mock_family_discovery.return_value.get_all_families_for_snapshot.return_value = {}
+        cmds = {
+            f"cmd{i}": _make_mock_command(
+                f"cmd{i}", "Cmd", [_make_mock_secret(f"KEY{i}", "integration", "Key", "string", True)]
+            )
+            for i in range(5)
+        }
+        mock_discovery.return_value.get_all_commands.return_value = cmds
+        mock_get_secrets.return_value = {("KEY2", "integration"): "v"}
+
+        snapshot = build_snapshot(user_id=7)
+
+        mock_get_secrets.assert_called_once_with(user_id=7)
+        mock_discovery.return_value.refresh_now.assert_not_called()
+        assert [c["secrets"][0]["is_set"] for c in snapshot["commands"]] == [False, False, True, False, False]
+
+    @patch("services.settings_snapshot_service.get_device_family_discovery_service")
+    @patch("services.settings_snapshot_service.get_secret_values")
+    @patch("services.settings_snapshot_service.get_command_discovery_service")
+    def test_user_scoped_values_come_from_bulk_lookup(
+        self, mock_discovery, mock_get_secrets, mock_family_discovery
+    ):
+        mock_family_discovery.return_value.get_all_families_for_snapshot.return_value = {}
+        secret = _make_mock_secret("EMAIL_TOKEN", "user", "Token", "string", True)
+        secret.is_sensitive = False
+        mock_discovery.return_value.get_all_commands.return_value = {
+            "email": _make_mock_command("email", "Email", [secret]),
+        }
+        mock_get_secrets.return_value = {("EMAIL_TOKEN", "user"): "tok"}
+
+        entry = build_snapshot(user_id=3)["commands"][0]["secrets"][0]
+        assert entry["is_set"] is True
+        assert entry["value"] == "tok"
+
+
+class TestSnapshotCache:
+    """Tests for get_snapshot() memoization."""
+
+    @patch("services.settings_snapshot_service.Config")
+    @patch("services.settings_snapshot_service.build_snapshot")
+    def test_repeat_request_reuses_snapshot(self, mock_build, mock_config):
+        mock_build.return_value = {"commands": [{"command_name": "a"}], "node_config": {}}
+        mock_config.get_float.return_value = 0.5
+        mock_config.get_int.return_value = 5
+        mock_config.get_bool.return_value = True
+
+        first = get_snapshot()
+        second = get_snapshot()
+
+        mock_build.assert_called_once()
+        assert second["commands"] == first["commands"]
+        # node_config is re-read on every request
+        assert second["node_config"]["volume_percent"] == 5
+
+    @patch("services.settings_snapshot_service.build_snapshot")
+    def test_keyed_by_user_and_include_values(self, mock_build):
+        mock_build.return_value = {"commands": []}
+        get_snapshot(user_id=1)
+        get_snapshot(user_id=2)
+        get_snapshot(user_id=1, include_values=True)
+        get_snapshot(user_id=1)
+        assert mock_build.call_count == 3
+
+    @patch("services.settings_snapshot_service.get_secrets_generation")
+    @patch("services.settings_snapshot_service.build_snapshot")
+    def test_secret_write_invalidates(self, mock_build, mock_generation):
+        mock_build.return_value = {"commands": []}
+        mock_generation.return_value = 1
+        get_snapshot()
+        mock_generation.return_value = 2
+        get_snapshot()
+        assert mock_build.call_count == 2
+
+    @patch("services.settings_snapshot_service.get_registry_generation")
+    @patch("services.settings_snapshot_service.build_snapshot")
+    def test_registry_change_invalidates(self, mock_build, mock_generation):
+        mock_build.return_value = {"commands": []}
+        mock_generation.return_value = 4
+        get_snapshot()
+        mock_generation.return_value = 5
+        get_snapshot()
+        assert mock_build.call_count == 2
+
+    @patch("services.settings_snapshot_service.build_snapshot")
+    def test_explicit_invalidate(self, mock_build):
+        mock_build.return_value = {"commands": []}
+        get_snapshot()
+        invalidate_snapshot_cache()
+        get_snapshot()
+        assert mock_build.call_count == 2
+
+    @patch("services.settings_snapshot_service.time")
+    @patch("services.settings_snapshot_service.build_snapshot")
+    def test_ttl_expiry_rebuilds(self, mock_build, mock_time):
+        from services.settings_snapshot_service import SNAPSHOT_CACHE_TTL_SECONDS
+
+        mock_build.return_value = {"commands": []}
+        mock_time.monotonic.return_value = 100.0
+        get_snapshot()
+        mock_time.monotonic.return_value = 100.0 + SNAPSHOT_CACHE_TTL_SECONDS + 1
+        get_snapshot()
+        assert mock_build.call_count == 2
+
+
 class TestDeviceFamiliesInSnapshot:
     """Tests for device_families in build_snapshot()."""
 
     @patch("services.settings_snapshot_service.get_device_family_discovery_service")
-    @patch("services.settings_snapshot_service.get_secret_value")
+    @patch("services.settings_snapshot_service.get_secret_values")
     @patch("services.settings_snapshot_service.get_command_discovery_service")
     def test_snapshot_includes_device_families(
         self, mock_discovery, mock_get_secret, mock_family_discovery
@@ -303,7 +422,7 @@ class TestDeviceFamiliesInSnapshot:
         mock_family_service.get_all_families_for_snapshot.return_value = {"govee": govee}
         mock_family_discovery.return_value = mock_family_service
 
-        mock_get_secret.return_value = None  # GOVEE_API_KEY not set
+        mock_get_secret.return_value = {}  # GOVEE_API_KEY not set
 
         snapshot = build_snapshot()
 
@@ -327,7 +446,7 @@ class TestDeviceFamiliesInSnapshot:
         assert family["supported_actions"][1]["button_action"] == "turn_off"
 
     @patch("services.settings_snapshot_service.get_device_family_discovery_service")
-    @patch("services.settings_snapshot_service.get_secret_value")
+    @patch("services.settings_snapshot_service.get_secret_values")
     @patch("services.settings_snapshot_service.get_command_discovery_service")
     def test_lan_family_with_no_secrets_is_configured(
         self, mock_discovery, mock_get_secret, mock_family_discovery
@@ -358,7 +477,7 @@ class TestDeviceFamiliesInSnapshot:
         assert family["secrets"] == []
 
     @patch("services.settings_snapshot_service.get_device_family_discovery_service")
-    @patch("services.settings_snapshot_service.get_secret_value")
+    @patch("services.settings_snapshot_service.get_secret_values")
     @patch("services.settings_snapshot_service.get_command_discovery_service")
     def test_snapshot_includes_family_authentication(
         self, mock_discovery, mock_get_secret, mock_family_discovery
@@ -0,0 +1,101 @@
+"""Tests for core.telemetry."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+import core.telemetry as tm
+from core.telemetry import Histogram, Telemetry
+
+
+class TestHistogram:
+    def test_summary_quantiles_from_buckets(self):
+        h = Histogram("turn_ms", bounds=(10, 100, 1000))
+        for v in [5] * 50 + [50] * 45 + [400] * 4 + [2500]:
+            h.observe(v)
+        s = h.summary()
+        assert s["n"] == 100
+        assert s["p50"] == 10
+        assert s["p95"] == 100
+        assert s["p99"] == 1000
+        assert s["max"] == 2500
+        assert s["mean"] == pytest.approx((250 + 2250 + 1600 + 2500) / 100, abs=0.1)
+
+    def test_quantile_capped_by_max(self):
+        h = Histogram("x", bounds=(10, 1000))
+        h.observe(120)
+        assert h.summary()["p50"] == 120
+
+    def test_empty_is_none(self):
+        assert Histogram("x").summary() is None
+
+    def test_timer(self):
+        h = Histogram("x")
+        with h.time():
+            pass
+        assert h.summary()["n"] == 1
+
+
+class TestTelemetry:
+    def test_snapshot_is_compact(self):
+        t = Telemetry()
+        t.counter("wakes").inc(3)
+        t.counter("turn_errors")
+        t.histogram("turn_ms").observe(640)
+        t.histogram("wake_response_ms")
+        t.gauge("depth", lambda: 4)
+        t.gauge("broken", lambda: 1 / 0)
+        t.gauge("missing", lambda: None)
+
+        payload = Telemetry.payload(t.snapshot())
+        assert payload["counters"] == {"wakes": 3}
+        assert list(payload["latency_ms"]) == ["turn_ms"]
+        assert payload["gauges"] == {"depth": 4}
+
+    def test_commit_starts_next_interval(self):
+        t = Telemetry()
+        t.counter("wakes").inc()
+        t.histogram("turn_ms").observe(100)
+        first = t.snapshot()
+        t.counter("wakes").inc()          # arrives after the snapshot was taken
+        t.commit(first)
+
+        second = Telemetry.payload(t.snapshot())
+        assert second["counters"] == {"wakes": 1}
+        assert "latency_ms" not in second
+
+    def test_uncommitted_interval_carries_over(self):
+        t = Telemetry()
+        t.counter("wakes").inc()
+        t.snapshot()                      # POST failed: never committed
+        t.counter("wakes").inc()
+        assert t.snapshot()["counters"] == {"wakes": 2}
+
+    def test_concurrent_recording(self):
+        t = Telemetry()
+
+        def work():
+            for i in range(2000):
+                t.counter("frames").inc()
+                t.histogram("lat").observe(i % 50)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        snap = t.snapshot()
+        # Lock-free: tolerate (very rare) lost increments, but not gross loss.
+        assert snap["counters"]["frames"] >= 7900
+        assert snap["latency_ms"]["lat"]["n"] >= 7900
+
+    def test_singleton_has_process_gauges(self):
+        tm.reset_telemetry()
+        try:
+            gauges = tm.get_telemetry().snapshot()["gauges"]
+            assert "cpu_percent" in gauges and "threads" in gauges
+            assert tm.get_telemetry() is tm.get_telemetry()
+        finally:
+            tm.reset_telemetry()
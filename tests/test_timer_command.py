@@ -200,3 +200,19 @@ class TestConfirmationMessage:
     def test_message_with_label(self, timer_command):
         msg = timer_command._build_confirmation_message("10 minutes", "pasta")
         assert msg == "Timer set for 10 minutes for pasta"
+
+
+class TestRouteLocally:
+    """route_locally fills parameters without the trigger-keyword gate"""
+
+    def test_pre_route_requires_trigger(self, timer_command):
+        assert timer_command.pre_route("five minutes for the pasta") is None
+
+    def test_route_locally_skips_trigger(self, timer_command):
+        result = timer_command.route_locally("5 minutes for the pasta")
+        assert result is not None
+        assert result.arguments["duration_seconds"] == 300
+        assert result.arguments["label"] == "pasta"
+
+    def test_route_locally_without_duration_returns_none(self, timer_command):
+        assert timer_command.route_locally("start one for the pasta") is None
@@ -0,0 +1,138 @@
+"""Tests for utils.tool_router (on-node hashed n-gram tool router)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from utils import tool_router
+from utils.tool_router import (
+    ToolRouterModel,
+    cross_validate_tool_router,
+    evaluate_tool_router,
+    featurize,
+    train_tool_router,
+)
+
+
+_ENTRIES = [
+    {"utterance": "set a timer for 5 minutes", "tool_name": "set_timer"},
+    {"utterance": "timer for 10 minutes please", "tool_name": "set_timer"},
+    {"utterance": "start a 30 second timer", "tool_name": "set_timer"},
+    {"utterance": "set a pasta timer for 12 minutes", "tool_name": "set_timer"},
+    {"utterance": "what's 5 plus 3", "tool_name": "calculate"},
+    {"utterance": "what is 6 times 7", "tool_name": "calculate"},
+    {"utterance": "calculate 10 minus 4", "tool_name": "calculate"},
+    {"utterance": "divide 20 by 5", "tool_name": "calculate"},
+    {"utterance": "what's the weather in miami", "tool_name": "get_weather"},
+    {"utterance": "how's the weather today", "tool_name": "get_weather"},
+    {"utterance": "forecast for chicago tomorrow", "tool_name": "get_weather"},
+    {"utterance": "is it going to rain tomorrow", "tool_name": "get_weather"},
+]
+
+
+@pytest.fixture(scope="module")
+def model() -> ToolRouterModel:
+    return train_tool_router(_ENTRIES, n_features=1024)
+
+
+class TestFeaturize:
+    def test_values_are_l2_normalised(self) -> None:
+        _, values = featurize("set a timer for five minutes", 1024)
+        assert np.linalg.norm(values) == pytest.approx(1.0, rel=1e-5)
+
+    def test_hashing_is_deterministic(self) -> None:
+        a = featurize("what's 5 plus 3", 1024)
+        b = featurize("what's 5 plus 3", 1024)
+        assert np.array_equal(a[0], b[0])
+        assert np.array_equal(a[1], b[1])
+
+    def test_numbers_collapse_to_one_token(self) -> None:
+        a = featurize("timer for 5 minutes", 1024)
+        b = featurize("timer for 45 minutes", 1024)
+        assert np.array_equal(np.sort(a[0]), np.sort(b[0]))
+
+    def test_empty_text_has_no_features(self) -> None:
+        indices, values = featurize("   ", 1024)
+        assert indices.size == 0
+        assert values.size == 0
+
+
+class TestModel:
+    def test_predicts_training_labels(self, model: ToolRouterModel) -> None:
+        prediction = model.predict("set a timer for 20 minutes")
+        assert prediction is not None
+        assert prediction.tool_name == "set_timer"
+        assert 0.0 < prediction.confidence <= 1.0
+        assert prediction.latency_ms >= 0.0
+
+    def test_generalises_to_unseen_phrasing(self, model: ToolRouterModel) -> None:
+        prediction = model.predict("what is 9 plus 4")
+        assert prediction is not None
+        assert prediction.tool_name == "calculate"
+
+    def test_empty_input_returns_none(self, model: ToolRouterModel) -> None:
+        assert model.predict("") is None
+
+    def test_save_load_roundtrip(self, model: ToolRouterModel, tmp_path: Path) -> None:
+        path = tmp_path / "router.npz"
+        model.save(path)
+        loaded = ToolRouterModel.load(path)
+        assert loaded.labels == model.labels
+        assert loaded.n_features == model.n_features
+        assert loaded.metadata["samples"] == str(len(_ENTRIES))
+        original = model.predict("forecast for boston")
+        restored = loaded.predict("forecast for boston")
+        assert restored.tool_name == original.tool_name
+        assert restored.confidence == pytest.approx(original.confidence, rel=1e-5)
+
+    def test_no_entries_raises(self) -> None:
+        with pytest.raises(ValueError):
+            train_tool_router([])
+
+
+class TestEvaluation:
+    def test_training_accuracy(self, model: ToolRouterModel) -> None:
+        result = evaluate_tool_router(model, _ENTRIES, threshold=0.0)
+        assert result.total == len(_ENTRIES)
+        assert result.accuracy == 1.0
+        assert result.confident == len(_ENTRIES)
+        assert result.misses == []
+
+    def test_threshold_limits_confident_count(self, model: ToolRouterModel) -> None:
+        result = evaluate_tool_router(model, _ENTRIES, threshold=1.01)
+        assert result.confident == 0
+        assert result.confident_accuracy == 0.0
+
+    def test_cross_validation_covers_every_entry(self) -> None:
+        result = cross_validate_tool_router(_ENTRIES, folds=3, n_features=1024)
+        assert result.total == len(_ENTRIES)
+        assert 0.0 <= result.accuracy <= 1.0
+
+
+class TestGetToolRouter:
+    def setup_method(self) -> None:
+        tool_router._model = None
+        tool_router._model_mtime = None
+
+    def test_missing_artifact_returns_none(self, tmp_path: Path) -> None:
+        with patch.object(tool_router, "get_tool_router_model_path", return_value=tmp_path / "missing.npz"):
+            assert tool_router.get_tool_router() is None
+
+    def test_loads_and_caches_artifact(self, model: ToolRouterModel, tmp_path: Path) -> None:
+        path = tmp_path / "router.npz"
+        model.save(path)
+        with patch.object(tool_router, "get_tool_router_model_path", return_value=path):
+            first = tool_router.get_tool_router()
+            second = tool_router.get_tool_router()
+        assert first is not None
+        assert first is second
+
+    def test_corrupt_artifact_returns_none(self, tmp_path: Path) -> None:
+        path = tmp_path / "router.npz"
+        path.write_bytes(b"not a numpy archive")
+        with patch.object(tool_router, "get_tool_router_model_path", return_value=path):
+            assert tool_router.get_tool_router() is None
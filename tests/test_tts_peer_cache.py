@@ -0,0 +1,256 @@
+"""Tests for services.tts_peer_cache."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import socket
+import time
+from typing import Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+import services.tts_peer_cache as tpc
+from services.tts_peer_cache import TtsPeerCache, inventory_topic, phrase_key
+
+
+class FakeCommandCenter:
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def __call__(self, text: str, timeout: int) -> bytes:
+        self.calls.append(text)
+        return f"RIFF-{text}".encode()
+
+
+class Bus:
+    """Retained-message stand-in for the household MQTT topic."""
+
+    def __init__(self) -> None:
+        self.retained: Dict[str, bytes] = {}
+        self.members: List[TtsPeerCache] = []
+
+    def join(self, cache: TtsPeerCache) -> None:
+        self.members.append(cache)
+        for topic, payload in self.retained.items():
+            cache.receive(topic, payload)
+        cache.attach(self.publish)
+
+    def publish(self, topic: str, payload: bytes, retain: bool) -> None:
+        if retain:
+            self.retained[topic] = payload
+        for member in self.members:
+            member.receive(topic, payload)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def cc():
+    return FakeCommandCenter()
+
+
+def _cache(tmp_path, name: str, cc, **kwargs) -> TtsPeerCache:
+    return TtsPeerCache(tmp_path / name, node_id=name, household_id="home", fetch_remote=cc, **kwargs)
+
+
+def _wait_serving(cache: TtsPeerCache, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while cache.url is None and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return cache.url is not None
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLocalStore:
+    def test_second_lookup_is_local(self, tmp_path, cc):
+        cache = _cache(tmp_path, "kitchen", cc)
+        assert cache.synthesize("One moment.") == b"RIFF-One moment."
+        assert cache.synthesize("One  moment. ") == b"RIFF-One moment."
+        assert cc.calls == ["One moment."]
+        assert cache.stats()["local_hits"] == 1
+
+    def test_survives_restart(self, tmp_path, cc):
+        _cache(tmp_path, "kitchen", cc).synthesize("Got it.")
+        reopened = _cache(tmp_path, "kitchen", cc)
+        assert reopened.synthesize("Got it.") == b"RIFF-Got it."
+        assert len(cc.calls) == 1
+
+    def test_long_text_not_cached(self, tmp_path, cc):
+        cache = _cache(tmp_path, "kitchen", cc, max_text_chars=10)
+        cache.synthesize("This is a long one-off answer.")
+        cache.synthesize("This is a long one-off answer.")
+        assert len(cc.calls) == 2
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction(self, tmp_path, cc):
+        cache = _cache(tmp_path, "kitchen", cc, max_bytes=30)
+        cache.synthesize("aaaaaaaaaa")         # 15 bytes each
+        cache.synthesize("bbbbbbbbbb")
+        cache.synthesize("aaaaaaaaaa")         # touch a
+        cache.synthesize("cccccccccc")         # evicts b
+        assert cache.read(phrase_key("bbbbbbbbbb")) is None
+        assert cache.read(phrase_key("aaaaaaaaaa")) is not None
+        assert cache.stats()["evictions"] == 1
+        assert len(list((tmp_path / "kitchen").glob("*.wav"))) == 2
+
+    def test_voice_is_part_of_the_key(self, tmp_path, cc):
+        assert phrase_key("Got it.", "piper/amy") != phrase_key("Got it.", "piper/ryan")
+        _cache(tmp_path, "kitchen", cc, voice="piper/amy").synthesize("Got it.")
+        _cache(tmp_path, "kitchen", cc, voice="piper/ryan").synthesize("Got it.")
+        assert len(cc.calls) == 2
+
+    def test_entries_expire(self, tmp_path, cc):
+        clock = Clock()
+        cache = _cache(tmp_path, "kitchen", cc, ttl_seconds=60, clock=clock)
+        cache.synthesize("Yes?")
+        clock.now += 61
+        assert cache.read(phrase_key("Yes?")) is None
+        assert cache.stats()["expirations"] == 1
+        assert list((tmp_path / "kitchen").glob("*.wav")) == []
+
+        cache.synthesize("Yes?")
+        assert len(cc.calls) == 2
+
+    def test_expired_entries_dropped_on_load(self, tmp_path, cc):
+        _cache(tmp_path, "kitchen", cc).synthesize("Yes?")
+        reopened = _cache(tmp_path, "kitchen", cc, ttl_seconds=60, clock=lambda: time.time() + 61)
+        assert reopened.stats()["entries"] == 0
+        assert reopened.stats()["expirations"] == 1
+
+
+class TestPeerProtocol:
+    def test_inventory_advertised_retained(self, tmp_path, cc):
+        bus = Bus()
+        cache = _cache(tmp_path, "kitchen", cc)
+        cache.url = "http://10.0.0.2:7780"
+        bus.join(cache)
+        cache.synthesize("Yes?")
+
+        payload = json.loads(bus.retained[inventory_topic("home", "kitchen")])
+        assert payload["url"] == "http://10.0.0.2:7780"
+        assert payload["token"] == cache.token
+        assert payload["entries"] == {phrase_key("Yes?"): hashlib.sha256(b"RIFF-Yes?").hexdigest()}
+
+    def test_not_advertised_without_server(self, tmp_path, cc):
+        bus = Bus()
+        cache = _cache(tmp_path, "kitchen", cc)
+        bus.join(cache)
+        cache.synthesize("Yes?")
+        assert bus.retained == {}
+
+    def test_malformed_and_cleared_inventories(self, tmp_path, cc):
+        cache = _cache(tmp_path, "kitchen", cc)
+        cache.receive(inventory_topic("home", "office"), b"{not json")
+        cache.receive(inventory_topic("home", "office"), json.dumps({"url": "http://x", "entries": {
+            "../etc/passwd": "x", phrase_key("a"): "d"}}).encode())
+        assert cache.stats()["peer_entries"] == 1
+        cache.receive(inventory_topic("home", "office"), b"")
+        assert cache.stats()["peers"] == 0
+
+    def test_endpoint(self, tmp_path, cc):
+        cache = _cache(tmp_path, "kitchen", cc)
+        cache.synthesize("On it.")
+        client = TestClient(cache.create_app(), headers={tpc.TOKEN_HEADER: cache.token})
+
+        ok = client.get(f"{tpc.CACHE_PATH}/{phrase_key('On it.')}")
+        assert ok.status_code == 200 and ok.content == b"RIFF-On it."
+        assert ok.headers["X-Audio-SHA256"] == hashlib.sha256(b"RIFF-On it.").hexdigest()
+        assert client.get(f"{tpc.CACHE_PATH}/{phrase_key('nope')}").status_code == 404
+        assert client.get(f"{tpc.CACHE_PATH}/abc").status_code == 400
+
+    def test_endpoint_requires_token(self, tmp_path, cc):
+        cache = _cache(tmp_path, "kitchen", cc, token="household-secret")
+        cache.synthesize("On it.")
+        client = TestClient(cache.create_app())
+        url = f"{tpc.CACHE_PATH}/{phrase_key('On it.')}"
+
+        assert client.get(url).status_code == 401
+        assert client.get(url, headers={tpc.TOKEN_HEADER: "guess"}).status_code == 401
+        assert client.get(url, headers={tpc.TOKEN_HEADER: "household-secret"}).status_code == 200
+        assert cache.stats()["unauthorized"] == 2
+        assert cache.stats()["served"] == 1
+
+
+class TestPeerFetch:
+    @pytest.fixture
+    def household(self, tmp_path, cc):
+        bus = Bus()
+        caches: List[TtsPeerCache] = []
+        for name in ("kitchen", "office"):
+            cache = _cache(tmp_path, name, cc)
+            cache.start_server(port=_free_port(), host="127.0.0.1")
+            assert _wait_serving(cache)
+            bus.join(cache)
+            caches.append(cache)
+        yield bus, caches
+        for cache in caches:
+            cache.stop_server()
+
+    def test_new_node_warms_from_peer(self, tmp_path, cc, household):
+        bus, (kitchen, office) = household
+        kitchen.synthesize("One moment.")
+        assert office.synthesize("One moment.") == b"RIFF-One moment."
+        assert cc.calls == ["One moment."]
+        assert office.stats()["peer_hits"] == 1
+        assert kitchen.stats()["served"] == 1
+
+        # A node booting later sees both inventories via the retained messages.
+        late = _cache(tmp_path, "bedroom", cc)
+        bus.join(late)
+        assert late.stats()["peers"] == 2
+        assert late.synthesize("One moment.") == b"RIFF-One moment."
+        assert len(cc.calls) == 1
+
+    def test_digest_mismatch_falls_back(self, cc, household):
+        _, (kitchen, office) = household
+        kitchen.synthesize("Got it.")
+        key = phrase_key("Got it.")
+        (kitchen.directory / f"{key}.wav").write_bytes(b"tampered")
+
+        assert office.synthesize("Got it.") == b"RIFF-Got it."
+        assert office.stats()["peer_failures"] == 1
+        assert len(cc.calls) == 2
+
+    def test_unreachable_peer_falls_back(self, tmp_path, cc):
+        cache = _cache(tmp_path, "office", cc, peer_timeout=0.2)
+        cache.receive(inventory_topic("home", "gone"), json.dumps({
+            "url": f"http://127.0.0.1:{_free_port()}", "entries": {phrase_key("Hi"): "0" * 64}}).encode())
+        assert cache.synthesize("Hi") == b"RIFF-Hi"
+        assert cache.stats()["peer_failures"] == 1
+
+    def test_start_server_does_not_block(self, tmp_path, cc):
+        bus = Bus()
+        cache = _cache(tmp_path, "kitchen", cc)
+        bus.join(cache)
+        started = time.monotonic()
+        cache.start_server(port=_free_port(), host="127.0.0.1")
+        try:
+            assert time.monotonic() - started < 0.5
+            assert _wait_serving(cache)
+            # Advertised from the server thread once it is up.
+            payload = json.loads(bus.retained[inventory_topic("home", "kitchen")])
+            assert payload["url"] == cache.url
+        finally:
+            cache.stop_server()
+
+    def test_port_in_use_is_not_advertised(self, tmp_path, cc):
+        with socket.socket() as taken:
+            taken.bind(("127.0.0.1", 0))
+            taken.listen()
+            cache = _cache(tmp_path, "kitchen", cc)
+            cache.start_server(port=taken.getsockname()[1], host="127.0.0.1")
+            assert not _wait_serving(cache, timeout=1.0)
+        assert cache.synthesize("Yes?") == b"RIFF-Yes?"
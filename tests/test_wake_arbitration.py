@@ -0,0 +1,160 @@
+"""Tests for core.wake_arbitration."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List, Optional
+from unittest.mock import patch
+
+import pytest
+
+import core.wake_arbitration as wa
+from core.wake_arbitration import WakeArbiter, WakeClaim, wake_topic
+
+
+class LocalBroker:
+    """In-memory stand-in for the household MQTT topic (fan-out to all, incl. sender)."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.arbiters: List[WakeArbiter] = []
+        self.published: List[WakeClaim] = []
+
+    def join(self, node_id: str, window_ms: float = 100.0, **kwargs) -> WakeArbiter:
+        arbiter = WakeArbiter(node_id, "home", window_ms=window_ms, **kwargs)
+        arbiter.attach(self.publish)
+        self.arbiters.append(arbiter)
+        return arbiter
+
+    def publish(self, topic: str, payload: bytes) -> None:
+        assert topic == wake_topic("home")
+        self.published.append(WakeClaim.from_payload(payload))
+        for arbiter in list(self.arbiters):
+            if self.latency:
+                threading.Timer(self.latency, arbiter.receive, args=(payload,)).start()
+            else:
+                arbiter.receive(payload)
+
+
+def _arbitrate_together(bids: Dict[WakeArbiter, tuple], stagger: float = 0.0) -> Dict[str, object]:
+    results: Dict[str, object] = {}
+
+    def run(arbiter: WakeArbiter, score: float, rms: int) -> None:
+        results[arbiter.node_id] = arbiter.arbitrate(score, rms)
+
+    threads = []
+    for arbiter, (score, rms) in bids.items():
+        t = threading.Thread(target=run, args=(arbiter, score, rms))
+        t.start()
+        threads.append(t)
+        time.sleep(stagger)
+    for t in threads:
+        t.join(timeout=5)
+    return results
+
+
+class TestArbitration:
+    def test_without_transport_wins_immediately(self):
+        arbiter = WakeArbiter("kitchen", "home")
+        result = arbiter.arbitrate(0.9, 1200)
+        assert result.won and result.reason == "solo"
+        assert result.delay_ms < 5
+        assert arbiter.stats()["solo"] == 1
+
+    def test_only_best_score_proceeds(self):
+        broker = LocalBroker(latency=0.005)
+        kitchen, office, bedroom = (broker.join(n) for n in ("kitchen", "office", "bedroom"))
+        results = _arbitrate_together({kitchen: (0.62, 900), office: (0.91, 400), bedroom: (0.55, 3000)})
+
+        assert [n for n, r in results.items() if r.won] == ["office"]
+        assert results["kitchen"].winner.node_id == "office"
+        assert results["kitchen"].reason == "outscored"
+        assert results["kitchen"].delay_ms < 100  # lost as soon as the better claim arrived
+
+    def test_energy_breaks_score_ties(self):
+        broker = LocalBroker()
+        near, far = broker.join("near"), broker.join("far")
+        results = _arbitrate_together({near: (0.8, 2500), far: (0.8, 600)})
+        assert results["near"].won and not results["far"].won
+
+    def test_late_wake_yields_to_announced_winner(self):
+        broker = LocalBroker()
+        first, late = broker.join("kitchen", window_ms=50), broker.join("office", window_ms=50)
+
+        assert first.arbitrate(0.6, 800).won
+        assert broker.published[-1].won
+
+        result = late.arbitrate(0.95, 3000)  # better, but the kitchen already committed
+        assert not result.won
+        assert result.reason == "settled"
+        assert result.winner.node_id == "kitchen"
+
+    def test_announcement_during_window_wins(self):
+        clock_start = time.monotonic()
+        arbiter = WakeArbiter("office", "home", window_ms=200, publisher=lambda t, p: None)
+        announcement = WakeClaim("w1", "kitchen", 0.5, 100, 0.0, won=True).to_payload()
+        threading.Timer(0.03, arbiter.receive, args=(announcement,)).start()
+
+        result = arbiter.arbitrate(0.99, 5000)
+        assert not result.won and result.reason == "announced"
+        assert time.monotonic() - clock_start < 0.2
+
+    def test_known_peers_allow_early_win(self):
+        broker = LocalBroker()
+        kitchen, office = broker.join("kitchen", window_ms=300), broker.join("office", window_ms=300)
+        _arbitrate_together({kitchen: (0.7, 500), office: (0.5, 500)})  # learn each other
+
+        time.sleep(0.65)  # past two windows, so the next round starts clean
+        results = _arbitrate_together({kitchen: (0.7, 500), office: (0.5, 500)})
+        assert results["kitchen"].won
+        assert results["kitchen"].reason == "all_peers"
+        assert results["kitchen"].delay_ms < 300
+
+    def test_ignores_own_echo_and_bad_payloads(self):
+        broker = LocalBroker()
+        arbiter = broker.join("kitchen", window_ms=20)
+        arbiter.receive(b"not json")
+        arbiter.receive(b'{"node_id": "office"}')
+
+        result = arbiter.arbitrate(0.5, 100)
+        assert result.won and result.reason == "best" and result.rivals == 0
+        stats = arbiter.stats()
+        assert stats["bad_payloads"] == 2
+        assert stats["peer_claims"] == 0
+
+    def test_stats_track_suppression_and_delay(self):
+        broker = LocalBroker()
+        a, b = broker.join("a", window_ms=40), broker.join("b", window_ms=40)
+        _arbitrate_together({a: (0.9, 100), b: (0.4, 100)})
+
+        assert a.stats()["wins"] == 1 and a.stats()["suppression_rate"] == 0.0
+        stats = b.stats()
+        assert stats["suppressed"] == 1
+        assert stats["suppression_rate"] == 1.0
+        assert stats["delay_ms_mean"] is not None
+
+
+class TestSingleton:
+    @pytest.fixture(autouse=True)
+    def _reset(self):
+        wa.reset_wake_arbiter()
+        yield
+        wa.reset_wake_arbiter()
+
+    def _config(self, values: Dict[str, Optional[str]]):
+        return patch.object(wa.Config, "get_str", side_effect=lambda key, default=None: values.get(key, default))
+
+    def test_requires_household(self):
+        with self._config({"node_id": "kitchen"}):
+            assert wa.get_wake_arbiter() is None
+        assert wa.get_wake_arbiter_stats() is None
+
+    def test_built_from_config(self):
+        with self._config({"node_id": "kitchen", "household_id": "hh-1"}), \
+                patch.object(wa.Config, "get_bool", return_value=True), \
+                patch.object(wa.Config, "get_float", return_value=80.0):
+            arbiter = wa.get_wake_arbiter()
+        assert arbiter is wa.get_wake_arbiter()
+        assert arbiter.topic == "jarvis/households/hh-1/wake"
+        assert wa.get_wake_arbiter_stats()["window_ms"] == 80.0
@@ -0,0 +1,157 @@
+"""Tests for core.wake_scorer.WakeScorer.
+
+The bus is driven via ``AudioBus.push()``; the openWakeWord model is a
+fake that records which thread calls it.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from core.audio_bus import AudioBus
+from core.wake_scorer import WakeScorer
+
+
+class _FakeOWW:
+    def __init__(self) -> None:
+        self.predict_calls = 0
+        self.reset_calls = 0
+        self.sample_lengths: list[int] = []
+        self.threads: set[str] = set()
+
+    def predict(self, samples: np.ndarray) -> dict[str, float]:
+        self.predict_calls += 1
+        self.sample_lengths.append(len(samples))
+        self.threads.add(threading.current_thread().name)
+        return {"hey_jarvis": 0.5, "alexa": 0.1}
+
+    def reset(self) -> None:
+        self.reset_calls += 1
+        self.threads.add(threading.current_thread().name)
+
+
+def _chunk(samples: int, amplitude: int = 1000) -> bytes:
+    return np.full(samples, amplitude, dtype=np.int16).tobytes()
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+@pytest.fixture
+def oww() -> _FakeOWW:
+    return _FakeOWW()
+
+
+@pytest.fixture
+def bus() -> AudioBus:
+    return AudioBus(rate=16000, chunk_samples=1280, history_secs=1.0)
+
+
+@pytest.fixture
+def scorer(bus: AudioBus, oww: _FakeOWW):
+    s = WakeScorer(bus, oww)
+    s.start()
+    yield s
+    s.stop()
+
+
+class TestPublish:
+    def test_every_subscriber_gets_the_same_event(self, scorer: WakeScorer, bus: AudioBus, oww: _FakeOWW) -> None:
+        q1 = scorer.subscribe("wake")
+        q2 = scorer.subscribe("diag")
+        bus.push(_chunk(1280))
+
+        e1 = q1.get(timeout=1)
+        e2 = q2.get(timeout=1)
+        assert e1 is e2
+        assert e1.scores == {"hey_jarvis": 0.5, "alexa": 0.1}
+        assert e1.rms == 1000
+        assert oww.predict_calls == 1
+
+    def test_frame_cursor_increases(self, scorer: WakeScorer, bus: AudioBus) -> None:
+        q = scorer.subscribe("wake")
+        for _ in range(3):
+            bus.push(_chunk(1280))
+        cursors = [q.get(timeout=1).frame_cursor for _ in range(3)]
+        assert cursors == sorted(cursors)
+        assert len(set(cursors)) == 3
+
+    def test_no_inference_without_subscribers(self, scorer: WakeScorer, bus: AudioBus, oww: _FakeOWW) -> None:
+        for _ in range(3):
+            bus.push(_chunk(1280))
+        assert _wait_for(lambda: scorer.frame_cursor == 3)
+        assert oww.predict_calls == 0
+
+    def test_model_only_used_from_scorer_thread(self, scorer: WakeScorer, bus: AudioBus, oww: _FakeOWW) -> None:
+        q = scorer.subscribe("wake")
+        scorer.request_reset()
+        bus.push(_chunk(1280))
+        q.get(timeout=1)
+        assert oww.threads == {"WakeScorer"}
+
+    def test_duplicate_subscribe_raises(self, scorer: WakeScorer) -> None:
+        scorer.subscribe("wake")
+        with pytest.raises(ValueError):
+            scorer.subscribe("wake")
+
+    def test_slow_subscriber_drops_oldest(self, scorer: WakeScorer, bus: AudioBus) -> None:
+        q = scorer.subscribe("slow", maxsize=2)
+        for _ in range(4):
+            bus.push(_chunk(1280))
+        assert _wait_for(lambda: scorer.frame_cursor == 4)
+        cursors = [q.get_nowait().frame_cursor for _ in range(2)]
+        assert cursors == [3, 4]
+        with pytest.raises(queue.Empty):
+            q.get_nowait()
+
+
+class TestReset:
+    def test_reset_applies_before_next_frame_and_bumps_epoch(self, scorer: WakeScorer, bus: AudioBus, oww: _FakeOWW) -> None:
+        q = scorer.subscribe("wake")
+        bus.push(_chunk(1280))
+        before = q.get(timeout=1)
+
+        epoch = scorer.request_reset()
+        bus.push(_chunk(1280))
+        after = q.get(timeout=1)
+
+        assert before.epoch < epoch
+        assert after.epoch == epoch
+        assert oww.reset_calls >= 1
+
+    def test_resets_coalesce(self, scorer: WakeScorer, bus: AudioBus, oww: _FakeOWW) -> None:
+        q = scorer.subscribe("wake")
+        bus.push(_chunk(1280))
+        q.get(timeout=1)
+        resets = oww.reset_calls
+        scorer.request_reset()
+        scorer.request_reset()
+        bus.push(_chunk(1280))
+        q.get(timeout=1)
+        assert oww.reset_calls == resets + 1
+
+
+class TestResample:
+    def test_48k_frames_are_downsampled(self, oww: _FakeOWW) -> None:
+        bus = AudioBus(rate=48000, chunk_samples=3840, history_secs=1.0)
+        s = WakeScorer(bus, oww)
+        s.start()
+        try:
+            q = s.subscribe("wake")
+            bus.push(_chunk(3840))
+            q.get(timeout=1)
+            assert oww.sample_lengths == [1280]
+            assert s.frame_seconds == pytest.approx(0.08)
+        finally:
+            s.stop()
@@ -0,0 +1,79 @@
+"""Tests for core.wake_words (multi-wake-word config and detection)."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from core.wake_scorer import WakeScores
+from core.wake_words import (
+    WakeWordDetector,
+    WakeWordSpec,
+    load_wake_word_specs,
+    parse_wake_words,
+)
+
+
+def _event(scores: dict[str, float], t: float = 0.0, cursor: int = 1) -> WakeScores:
+    return WakeScores(frame_cursor=cursor, scores=scores, rms=0, epoch=0, timestamp=t)
+
+
+class TestParse:
+    def test_model_threshold_and_debounce(self) -> None:
+        specs = parse_wake_words("hey_jarvis:0.4, alexa:0.6:2.5")
+        assert specs == [
+            WakeWordSpec("hey_jarvis", 0.4, 1.0),
+            WakeWordSpec("alexa", 0.6, 2.5),
+        ]
+
+    def test_default_threshold_applies(self) -> None:
+        assert parse_wake_words("hey_jarvis", default_threshold=0.3)[0].threshold == 0.3
+
+    def test_invalid_and_duplicate_entries_skipped(self) -> None:
+        specs = parse_wake_words("hey_jarvis:abc, alexa, alexa:0.9, ,")
+        assert [s.model for s in specs] == ["alexa"]
+
+    def test_legacy_single_model_fallback(self) -> None:
+        values = {"wake_words": "", "wake_word_model": "alexa"}
+        with patch("core.wake_words.Config") as config:
+            config.get_str.side_effect = lambda key, default=None: values.get(key, default)
+            config.get_float.return_value = 0.45
+            specs = load_wake_word_specs()
+        assert specs == [WakeWordSpec("alexa", 0.45)]
+
+
+class TestDetector:
+    def test_fires_model_that_crossed_its_own_threshold(self) -> None:
+        detector = WakeWordDetector([WakeWordSpec("hey_jarvis", 0.4), WakeWordSpec("alexa", 0.8)])
+        assert detector.check(_event({"hey_jarvis": 0.3, "alexa": 0.7})) is None
+
+        wake = detector.check(_event({"hey_jarvis": 0.5, "alexa": 0.7}, cursor=9))
+        assert wake is not None
+        assert wake.model == "hey_jarvis"
+        assert wake.score == 0.5
+        assert wake.frame_cursor == 9
+
+    def test_largest_margin_wins(self) -> None:
+        detector = WakeWordDetector([WakeWordSpec("hey_jarvis", 0.4), WakeWordSpec("alexa", 0.5)])
+        wake = detector.check(_event({"hey_jarvis": 0.5, "alexa": 0.9}))
+        assert wake.model == "alexa"
+
+    def test_debounce_per_model(self) -> None:
+        detector = WakeWordDetector([
+            WakeWordSpec("hey_jarvis", 0.4, debounce_seconds=1.0),
+            WakeWordSpec("alexa", 0.4, debounce_seconds=1.0),
+        ])
+        assert detector.check(_event({"hey_jarvis": 0.9}, t=10.0)).model == "hey_jarvis"
+        assert detector.check(_event({"hey_jarvis": 0.9}, t=10.5)) is None
+        # Another model is not blocked by hey_jarvis's debounce
+        assert detector.check(_event({"alexa": 0.9}, t=10.5)).model == "alexa"
+        assert detector.check(_event({"hey_jarvis": 0.9}, t=11.1)).model == "hey_jarvis"
+
+    def test_max_score_only_considers_configured_models(self) -> None:
+        detector = WakeWordDetector([WakeWordSpec("hey_jarvis")])
+        assert detector.max_score(_event({"hey_jarvis": 0.2, "alexa": 0.9})) == 0.2
+
+    def test_requires_a_spec(self) -> None:
+        with pytest.raises(ValueError):
+            WakeWordDetector([])
@@ -8,6 +8,7 @@ from typing import Dict, List, Optional
 from jarvis_log_client import JarvisLogger
 
 from jarvis_command_sdk import IJarvisCommand
+from core.execution_policy import apply_thread_role
 from db import SessionLocal
 from repositories.command_registry_repository import CommandRegistryRepository
 
@@ -36,6 +37,7 @@ class CommandDiscoveryService:
 
     def _background_refresh(self) -> None:
         """Background thread that refreshes commands every refresh_interval seconds."""
+        apply_thread_role("background")
         while True:
             if _shutdown_event is not None:
                 _shutdown_event.wait(timeout=self.refresh_interval)
@@ -148,9 +150,11 @@ class CommandDiscoveryService:
         except ImportError:
             pass  # test_commands package doesn't exist yet
 
+        global _discovery_generation
         with self._lock:
             self._commands_cache = new_commands
             self._last_refresh = time.time()
+            _discovery_generation += 1
 
     def _scan_package(self, package, package_path: str, commands_dict: Dict[str, IJarvisCommand]) -> None:
         """Scan a package for IJarvisCommand implementations."""
@@ -216,6 +220,9 @@ class CommandDiscoveryService:
 _command_discovery_service: Optional[CommandDiscoveryService] = None
 _init_lock = threading.Lock()
 
+# Incremented after every discovery pass (startup, background, refresh_now)
+_discovery_generation: int = 0
+
 # Shutdown event shared with main.py for graceful shutdown
 _shutdown_event: Optional[threading.Event] = None
 
@@ -233,4 +240,9 @@ def get_command_discovery_service() -> CommandDiscoveryService:
         with _init_lock:
             if _command_discovery_service is None:
                 _command_discovery_service = CommandDiscoveryService()
-    return _command_discovery_service
\ No newline at end of file
+    return _command_discovery_service
+
+
+def get_discovery_generation() -> int:
+    """Number of completed discovery passes (does not create the service)."""
+    return _discovery_generation
@@ -3,7 +3,8 @@ import threading
 import time
 import uuid
 from dataclasses import dataclass, field
-from typing import Dict, Any, List, Optional, Callable
+from datetime import date
+from typing import Dict, Any, List, Optional, Callable, Hashable
 
 from jarvis_log_client import JarvisLogger
 
@@ -13,10 +14,14 @@ from core.command_response import CommandResponse
 from core.helpers import get_tts_provider
 from core.platform_audio import platform_audio
 from core.request_information import RequestInformation
-from utils.command_discovery_service import get_command_discovery_service
+from repositories.command_registry_repository import get_registry_generation
+from utils.command_discovery_service import get_command_discovery_service, get_discovery_generation
 from utils.config_service import Config
+from utils.conversation_pool import WarmConversationPool, context_fingerprint
 from utils.service_discovery import get_command_center_url
 from utils.tool_result_formatter import format_tool_result, format_tool_error
+from utils.tool_router import DEFAULT_CONFIDENCE_THRESHOLD, get_tool_router
+from utils.tool_schema_builder import command_schema_hashes
 
 
 def _build_secrets(command) -> Dict[str, str]:
@@ -62,6 +67,7 @@ class ParseResult:
     success: bool
     validation_request: ValidationRequest | None = None
     assistant_message: str | None = None
+    router_confidence: float | None = None  # set when the on-node router routed it
 
 
 class CommandExecutionService:
@@ -72,9 +78,42 @@ class CommandExecutionService:
         self.command_discovery = get_command_discovery_service()
         self.client = JarvisCommandCenterClient(self.command_center_url)
         self._conversation_users: Dict[str, int | None] = {}
+        self.tool_router_threshold = Config.get_float(
+            "tool_router_confidence_threshold", DEFAULT_CONFIDENCE_THRESHOLD,
+        )
+        self.conversation_pool = WarmConversationPool(
+            register=lambda cid, speaker: self.register_tools_for_conversation(cid, speaker_user_id=speaker),
+            fingerprint=self._context_fingerprint,
+            version=self._context_version,
+        )
         # Force initial discovery
         self.command_discovery.refresh_now()
 
+    def _context_fingerprint(self) -> str:
+        """Fingerprint of what a registered conversation bakes in (tools, date, agents)."""
+        agent_context = None
+        try:
+            from services.agent_scheduler_service import get_agent_scheduler_service
+            agent_context = get_agent_scheduler_service().get_aggregated_context()
+        except Exception as e:
+            logger.debug("Agent context unavailable for pool fingerprint", error=str(e))
+        return context_fingerprint(command_schema_hashes(self.command_discovery.get_all_commands()), agent_context)
+
+    @staticmethod
+    def _context_version() -> Hashable:
+        """Cheap token that changes whenever ``_context_fingerprint`` may have."""
+        agents_version = None
+        try:
+            from services.agent_scheduler_service import get_agent_scheduler_service
+            agents_version = get_agent_scheduler_service().get_context_version()
+        except Exception as e:
+            logger.debug("Agent context version unavailable", error=str(e))
+        return (get_discovery_generation(), get_registry_generation(), date.today(), agents_version)
+
+    def checkout_warm_conversation(self, speaker_user_id: Optional[int] = None) -> Optional[str]:
+        """Take an already-registered conversation ID from the pool, or None on a miss."""
+        return self.conversation_pool.checkout(speaker_user_id)
+
     def register_tools_for_conversation(
         self,
         conversation_id: str,
@@ -135,6 +174,7 @@ class CommandExecutionService:
         agents: dict | None = None,
         warmup_delay: float = 0,
         adapter_settings: dict | None = None,
+        use_local_router: bool = True,
     ) -> ParseResult:
         """Classify a voice command through the production code path without executing tools.
 
@@ -147,6 +187,8 @@ class CommandExecutionService:
             agents: Optional agent context (e.g., Home Assistant device data)
             warmup_delay: Seconds to wait between tool registration and sending
                           the command (for KV cache warmup on GGUF models)
+            use_local_router: Let the on-node tool router answer confident
+                              hits. The eval turns this off to measure the model.
 
         Returns:
             ParseResult with classification details
@@ -173,6 +215,21 @@ class CommandExecutionService:
                     assistant_message=pre.spoken_response,
                 )
 
+        # Step 1b: On-node tool router (classification only)
+        local = self._local_route(voice_command) if use_local_router else None
+        if local is not None:
+            command, pre, confidence = local
+            return ParseResult(
+                conversation_id=conversation_id,
+                pre_routed=True,
+                tool_name=command.command_name,
+                tool_arguments=pre.arguments,
+                raw_response=None,
+                success=True,
+                assistant_message=pre.spoken_response,
+                router_confidence=confidence,
+            )
+
         # Step 2: Register tools
         if not self.register_tools_for_conversation(
             conversation_id, speaker_user_id=speaker_user_id, agents=agents,
@@ -338,7 +395,9 @@ class CommandExecutionService:
             conversation_id: Optional pre-generated conversation ID (from parallel warmup)
             warmup_thread: Optional background warmup thread to join instead of
                           calling register_tools_for_conversation inline
-            warmup_result: Optional dict with warmup outcome ({"success": bool})
+            warmup_result: Optional dict with warmup outcome ({"success": bool}).
+                          ``{"pooled": True}`` means the conversation came from
+                          the warm pool and needs no registration or join.
             skip_ack: If True, suppress the ack timer (processing ack already played)
 
         Returns:
@@ -353,6 +412,11 @@ class CommandExecutionService:
         if pre_result is not None:
             return pre_result
 
+        # Confident on-node router hit with locally fillable parameters
+        local_result = self.try_local_route(voice_command, conversation_id, speaker_user_id=speaker_user_id)
+        if local_result is not None:
+            return local_result
+
         logger.info("Starting conversation", conversation_id=conversation_id, command=voice_command)
 
         # Gate the ack on a timer so fast conversational responses aren't
@@ -373,9 +437,23 @@ class CommandExecutionService:
             ack_thread.start()
 
             # Register available tools if requested
-            if warmup_thread is not None and register_tools:
+            if warmup_result and warmup_result.get("pooled") and register_tools:
+                # Checked out of the warm pool at wake time — already registered
+                self._conversation_users[conversation_id] = speaker_user_id
+                logger.info(
+                    "Conversation warmup", pool_hit=True, join_wait_ms=0,
+                    wait_saved_ms=round(self.conversation_pool.expected_register_ms or 0),
+                    pool_hit_rate=round(self.conversation_pool.hit_rate, 3),
+                )
+            elif warmup_thread is not None and register_tools:
                 # Parallel warmup was started during recording — wait for it
+                join_start = time.perf_counter()
                 warmup_thread.join(timeout=10)
+                logger.info(
+                    "Conversation warmup", pool_hit=False,
+                    join_wait_ms=round((time.perf_counter() - join_start) * 1000),
+                    pool_hit_rate=round(self.conversation_pool.hit_rate, 3),
+                )
                 if warmup_result and not warmup_result.get("success"):
                     logger.warning("Parallel warmup failed, falling back to inline warmup")
                     self.register_tools_for_conversation(conversation_id, speaker_user_id=speaker_user_id)
@@ -752,45 +830,111 @@ class CommandExecutionService:
                 command=command.command_name,
                 voice_command=voice_command,
             )
+            return self._execute_locally(
+                command, pre, voice_command, conversation_id, speaker_user_id,
+            )
 
-            try:
-                request_info = RequestInformation(
-                    voice_command=voice_command,
-                    conversation_id=conversation_id,
-                    is_validation_response=False,
-                    user_id=speaker_user_id,
-                )
+        return None
 
-                from jarvis_command_sdk.context import set_current_user_id
-                set_current_user_id(speaker_user_id)
-                try:
-                    command_response: CommandResponse = command.execute(
-                        request_info, secrets=_build_secrets(command), **pre.arguments,
-                    )
-                finally:
-                    set_current_user_id(None)
+    def try_local_route(self, voice_command: str, conversation_id: str, speaker_user_id: int | None = None) -> Dict[str, Any] | None:
+        """Route through the on-node tool router, skipping the CC round trip.
 
-                message = pre.spoken_response
-                if not message:
-                    ctx = command_response.context_data or {}
-                    message = ctx.get("message", "Done.")
-
-                return {
-                    "success": command_response.success,
-                    "message": message,
-                    "conversation_id": conversation_id,
-                    "wait_for_input": False,
-                    "clear_history": False,
-                }
-            except Exception as e:
-                logger.error(
-                    "Pre-route execution failed, falling through to LLM",
-                    command=command.command_name,
-                    error=str(e),
-                )
-                return None
+        Only acts when the router artifact is present, its top prediction
+        clears ``tool_router_confidence_threshold``, and the predicted
+        command can fill its own parameters via ``route_locally()``.
 
-        return None
+        Returns:
+            Result dict (same shape as process_voice_command), or None to
+            fall through to the normal LLM path.
+        """
+        local = self._local_route(voice_command)
+        if local is None:
+            return None
+        command, pre, _ = local
+        return self._execute_locally(command, pre, voice_command, conversation_id, speaker_user_id)
+
+    def _local_route(self, voice_command: str) -> tuple[Any, Any, float] | None:
+        """Return (command, PreRouteResult, confidence) for a confident router hit."""
+        router = get_tool_router()
+        if router is None:
+            return None
+
+        prediction = router.predict(voice_command)
+        if prediction is None or prediction.confidence < self.tool_router_threshold:
+            return None
+
+        command = self.command_discovery.get_command(prediction.tool_name)
+        route_locally = getattr(command, "route_locally", None) if command else None
+        if route_locally is None:
+            logger.debug(
+                "Tool router hit has no local parameter filler",
+                tool=prediction.tool_name,
+                confidence=round(prediction.confidence, 3),
+            )
+            return None
+
+        try:
+            pre = route_locally(voice_command)
+        except Exception as e:
+            logger.warning("route_locally failed", command=prediction.tool_name, error=str(e))
+            return None
+        if pre is None:
+            return None
+
+        logger.info(
+            "Locally routed to command",
+            command=prediction.tool_name,
+            confidence=round(prediction.confidence, 3),
+            router_ms=round(prediction.latency_ms, 3),
+            voice_command=voice_command,
+        )
+        return command, pre, prediction.confidence
+
+    def _execute_locally(
+        self,
+        command: Any,
+        pre: Any,
+        voice_command: str,
+        conversation_id: str,
+        speaker_user_id: int | None,
+    ) -> Dict[str, Any] | None:
+        """Execute a pre-routed / locally routed command without contacting CC."""
+        try:
+            request_info = RequestInformation(
+                voice_command=voice_command,
+                conversation_id=conversation_id,
+                is_validation_response=False,
+                user_id=speaker_user_id,
+            )
+
+            from jarvis_command_sdk.context import set_current_user_id
+            set_current_user_id(speaker_user_id)
+            try:
+                command_response: CommandResponse = command.execute(
+                    request_info, secrets=_build_secrets(command), **pre.arguments,
+                )
+            finally:
+                set_current_user_id(None)
+
+            message = pre.spoken_response
+            if not message:
+                ctx = command_response.context_data or {}
+                message = ctx.get("message", "Done.")
+
+            return {
+                "success": command_response.success,
+                "message": message,
+                "conversation_id": conversation_id,
+                "wait_for_input": False,
+                "clear_history": False,
+            }
+        except Exception as e:
+            logger.error(
+                "Pre-route execution failed, falling through to LLM",
+                command=command.command_name,
+                error=str(e),
+            )
+            return None
 
     def _default_validation_handler(self, validation: ValidationRequest) -> str:
         """
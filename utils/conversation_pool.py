@@ -0,0 +1,354 @@
+"""Pool of pre-registered Command Center conversations.
+
+Every wake used to start a fresh ``/conversation/start`` (date context +
+tool schemas + agent context + KV warmup) in a thread and then join it
+before the command could be sent. On a slow command center that join is
+the dominant wait after STT.
+
+``WarmConversationPool`` keeps a few conversations already registered in
+the background, keyed by speaker (``None`` = unidentified). A wake checks
+one out immediately; the pool then refills behind it. Entries are tagged
+with a context fingerprint (registered tool schemas, local date, agent
+context) and dropped as soon as that fingerprint changes or they exceed
+their TTL, so a checked-out conversation never carries stale tools or
+context. Computing the fingerprint hashes every tool schema, so it is
+cached against a cheap version token (discovery/registry generations,
+date, agent context version) and a checkout only compares tokens.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from jarvis_log_client import JarvisLogger
+
+from utils.config_service import Config
+
+logger = JarvisLogger(service="jarvis-node")
+
+DEFAULT_POOL_SIZE = 1
+DEFAULT_TTL_SECONDS = 600
+DEFAULT_REFRESH_INTERVAL_SECONDS = 30
+# Identified speakers each get their own warm entries; cap how many so a
+# busy household doesn't keep a conversation open per person forever.
+MAX_SPEAKER_KEYS = 4
+
+
+@dataclass
+class WarmConversation:
+    conversation_id: str
+    speaker_user_id: Optional[int]
+    fingerprint: str
+    created_at: float
+    register_ms: float
+
+
+def context_fingerprint(command_schemas: Dict[str, str], agent_context: Optional[Dict] = None) -> str:
+    """Hash of everything baked into a registered conversation.
+
+    ``command_schemas`` maps each command name to a hash of its tool
+    schema (``command_schema_hashes``), so a command whose description or
+    parameters change after a package update invalidates the pool just
+    like one added or removed. Date context is represented by the local
+    date: the schema text only changes when "today" does, and the TTL
+    covers time-of-day drift.
+    """
+    payload = json.dumps(
+        {
+            "commands": command_schemas,
+            "date": date.today().isoformat(),
+            "agents": agent_context or {},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class WarmConversationPool:
+    """Background-refilled pool of registered conversation IDs.
+
+    Args:
+        register: ``register(conversation_id, speaker_user_id) -> bool``,
+                  normally ``CommandExecutionService.register_tools_for_conversation``.
+        fingerprint: Returns the current context fingerprint; entries whose
+                     fingerprint differs are discarded.
+        version: Cheap token that changes whenever the fingerprint may have.
+                 The fingerprint is recomputed only when it does; without
+                 one, every checkout recomputes it.
+    """
+
+    def __init__(
+        self,
+        register: Callable[[str, Optional[int]], bool],
+        fingerprint: Callable[[], str],
+        size: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        refresh_interval: Optional[float] = None,
+        version: Optional[Callable[[], Hashable]] = None,
+    ) -> None:
+        self._register = register
+        self._fingerprint = fingerprint
+        self._version = version
+        self._cached_fingerprint: Optional[Tuple[Hashable, str]] = None
+        self.size = size if size is not None else Config.get_int("conversation_pool_size", DEFAULT_POOL_SIZE)
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None
+            else Config.get_int("conversation_pool_ttl_seconds", DEFAULT_TTL_SECONDS)
+        )
+        self.refresh_interval = (
+            refresh_interval if refresh_interval is not None
+            else Config.get_int("conversation_pool_refresh_seconds", DEFAULT_REFRESH_INTERVAL_SECONDS)
+        )
+
+        self._lock = threading.Lock()
+        self._entries: Dict[Optional[int], List[WarmConversation]] = {}
+        # Speakers to keep warm, most recent last. None (unidentified) is always kept.
+        self._speakers: "OrderedDict[Optional[int], None]" = OrderedDict({None: None})
+        self._filling = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_fingerprint: Optional[str] = None
+
+        self.fingerprints_computed = 0
+        self.hits = 0
+        self.misses = 0
+        self.wait_saved_ms = 0.0
+        self._register_ms_avg: Optional[float] = None
+
+    # ── Lifecycle ────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Start the refill thread (idempotent). The first fill also warms the LLM KV cache."""
+        if self.size <= 0:
+            logger.info("Conversation pool disabled", size=self.size)
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="conversation-pool", daemon=True)
+        self._thread.start()
+        logger.info("Conversation pool started", size=self.size, ttl_seconds=self.ttl_seconds)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    # ── Checkout ─────────────────────────────────────────────────────
+
+    def checkout(self, speaker_user_id: Optional[int] = None) -> Optional[str]:
+        """Take a warm conversation for ``speaker_user_id``; None on a miss.
+
+        Falls back to an unidentified-speaker entry when the speaker has
+        none of their own (the caller re-attributes the speaker for tool
+        execution, same as the parallel warmup path always did).
+        """
+        fingerprint = self._current_fingerprint()
+        now = time.monotonic()
+        entry: Optional[WarmConversation] = None
+
+        with self._lock:
+            self._remember_speaker(speaker_user_id)
+            for key in (speaker_user_id, None):
+                bucket = self._entries.get(key, [])
+                while bucket:
+                    candidate = bucket.pop(0)
+                    if self._is_fresh(candidate, fingerprint, now):
+                        entry = candidate
+                        break
+                if entry is not None:
+                    break
+
+            if entry is not None:
+                self.hits += 1
+                self.wait_saved_ms += entry.register_ms
+            else:
+                self.misses += 1
+
+        self._wake.set()
+
+        if entry is None:
+            logger.info("Conversation pool miss", speaker_user_id=speaker_user_id, hit_rate=round(self.hit_rate, 3))
+            return None
+
+        logger.info(
+            "Conversation pool hit",
+            conversation_id=entry.conversation_id,
+            speaker_user_id=speaker_user_id,
+            age_s=round(now - entry.created_at, 1),
+            wait_saved_ms=round(entry.register_ms),
+            hit_rate=round(self.hit_rate, 3),
+        )
+        return entry.conversation_id
+
+    def invalidate(self, reason: str = "manual") -> None:
+        """Drop every pooled entry and refill (e.g. after a command install)."""
+        with self._lock:
+            dropped = sum(len(bucket) for bucket in self._entries.values())
+            self._entries.clear()
+        if dropped:
+            logger.info("Conversation pool invalidated", reason=reason, dropped=dropped)
+        self._wake.set()
+
+    # ── Stats ────────────────────────────────────────────────────────
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def expected_register_ms(self) -> Optional[float]:
+        """Moving average of /conversation/start latency seen by refills."""
+        return self._register_ms_avg
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            pooled = sum(len(bucket) for bucket in self._entries.values())
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+            "wait_saved_ms": round(self.wait_saved_ms),
+            "pooled": pooled,
+            "fingerprints_computed": self.fingerprints_computed,
+        }
+
+    # ── Refill ───────────────────────────────────────────────────────
+
+    def fill(self) -> int:
+        """Top up every tracked speaker's bucket. Returns how many were registered."""
+        if not self._filling.acquire(blocking=False):
+            return 0
+        try:
+            fingerprint = self._current_fingerprint(recompute=True)
+            if self._last_fingerprint is not None and fingerprint != self._last_fingerprint:
+                self.invalidate(reason="context_changed")
+            self._last_fingerprint = fingerprint
+
+            registered = 0
+            with self._lock:
+                self._prune(fingerprint, time.monotonic())
+                wanted = [
+                    (speaker, self.size - len(self._entries.get(speaker, [])))
+                    for speaker in self._speakers
+                ]
+
+            for speaker, missing in wanted:
+                for _ in range(max(0, missing)):
+                    if self._stop.is_set():
+                        return registered
+                    if not self._register_one(speaker, fingerprint):
+                        # Command center unreachable — try again next cycle
+                        return registered
+                    registered += 1
+            return registered
+        finally:
+            self._filling.release()
+
+    def _register_one(self, speaker_user_id: Optional[int], fingerprint: str) -> bool:
+        conversation_id = str(uuid.uuid4())
+        start = time.perf_counter()
+        try:
+            ok = self._register(conversation_id, speaker_user_id)
+        except Exception as e:
+            logger.warning("Conversation pool registration failed", error=str(e))
+            return False
+        register_ms = (time.perf_counter() - start) * 1000
+        if not ok:
+            return False
+
+        self._register_ms_avg = (
+            register_ms if self._register_ms_avg is None
+            else 0.8 * self._register_ms_avg + 0.2 * register_ms
+        )
+        with self._lock:
+            self._entries.setdefault(speaker_user_id, []).append(WarmConversation(
+                conversation_id=conversation_id,
+                speaker_user_id=speaker_user_id,
+                fingerprint=fingerprint,
+                created_at=time.monotonic(),
+                register_ms=register_ms,
+            ))
+        logger.debug("Conversation pooled", conversation_id=conversation_id,
+                     speaker_user_id=speaker_user_id, register_ms=round(register_ms))
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.fill()
+            except Exception as e:
+                logger.warning("Conversation pool refill failed", error=str(e))
+            self._wake.wait(timeout=self.refresh_interval)
+            self._wake.clear()
+
+    # ── Helpers (call with self._lock held where noted) ──────────────
+
+    def _current_fingerprint(self, recompute: bool = False) -> str:
+        """Fingerprint cached for the current version token (the refill thread recomputes it)."""
+        version = self._safe_version()
+        cached = self._cached_fingerprint
+        if not recompute and version is not None and cached is not None and cached[0] == version:
+            return cached[1]
+        # Read the version before computing: a change racing the hash only
+        # leaves the token stale, so the next call recomputes
+        fingerprint = self._safe_fingerprint()
+        if version is not None and fingerprint:
+            self._cached_fingerprint = (version, fingerprint)
+        return fingerprint
+
+    def _safe_version(self) -> Optional[Hashable]:
+        if self._version is None:
+            return None
+        try:
+            return self._version()
+        except Exception as e:
+            logger.warning("Conversation pool version failed", error=str(e))
+            return None
+
+    def _safe_fingerprint(self) -> str:
+        self.fingerprints_computed += 1
+        try:
+            return self._fingerprint()
+        except Exception as e:
+            logger.warning("Conversation pool fingerprint failed", error=str(e))
+            return ""
+
+    def _is_fresh(self, entry: WarmConversation, fingerprint: str, now: float) -> bool:
+        return entry.fingerprint == fingerprint and now - entry.created_at < self.ttl_seconds
+
+    def _prune(self, fingerprint: str, now: float) -> None:
+        # self._lock held
+        for key in list(self._entries):
+            fresh = [e for e in self._entries[key] if self._is_fresh(e, fingerprint, now)]
+            if key not in self._speakers:
+                fresh = []
+            if fresh:
+                self._entries[key] = fresh
+            else:
+                del self._entries[key]
+
+    def _remember_speaker(self, speaker_user_id: Optional[int]) -> None:
+        # self._lock held
+        if speaker_user_id is None:
+            return
+        self._speakers[speaker_user_id] = None
+        self._speakers.move_to_end(speaker_user_id)
+        while len(self._speakers) > MAX_SPEAKER_KEYS + 1:
+            for key in self._speakers:
+                if key is not None:
+                    del self._speakers[key]
+                    break
@@ -5,17 +5,30 @@ base requirements, and detects version conflicts using the ``packaging``
 library.  Pure logic — no side effects (pip installs, file writes) happen
 here; the caller (``install_command.py``) decides what to do with the
 :class:`ResolutionResult`.
+
+Constraints live in a :class:`DependencyGraph` (package → {source: spec}).
+The graph is serialized into ``dependency-snapshot.json`` and passed back
+in on the next run, so only packages whose constraints changed (a command
+added, removed or edited, or ``requirements.txt`` changed) are re-solved,
+and ``ResolutionResult.install_specs`` holds just the delta pip has to
+install.
+
+Each package is solved by intersecting its specifiers as version
+intervals, which is exact for ``==``/``!=``/``<``/``<=``/``>``/``>=``/``~=``
+and ``.*`` wildcards.
 """
 
 from __future__ import annotations
 
+import hashlib
 import re
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any
+from importlib import metadata
+from typing import Any, Callable, Iterable
 
-from packaging.specifiers import SpecifierSet
-from packaging.version import Version
+from packaging.specifiers import InvalidSpecifier, SpecifierSet
+from packaging.version import InvalidVersion, Version
 
 
 # ── Helpers ──────────────────────────────────────────────────────────
@@ -54,6 +67,286 @@ class ResolutionResult:
     merged_specs: list[str]  # pip specs for custom-requirements.txt
     conflicts: list[DependencyConflict] = field(default_factory=list)
     snapshot: dict[str, Any] = field(default_factory=dict)
+    # Subset of merged_specs that changed since the previous snapshot or
+    # isn't satisfied by the installed distribution — what pip must install
+    install_specs: list[str] = field(default_factory=list)
+    # Packages re-solved in this run (everything on a cold run)
+    resolved_packages: list[str] = field(default_factory=list)
+
+
+# ── Interval solver ──────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class _Bound:
+    version: Version
+    inclusive: bool
+
+
+@dataclass
+class _Interval:
+    """Set of versions between ``lower`` and ``upper`` (None = unbounded)."""
+    lower: _Bound | None = None
+    upper: _Bound | None = None
+    excluded: list[Version] = field(default_factory=list)
+    excluded_ranges: list[tuple[Version, Version]] = field(default_factory=list)
+
+    def tighten_lower(self, bound: _Bound) -> None:
+        cur = self.lower
+        if (
+            cur is None
+            or bound.version > cur.version
+            or (bound.version == cur.version and not bound.inclusive)
+        ):
+            self.lower = bound
+
+    def tighten_upper(self, bound: _Bound) -> None:
+        cur = self.upper
+        if (
+            cur is None
+            or bound.version < cur.version
+            or (bound.version == cur.version and not bound.inclusive)
+        ):
+            self.upper = bound
+
+    def pinned(self) -> Version | None:
+        """The single version this interval allows, if it is a point."""
+        if self.lower and self.upper and self.lower.version == self.upper.version:
+            return self.lower.version
+        return None
+
+    def is_empty(self) -> bool:
+        lo, hi = self.lower, self.upper
+        if lo and hi:
+            if lo.version > hi.version:
+                return True
+            if lo.version == hi.version and not (lo.inclusive and hi.inclusive):
+                return True
+        point = self.pinned()
+        if point is not None:
+            if point in self.excluded:
+                return True
+            if any(start <= point < end for start, end in self.excluded_ranges):
+                return True
+        elif lo and hi:
+            # A continuous range is only emptied by a wildcard exclusion covering it
+            for start, end in self.excluded_ranges:
+                if start <= lo.version and hi.version <= end and not (hi.version == end and hi.inclusive):
+                    return True
+        return False
+
+
+def _prefix_range(version_text: str) -> tuple[Version, Version]:
+    """``1.4`` (from ``==1.4.*``) → [1.4, 1.5)."""
+    parts = [int(p) for p in Version(version_text).release]
+    upper = parts[:-1] + [parts[-1] + 1]
+    return Version(".".join(map(str, parts))), Version(".".join(map(str, upper)))
+
+
+def _interval_for(specs: Iterable[str]) -> _Interval:
+    """Intersect every specifier in ``specs`` into one interval.
+
+    Raises:
+        InvalidSpecifier / InvalidVersion for unparseable specs.
+    """
+    interval = _Interval()
+    for spec_text in specs:
+        if not spec_text:
+            continue
+        for spec in SpecifierSet(spec_text):
+            op, text = spec.operator, spec.version
+            if op in ("==", "===") and text.endswith(".*"):
+                start, end = _prefix_range(text[:-2])
+                interval.tighten_lower(_Bound(start, True))
+                interval.tighten_upper(_Bound(end, False))
+            elif op in ("==", "==="):
+                v = Version(text)
+                interval.tighten_lower(_Bound(v, True))
+                interval.tighten_upper(_Bound(v, True))
+            elif op == "!=" and text.endswith(".*"):
+                interval.excluded_ranges.append(_prefix_range(text[:-2]))
+            elif op == "!=":
+                interval.excluded.append(Version(text))
+            elif op == ">=":
+                interval.tighten_lower(_Bound(Version(text), True))
+            elif op == ">":
+                interval.tighten_lower(_Bound(Version(text), False))
+            elif op == "<=":
+                interval.tighten_upper(_Bound(Version(text), True))
+            elif op == "<":
+                interval.tighten_upper(_Bound(Version(text), False))
+            elif op == "~=":
+                # ~=1.4.2 → >=1.4.2, ==1.4.*
+                v = Version(text)
+                interval.tighten_lower(_Bound(v, True))
+                prefix = ".".join(str(p) for p in v.release[:-1])
+                _, end = _prefix_range(prefix)
+                interval.tighten_upper(_Bound(end, False))
+    return interval
+
+
+@dataclass
+class PackageResolution:
+    """Solved constraints for one package."""
+    package_name: str
+    sources: list[tuple[str, str]]  # [(source_name, version_spec), ...]
+    spec: str  # merged specifier ("" = any version)
+    ok: bool
+    reason: str = ""
+
+    @property
+    def pip_line(self) -> str:
+        return f"{self.package_name}{self.spec}"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "sources": [list(s) for s in self.sources],
+            "spec": self.spec,
+            "ok": self.ok,
+            "reason": self.reason,
+        }
+
+    @classmethod
+    def from_dict(cls, name: str, data: dict[str, Any]) -> PackageResolution:
+        return cls(
+            package_name=name,
+            sources=[(src, spec) for src, spec in data.get("sources", [])],
+            spec=data.get("spec", ""),
+            ok=bool(data.get("ok", True)),
+            reason=data.get("reason", ""),
+        )
+
+
+def _solve_package(name: str, sources: list[tuple[str, str]]) -> PackageResolution:
+    specs = [spec for _, spec in sources]
+    non_empty = [s for s in specs if s]
+    try:
+        interval = _interval_for(non_empty)
+    except (InvalidSpecifier, InvalidVersion, ValueError) as e:
+        return PackageResolution(name, sources, "", False, f"Invalid specifier: {e}")
+    if interval.is_empty():
+        return PackageResolution(name, sources, "", False, _conflict_reason(specs))
+    # Deduplicate fragments but keep the sources' own wording
+    fragments: list[str] = []
+    for spec in non_empty:
+        for part in spec.split(","):
+            part = part.strip()
+            if part and part not in fragments:
+                fragments.append(part)
+    return PackageResolution(name, sources, ",".join(fragments), True)
+
+
+# ── Constraint graph ─────────────────────────────────────────────────
+
+
+BASE_SOURCE = "requirements.txt"
+
+
+class DependencyGraph:
+    """Package constraints by source, with per-package cached solutions.
+
+    ``set_source`` / ``remove_source`` mark only the packages they touch
+    as dirty; ``solve`` re-solves just those.
+    """
+
+    def __init__(self) -> None:
+        self.base_sha256: str | None = None
+        # source (command name or BASE_SOURCE) → {package: spec}
+        self.sources: dict[str, dict[str, str]] = {}
+        self.resolutions: dict[str, PackageResolution] = {}
+        self._dirty: set[str] = set()
+
+    # Mutation
+
+    def set_source(self, source: str, packages: dict[str, str]) -> None:
+        old = self.sources.get(source, {})
+        if old == packages:
+            return
+        for pkg in old.keys() | packages.keys():
+            if old.get(pkg) != packages.get(pkg):
+                self._dirty.add(pkg)
+        if packages:
+            self.sources[source] = dict(packages)
+        else:
+            self.sources.pop(source, None)
+
+    def remove_source(self, source: str) -> None:
+        self.set_source(source, {})
+
+    # Solving
+
+    def constraints(self, package: str) -> list[tuple[str, str]]:
+        """``[(source, spec), ...]`` for one package; commands first, base last."""
+        found = [
+            (src, pkgs[package]) for src, pkgs in sorted(self.sources.items())
+            if src != BASE_SOURCE and package in pkgs
+        ]
+        base = self.sources.get(BASE_SOURCE, {})
+        if package in base and found:
+            found.append((BASE_SOURCE, base[package]))
+        return found
+
+    def solve(self) -> list[str]:
+        """Re-solve dirty packages.
+
+        Returns:
+            Command packages whose resolution was recomputed or dropped
+            (base-only packages are not counted).
+        """
+        solved: list[str] = []
+        for pkg in sorted(self._dirty):
+            sources = self.constraints(pkg)
+            if sources:
+                self.resolutions[pkg] = _solve_package(pkg, sources)
+                solved.append(pkg)
+            elif self.resolutions.pop(pkg, None) is not None:
+                # Only the base (or nobody) needs it now
+                solved.append(pkg)
+        self._dirty.clear()
+        return solved
+
+    def conflicts(self) -> list[DependencyConflict]:
+        return [
+            DependencyConflict(package_name=r.package_name, sources=list(r.sources), reason=r.reason)
+            for _, r in sorted(self.resolutions.items()) if not r.ok
+        ]
+
+    def merged_specs(self) -> list[str]:
+        """pip lines for command packages not already provided by the base requirements."""
+        base = self.sources.get(BASE_SOURCE, {})
+        return sorted(
+            r.pip_line for name, r in self.resolutions.items()
+            if r.ok and name not in base
+        )
+
+    # Persistence
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "base_sha256": self.base_sha256,
+            "sources": self.sources,
+            "resolutions": {name: r.to_dict() for name, r in sorted(self.resolutions.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> DependencyGraph:
+        graph = cls()
+        if not data:
+            return graph
+        graph.base_sha256 = data.get("base_sha256")
+        graph.sources = {src: dict(pkgs) for src, pkgs in (data.get("sources") or {}).items()}
+        graph.resolutions = {
+            name: PackageResolution.from_dict(name, r)
+            for name, r in (data.get("resolutions") or {}).items()
+        }
+        return graph
+
+
+def _installed_version(package: str) -> str | None:
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return None
 
 
 # ── Public API ───────────────────────────────────────────────────────
@@ -105,90 +398,97 @@ def collect_command_packages(
 def check_compatibility(specs: list[str]) -> bool:
     """Return True if all *specs* can be simultaneously satisfied.
 
-    Strategy: merge into one :class:`SpecifierSet` and test a range of
-    synthetic versions.  Good enough for an MVP — catches obvious
-    conflicts (disjoint ranges, conflicting pins).
+    Intersects the specifiers as version intervals (exact, no sampling).
     """
-    if not specs:
-        return True
-
-    # Filter out empty (unconstrained) specs
     non_empty = [s for s in specs if s]
     if not non_empty:
         return True
-
-    merged = SpecifierSet()
-    for s in non_empty:
-        merged &= SpecifierSet(s)
-
-    # Test synthetic versions: 0.1 .. 100.0 in steps of 0.1
-    candidates = [Version(f"{major}.{minor}.0") for major in range(101) for minor in range(10)]
-    return any(v in merged for v in candidates)
+    try:
+        return not _interval_for(non_empty).is_empty()
+    except (InvalidSpecifier, InvalidVersion, ValueError):
+        return False
 
 
 def resolve_all(
     base_req_path: str,
     commands: dict[str, Any],
+    previous_snapshot: dict[str, Any] | None = None,
+    installed_version: Callable[[str], str | None] = _installed_version,
 ) -> ResolutionResult:
-    """Run full dependency resolution.
-
-    1. Parse base requirements.
-    2. Collect command packages.
-    3. For each command package, check compatibility (across commands and
-       against base).
-    4. Build ``merged_specs`` (only new packages, not already in base).
+    """Run dependency resolution, incrementally if a previous snapshot is given.
+
+    1. Load the constraint graph from ``previous_snapshot["graph"]``.
+    2. Re-parse base requirements only if the file's hash changed.
+    3. Update each command's constraints (and drop removed commands);
+       only the packages that changed are re-solved.
+    4. ``merged_specs`` — every command package not already in base.
+       ``install_specs`` — the ones whose resolution changed since the
+       snapshot or whose installed version doesn't satisfy it.
     """
-    base_reqs = parse_requirements_file(base_req_path)
-    cmd_packages = collect_command_packages(commands)
+    graph = DependencyGraph.from_dict((previous_snapshot or {}).get("graph"))
+    previous_lines = {
+        name: r.pip_line for name, r in graph.resolutions.items() if r.ok
+    }
 
-    conflicts: list[DependencyConflict] = []
-    merged_specs: list[str] = []
-
-    for pkg_name, sources in sorted(cmd_packages.items()):
-        all_specs: list[str] = [spec for _, spec in sources]
-        all_sources: list[tuple[str, str]] = list(sources)
-
-        in_base = pkg_name in base_reqs
-        if in_base:
-            base_spec = base_reqs[pkg_name]
-            all_specs.append(base_spec)
-            all_sources.append(("requirements.txt", base_spec))
-
-        if not check_compatibility(all_specs):
-            conflicts.append(DependencyConflict(
-                package_name=pkg_name,
-                sources=all_sources,
-                reason=_conflict_reason(all_specs),
-            ))
-            continue
+    with open(base_req_path, "rb") as f:
+        base_sha256 = hashlib.sha256(f.read()).hexdigest()
+    if graph.base_sha256 != base_sha256:
+        graph.set_source(BASE_SOURCE, parse_requirements_file(base_req_path))
+        graph.base_sha256 = base_sha256
 
-        # If it's already in base and compatible, base wins — skip.
-        if in_base:
+    cmd_packages = collect_command_packages(commands)
+    per_command: dict[str, dict[str, str]] = {}
+    for pkg_name, sources in cmd_packages.items():
+        for cmd_name, spec in sources:
+            existing = per_command.setdefault(cmd_name, {}).get(pkg_name)
+            per_command[cmd_name][pkg_name] = f"{existing},{spec}".strip(",") if existing else spec
+
+    for source in list(graph.sources):
+        if source != BASE_SOURCE and source not in per_command:
+            graph.remove_source(source)
+    for cmd_name, pkgs in per_command.items():
+        graph.set_source(cmd_name, pkgs)
+
+    resolved = graph.solve()
+    conflicts = graph.conflicts()
+    merged_specs = graph.merged_specs()
+
+    install_specs: list[str] = []
+    base = graph.sources.get(BASE_SOURCE, {})
+    for name, r in sorted(graph.resolutions.items()):
+        if not r.ok or name in base:
             continue
+        changed = previous_lines.get(name) != r.pip_line
+        if changed or not _satisfied(installed_version(name), r.spec):
+            install_specs.append(r.pip_line)
 
-        # Merge all non-empty specs into a single pip line.
-        non_empty = [s for s in all_specs if s]
-        if non_empty:
-            # Combine all specifier fragments (e.g. ">=1.0" + "<2.0" → ">=1.0,<2.0")
-            combined = ",".join(non_empty)
-            merged_specs.append(f"{pkg_name}{combined}")
-        else:
-            merged_specs.append(pkg_name)
-
-    # Build snapshot
     snapshot = _build_snapshot(commands, cmd_packages, merged_specs)
+    snapshot["graph"] = graph.to_dict()
 
     return ResolutionResult(
         success=len(conflicts) == 0,
-        merged_specs=sorted(merged_specs),
+        merged_specs=merged_specs,
         conflicts=conflicts,
         snapshot=snapshot,
+        install_specs=install_specs,
+        resolved_packages=resolved,
     )
 
 
 # ── Private helpers ──────────────────────────────────────────────────
 
 
+def _satisfied(version: str | None, spec: str) -> bool:
+    if version is None:
+        return False
+    if not spec:
+        return True
+    try:
+        return Version(version) in SpecifierSet(spec)
+    except (InvalidSpecifier, InvalidVersion):
+        return False
+
+
 def _conflict_reason(specs: list[str]) -> str:
     non_empty = [s for s in specs if s]
     return f"No version satisfies all constraints: {', '.join(non_empty)}"
@@ -0,0 +1,265 @@
+"""Concurrent, resumable runner for the command-parsing eval.
+
+``test_command_parsing.py`` used to run every ``CommandTest`` serially
+through ``parse_voice_command(..., warmup_delay=1.5)``, so a full eval
+cost the warmup sleep plus a Command Center round trip per test (twice
+over under ``eval_gate.py --with-baseline``).
+
+``EvalRunner`` keeps up to ``concurrency`` conversations in flight on a
+thread pool. Parsing (register → warmup → send) happens on the workers;
+evaluation and reporting stay on the calling thread, in completion
+order, so the per-test console output is never interleaved.
+
+Two append-only JSONL stores sit in front of the pool:
+
+  - **checkpoint** — every finished test of the current run. With
+    ``resume`` the records already in it are reused, so an interrupted
+    run picks up where it stopped.
+  - **cache** — finished tests across runs, keyed by ``case_cache_key``
+    (utterance, agent context, expectations, the expected command's
+    schema hash, the registered tool set and the adapter settings).
+    Editing one command's schema only re-runs that command's cases.
+
+Tests that raised (network errors, CC restarts) are written to neither
+store, so they are always retried.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_CONCURRENCY = 4
+
+
+@dataclass
+class EvalCase:
+    """One test to run: its suite index, the test object and its cache key."""
+    index: int
+    test: Any
+    key: str
+
+
+@dataclass
+class EvalRecord:
+    """A finished test, in the shape ``test_results.json`` stores it."""
+    index: int
+    key: str
+    test_result: Dict[str, Any]
+    failure_detail: Optional[Dict[str, Any]] = None
+    cached: bool = False
+    errored: bool = False
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "key": self.key,
+            "test_result": self.test_result,
+            "failure_detail": self.failure_detail,
+        }
+
+
+# Worker: (case) -> parse result. Runs on the pool.
+ParseFn = Callable[[EvalCase], Any]
+# Main thread: (case, parse result, seconds) -> (test_result, failure_detail or None)
+EvaluateFn = Callable[[EvalCase, Any, float], Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]
+# Main thread: (case, exception) -> (test_result, failure_detail)
+ErrorFn = Callable[[EvalCase, BaseException], Tuple[Dict[str, Any], Dict[str, Any]]]
+
+
+def _sha256(payload: Any) -> str:
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def case_cache_key(
+    test: Any,
+    schema_hashes: Dict[str, str],
+    adapter_settings: Optional[Dict[str, Any]] = None,
+    local_router: bool = False,
+) -> str:
+    """Cache key for one test.
+
+    Only the expected command's schema is hashed, plus the *names* of the
+    registered tools: changing another command's description does not
+    invalidate this case, but adding or removing a tool does (the model
+    may now route somewhere else).
+    """
+    return _sha256(
+        {
+            "utterance": test.voice_command,
+            "agents": getattr(test, "ha_context", None),
+            "expected_command": test.expected_command,
+            "expected_params": test.expected_params,
+            "schema": schema_hashes.get(test.expected_command),
+            "tools": sorted(schema_hashes),
+            "adapter": adapter_settings,
+            "local_router": local_router,
+        }
+    )
+
+
+class ResultStore:
+    """Append-only JSONL file of ``EvalRecord``s; the last record per key wins."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        records: Dict[str, Dict[str, Any]] = {}
+        if not self.path.is_file():
+            return records
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    # A run killed mid-write leaves a truncated last line
+                    continue
+                if isinstance(row, dict) and row.get("key"):
+                    records[row["key"]] = row
+        return records
+
+    def append(self, record: EvalRecord) -> None:
+        line = json.dumps(record.to_json(), default=str)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+
+
+class EvalRunner:
+    """Run eval cases with bounded concurrency, a checkpoint and a cache."""
+
+    def __init__(
+        self,
+        parse: ParseFn,
+        evaluate: EvaluateFn,
+        on_error: ErrorFn,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        checkpoint: Optional[ResultStore] = None,
+        resume: bool = False,
+        cache: Optional[ResultStore] = None,
+    ):
+        self._parse = parse
+        self._evaluate = evaluate
+        self._on_error = on_error
+        self.concurrency = max(1, concurrency)
+        self._checkpoint = checkpoint
+        self._resume = resume
+        self._cache = cache
+
+        self.executed = 0
+        self.from_checkpoint = 0
+        self.from_cache = 0
+        self.wall_seconds = 0.0
+
+    def run(
+        self,
+        cases: List[EvalCase],
+        on_record: Optional[Callable[[EvalRecord], None]] = None,
+    ) -> List[EvalRecord]:
+        """Run ``cases`` and return their records in suite order."""
+        start = time.perf_counter()
+        records: Dict[int, EvalRecord] = {}
+
+        done_before = self._checkpoint.load() if (self._checkpoint and self._resume) else {}
+        if self._checkpoint and not self._resume:
+            self._checkpoint.clear()
+        cached = self._cache.load() if self._cache else {}
+
+        pending: List[EvalCase] = []
+        for case in cases:
+            row = done_before.get(case.key)
+            from_cache = False
+            if row is None and case.key in cached:
+                row, from_cache = cached[case.key], True
+            if row is None:
+                pending.append(case)
+                continue
+            if from_cache:
+                self.from_cache += 1
+            else:
+                self.from_checkpoint += 1
+            record = self._record_from_row(case, row)
+            records[case.index] = record
+            if from_cache and self._checkpoint:
+                # Cache hits go into the checkpoint so a resume doesn't
+                # depend on the cache still being there.
+                self._checkpoint.append(record)
+            if on_record:
+                on_record(record)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="eval") as pool:
+                waiting = list(pending)
+                in_flight: Dict[Future, Tuple[EvalCase, float]] = {}
+                while waiting or in_flight:
+                    while waiting and len(in_flight) < self.concurrency:
+                        case = waiting.pop(0)
+                        in_flight[pool.submit(self._parse, case)] = (case, time.perf_counter())
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        case, submitted = in_flight.pop(future)
+                        elapsed = time.perf_counter() - submitted
+                        record = self._finish(case, future, elapsed)
+                        records[case.index] = record
+                        if on_record:
+                            on_record(record)
+
+        self.wall_seconds = time.perf_counter() - start
+        return [records[case.index] for case in cases]
+
+    def _finish(self, case: EvalCase, future: Future, elapsed: float) -> EvalRecord:
+        self.executed += 1
+        try:
+            result = future.result()
+            test_result, failure = self._evaluate(case, result, elapsed)
+        except Exception as e:
+            test_result, failure = self._on_error(case, e)
+            return EvalRecord(case.index, case.key, test_result, failure, errored=True)
+
+        record = EvalRecord(case.index, case.key, test_result, failure)
+        if self._checkpoint:
+            self._checkpoint.append(record)
+        if self._cache:
+            self._cache.append(record)
+        return record
+
+    @staticmethod
+    def _record_from_row(case: EvalCase, row: Dict[str, Any]) -> EvalRecord:
+        # Suite indices shift when tests are added; the key is what matched
+        test_result = dict(row.get("test_result") or {})
+        test_result["test_number"] = case.index
+        test_result["cached"] = True
+        failure = row.get("failure_detail")
+        if failure:
+            failure = dict(failure)
+            failure["test_number"] = case.index
+        return EvalRecord(case.index, case.key, test_result, failure, cached=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "executed": self.executed,
+            "from_checkpoint": self.from_checkpoint,
+            "from_cache": self.from_cache,
+            "wall_seconds": round(self.wall_seconds, 3),
+        }
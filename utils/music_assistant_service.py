@@ -1,105 +1,58 @@
-import asyncio
-import json
-import threading
 from typing import Any, Dict, Optional
 
-import websockets
-
 from jarvis_log_client import JarvisLogger
 
+from music_assistant_shared.music_assistant_session import (
+    MusicAssistantSession,
+    get_music_assistant_session,
+)
 from services.secret_service import get_secret_value
 
 logger = JarvisLogger(service="jarvis-node")
 
 
 class MusicAssistantService:
+    """Node-side Music Assistant access over the shared ``MusicAssistantSession``.
+
+    The session owns the websocket (on the node's async runtime) and keeps
+    the player index current from push events, so lookups here never hit
+    the network and a pause is a single command.
+    """
+
     def __init__(self) -> None:
         self.uri: Optional[str] = get_secret_value("MUSIC_ASSISTANT_URL", "integration")
         self.player_id: Optional[str] = get_secret_value("MUSIC_ASSISTANT_PLAYER_ID", "integration")
-        self.ws: Optional[Any] = None  # websockets.WebSocketServerProtocol
-        self.lock: threading.Lock = threading.Lock()
-        self.connected: bool = False
-        self.message_id: int = 0
-        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
-        self.player_cache: Dict[str, Dict[str, Any]] = {}
-
-        threading.Thread(target=self._start_event_loop, daemon=True).start()
+        self.session: Optional[MusicAssistantSession] = get_music_assistant_session()
+        if self.session is None:
+            logger.warning("Music Assistant URL not configured")
 
-    def _start_event_loop(self) -> None:
-        asyncio.set_event_loop(self.loop)
-        self.loop.run_until_complete(self._connect())
-
-    async def _connect(self) -> None:
-        try:
-            if not self.uri:
-                raise ValueError("music_assistant_url not configured")
-            self.ws = await websockets.connect(self.uri)
-            self.connected = True
-            await self._get_players_async()
-        except Exception as e:
-            logger.error("Music Assistant connection failed", error=str(e))
-            self.connected = False
-            await asyncio.sleep(5)
-            await self._connect()
+    @property
+    def connected(self) -> bool:
+        return self.session is not None and self.session.connected
 
-    async def _get_players_async(self) -> None:
-        """Async version of get_players for internal use"""
-        result: Optional[Dict[str, Any]] = await self._send_command("players/all")
-        if result and "result" in result:
-            for p in result["result"]:
-                self.player_cache[p["name"]] = p
-
-    async def _send_command(self, command: str, payload: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
-        if not self.ws or self.ws.closed:
-            logger.warning("Music Assistant WebSocket not open, reconnecting")
-            await self._connect()
-
-        self.message_id += 1
-        message: Dict[str, Any] = {
-                "message_id": self.message_id,
-                "command": command
-        }
-
-        if payload:
-            message["payload"] = payload
-
-        try:
-            if self.ws:
-                await self.ws.send(json.dumps(message))
-                response: str = await self.ws.recv()
-                return json.loads(response)
-        except Exception as e:
-            logger.error("Music Assistant command failed", error=str(e))
-            self.connected = False
-            return None
-
-    def _run_async(self, coro: Any) -> Any:
-        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+    @property
+    def player_cache(self) -> Dict[str, Dict[str, Any]]:
+        if self.session is None:
+            return {}
+        return {p.get("display_name") or p.get("name", ""): p for p in self.session.players.all()}
 
     def get_players(self) -> Dict[str, Dict[str, Any]]:
-        result: Optional[Dict[str, Any]] = self._run_async(self._send_command("players/all"))
-
-        if result and "result" in result:
-            for p in result["result"]:
-                self.player_cache[p["name"]] = p
         return self.player_cache
 
     def pause_player(self, player_name: str) -> Optional[Dict[str, Any]]:
-        player: Optional[Dict[str, Any]] = self.player_cache.get(player_name)
-        if not player:
-            self.get_players()
-            player = self.player_cache.get(player_name)
-
+        if self.session is None:
+            return None
+        player = self.session.find_player(player_name)
         if not player:
             logger.warning("Music Assistant player not found", player_name=player_name)
             return None
 
-        payload: Dict[str, Any] = {
-                "player_id": player["player_id"],
-                "command": "pause"
-        }
-
-        return self._run_async(self._send_command("players/cmd/pause", payload))
+        try:
+            result = self.session.call("player_queues/pause", queue_id=self.session.queue_id_for(player))
+        except Exception as e:
+            logger.error("Music Assistant command failed", error=str(e))
+            return None
+        return {"result": result}
 
 
 class DummyMusicAssistantService:
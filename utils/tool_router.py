@@ -0,0 +1,350 @@
+"""On-node tool router: hashed n-gram features + a linear softmax model.
+
+The command center already runs a FastText tool router, but every
+utterance that misses ``pre_route()`` still pays a full LLM round trip.
+This module is the small on-node counterpart: a multinomial logistic
+regression over hashed word/char n-grams, trained offline by
+``scripts/train_tool_router.py --local`` and shipped as a single
+``.npz`` artifact (a few hundred KB).
+
+At runtime ``CommandExecutionService`` asks the router for the most
+likely tool. Only when the prediction is highly confident AND the
+command can fill its own parameters (``route_locally()``) does the node
+skip ``send_command_unified``; everything else falls through to the LLM.
+
+Pure numpy — no sklearn/onnx dependency, so the same artifact loads on a
+Pi Zero.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from jarvis_log_client import JarvisLogger
+
+logger = JarvisLogger(service="jarvis-node")
+
+DEFAULT_N_FEATURES = 1 << 12
+DEFAULT_CONFIDENCE_THRESHOLD = 0.85
+ARTIFACT_VERSION = 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+# ── Features ─────────────────────────────────────────────────────────
+
+
+def _hash(token: str, n_features: int) -> int:
+    # crc32 is stable across processes (unlike hash()), so the artifact
+    # trained on a dev box scores identically on the node.
+    return zlib.crc32(token.encode("utf-8")) % n_features
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens; digits kept so "5 minutes" stays informative."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def featurize(text: str, n_features: int = DEFAULT_N_FEATURES) -> tuple[np.ndarray, np.ndarray]:
+    """Sparse hashed feature vector for ``text``.
+
+    Features: word unigrams, word bigrams and char 3-grams of each word
+    (with boundary markers, so "timer"/"timers" share most buckets).
+    Numbers collapse to a ``<num>`` token — the router cares that a
+    number is present, not which one.
+
+    Returns:
+        (indices, values) with values L2-normalised.
+    """
+    words = ["<num>" if w.isdigit() else w for w in tokenize(text)]
+    counts: dict[int, float] = {}
+
+    def add(token: str, weight: float = 1.0) -> None:
+        idx = _hash(token, n_features)
+        counts[idx] = counts.get(idx, 0.0) + weight
+
+    for i, word in enumerate(words):
+        add(f"w:{word}")
+        if i + 1 < len(words):
+            add(f"b:{word}_{words[i + 1]}")
+        padded = f"<{word}>"
+        for j in range(len(padded) - 2):
+            add(f"c:{padded[j:j + 3]}", 0.5)
+
+    if not counts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+    indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+    norm = float(np.linalg.norm(values))
+    if norm > 0:
+        values /= norm
+    return indices, values
+
+
+def _dense_matrix(texts: list[str], n_features: int) -> np.ndarray:
+    matrix = np.zeros((len(texts), n_features), dtype=np.float32)
+    for row, text in enumerate(texts):
+        indices, values = featurize(text, n_features)
+        np.add.at(matrix[row], indices, values)
+    return matrix
+
+
+# ── Model ────────────────────────────────────────────────────────────
+
+
+@dataclass
+class RouterPrediction:
+    tool_name: str
+    confidence: float
+    latency_ms: float
+
+
+@dataclass
+class ToolRouterModel:
+    """Linear softmax classifier over hashed features."""
+
+    labels: list[str]
+    weights: np.ndarray  # (n_features, n_labels)
+    bias: np.ndarray  # (n_labels,)
+    n_features: int = DEFAULT_N_FEATURES
+    metadata: dict[str, str] = field(default_factory=dict)
+
+    def predict(self, text: str) -> Optional[RouterPrediction]:
+        """Return the top tool and its softmax probability, or None for empty input."""
+        start = time.perf_counter()
+        indices, values = featurize(text, self.n_features)
+        if indices.size == 0:
+            return None
+        logits = values @ self.weights[indices] + self.bias
+        logits -= logits.max()
+        probs = np.exp(logits)
+        probs /= probs.sum()
+        best = int(probs.argmax())
+        return RouterPrediction(
+            tool_name=self.labels[best],
+            confidence=float(probs[best]),
+            latency_ms=(time.perf_counter() - start) * 1000,
+        )
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                version=np.array(ARTIFACT_VERSION),
+                labels=np.array(self.labels),
+                weights=self.weights.astype(np.float32),
+                bias=self.bias.astype(np.float32),
+                n_features=np.array(self.n_features),
+                metadata_keys=np.array(list(self.metadata.keys())),
+                metadata_values=np.array(list(self.metadata.values())),
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "ToolRouterModel":
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["version"])
+            if version != ARTIFACT_VERSION:
+                raise ValueError(f"Unsupported tool router artifact version: {version}")
+            return cls(
+                labels=[str(label) for label in data["labels"]],
+                weights=data["weights"],
+                bias=data["bias"],
+                n_features=int(data["n_features"]),
+                metadata=dict(zip(
+                    (str(k) for k in data["metadata_keys"]),
+                    (str(v) for v in data["metadata_values"]),
+                )),
+            )
+
+
+def train_tool_router(
+    entries: Iterable[dict[str, str]],
+    *,
+    n_features: int = DEFAULT_N_FEATURES,
+    epochs: int = 300,
+    lr: float = 5.0,
+    l2: float = 1e-4,
+) -> ToolRouterModel:
+    """Fit the router with full-batch gradient descent on softmax cross-entropy.
+
+    Training sets here are a few hundred utterances, so a dense
+    (n_samples, n_features) matrix is cheap and keeps this numpy-only.
+
+    Args:
+        entries: ``{"utterance": ..., "tool_name": ...}`` dicts (same
+                 shape as ``training/tool_router_extra_utterances.jsonl``).
+    """
+    rows = [(e["utterance"], e["tool_name"]) for e in entries if e.get("utterance") and e.get("tool_name")]
+    if not rows:
+        raise ValueError("No training entries")
+
+    labels = sorted({tool for _, tool in rows})
+    label_index = {label: i for i, label in enumerate(labels)}
+    x = _dense_matrix([utterance for utterance, _ in rows], n_features)
+    y = np.zeros((len(rows), len(labels)), dtype=np.float32)
+    for row, (_, tool) in enumerate(rows):
+        y[row, label_index[tool]] = 1.0
+
+    weights = np.zeros((n_features, len(labels)), dtype=np.float32)
+    bias = np.zeros(len(labels), dtype=np.float32)
+    n = float(len(rows))
+
+    for _ in range(epochs):
+        logits = x @ weights + bias
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        grad = (probs - y) / n
+        weights -= lr * (x.T @ grad + l2 * weights)
+        bias -= lr * grad.sum(axis=0)
+
+    return ToolRouterModel(
+        labels=labels,
+        weights=weights,
+        bias=bias,
+        n_features=n_features,
+        metadata={"trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "samples": str(len(rows))},
+    )
+
+
+# ── Evaluation ───────────────────────────────────────────────────────
+
+
+@dataclass
+class RouterEvaluation:
+    total: int
+    accuracy: float
+    # Of the utterances the router would act on (confidence >= threshold),
+    # how many and how many were right. This is what matters on the node:
+    # a confident wrong answer skips the LLM and runs the wrong command.
+    confident: int
+    confident_accuracy: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    misses: list[dict[str, str]] = field(default_factory=list)
+
+
+def evaluate_tool_router(
+    model: ToolRouterModel,
+    entries: Iterable[dict[str, str]],
+    threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+) -> RouterEvaluation:
+    correct = 0
+    confident = 0
+    confident_correct = 0
+    latencies: list[float] = []
+    misses: list[dict[str, str]] = []
+    total = 0
+
+    for entry in entries:
+        prediction = model.predict(entry["utterance"])
+        total += 1
+        if prediction is None:
+            continue
+        latencies.append(prediction.latency_ms)
+        hit = prediction.tool_name == entry["tool_name"]
+        correct += hit
+        if prediction.confidence >= threshold:
+            confident += 1
+            confident_correct += hit
+        if not hit:
+            misses.append({
+                "utterance": entry["utterance"],
+                "expected": entry["tool_name"],
+                "predicted": prediction.tool_name,
+                "confidence": f"{prediction.confidence:.3f}",
+            })
+
+    return RouterEvaluation(
+        total=total,
+        accuracy=correct / total if total else 0.0,
+        confident=confident,
+        confident_accuracy=confident_correct / confident if confident else 0.0,
+        latency_p50_ms=float(np.percentile(latencies, 50)) if latencies else 0.0,
+        latency_p95_ms=float(np.percentile(latencies, 95)) if latencies else 0.0,
+        misses=misses,
+    )
+
+
+def cross_validate_tool_router(
+    entries: list[dict[str, str]],
+    folds: int = 5,
+    threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+    seed: int = 0,
+    **train_kwargs,
+) -> RouterEvaluation:
+    """K-fold held-out evaluation (training-set accuracy flatters a linear model)."""
+    order = np.random.default_rng(seed).permutation(len(entries))
+    shuffled = [entries[i] for i in order]
+    results: list[RouterEvaluation] = []
+    for k in range(folds):
+        held_out = shuffled[k::folds]
+        train = [e for i, e in enumerate(shuffled) if i % folds != k]
+        if not held_out or not train:
+            continue
+        results.append(evaluate_tool_router(train_tool_router(train, **train_kwargs), held_out, threshold))
+
+    total = sum(r.total for r in results)
+    confident = sum(r.confident for r in results)
+    return RouterEvaluation(
+        total=total,
+        accuracy=sum(r.accuracy * r.total for r in results) / total if total else 0.0,
+        confident=confident,
+        confident_accuracy=(
+            sum(r.confident_accuracy * r.confident for r in results) / confident if confident else 0.0
+        ),
+        latency_p50_ms=float(np.median([r.latency_p50_ms for r in results])) if results else 0.0,
+        latency_p95_ms=float(max((r.latency_p95_ms for r in results), default=0.0)),
+        misses=[m for r in results for m in r.misses],
+    )
+
+
+# ── Runtime singleton ────────────────────────────────────────────────
+
+
+def get_tool_router_model_path() -> Path:
+    """Artifact location: ``tool_router_model_path`` config, else ~/.jarvis/tool_router.npz."""
+    from utils.config_service import Config
+    from utils.encryption_utils import get_secret_dir
+
+    configured = Config.get_str("tool_router_model_path")
+    if configured:
+        return Path(configured).expanduser()
+    return get_secret_dir() / "tool_router.npz"
+
+
+_model: Optional[ToolRouterModel] = None
+_model_mtime: float | None = None
+_model_lock = threading.Lock()
+
+
+def get_tool_router() -> Optional[ToolRouterModel]:
+    """Load (or hot-reload on mtime change) the router artifact; None if absent."""
+    global _model, _model_mtime
+    path = get_tool_router_model_path()
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None
+
+    with _model_lock:
+        if _model is None or _model_mtime != mtime:
+            try:
+                _model = ToolRouterModel.load(path)
+                _model_mtime = mtime
+                logger.info("Loaded on-node tool router", path=str(path), labels=len(_model.labels))
+            except Exception as e:
+                logger.warning("Failed to load tool router artifact", path=str(path), error=str(e))
+                _model = None
+                _model_mtime = None
+        return _model
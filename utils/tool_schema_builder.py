@@ -4,6 +4,8 @@ Handles both IJarvisCommand (built-in) commands that have
 to_openai_tool_schema() and SDK-only (Pantry) commands that don't.
 """
 
+import hashlib
+import json
 from typing import Any, Dict, List, Tuple
 
 
@@ -41,6 +43,16 @@ def build_tool_schemas(
     return client_tools, available_commands
 
 
+def command_schema_hashes(commands: Dict[str, Any], date_context: Any = None) -> Dict[str, str]:
+    """Hash each command's tool schema as it would be registered with the CC."""
+    hashes: Dict[str, str] = {}
+    for name, command in commands.items():
+        client_tools, available = build_tool_schemas({name: command}, date_context)
+        payload = json.dumps({"tool": client_tools, "command": available}, sort_keys=True, default=str)
+        hashes[name] = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return hashes
+
+
 def _build_schema_from_sdk_command(cmd: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """Build OpenAI tool schema from an SDK IJarvisCommand instance."""
     name = cmd.command_name